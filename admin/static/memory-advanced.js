@@ -203,11 +203,19 @@ function showBulkTag() {
 }
 
 // Perform bulk operations
+function bulkJobMessage(result, doneMessage) {
+    // Large jobs run in the background; progress is at /admin/api/memory/bulk-operations/{job_id}
+    if (result.status === 'running') {
+        return `Bulk ${result.operation} of ${result.total_processed} memories started in the background (job ${result.job_id})`;
+    }
+    return doneMessage;
+}
+
 async function performBulkOperation(operation) {
     if (selectedMemories.length === 0) return;
     
     const confirmMessage = operation === 'delete' ? 
-        `Are you sure you want to delete ${selectedMemories.length} memories? This cannot be undone.` :
+        `Are you sure you want to delete ${selectedMemories.length} memories? They can be recovered from the recycle bin for 30 days.` :
         `Perform ${operation} on ${selectedMemories.length} memories?`;
     
     if (!confirm(confirmMessage)) return;
@@ -222,9 +230,19 @@ async function performBulkOperation(operation) {
             })
         });
         
-        if (response.ok) {
+        if (response.ok && operation === 'export') {
+            // NDJSON stream, one memory per line
+            const blob = await response.blob();
+            const url = URL.createObjectURL(blob);
+            const link = document.createElement('a');
+            link.href = url;
+            link.download = `haivemind-memories-${new Date().toISOString().slice(0, 10)}.ndjson`;
+            link.click();
+            URL.revokeObjectURL(url);
+            showNotification(`Exported ${selectedMemories.length} memories`, 'success');
+        } else if (response.ok) {
             const result = await response.json();
-            showNotification(`${operation} completed: ${result.successful} successful, ${result.failed} failed`, 'success');
+            showNotification(bulkJobMessage(result, `${operation} completed: ${result.successful} successful, ${result.failed} failed`), 'success');
             closeModal();
             clearSelection();
             performAdvancedSearch(); // Refresh results
@@ -254,7 +272,7 @@ async function performBulkCategorize() {
         
         if (response.ok) {
             const result = await response.json();
-            showNotification(`Category updated for ${result.successful} memories`, 'success');
+            showNotification(bulkJobMessage(result, `Category updated for ${result.successful} memories`), 'success');
             closeModal();
             clearSelection();
             performAdvancedSearch();
@@ -290,7 +308,7 @@ async function performBulkTag() {
         
         if (response.ok) {
             const result = await response.json();
-            showNotification(`Tags added to ${result.successful} memories`, 'success');
+            showNotification(bulkJobMessage(result, `Tags added to ${result.successful} memories`), 'success');
             closeModal();
             clearSelection();
             performAdvancedSearch();
@@ -415,8 +433,8 @@ function displayAnalyticsDashboard(analytics) {
                             <span>${analytics.quality_metrics.memories_with_context}%</span>
                         </div>
                         <div class="metric">
-                            <span>Duplicate Detection Score:</span>
-                            <span>${analytics.quality_metrics.duplicate_detection_score}%</span>
+                            <span>Merged Duplicates:</span>
+                            <span>${analytics.quality_metrics.merged_duplicates}</span>
                         </div>
                     </div>
                 </div>
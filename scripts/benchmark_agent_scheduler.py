@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+hAIveMind Agent Scheduler Benchmark
+Populates an agent kanban database with a synthetic fleet of agents and a
+backlog of capability-tagged tasks, then compares the previous per-task
+capability query against AgentTaskScheduler batch assignment.
+
+Usage:
+    python scripts/benchmark_agent_scheduler.py --agents 1000 --tasks 10000
+
+Author: Lance James, Unit 221B Inc
+"""
+
+import argparse
+import json
+import logging
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from agent_kanban_system import AgentKanbanSystem
+from agent_task_scheduler import AgentTaskScheduler
+
+CAPABILITIES = ["docker", "kubernetes", "nginx", "mysql", "redis", "kafka", "elasticsearch", "terraform",
+                "ansible", "python", "golang", "prometheus", "grafana", "aws", "gcp", "security",
+                "networking", "postgres", "mongodb", "ci_cd"]
+PRIORITIES = ["low", "medium", "medium", "high", "critical"]
+
+# The query get_available_agents ran on every assignment before the scheduler
+LEGACY_AVAILABLE_AGENTS_SQL = '''
+    SELECT a.*, GROUP_CONCAT(ac.name || ':' || ac.level) as capabilities_str
+    FROM agents a
+    LEFT JOIN agent_capabilities ac ON a.id = ac.agent_id
+    WHERE a.status = 'active' AND a.current_workload < a.max_workload
+    AND a.id IN (
+        SELECT agent_id FROM agent_capabilities
+        WHERE name IN ({placeholders}) AND level >= ?
+        GROUP BY agent_id
+        HAVING COUNT(DISTINCT name) = ?
+    )
+    GROUP BY a.id
+    ORDER BY a.current_workload ASC, a.last_seen DESC
+'''
+
+
+def populate(db_path: Path, agents: int, tasks: int, max_workload: int, seed: int = 221):
+    """Bulk-load agents, capabilities and backlog tasks"""
+    AgentKanbanSystem(str(db_path))
+    rng = random.Random(seed)
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany("INSERT INTO agents (id, name, machine_id, status, max_workload) VALUES (?, ?, ?, 'active', ?)",
+                         [(f"agent-{i:04d}", f"Agent {i}", f"machine-{i % 50}", max_workload) for i in range(agents)])
+        conn.executemany("INSERT INTO agent_capabilities (agent_id, name, level) VALUES (?, ?, ?)",
+                         [(f"agent-{i:04d}", cap, rng.randint(1, 5))
+                          for i in range(agents) for cap in rng.sample(CAPABILITIES, rng.randint(2, 6))])
+        rows = []
+        for i in range(tasks):
+            required = rng.sample(CAPABILITIES, rng.choice([0, 1, 1, 2]))
+            metadata = {'required_capabilities': required, 'min_capability_level': rng.randint(1, 3)} if required else {}
+            rows.append((str(uuid.uuid4()), f"Task {i}", rng.choice(PRIORITIES), json.dumps(metadata)))
+        conn.executemany("INSERT INTO agent_tasks (id, title, priority, created_by, board_id, metadata) "
+                         "VALUES (?, ?, ?, 'bench', 'default', ?)", rows)
+
+
+def legacy_assign(db_path: Path, sample: int) -> float:
+    """Per-task capability query plus assignment on new connections, as before"""
+    with sqlite3.connect(db_path) as conn:
+        tasks = conn.execute("SELECT id, metadata FROM agent_tasks WHERE status = 'backlog' LIMIT ?",
+                             (sample,)).fetchall()
+    started = time.perf_counter()
+    for task_id, metadata in tasks:
+        metadata = json.loads(metadata)
+        required = metadata.get('required_capabilities') or CAPABILITIES[:1]
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(LEGACY_AVAILABLE_AGENTS_SQL.format(placeholders=','.join('?' * len(required))),
+                            required + [metadata.get('min_capability_level', 1), len(required)]).fetchall()
+        agents = []
+        for row in rows:
+            agent = dict(row)
+            agent['capabilities'] = [{'name': c.split(':')[0], 'level': int(c.split(':')[1])}
+                                     for c in (agent.pop('capabilities_str') or '').split(',') if c]
+            agents.append(agent)
+        conn.close()
+        if agents:
+            conn = sqlite3.connect(db_path)
+            conn.execute("UPDATE agent_tasks SET assigned_agent = ?, status = 'assigned' WHERE id = ?",
+                         (agents[0]['id'], task_id))
+            conn.execute("UPDATE agents SET current_workload = current_workload + 1 WHERE id = ?", (agents[0]['id'],))
+            conn.commit()
+            conn.close()
+    return time.perf_counter() - started
+
+
+def check_integrity(db_path: Path) -> str:
+    with sqlite3.connect(db_path) as conn:
+        over = conn.execute("SELECT COUNT(*) FROM agents WHERE current_workload > max_workload").fetchone()[0]
+        mismatched = conn.execute('''
+            SELECT COUNT(*) FROM agents a
+            WHERE a.current_workload != (SELECT COUNT(*) FROM agent_tasks t WHERE t.assigned_agent = a.id)
+        ''').fetchone()[0]
+    return "ok" if not over and not mismatched else f"{over} over capacity, {mismatched} workload mismatches"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark agent task scheduling")
+    parser.add_argument("--agents", type=int, default=1000)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--max-workload", type=int, default=8)
+    parser.add_argument("--legacy-sample", type=int, default=200,
+                        help="Tasks assigned with the per-task query (extrapolated to --tasks)")
+    parser.add_argument("--dispatchers", type=int, default=4, help="Concurrent schedulers in the race run")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"📊 Agent scheduler: {args.agents} agents x {args.tasks} tasks "
+              f"(capacity {args.agents * args.max_workload})")
+        print("=" * 60)
+
+        legacy_db = Path(tmp) / "legacy.db"
+        populate(legacy_db, args.agents, args.tasks, args.max_workload)
+        elapsed = legacy_assign(legacy_db, args.legacy_sample)
+        per_task = elapsed / args.legacy_sample
+        print(f"per-task query: {per_task * 1000:.1f}ms/task -> ~{per_task * args.tasks:.0f}s for {args.tasks} tasks")
+
+        db_path = Path(tmp) / "scheduler.db"
+        populate(db_path, args.agents, args.tasks, args.max_workload)
+        scheduler = AgentTaskScheduler(db_path)
+        started = time.perf_counter()
+        scheduler.load()
+        print(f"scheduler load: {time.perf_counter() - started:.2f}s")
+        result = scheduler.assign_batch()
+        print(f"batch assign: {result['assigned_count']} assigned, {result['unassignable']} waiting for capacity "
+              f"in {result['seconds']:.2f}s (integrity {check_integrity(db_path)})")
+
+        race_db = Path(tmp) / "race.db"
+        populate(race_db, args.agents, args.tasks, args.max_workload)
+        dispatchers = [AgentTaskScheduler(race_db) for _ in range(args.dispatchers)]
+        for dispatcher in dispatchers:
+            dispatcher.load()
+        results = []
+        started = time.perf_counter()
+        threads = [threading.Thread(target=lambda d=d: results.append(d.assign_batch())) for d in dispatchers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print(f"{args.dispatchers} racing dispatchers: {sum(r['assigned_count'] for r in results)} assigned, "
+              f"{sum(r['conflicts'] for r in results)} lost claims in {time.perf_counter() - started:.2f}s "
+              f"(integrity {check_integrity(race_db)})")
+
+
+if __name__ == "__main__":
+    main()
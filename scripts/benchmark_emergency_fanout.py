@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+hAIveMind Emergency Fan-out Benchmark
+Measures emergency rule propagation time across a fleet of local stub servers,
+comparing the previous sequential delivery against EmergencyFanoutDispatcher.
+
+Usage:
+    python scripts/benchmark_emergency_fanout.py --machines 50 --dead 3 --hung 2
+
+Author: Lance James, Unit 221B Inc
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import httpx
+
+from emergency_fanout import EmergencyFanoutDispatcher
+
+URL_TEMPLATE = "http://{machine}/api/rules/emergency-sync"
+
+
+async def start_stub_server(latency: float, hang: bool = False):
+    """Minimal HTTP/1.1 endpoint that reports every POST applied after latency seconds"""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                headers = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in headers.decode().split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                await reader.readexactly(length)
+                if hang:
+                    await asyncio.sleep(3600)
+                await asyncio.sleep(latency)
+                body = json.dumps({"success": True, "applied": True}).encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"127.0.0.1:{port}"
+
+
+def dead_address() -> str:
+    """A local port with nothing listening (connections are refused)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"127.0.0.1:{sock.getsockname()[1]}"
+
+
+async def sequential_delivery(machines, payload, timeout: float) -> float:
+    """The previous behaviour: one new client per machine, one machine at a time"""
+    started = time.perf_counter()
+    for machine in machines:
+        try:
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                await client.post(URL_TEMPLATE.format(machine=machine), json=payload)
+        except Exception:
+            pass
+    return time.perf_counter() - started
+
+
+async def run(args):
+    servers = []
+    machines = []
+    healthy = args.machines - args.dead - args.hung
+    for _ in range(healthy):
+        server, address = await start_stub_server(latency=args.latency)
+        servers.append(server)
+        machines.append(address)
+    for _ in range(args.hung):
+        server, address = await start_stub_server(latency=0, hang=True)
+        servers.append(server)
+        machines.append(address)
+    machines.extend(dead_address() for _ in range(args.dead))
+
+    payload = {"sync_message": {"sync_id": "bench", "operation": "emergency_update",
+                                "rule_data": {"id": "rule_bench"}}, "source": "bench"}
+
+    print(f"🚨 Emergency fan-out: {args.machines} machines "
+          f"({healthy} healthy @ {args.latency * 1000:.0f}ms, {args.hung} hung, {args.dead} dead)")
+    print("=" * 60)
+
+    dispatcher = EmergencyFanoutDispatcher({
+        "max_concurrency": args.concurrency,
+        "timeout": args.timeout,
+        "hedge_delay": args.hedge_delay,
+        "quorum": args.quorum,
+    })
+    try:
+        for run_number in range(1, args.runs + 1):
+            result = await dispatcher.dispatch(machines, payload, URL_TEMPLATE)
+            quorum = f"{result.quorum_seconds * 1000:.0f}ms" if result.quorum_reached else "not reached"
+            print(f"fan-out run {run_number}: quorum {result.quorum}/{result.targets} in {quorum}, "
+                  f"all done in {result.total_seconds:.2f}s "
+                  f"(acked {len(result.acknowledged)}, failed {len(result.failed)}, "
+                  f"skipped {len(result.skipped)}, hedged {result.hedged_attempts})")
+    finally:
+        await dispatcher.aclose()
+
+    if not args.skip_sequential:
+        elapsed = await sequential_delivery(machines, payload, args.baseline_timeout)
+        print(f"sequential (new client per machine, {args.baseline_timeout:.0f}s timeout): {elapsed:.2f}s")
+
+    for server in servers:
+        server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark emergency rule fan-out")
+    parser.add_argument("--machines", type=int, default=50)
+    parser.add_argument("--dead", type=int, default=3, help="Machines refusing connections")
+    parser.add_argument("--hung", type=int, default=2, help="Machines that accept but never respond")
+    parser.add_argument("--latency", type=float, default=0.02, help="Healthy machine response latency (s)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--hedge-delay", type=float, default=0.5)
+    parser.add_argument("--quorum", type=float, default=0.5)
+    parser.add_argument("--runs", type=int, default=4,
+                        help="Later runs show dead hosts skipped by open circuit breakers")
+    parser.add_argument("--baseline-timeout", type=float, default=10.0)
+    parser.add_argument("--skip-sequential", action="store_true")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+hAIveMind Metrics Overhead Benchmark
+Measures what the /metrics instrumentation adds to each hot-path call:
+histogram observe, timed sync calls (ChromaDB, Redis), timed async tool
+calls and the SQLite query hook, against the same calls uninstrumented.
+Exits non-zero when any overhead exceeds the budget.
+
+Usage:
+    python scripts/benchmark_metrics.py
+    python scripts/benchmark_metrics.py --iterations 500000 --budget-ns 1000
+
+Author: Lance James, Unit 221B Inc
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import metrics
+from metrics import InstrumentedRedis, instrument_tool, sqlite_query_hook
+
+
+class StubRedis:
+    def get(self, key):
+        return None
+
+
+def per_call_ns(fn, iterations: int) -> float:
+    """Best of five runs, in nanoseconds per call"""
+    return min(timeit.repeat(fn, number=iterations, repeat=5)) / iterations * 1e9
+
+
+def per_await_ns(fn, iterations: int) -> float:
+    async def loop():
+        started = time.perf_counter_ns()
+        for _ in range(iterations):
+            await fn()
+        return (time.perf_counter_ns() - started) / iterations
+    return min(asyncio.run(loop()) for _ in range(5))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark metrics instrumentation overhead")
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--budget-ns", type=float, default=1000.0, help="Maximum overhead per call")
+    args = parser.parse_args()
+    n = args.iterations
+
+    raw_redis = StubRedis()
+    redis_client = InstrumentedRedis(StubRedis())
+    child = metrics.REDIS_SECONDS.labels('benchmark')
+
+    async def tool(query: str = "x"):
+        return query
+    timed_tool = instrument_tool(tool, "benchmark")
+    sql = "SELECT id FROM memories WHERE id = ?"
+
+    def noop():
+        pass
+
+    empty = per_call_ns(noop, n)
+    cases = [
+        ("histogram observe", empty, per_call_ns(lambda: child.observe(0.001), n)),
+        ("redis command", per_call_ns(lambda: raw_redis.get("k"), n),
+         per_call_ns(lambda: redis_client.get("k"), n)),
+        ("sqlite query hook", empty, per_call_ns(lambda: sqlite_query_hook("data/x.db", sql, 0.001), n)),
+        ("async tool call", per_await_ns(tool, n), per_await_ns(timed_tool, n)),
+    ]
+
+    print(f"📈 Metrics overhead ({n:,} iterations, best of 5, budget {args.budget_ns:.0f}ns)")
+    print("=" * 60)
+    print(f"{'path':<20} {'plain':>10} {'timed':>10} {'overhead':>10}")
+    over = []
+    for name, plain, timed in cases:
+        overhead = timed - plain
+        print(f"{name:<20} {plain:>8.0f}ns {timed:>8.0f}ns {overhead:>8.0f}ns")
+        if overhead > args.budget_ns:
+            over.append(name)
+
+    started = time.perf_counter()
+    text = metrics.render_prometheus()
+    print(f"\nrender: {len(text.splitlines())} lines in {(time.perf_counter() - started) * 1000:.2f}ms")
+    if over:
+        print(f"❌ Over budget: {', '.join(over)}")
+        sys.exit(1)
+    print("✅ All instrumented paths within budget")
+
+
+if __name__ == "__main__":
+    main()
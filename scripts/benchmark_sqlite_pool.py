@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+hAIveMind SQLite Access Layer Benchmark
+Measures ops/sec for a mixed read/write workload under concurrent threads,
+comparing the previous connect-per-call pattern (rollback journal, default
+pragmas) against pooled connections from sqlite_pool.
+
+Usage:
+    python scripts/benchmark_sqlite_pool.py --threads 8 --seconds 5
+
+Author: Lance James, Unit 221B Inc
+"""
+
+import argparse
+import logging
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import sqlite_pool
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS agents (
+        id TEXT PRIMARY KEY, name TEXT, status TEXT, current_workload INTEGER DEFAULT 0,
+        last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_agents_status ON agents(status);
+'''
+
+
+def populate(db_path: Path, rows: int):
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(SCHEMA)
+        conn.executemany("INSERT INTO agents (id, name, status) VALUES (?, ?, 'active')",
+                         [(f"agent-{i}", f"Agent {i}") for i in range(rows)])
+
+
+def run_load(connect, db_path: Path, threads: int, seconds: float, write_ratio: float, rows: int):
+    """Run the workload and return (ops, errors)"""
+    counts = [0] * threads
+    errors = [0] * threads
+    deadline = time.perf_counter() + seconds
+
+    def worker(n):
+        rng = random.Random(n)
+        while time.perf_counter() < deadline:
+            agent_id = f"agent-{rng.randrange(rows)}"
+            try:
+                if rng.random() < write_ratio:
+                    with connect(db_path) as conn:
+                        conn.execute("UPDATE agents SET current_workload = current_workload + 1, "
+                                     "last_seen = CURRENT_TIMESTAMP WHERE id = ?", (agent_id,))
+                else:
+                    conn = connect(db_path)
+                    conn.row_factory = sqlite3.Row
+                    conn.execute("SELECT * FROM agents WHERE id = ?", (agent_id,)).fetchone()
+                    conn.close()
+                counts[n] += 1
+            except sqlite3.OperationalError:
+                errors[n] += 1
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sum(counts), sum(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled SQLite access")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--rows", type=int, default=10000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"📊 SQLite access: {args.threads} threads, {args.write_ratio:.0%} writes, {args.seconds:.0f}s each")
+        print("=" * 60)
+        for label, connect in (("connect per call", sqlite3.connect), ("sqlite_pool", sqlite_pool.connect)):
+            db_path = Path(tmp) / f"{label.replace(' ', '_')}.db"
+            populate(db_path, args.rows)
+            ops, errors = run_load(connect, db_path, args.threads, args.seconds, args.write_ratio, args.rows)
+            print(f"{label:>18}: {ops / args.seconds:>9,.0f} ops/sec ({errors} lock errors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+hAIveMind Startup Benchmark
+Profiles module import time with `python -X importtime` and, optionally,
+measures how long a freshly started remote server takes to answer
+/health/live and /health/ready.
+
+Usage:
+    python scripts/benchmark_startup.py --module remote_mcp_server --top 15
+    python scripts/benchmark_startup.py --serve --port 8955 --output startup.jsonl
+
+Author: Lance James, Unit 221B Inc
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SRC_DIR = PROJECT_ROOT / 'src'
+
+IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_imports(module: str):
+    """Import module in a fresh interpreter; returns (wall seconds, [(module, self_us, cumulative_us, depth)], error)"""
+    code = f"import sys; sys.path.insert(0, {str(SRC_DIR)!r}); import {module}"
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, cwd=PROJECT_ROOT)
+    wall = time.perf_counter() - started
+    entries = []
+    error_lines = []
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+        elif not line.startswith("import time:"):
+            error_lines.append(line)
+    error = None
+    if proc.returncode:
+        output = error_lines + proc.stdout.splitlines()
+        error = output[-1] if output else f"exit code {proc.returncode}"
+    return wall, entries, error
+
+
+def first_party(name: str) -> bool:
+    return (SRC_DIR / f"{name.split('.')[0]}.py").exists()
+
+
+def report_imports(module: str, top: int) -> dict:
+    wall, entries, error = profile_imports(module)
+    target = next((e for e in entries if e[0] == module), None)
+    print(f"📦 import {module}: {wall:.2f}s interpreter wall time"
+          + (f", {target[2] / 1e6:.2f}s cumulative import" if target else ""))
+    if error:
+        print(f"   ⚠️ import failed: {error}")
+    print("=" * 60)
+
+    # Top-level packages only, so nested imports are not double counted
+    roots = {}
+    for name, self_us, cumulative_us, depth in entries:
+        root = name.split('.')[0]
+        if depth == 0 or name == root:
+            roots[root] = max(roots.get(root, 0), cumulative_us)
+    print(f"{'cumulative':>12}  module")
+    for name, cumulative_us in sorted(roots.items(), key=lambda item: item[1], reverse=True)[:top]:
+        tag = "  (src)" if first_party(name) else ""
+        print(f"{cumulative_us / 1000:>10.1f}ms  {name}{tag}")
+
+    ours = sum(self_us for name, self_us, _, _ in entries if first_party(name))
+    print(f"\nself time in src modules: {ours / 1000:.1f}ms across "
+          f"{sum(1 for e in entries if first_party(e[0]))} modules")
+    return {
+        "module": module,
+        "wall_seconds": wall,
+        "import_seconds": target[2] / 1e6 if target else None,
+        "src_self_seconds": ours / 1e6,
+        "error": error,
+        "top": {name: us / 1e6 for name, us in sorted(roots.items(), key=lambda item: item[1], reverse=True)[:top]},
+    }
+
+
+def wait_for(url: str, deadline: float):
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter()
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.05)
+    return None
+
+
+def report_serve(port: int, timeout: float, config: str = None) -> dict:
+    command = [sys.executable, str(SRC_DIR / "remote_mcp_server.py"), "--port", str(port)]
+    if config:
+        command += ["--config", config]
+    started = time.perf_counter()
+    proc = subprocess.Popen(command, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = started + timeout
+        live = wait_for(f"http://127.0.0.1:{port}/health/live", deadline)
+        ready = wait_for(f"http://127.0.0.1:{port}/health/ready", deadline)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+    print(f"\n🩺 remote server on port {port}")
+    print("=" * 60)
+    print(f"live  (/health/live):  {'timed out' if live is None else f'{live - started:.2f}s'}")
+    print(f"ready (/health/ready): {'timed out' if ready is None else f'{ready - started:.2f}s'}")
+    return {
+        "live_seconds": None if live is None else live - started,
+        "ready_seconds": None if ready is None else ready - started,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import and startup time")
+    parser.add_argument("--module", default="remote_mcp_server")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--serve", action="store_true", help="Also start the server and time health probes")
+    parser.add_argument("--port", type=int, default=8955)
+    parser.add_argument("--config", default=None)
+    parser.add_argument("--timeout", type=float, default=180.0)
+    parser.add_argument("--output", default=None, help="Append the results as a JSON line to track over time")
+    args = parser.parse_args()
+
+    result = {"timestamp": time.time(), **report_imports(args.module, args.top)}
+    if args.serve:
+        result.update(report_serve(args.port, args.timeout, args.config))
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
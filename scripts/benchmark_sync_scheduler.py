@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+hAIveMind Sync Fan-out Benchmark
+Measures fleet sync cycle time against local stub peers, comparing the previous
+one-machine-at-a-time sync_with_machine loop (change set rebuilt and a new
+client per peer) against SyncFanoutScheduler.
+
+Usage:
+    python scripts/benchmark_sync_scheduler.py --machines 50 --dead 3 --memories 2000
+
+Author: Lance James, Unit 221B Inc
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import socket
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import httpx
+
+from sync_scheduler import SyncFanoutScheduler
+
+URL_TEMPLATE = "http://{machine}/api/sync"
+
+
+async def start_stub_server(latency: float):
+    """Minimal HTTP/1.1 /api/sync endpoint that answers with an empty delta after latency seconds"""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                headers = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in headers.decode().split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                await reader.readexactly(length)
+                await asyncio.sleep(latency)
+                body = json.dumps({"memories": [], "vector_clock": {}}).encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"127.0.0.1:{port}"
+
+
+def dead_address() -> str:
+    """A local port with nothing listening (connections are refused)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"127.0.0.1:{sock.getsockname()[1]}"
+
+
+class StubSyncService:
+    """Stands in for MemorySyncService; building the change set costs build_cost seconds"""
+
+    def __init__(self, memories: int, build_cost: float):
+        self.machine_id = "bench"
+        self.vector_clock = {"bench": 1}
+        self.build_cost = build_cost
+        base = datetime.now() - timedelta(hours=1)
+        self.memories = [{
+            "id": f"memory-{i}",
+            "content": f"benchmark memory {i} " + "x" * 200,
+            "category": "global",
+            "metadata": {"created_at": (base + timedelta(seconds=i)).isoformat()},
+        } for i in range(memories)]
+
+    async def get_outbound_changeset(self, max_age=None):
+        await asyncio.sleep(self.build_cost)  # ChromaDB read of the last 24h
+        return list(self.memories)
+
+    async def _process_sync_response(self, remote_data):
+        pass
+
+
+async def sequential_sync(service: StubSyncService, machines, timeout: float) -> float:
+    """The previous behaviour: sync_with_machine for each peer in turn"""
+    started = time.perf_counter()
+    for machine in machines:
+        try:
+            memories = await service.get_outbound_changeset()
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                response = await client.post(URL_TEMPLATE.format(machine=machine), json={
+                    "machine_id": service.machine_id,
+                    "memories": memories,
+                    "vector_clock": service.vector_clock,
+                })
+                if response.status_code == 200:
+                    await service._process_sync_response(response.json())
+        except Exception:
+            pass
+    return time.perf_counter() - started
+
+
+async def run(args):
+    servers = []
+    machines = []
+    for _ in range(args.machines - args.dead):
+        server, address = await start_stub_server(latency=args.latency)
+        servers.append(server)
+        machines.append(address)
+    machines.extend(dead_address() for _ in range(args.dead))
+
+    service = StubSyncService(args.memories, args.build_cost)
+
+    print(f"🔄 Sync fan-out: {args.machines} peers ({args.dead} dead, {args.latency * 1000:.0f}ms latency), "
+          f"{args.memories} memories, {args.build_cost * 1000:.0f}ms change set build")
+    print("=" * 60)
+
+    scheduler = SyncFanoutScheduler(service, {
+        "max_concurrency": args.concurrency,
+        "timeout": args.timeout,
+        "max_bytes_per_second": args.max_bytes_per_second,
+        "url_template": URL_TEMPLATE,
+    })
+    try:
+        for run_number in range(1, args.runs + 1):
+            result = await scheduler.run_cycle(machines)
+            print(f"fan-out cycle {run_number}: {result.cycle_seconds:.2f}s "
+                  f"(synced {len(result.synced)}, failed {len(result.failed)}, "
+                  f"backing off {len(result.backing_off)}, {result.bytes_sent / 1e6:.1f} MB sent, "
+                  f"{result.payloads_serialized} payloads serialized)")
+    finally:
+        await scheduler.aclose()
+
+    if not args.skip_sequential:
+        elapsed = await sequential_sync(service, machines, args.timeout)
+        print(f"sequential (change set + new client per peer): {elapsed:.2f}s")
+
+    for server in servers:
+        server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fleet sync cycles")
+    parser.add_argument("--machines", type=int, default=50)
+    parser.add_argument("--dead", type=int, default=3, help="Peers refusing connections")
+    parser.add_argument("--latency", type=float, default=0.02, help="Peer response latency (s)")
+    parser.add_argument("--memories", type=int, default=2000)
+    parser.add_argument("--build-cost", type=float, default=0.05, help="Simulated change set build time (s)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--max-bytes-per-second", type=float, default=0)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--runs", type=int, default=3,
+                        help="Later cycles send deltas only and skip dead peers while they back off")
+    parser.add_argument("--skip-sequential", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
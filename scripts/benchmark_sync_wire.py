@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+hAIveMind Sync Wire Format Benchmark
+Compares the JSON /api/sync payload against the binary wire format for a
+synthetic change set: bytes per memory and encode + decode CPU per memory,
+for each embedding dtype and the available codecs.
+
+Usage:
+    python scripts/benchmark_sync_wire.py
+    python scripts/benchmark_sync_wire.py --memories 2000 --dim 384
+
+Author: Lance James, Unit 221B Inc
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from sync_wire import SyncWireEncoder, available_codecs, decode
+
+
+def make_memories(count: int, dim: int):
+    rng = random.Random(221)
+    memories = []
+    for i in range(count):
+        memories.append({
+            'id': f"mem-{i:06d}",
+            'content': f"Deployed build {i} to elastic{i % 5 + 1}; restarted ingest workers after heap pressure alert",
+            'category': 'deployments',
+            'metadata': {
+                'machine_id': 'lance-dev', 'created_at': '2026-10-01T12:00:00', 'tags': 'deploy,elastic',
+                'scope': 'project-shared', 'confidentiality_level': 'normal'
+            },
+            'embedding': [rng.gauss(0, 0.05) for _ in range(dim)]
+        })
+    return memories
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sync payload encodings")
+    parser.add_argument("--memories", type=int, default=1000)
+    parser.add_argument("--dim", type=int, default=384, help="Embedding size (all-MiniLM-L6-v2 is 384)")
+    args = parser.parse_args()
+
+    memories = make_memories(args.memories, args.dim)
+    meta = {'machine_id': 'lance-dev', 'vector_clock': {'lance-dev': 1}}
+    n = len(memories)
+
+    def json_roundtrip():
+        body = json.dumps(dict(meta, memories=memories), default=str).encode()
+        json.loads(body)
+        return body
+
+    json_size = len(json_roundtrip())
+    json_seconds = best_of(json_roundtrip)
+    rows = [("json", json_size, json_seconds)]
+
+    for codec in [codec for codec in available_codecs() if codec != 'none'] + ['none']:
+        for dtype in ('float32', 'float16', 'int8'):
+            encoder = SyncWireEncoder(codec=codec, embedding_dtype=dtype)
+            size = len(encoder.encode(meta, memories))
+            seconds = best_of(lambda: decode(encoder.encode(meta, memories)))
+            rows.append((f"{codec}/{dtype}", size, seconds))
+
+    print(f"📦 Sync payload: {n:,} memories, {args.dim}-dim embeddings (encode + decode, best of 3)")
+    print("=" * 72)
+    print(f"{'format':<16} {'bytes/memory':>13} {'size vs json':>13} {'µs/memory':>11} {'cpu vs json':>12}")
+    for name, size, seconds in rows:
+        print(f"{name:<16} {size / n:>13,.0f} {json_size / size:>12.1f}x "
+              f"{seconds / n * 1e6:>11.1f} {json_seconds / seconds:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1014,15 +1014,20 @@ class AdvancedPlaybookEngine:
         pass
 
     async def _store_haivemind_memory(self, content: str, category: str, metadata: Dict[str, Any]) -> None:
-        """Store memory in hAIveMind system"""
+        """Store memory in hAIveMind system, write-behind when the client supports telemetry"""
         if self.haivemind_client:
             try:
-                await self.haivemind_client.store_memory(
-                    content=content,
-                    category=category,
-                    metadata=metadata,
-                    tags=["playbook", "execution", "advanced"]
-                )
+                memory = {
+                    "content": content,
+                    "category": category,
+                    "metadata": metadata,
+                    "tags": ["playbook", "execution", "advanced"]
+                }
+                store_telemetry = getattr(self.haivemind_client, 'store_telemetry', None)
+                if store_telemetry:
+                    store_telemetry(**memory)
+                else:
+                    await self.haivemind_client.store_memory(**memory)
             except Exception as e:
                 logger.error(f"Failed to store hAIveMind memory: {e}")
 
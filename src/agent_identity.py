@@ -37,6 +37,11 @@ except ImportError:
 # Import Firebase auth
 from .firebase_auth import get_firebase_auth, AgentClaims
 
+try:
+    from . import sqlite_pool
+except ImportError:
+    import sqlite_pool
+
 
 class AgentStatus(Enum):
     """Agent lifecycle states (Tailscale-style)"""
@@ -165,7 +170,7 @@ class AgentIdentitySystem:
 
     def _init_database(self):
         """Initialize SQLite database with schema"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         cursor = conn.cursor()
 
         # Agent identities table (linked to Firebase)
@@ -483,7 +488,7 @@ class AgentIdentitySystem:
 
             expires_at = (datetime.utcnow() + timedelta(hours=expires_hours)).isoformat() if expires_hours else None
 
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -535,7 +540,7 @@ class AgentIdentitySystem:
         try:
             key_hash = hashlib.sha256(raw_key.encode()).hexdigest()
 
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -593,7 +598,7 @@ class AgentIdentitySystem:
         try:
             key_hash = hashlib.sha256(raw_key.encode()).hexdigest()
 
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -618,7 +623,7 @@ class AgentIdentitySystem:
     ) -> List[PreAuthKey]:
         """List all pre-auth keys with optional filtering"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             query = """
@@ -663,7 +668,7 @@ class AgentIdentitySystem:
     def revoke_pre_auth_key(self, key_id: str, revoked_by: str) -> bool:
         """Revoke a pre-auth key"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -758,7 +763,7 @@ class AgentIdentitySystem:
                     firebase_token = self.firebase.mint_agent_token(agent_id, claims.to_dict())
 
             # Store in database
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -842,7 +847,7 @@ class AgentIdentitySystem:
     def get_agent(self, agent_id: str) -> Optional[AgentIdentity]:
         """Get an agent by ID"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -894,7 +899,7 @@ class AgentIdentitySystem:
     def get_agent_by_firebase_uid(self, firebase_uid: str) -> Optional[AgentIdentity]:
         """Get an agent by their Firebase UID"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute(
@@ -924,7 +929,7 @@ class AgentIdentitySystem:
     ) -> List[AgentIdentity]:
         """List all agents with optional filtering"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             query = "SELECT agent_id FROM agent_identities WHERE 1=1"
@@ -973,7 +978,7 @@ class AgentIdentitySystem:
                 logger.warning(f"Agent {agent_id} is not pending approval")
                 return False
 
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             # Update agent status
@@ -1034,7 +1039,7 @@ class AgentIdentitySystem:
     def reject_agent(self, agent_id: str, rejected_by: str, reason: str) -> bool:
         """Reject a pending agent"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -1067,7 +1072,7 @@ class AgentIdentitySystem:
     def get_pending_approvals(self) -> List[Dict[str, Any]]:
         """Get all pending agent approvals"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -1101,7 +1106,7 @@ class AgentIdentitySystem:
     def revoke_agent(self, agent_id: str, revoked_by: str, reason: str) -> bool:
         """Revoke an agent's access"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -1158,7 +1163,7 @@ class AgentIdentitySystem:
     ):
         """Log an audit event"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -1191,7 +1196,7 @@ class AgentIdentitySystem:
     ) -> List[Dict[str, Any]]:
         """Get audit log entries"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             since = (datetime.utcnow() - timedelta(hours=hours)).isoformat()
@@ -1255,7 +1260,7 @@ class AgentIdentitySystem:
         try:
             share_id = f"share_{secrets.token_hex(12)}"
 
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -1299,7 +1304,7 @@ class AgentIdentitySystem:
     def get_vault_share(self, share_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific vault share by ID"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -1337,7 +1342,7 @@ class AgentIdentitySystem:
             List of share records
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             query = "SELECT * FROM vault_access_shares WHERE vault_id = ?"
@@ -1378,7 +1383,7 @@ class AgentIdentitySystem:
             List of share records
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             query = "SELECT * FROM vault_access_shares WHERE recipient_agent_id = ?"
@@ -1421,7 +1426,7 @@ class AgentIdentitySystem:
             True if successful
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             # Get share info for audit
@@ -1483,7 +1488,7 @@ class AgentIdentitySystem:
         required = level_hierarchy.get(required_level, 1)
 
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             now = datetime.utcnow().isoformat()
@@ -1529,7 +1534,7 @@ class AgentIdentitySystem:
             True if successful
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite_pool.connect(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
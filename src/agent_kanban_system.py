@@ -9,6 +9,7 @@ Features:
 - Agent registration and capability tracking
 - Task creation with priority, dependencies, and time estimates  
 - Intelligent task assignment based on agent capabilities
+- In-memory scheduler with atomic claims and batch assignment
 - Kanban board with customizable columns and WIP limits
 - Real-time updates and collaborative editing
 - Performance analytics and SLA monitoring
@@ -27,6 +28,9 @@ import uuid
 import hashlib
 from enum import Enum
 
+from agent_task_scheduler import AgentTaskScheduler
+import sqlite_pool
+
 logger = logging.getLogger(__name__)
 
 class TaskStatus(Enum):
@@ -108,15 +112,24 @@ class TaskDependency:
 class AgentKanbanSystem:
     """Agent Kanban Task Management System with intelligent assignment and collaboration"""
     
-    def __init__(self, db_path: str = "data/agent_kanban.db"):
+    def __init__(self, db_path: str = "data/agent_kanban.db", heartbeat_ttl: Optional[int] = None):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.heartbeat_ttl = heartbeat_ttl
+        self._scheduler: Optional[AgentTaskScheduler] = None
         self._init_database()
         logger.info("📊 Agent Kanban system initialized")
     
+    def get_scheduler(self) -> AgentTaskScheduler:
+        """In-memory assignment scheduler, loaded from the database on first use"""
+        if self._scheduler is None:
+            self._scheduler = AgentTaskScheduler(self.db_path, heartbeat_ttl=self.heartbeat_ttl)
+            self._scheduler.load()
+        return self._scheduler
+    
     def _init_database(self):
         """Initialize the SQLite database with comprehensive kanban schema"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         conn.execute("PRAGMA foreign_keys = ON")
         
         try:
@@ -194,8 +207,8 @@ class AgentKanbanSystem:
                     metadata TEXT DEFAULT '{}',
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (assigned_agent) REFERENCES agents (id) ON SET NULL,
-                    FOREIGN KEY (board_id) REFERENCES kanban_boards (id) ON SET NULL
+                    FOREIGN KEY (assigned_agent) REFERENCES agents (id) ON DELETE SET NULL,
+                    FOREIGN KEY (board_id) REFERENCES kanban_boards (id) ON DELETE SET NULL
                 )
             ''')
             
@@ -281,7 +294,7 @@ class AgentKanbanSystem:
                       capabilities: List[Dict[str, Any]], max_workload: int = 5,
                       metadata: Optional[Dict[str, Any]] = None) -> bool:
         """Register a new agent with capabilities"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         conn.execute("PRAGMA foreign_keys = ON")
         
         try:
@@ -302,6 +315,8 @@ class AgentKanbanSystem:
                 ''', (agent_id, cap['name'], cap.get('level', 3), cap.get('description', '')))
             
             conn.commit()
+            if self._scheduler:
+                self._scheduler.register_agent(agent_id, capabilities, max_workload)
             logger.info(f"📊 Agent {name} registered with {len(capabilities)} capabilities")
             return True
             
@@ -315,24 +330,26 @@ class AgentKanbanSystem:
     def update_agent_status(self, agent_id: str, status: AgentStatus, 
                            current_workload: Optional[int] = None) -> bool:
         """Update agent status and workload"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         
         try:
             if current_workload is not None:
-                conn.execute('''
+                cursor = conn.execute('''
                     UPDATE agents SET status = ?, current_workload = ?, 
                                     last_seen = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
                     WHERE id = ?
                 ''', (status.value, current_workload, agent_id))
             else:
-                conn.execute('''
+                cursor = conn.execute('''
                     UPDATE agents SET status = ?, last_seen = CURRENT_TIMESTAMP, 
                                     updated_at = CURRENT_TIMESTAMP
                     WHERE id = ?
                 ''', (status.value, agent_id))
             
             conn.commit()
-            return conn.rowcount > 0
+            if self._scheduler:
+                self._scheduler.heartbeat(agent_id, status.value, current_workload)
+            return cursor.rowcount > 0
             
         except Exception as e:
             logger.error(f"❌ Failed to update agent status: {e}")
@@ -343,56 +360,7 @@ class AgentKanbanSystem:
     def get_available_agents(self, required_capabilities: Optional[List[str]] = None,
                            min_capability_level: int = 1) -> List[Dict[str, Any]]:
         """Get available agents with optional capability filtering"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        
-        try:
-            if required_capabilities:
-                # Complex query to find agents with all required capabilities
-                placeholders = ','.join(['?' for _ in required_capabilities])
-                sql = f'''
-                    SELECT a.*, GROUP_CONCAT(ac.name || ':' || ac.level) as capabilities_str
-                    FROM agents a
-                    LEFT JOIN agent_capabilities ac ON a.id = ac.agent_id
-                    WHERE a.status = 'active' AND a.current_workload < a.max_workload
-                    AND a.id IN (
-                        SELECT agent_id FROM agent_capabilities 
-                        WHERE name IN ({placeholders}) AND level >= ?
-                        GROUP BY agent_id
-                        HAVING COUNT(DISTINCT name) = ?
-                    )
-                    GROUP BY a.id
-                    ORDER BY a.current_workload ASC, a.last_seen DESC
-                '''
-                cursor = conn.execute(sql, required_capabilities + [min_capability_level, len(required_capabilities)])
-            else:
-                cursor = conn.execute('''
-                    SELECT a.*, GROUP_CONCAT(ac.name || ':' || ac.level) as capabilities_str
-                    FROM agents a
-                    LEFT JOIN agent_capabilities ac ON a.id = ac.agent_id
-                    WHERE a.status = 'active' AND a.current_workload < a.max_workload
-                    GROUP BY a.id
-                    ORDER BY a.current_workload ASC, a.last_seen DESC
-                ''')
-            
-            agents = []
-            for row in cursor.fetchall():
-                agent_data = dict(row)
-                if agent_data['capabilities_str']:
-                    caps = []
-                    for cap_str in agent_data['capabilities_str'].split(','):
-                        name, level = cap_str.split(':')
-                        caps.append({'name': name, 'level': int(level)})
-                    agent_data['capabilities'] = caps
-                else:
-                    agent_data['capabilities'] = []
-                del agent_data['capabilities_str']
-                agents.append(agent_data)
-            
-            return agents
-            
-        finally:
-            conn.close()
+        return self.get_scheduler().available_agents(required_capabilities, min_capability_level)
     
     # ===== TASK MANAGEMENT =====
     
@@ -400,10 +368,16 @@ class AgentKanbanSystem:
                    priority: TaskPriority = TaskPriority.MEDIUM,
                    board_id: str = "default", dependencies: Optional[List[str]] = None,
                    estimated_hours: Optional[int] = None, due_date: Optional[datetime] = None,
-                   tags: Optional[List[str]] = None, metadata: Optional[Dict[str, Any]] = None) -> str:
+                   tags: Optional[List[str]] = None, metadata: Optional[Dict[str, Any]] = None,
+                   required_capabilities: Optional[List[str]] = None,
+                   min_capability_level: int = 1) -> str:
         """Create a new task"""
         task_id = str(uuid.uuid4())
-        conn = sqlite3.connect(self.db_path)
+        metadata = dict(metadata or {})
+        if required_capabilities:
+            metadata['required_capabilities'] = required_capabilities
+            metadata['min_capability_level'] = min_capability_level
+        conn = sqlite_pool.connect(self.db_path)
         conn.execute("PRAGMA foreign_keys = ON")
         
         try:
@@ -413,7 +387,7 @@ class AgentKanbanSystem:
                                        estimated_hours, due_date, tags, metadata)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (task_id, title, description, priority.value, created_by, board_id,
-                  estimated_hours, due_date, json.dumps(tags or []), json.dumps(metadata or {})))
+                  estimated_hours, due_date, json.dumps(tags or []), json.dumps(metadata)))
             
             # Add dependencies
             if dependencies:
@@ -424,6 +398,8 @@ class AgentKanbanSystem:
                     ''', (dep_id, task_id))
             
             conn.commit()
+            if self._scheduler and not dependencies:
+                self._scheduler.submit(task_id, priority.value, required_capabilities, min_capability_level)
             logger.info(f"📊 Task '{title}' created with ID {task_id}")
             return task_id
             
@@ -437,7 +413,7 @@ class AgentKanbanSystem:
     def assign_task(self, task_id: str, agent_id: Optional[str] = None,
                    auto_assign: bool = True) -> bool:
         """Assign task to agent (auto-assign finds best available agent)"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         
         try:
@@ -458,57 +434,43 @@ class AgentKanbanSystem:
                 logger.warning(f"⚠️ Task {task_id} has {blocking_deps} blocking dependencies")
                 return False
             
-            if auto_assign and not agent_id:
-                # Find best available agent
-                # TODO: Add capability-based matching logic here
-                available_agents = conn.execute('''
-                    SELECT id FROM agents WHERE status = 'active' AND current_workload < max_workload
-                    ORDER BY current_workload ASC, last_seen DESC LIMIT 1
-                ''').fetchone()
-                
-                if not available_agents:
-                    logger.warning("⚠️ No available agents for auto-assignment")
-                    return False
-                    
-                agent_id = available_agents['id']
-            
-            if not agent_id:
+            if not auto_assign and not agent_id:
                 logger.error("❌ No agent specified for task assignment")
                 return False
             
-            # Assign task and update workload
-            conn.execute('BEGIN TRANSACTION')
-            
-            conn.execute('''
-                UPDATE agent_tasks SET assigned_agent = ?, status = 'assigned', updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (agent_id, task_id))
-            
-            conn.execute('''
-                UPDATE agents SET current_workload = current_workload + 1, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (agent_id,))
+            scheduler = self.get_scheduler()
+            if agent_id:
+                assigned = agent_id if scheduler.claim(task_id, agent_id) else None
+            else:
+                # Least loaded agent holding the task's required capabilities
+                metadata = json.loads(task['metadata'] or '{}')
+                assigned = scheduler.assign(task_id, metadata.get('required_capabilities'),
+                                            metadata.get('min_capability_level', 1), task['priority'])
             
-            # Add to task history
-            conn.execute('''
-                INSERT INTO task_history (task_id, field_name, new_value, changed_by)
-                VALUES (?, 'assigned_agent', ?, 'system')
-            ''', (task_id, agent_id))
+            if not assigned:
+                logger.warning(f"⚠️ Task {task_id} could not be assigned (already claimed or no available agent)")
+                return False
             
-            conn.commit()
-            logger.info(f"📊 Task {task_id} assigned to agent {agent_id}")
+            logger.info(f"📊 Task {task_id} assigned to agent {assigned}")
             return True
             
         except Exception as e:
-            conn.rollback()
             logger.error(f"❌ Failed to assign task: {e}")
             return False
         finally:
             conn.close()
     
+    def assign_pending_tasks(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Batch-assign ready backlog tasks by priority to qualified agents"""
+        return self.get_scheduler().assign_batch(limit=limit)
+    
+    def claim_next_task(self, agent_id: str) -> Optional[str]:
+        """Let an agent pull the highest priority ready task it can serve"""
+        return self.get_scheduler().claim_next(agent_id)
+    
     def move_task(self, task_id: str, new_status: TaskStatus, moved_by: str) -> bool:
         """Move task to different status/column"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         
         try:
@@ -557,6 +519,8 @@ class AgentKanbanSystem:
             ''', (task_id, old_status, new_status.value, moved_by))
             
             conn.commit()
+            if self._scheduler and new_status in [TaskStatus.DONE, TaskStatus.CANCELLED]:
+                self._scheduler.task_finished(task_id, task['assigned_agent'])
             logger.info(f"📊 Task {task_id} moved from {old_status} to {new_status.value}")
             return True
             
@@ -569,7 +533,7 @@ class AgentKanbanSystem:
     
     def get_kanban_board(self, board_id: str = "default", include_metrics: bool = True) -> Dict[str, Any]:
         """Get complete kanban board state"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         
         try:
@@ -666,7 +630,7 @@ class AgentKanbanSystem:
     
     def get_agent_workload_report(self) -> List[Dict[str, Any]]:
         """Generate agent workload and performance report"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         
         try:
@@ -689,7 +653,7 @@ class AgentKanbanSystem:
     
     def get_task_analytics(self, days: int = 30) -> Dict[str, Any]:
         """Get task analytics for the specified time period"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         
         try:
@@ -0,0 +1,475 @@
+"""
+Agent Task Scheduler for the hAIveMind Agent Kanban System
+
+Keeps the assignment-relevant state of the kanban database in memory so
+assigning a task does not re-query and re-parse every agent's capabilities:
+
+- Capabilities are interned to bit positions; each agent holds one bitmask per
+  proficiency level, so "has all required capabilities at level >= n" is a
+  single AND
+- Agent status, workload and last_seen are fed by heartbeats
+  (AgentKanbanSystem.update_agent_status) instead of being re-read per call
+- Ready backlog tasks sit in priority queues keyed by their rarest required
+  capability, so an agent pulling work only looks at queues it can serve
+- Claims are compare-and-set updates in one transaction: a task is only taken
+  while still unassigned and an agent only while below max_workload, so
+  concurrent dispatchers (other processes included) cannot double-assign
+- Batch assignment matches many pending tasks in memory, then claims all of
+  them in a single write transaction
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_RANK = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+MAX_CAPABILITY_LEVEL = 5
+
+# Ready tasks: backlog, unassigned, and no unfinished blocking dependency
+READY_TASKS_SQL = '''
+    SELECT t.id, t.priority, t.metadata FROM agent_tasks t
+    WHERE t.status = 'backlog' AND t.assigned_agent IS NULL
+    AND NOT EXISTS (
+        SELECT 1 FROM task_dependencies td
+        JOIN agent_tasks dep ON td.source_task = dep.id
+        WHERE td.target_task = t.id AND dep.status NOT IN ('done', 'cancelled')
+    )
+'''
+
+
+@dataclass
+class AgentSlot:
+    """In-memory view of one agent"""
+    id: str
+    status: str
+    current_workload: int
+    max_workload: int
+    last_seen: float
+    level_masks: List[int] = field(default_factory=lambda: [0] * (MAX_CAPABILITY_LEVEL + 1))
+    capabilities: Dict[str, int] = field(default_factory=dict)
+    row: Dict[str, Any] = field(default_factory=dict)
+
+    def has_capacity(self) -> bool:
+        return self.status == 'active' and self.current_workload < self.max_workload
+
+    def qualifies(self, mask: int, min_level: int) -> bool:
+        return self.level_masks[min(max(min_level, 1), MAX_CAPABILITY_LEVEL)] & mask == mask
+
+
+@dataclass
+class PendingTask:
+    """A ready task waiting in a capability queue"""
+    id: str
+    rank: int
+    seq: int
+    mask: int
+    min_level: int
+    queue: str
+
+
+class AgentTaskScheduler:
+    """Capability-indexed, heartbeat-fed task scheduler over the kanban database"""
+
+    def __init__(self, db_path, heartbeat_ttl: Optional[int] = None, resync_interval: int = 60):
+        """
+        Args:
+            db_path: Agent kanban SQLite database
+            heartbeat_ttl: Agents silent for longer than this (seconds) are not assigned
+                work; None keeps every active agent eligible
+            resync_interval: Reload state from the database at least this often (seconds),
+                picking up changes made by other processes
+        """
+        self.db_path = db_path
+        self.heartbeat_ttl = heartbeat_ttl
+        self.resync_interval = resync_interval
+
+        self._lock = threading.RLock()
+        self._capability_bits: Dict[str, int] = {}
+        self._capability_holders: Dict[int, Set[str]] = {}
+        self.agents: Dict[str, AgentSlot] = {}
+        self._pending: Dict[str, PendingTask] = {}
+        self._queues: Dict[str, List[Tuple[int, int, str]]] = {}
+        self._seq = itertools.count()
+        self._loaded_at = 0.0
+
+        self.stats = {'claims': 0, 'claim_conflicts': 0, 'batches': 0, 'resyncs': 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _bit(self, capability: str) -> int:
+        if capability not in self._capability_bits:
+            self._capability_bits[capability] = 1 << len(self._capability_bits)
+        return self._capability_bits[capability]
+
+    def _mask(self, capabilities: Iterable[str]) -> int:
+        mask = 0
+        for capability in capabilities:
+            mask |= self._bit(capability)
+        return mask
+
+    # ===== STATE LOADING =====
+
+    def load(self):
+        """(Re)build agent and queue state from the database"""
+        conn = self._connect()
+        try:
+            agent_rows = conn.execute('''
+                SELECT *, CAST(strftime('%s', last_seen) AS INTEGER) AS last_seen_epoch FROM agents
+            ''').fetchall()
+            capability_rows = conn.execute('SELECT agent_id, name, level FROM agent_capabilities').fetchall()
+            task_rows = conn.execute(READY_TASKS_SQL + ' ORDER BY t.created_at, t.rowid').fetchall()
+        finally:
+            conn.close()
+
+        capabilities: Dict[str, Dict[str, int]] = {}
+        for row in capability_rows:
+            capabilities.setdefault(row['agent_id'], {})[row['name']] = row['level']
+
+        with self._lock:
+            self.agents = {}
+            self._capability_holders = {}
+            for row in agent_rows:
+                row = dict(row)
+                self._set_agent(row['id'], row['status'], row['current_workload'], row['max_workload'],
+                                float(row.pop('last_seen_epoch') or time.time()),
+                                capabilities.get(row['id'], {}), row)
+
+            self._pending = {}
+            self._queues = {}
+            for row in task_rows:
+                metadata = json.loads(row['metadata'] or '{}')
+                self._enqueue(row['id'], row['priority'], metadata.get('required_capabilities') or [],
+                              metadata.get('min_capability_level', 1))
+            self._loaded_at = time.time()
+            self.stats['resyncs'] += 1
+
+        logger.info(f"📊 Scheduler loaded {len(self.agents)} agents, {len(self._pending)} ready tasks")
+
+    def _maybe_resync(self):
+        if time.time() - self._loaded_at > self.resync_interval:
+            self.load()
+
+    def _set_agent(self, agent_id: str, status: str, workload: int, max_workload: int,
+                   last_seen: float, capabilities: Dict[str, int], row: Dict[str, Any]):
+        previous = self.agents.get(agent_id)
+        if previous:
+            for capability in previous.capabilities:
+                self._capability_holders.get(self._bit(capability), set()).discard(agent_id)
+
+        slot = AgentSlot(agent_id, status, workload, max_workload, last_seen, capabilities=dict(capabilities), row=row)
+        for capability, level in capabilities.items():
+            bit = self._bit(capability)
+            self._capability_holders.setdefault(bit, set()).add(agent_id)
+            for threshold in range(1, min(level, MAX_CAPABILITY_LEVEL) + 1):
+                slot.level_masks[threshold] |= bit
+        self.agents[agent_id] = slot
+
+    # ===== EVENTS =====
+
+    def register_agent(self, agent_id: str, capabilities: List[Dict[str, Any]], max_workload: int,
+                       row: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            levels = {cap['name']: cap.get('level', 3) for cap in capabilities}
+            self._set_agent(agent_id, 'active', 0, max_workload, time.time(), levels,
+                            row or {'id': agent_id, 'status': 'active', 'current_workload': 0,
+                                    'max_workload': max_workload})
+
+    def heartbeat(self, agent_id: str, status: Optional[str] = None, current_workload: Optional[int] = None):
+        """Record an agent heartbeat (status and workload updates)"""
+        with self._lock:
+            slot = self.agents.get(agent_id)
+            if slot is None:
+                return
+            slot.last_seen = time.time()
+            if status is not None:
+                slot.status = status
+                slot.row['status'] = status
+            if current_workload is not None:
+                slot.current_workload = current_workload
+                slot.row['current_workload'] = current_workload
+
+    def submit(self, task_id: str, priority: str = 'medium', required_capabilities: Optional[List[str]] = None,
+               min_capability_level: int = 1):
+        """Queue a ready task for assignment"""
+        with self._lock:
+            self._enqueue(task_id, priority, required_capabilities or [], min_capability_level)
+
+    def task_finished(self, task_id: str, agent_id: Optional[str]):
+        """A task reached done/cancelled: free the agent's slot and queue newly unblocked tasks"""
+        conn = self._connect()
+        try:
+            unblocked = conn.execute(READY_TASKS_SQL + '''
+                AND t.id IN (SELECT target_task FROM task_dependencies WHERE source_task = ?)
+            ''', (task_id,)).fetchall()
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._pending.pop(task_id, None)
+            slot = self.agents.get(agent_id) if agent_id else None
+            if slot:
+                slot.current_workload = max(0, slot.current_workload - 1)
+                slot.row['current_workload'] = slot.current_workload
+            for row in unblocked:
+                metadata = json.loads(row['metadata'] or '{}')
+                self._enqueue(row['id'], row['priority'], metadata.get('required_capabilities') or [],
+                              metadata.get('min_capability_level', 1))
+
+    def _enqueue(self, task_id: str, priority: str, required: List[str], min_level: int):
+        mask = self._mask(required)
+        # Queue under the rarest capability: the smallest set of agents that can serve it
+        queue = min(required, key=lambda c: len(self._capability_holders.get(self._bit(c), ())), default='')
+        task = PendingTask(task_id, PRIORITY_RANK.get(priority, 2), next(self._seq), mask, min_level, queue)
+        self._pending[task_id] = task
+        heapq.heappush(self._queues.setdefault(queue, []), (task.rank, task.seq, task_id))
+
+    # ===== MATCHING =====
+
+    def _is_live(self, slot: AgentSlot, now: float) -> bool:
+        if self.heartbeat_ttl is not None and now - slot.last_seen > self.heartbeat_ttl:
+            return False
+        return slot.has_capacity()
+
+    def _candidates(self, mask: int) -> Iterable[str]:
+        if not mask:
+            return self.agents.keys()
+        holders = [self._capability_holders.get(bit, set()) for bit in self._bits(mask)]
+        return min(holders, key=len)
+
+    @staticmethod
+    def _bits(mask: int) -> Iterable[int]:
+        while mask:
+            bit = mask & -mask
+            yield bit
+            mask ^= bit
+
+    def available_agents(self, required_capabilities: Optional[List[str]] = None,
+                         min_capability_level: int = 1) -> List[Dict[str, Any]]:
+        """Agents that can take work now, least loaded first"""
+        with self._lock:
+            self._maybe_resync()
+            now = time.time()
+            if required_capabilities and any(c not in self._capability_bits for c in required_capabilities):
+                return []
+            mask = self._mask(required_capabilities or [])
+            slots = [self.agents[a] for a in self._candidates(mask)
+                     if self._is_live(self.agents[a], now) and self.agents[a].qualifies(mask, min_capability_level)]
+            slots.sort(key=lambda s: (s.current_workload, -s.last_seen))
+            return [{**s.row, 'capabilities': [{'name': n, 'level': l} for n, l in s.capabilities.items()]}
+                    for s in slots]
+
+    def _best_agent(self, task: PendingTask, now: float) -> Optional[AgentSlot]:
+        best = None
+        for agent_id in self._candidates(task.mask):
+            slot = self.agents[agent_id]
+            if not self._is_live(slot, now) or not slot.qualifies(task.mask, task.min_level):
+                continue
+            if best is None or (slot.current_workload, -slot.last_seen) < (best.current_workload, -best.last_seen):
+                best = slot
+        return best
+
+    # ===== CLAIMS =====
+
+    def _claim_in_transaction(self, conn: sqlite3.Connection, task_id: str, agent_id: str,
+                              changed_by: str) -> bool:
+        """Compare-and-set claim; caller holds BEGIN IMMEDIATE"""
+        conn.execute('SAVEPOINT claim')
+        taken = conn.execute('''
+            UPDATE agent_tasks SET assigned_agent = ?, status = 'assigned', updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND status = 'backlog' AND assigned_agent IS NULL
+        ''', (agent_id, task_id)).rowcount
+        if taken:
+            taken = conn.execute('''
+                UPDATE agents SET current_workload = current_workload + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND status = 'active' AND current_workload < max_workload
+            ''', (agent_id,)).rowcount
+        if not taken:
+            conn.execute('ROLLBACK TO claim')
+            conn.execute('RELEASE claim')
+            return False
+        conn.execute('''
+            INSERT INTO task_history (task_id, field_name, new_value, changed_by)
+            VALUES (?, 'assigned_agent', ?, ?)
+        ''', (task_id, agent_id, changed_by))
+        conn.execute('RELEASE claim')
+        return True
+
+    def _claim_many(self, plan: List[Tuple[str, str]], changed_by: str) -> List[Tuple[str, str]]:
+        """Claim (task, agent) pairs in one write transaction; returns the pairs that won"""
+        if not plan:
+            return []
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            won = [(task_id, agent_id) for task_id, agent_id in plan
+                   if self._claim_in_transaction(conn, task_id, agent_id, changed_by)]
+            conn.execute('COMMIT')
+            won_pairs = set(won)
+            lost = [pair for pair in plan if pair not in won_pairs]
+            if lost:
+                self._refresh_after_conflicts(conn, lost)
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+        self.stats['claims'] += len(won)
+        self.stats['claim_conflicts'] += len(plan) - len(won)
+        return won
+
+    def _refresh_after_conflicts(self, conn: sqlite3.Connection, lost: List[Tuple[str, str]]):
+        """Another dispatcher got there first: re-read the agents and tasks involved"""
+        agent_ids = list({agent_id for _, agent_id in lost})
+        task_ids = [task_id for task_id, _ in lost]
+        agent_rows = conn.execute(
+            f"SELECT id, status, current_workload FROM agents WHERE id IN ({','.join('?' * len(agent_ids))})",
+            agent_ids).fetchall()
+        still_ready = {row['id'] for row in conn.execute(
+            f"SELECT id FROM agent_tasks WHERE status = 'backlog' AND assigned_agent IS NULL "
+            f"AND id IN ({','.join('?' * len(task_ids))})", task_ids)}
+        with self._lock:
+            for row in agent_rows:
+                slot = self.agents.get(row['id'])
+                if slot:
+                    slot.status = row['status']
+                    slot.current_workload = row['current_workload']
+                    slot.row.update(status=row['status'], current_workload=row['current_workload'])
+            for task_id in task_ids:
+                if task_id not in still_ready:
+                    self._pending.pop(task_id, None)
+
+    def claim(self, task_id: str, agent_id: str, changed_by: str = 'system') -> bool:
+        """Atomically assign one task to one agent"""
+        won = self._claim_many([(task_id, agent_id)], changed_by)
+        with self._lock:
+            if won:
+                self._pending.pop(task_id, None)
+                slot = self.agents.get(agent_id)
+                if slot:
+                    slot.current_workload += 1
+                    slot.row['current_workload'] = slot.current_workload
+        return bool(won)
+
+    def assign(self, task_id: str, required_capabilities: Optional[List[str]] = None,
+               min_capability_level: int = 1, priority: str = 'medium') -> Optional[str]:
+        """Pick the least loaded qualified agent for one task and claim it"""
+        with self._lock:
+            self._maybe_resync()
+            task = self._pending.get(task_id) or PendingTask(
+                task_id, PRIORITY_RANK.get(priority, 2), next(self._seq),
+                self._mask(required_capabilities or []), min_capability_level, '')
+            agent = self._best_agent(task, time.time())
+        if agent is None:
+            return None
+        return agent.id if self.claim(task_id, agent.id) else None
+
+    def assign_batch(self, limit: Optional[int] = None, changed_by: str = 'scheduler') -> Dict[str, Any]:
+        """Match queued tasks to agents in priority order and claim them in one transaction"""
+        started = time.perf_counter()
+        with self._lock:
+            self._maybe_resync()
+            now = time.time()
+            ordered = sorted(self._pending.values(), key=lambda t: (t.rank, t.seq))
+
+            # Per-requirement heaps of (workload, -last_seen, agent) with lazy invalidation
+            heaps: Dict[Tuple[int, int], List[Tuple[int, float, str]]] = {}
+            plan: List[Tuple[str, str]] = []
+            unassignable = 0
+            for task in ordered:
+                if limit is not None and len(plan) >= limit:
+                    break
+                key = (task.mask, task.min_level)
+                heap = heaps.get(key)
+                if heap is None:
+                    heap = [(s.current_workload, -s.last_seen, s.id)
+                            for s in (self.agents[a] for a in self._candidates(task.mask))
+                            if self._is_live(s, now) and s.qualifies(task.mask, task.min_level)]
+                    heapq.heapify(heap)
+                    heaps[key] = heap
+
+                agent = None
+                while heap:
+                    workload, _, agent_id = heap[0]
+                    slot = self.agents[agent_id]
+                    if slot.current_workload != workload or not slot.has_capacity():
+                        heapq.heappop(heap)
+                        if slot.has_capacity():
+                            heapq.heappush(heap, (slot.current_workload, -slot.last_seen, agent_id))
+                        continue
+                    agent = slot
+                    break
+                if agent is None:
+                    unassignable += 1
+                    continue
+
+                # Reserve the slot in memory; undone below if the claim loses
+                agent.current_workload += 1
+                plan.append((task.id, agent.id))
+
+            won = self._claim_many(plan, changed_by)
+            won_tasks = {task_id for task_id, _ in won}
+            for task_id, agent_id in plan:
+                slot = self.agents[agent_id]
+                if task_id in won_tasks:
+                    self._pending.pop(task_id, None)
+                    slot.row['current_workload'] = slot.current_workload
+            self.stats['batches'] += 1
+
+        return {
+            'assigned': dict(won),
+            'assigned_count': len(won),
+            'conflicts': len(plan) - len(won),
+            'unassignable': unassignable,
+            'pending': len(self._pending),
+            'seconds': round(time.perf_counter() - started, 4)
+        }
+
+    def claim_next(self, agent_id: str, changed_by: Optional[str] = None) -> Optional[str]:
+        """Pull: claim the highest priority ready task this agent can serve"""
+        with self._lock:
+            self._maybe_resync()
+            slot = self.agents.get(agent_id)
+            if slot is None or not self._is_live(slot, time.time()):
+                return None
+
+            best = None
+            for queue in [''] + list(slot.capabilities):
+                heap = self._queues.get(queue)
+                while heap and heap[0][2] not in self._pending:
+                    heapq.heappop(heap)
+                for _, _, task_id in heapq.nsmallest(32, heap or []):
+                    task = self._pending.get(task_id)
+                    if task and slot.qualifies(task.mask, task.min_level):
+                        if best is None or (task.rank, task.seq) < (best.rank, best.seq):
+                            best = task
+                        break
+        if best is None:
+            return None
+        return best.id if self.claim(best.id, agent_id, changed_by or agent_id) else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.time()
+            return {
+                **self.stats,
+                'agents': len(self.agents),
+                'available_agents': sum(1 for s in self.agents.values() if self._is_live(s, now)),
+                'capabilities': len(self._capability_bits),
+                'pending_tasks': len(self._pending),
+                'queues': {name or '*': sum(1 for _, _, t in heap if t in self._pending)
+                           for name, heap in self._queues.items()},
+                'loaded_at': self._loaded_at
+            }
@@ -0,0 +1,207 @@
+"""
+hAIveMind Chroma Registry - Process-wide ChromaDB Client and Collections
+
+One ChromaDB client, one embedding model and one collection handle per name
+for everything in a process that reads or writes the memory store.
+
+Features:
+- shared_chroma(config) returns the same registry for every caller pointing
+  at the same storage path (MemoryStorage, MemorySyncService, rules)
+- Drop-in for a chromadb client: get_collection, create_collection and
+  get_or_create_collection return cached handles bound to the shared
+  embedding function; anything else passes through to the client
+- The client is opened lazily on first use, so services that never touch
+  ChromaDB pay nothing
+- close_shared_chroma() stops every client at shutdown (also run at exit)
+"""
+
+import atexit
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from metrics import instrument_embedding_function
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+
+def create_embedding_function(model: Optional[str] = None):
+    """
+    ChromaDB embedding function for the configured model.
+
+    all-MiniLM-L6-v2 is ChromaDB's own default (ONNX), so collections created
+    without an explicit embedding function keep producing compatible vectors.
+    """
+    from chromadb.utils import embedding_functions
+    if not model or model == DEFAULT_EMBEDDING_MODEL:
+        return embedding_functions.DefaultEmbeddingFunction()
+    return embedding_functions.SentenceTransformerEmbeddingFunction(model_name=model)
+
+
+class ChromaRegistry:
+    """Lazily opened ChromaDB client with cached collection handles"""
+
+    def __init__(self, path: str, anonymized_telemetry: bool = False,
+                 embedding_model: Optional[str] = DEFAULT_EMBEDDING_MODEL,
+                 client_factory: Optional[Callable[[], Any]] = None,
+                 embedding_function_factory: Optional[Callable[[], Any]] = None):
+        """
+        Args:
+            path: PersistentClient directory
+            client_factory: Builds the client (defaults to chromadb.PersistentClient)
+            embedding_function_factory: Builds the one embedding function shared by all collections
+        """
+        self.path = path
+        self.anonymized_telemetry = anonymized_telemetry
+        self.embedding_model = embedding_model
+        self._client_factory = client_factory or self._persistent_client
+        self._embedding_function_factory = embedding_function_factory or (
+            lambda: create_embedding_function(embedding_model))
+        self._client = None
+        self._embedding_function = None
+        self._collections: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self.opens = 0
+        self.open_seconds = 0.0
+        self.collection_loads = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'ChromaRegistry':
+        chroma_config = config['storage']['chromadb']
+        return cls(
+            chroma_config['path'],
+            anonymized_telemetry=chroma_config.get('anonymized_telemetry', False),
+            embedding_model=chroma_config.get('embedding_model', DEFAULT_EMBEDDING_MODEL)
+        )
+
+    def _persistent_client(self):
+        import chromadb
+        from chromadb.config import Settings
+
+        Path(self.path).mkdir(parents=True, exist_ok=True)
+        return chromadb.PersistentClient(
+            path=self.path,
+            settings=Settings(anonymized_telemetry=self.anonymized_telemetry, allow_reset=True)
+        )
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    started = time.perf_counter()
+                    self._client = self._client_factory()
+                    self.opens += 1
+                    self.open_seconds += time.perf_counter() - started
+                    logger.info(f"🗄️ ChromaDB opened at {self.path} ({time.perf_counter() - started:.2f}s)")
+        return self._client
+
+    @property
+    def embedding_function(self):
+        if self._embedding_function is None:
+            with self._lock:
+                if self._embedding_function is None:
+                    self._embedding_function = instrument_embedding_function(self._embedding_function_factory())
+        return self._embedding_function
+
+    # chromadb client surface
+
+    def get_collection(self, name: str, **kwargs):
+        collection = self._collections.get(name)
+        if collection is None:
+            with self._lock:
+                collection = self._collections.get(name)
+                if collection is None:
+                    kwargs.setdefault('embedding_function', self.embedding_function)
+                    collection = self._collections[name] = self.client.get_collection(name, **kwargs)
+                    self.collection_loads += 1
+        return collection
+
+    def create_collection(self, name: str, metadata: Optional[Dict[str, Any]] = None, **kwargs):
+        kwargs.setdefault('embedding_function', self.embedding_function)
+        with self._lock:
+            collection = self._collections[name] = self.client.create_collection(
+                name=name, metadata=metadata, **kwargs)
+            self.collection_loads += 1
+        return collection
+
+    def get_or_create_collection(self, name: str, metadata: Optional[Dict[str, Any]] = None, **kwargs):
+        collection = self._collections.get(name)
+        if collection is None:
+            with self._lock:
+                collection = self._collections.get(name)
+                if collection is None:
+                    kwargs.setdefault('embedding_function', self.embedding_function)
+                    collection = self._collections[name] = self.client.get_or_create_collection(
+                        name=name, metadata=metadata, **kwargs)
+                    self.collection_loads += 1
+        return collection
+
+    def delete_collection(self, name: str):
+        with self._lock:
+            self._collections.pop(name, None)
+            self.client.delete_collection(name)
+
+    def __getattr__(self, name):
+        # Only reached for attributes the registry does not define (list_collections, heartbeat, ...)
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    # Lifecycle
+
+    def close(self):
+        """Drop cached handles and stop the client's background system"""
+        with self._lock:
+            client, self._client = self._client, None
+            self._collections.clear()
+        if client is None:
+            return
+        try:
+            system = getattr(client, '_system', None)
+            if system is not None and hasattr(system, 'stop'):
+                system.stop()
+            clear_cache = getattr(type(client), 'clear_system_cache', None)
+            if clear_cache is not None:
+                clear_cache()
+        except Exception as e:
+            logger.warning(f"⚠️ ChromaDB shutdown failed for {self.path}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'open': self._client is not None,
+            'opens': self.opens,
+            'open_seconds': round(self.open_seconds, 4),
+            'collections': len(self._collections),
+            'collection_loads': self.collection_loads,
+        }
+
+
+_registries: Dict[str, ChromaRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def shared_chroma(config: Dict[str, Any]) -> ChromaRegistry:
+    """The process-wide registry for config's storage.chromadb path"""
+    path = str(Path(config['storage']['chromadb']['path']).expanduser().resolve())
+    with _registries_lock:
+        registry = _registries.get(path)
+        if registry is None:
+            registry = _registries[path] = ChromaRegistry.from_config(config)
+        return registry
+
+
+def close_shared_chroma():
+    """Close every shared registry; later shared_chroma() calls open fresh ones"""
+    with _registries_lock:
+        registries = list(_registries.values())
+        _registries.clear()
+    for registry in registries:
+        registry.close()
+
+
+atexit.register(close_shared_chroma)
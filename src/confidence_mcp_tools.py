@@ -454,16 +454,18 @@ Higher credibility = more trustworthy information from this agent.
 class ConfidenceMCPTools:
     """Handler class for confidence MCP tools"""
 
-    def __init__(self, system: ConfidenceSystem, default_agent_id: str):
+    def __init__(self, system: ConfidenceSystem, default_agent_id: str, storage=None):
         """
         Initialize confidence MCP tools handler
 
         Args:
             system: ConfidenceSystem instance
             default_agent_id: Default agent ID for operations
+            storage: Optional MemoryStorage used for confidence-ranked search
         """
         self.system = system
         self.default_agent_id = default_agent_id
+        self.storage = storage
         logger.info("📊 Confidence MCP Tools initialized")
 
     # ========================================================================
@@ -561,6 +563,26 @@ class ConfidenceMCPTools:
         min_confidence = arguments.get('min_confidence', 0.7)
         limit = arguments.get('limit', 20)
 
+        # Rank by similarity + confidence + freshness in a single search call
+        if self.storage is not None and getattr(self.storage, 'hybrid_ranker', None):
+            memories = await self.storage.search_memories(
+                query=query,
+                limit=limit,
+                category=arguments.get('category'),
+                rank_by_confidence=True,
+                min_confidence=min_confidence
+            )
+            self.system.record_access([m['id'] for m in memories])
+            return {
+                "success": True,
+                "query": query,
+                "min_confidence": min_confidence,
+                "count": len(memories),
+                "memory_ids": [m['id'] for m in memories],
+                "memories": memories,
+                "message": f"Found {len(memories)} memories matching '{query}' with confidence >= {min_confidence}"
+            }
+
         # Get high-confidence memory IDs
         memory_ids = self.system.get_high_confidence_memories(
             min_confidence=min_confidence,
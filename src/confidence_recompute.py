@@ -0,0 +1,144 @@
+"""
+hAIveMind Confidence Recompute Scheduler
+
+Keeps stored confidence scores current without manual rescoring.
+
+Features:
+- Background daemon thread that rescores memories in prioritized batches
+  (most-accessed and longest-unscored first)
+- CPU budget: the thread sleeps in proportion to the CPU time it used
+- Throughput and backlog metrics exposed through get_confidence_stats()
+
+Freshness itself never needs a recompute; it is decayed analytically at
+read time from the stored half-life parameters.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+
+from confidence_system import ConfidenceSystem
+
+logger = logging.getLogger(__name__)
+
+
+class ConfidenceRecomputeScheduler:
+    """Rescore stale confidence scores in the background under a CPU budget"""
+
+    def __init__(self,
+                 system: ConfidenceSystem,
+                 batch_size: int = 200,
+                 cpu_budget: float = 0.1,
+                 rescore_after_seconds: int = 3600,
+                 idle_interval: float = 60.0):
+        """
+        Args:
+            system: ConfidenceSystem to rescore
+            batch_size: Memories rescored per batch
+            cpu_budget: Fraction of one core the scheduler may use (0.0-1.0]
+            rescore_after_seconds: Scores older than this are due for recompute
+            idle_interval: Sleep between polls when the backlog is empty
+        """
+        self.system = system
+        self.batch_size = batch_size
+        self.cpu_budget = max(0.01, min(1.0, cpu_budget))
+        self.rescore_after = timedelta(seconds=rescore_after_seconds)
+        self.idle_interval = idle_interval
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Metrics
+        self.total_rescored = 0
+        self.batches_run = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.last_batch_size = 0
+        self.last_batch_seconds = 0.0
+        self.last_run_at: Optional[str] = None
+
+        system.recompute_scheduler = self
+
+    @classmethod
+    def from_config(cls, system: ConfidenceSystem, config: Dict[str, Any]) -> 'ConfidenceRecomputeScheduler':
+        return cls(
+            system,
+            batch_size=config.get('batch_size', 200),
+            cpu_budget=config.get('cpu_budget', 0.1),
+            rescore_after_seconds=config.get('rescore_after_seconds', 3600),
+            idle_interval=config.get('idle_interval', 60.0)
+        )
+
+    def run_once(self) -> int:
+        """Rescore one prioritized batch; returns the number of memories rescored"""
+        stale_before = datetime.now() - self.rescore_after
+        memory_ids = self.system.get_rescore_candidates(stale_before, limit=self.batch_size)
+        if not memory_ids:
+            return 0
+
+        started = time.perf_counter()
+        self.system.calculate_confidence_batch(memory_ids)
+        elapsed = time.perf_counter() - started
+
+        self.total_rescored += len(memory_ids)
+        self.batches_run += 1
+        self.busy_seconds += elapsed
+        self.last_batch_size = len(memory_ids)
+        self.last_batch_seconds = elapsed
+        self.last_run_at = datetime.now().isoformat()
+        return len(memory_ids)
+
+    def start(self):
+        """Start the background recompute thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="confidence_recompute", daemon=True)
+        self._thread.start()
+        logger.info(f"📊 Confidence recompute scheduler started (cpu budget {self.cpu_budget:.0%})")
+
+    def stop(self, timeout: float = 5.0):
+        """Signal the thread to stop and wait for the current batch"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop_event.is_set():
+            cpu_started = time.thread_time()
+            try:
+                rescored = self.run_once()
+            except Exception as e:
+                self.errors += 1
+                rescored = 0
+                logger.debug(f"confidence recompute batch failed: {e}")
+
+            if not rescored:
+                self._stop_event.wait(self.idle_interval)
+                continue
+
+            # Sleep long enough that used / (used + idle) stays within the budget
+            cpu_used = time.thread_time() - cpu_started
+            self._stop_event.wait(cpu_used * (1 - self.cpu_budget) / self.cpu_budget)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Recompute throughput and backlog"""
+        try:
+            backlog = self.system.count_rescore_backlog(datetime.now() - self.rescore_after)
+        except Exception:
+            backlog = None
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "backlog": backlog,
+            "total_rescored": self.total_rescored,
+            "batches_run": self.batches_run,
+            "errors": self.errors,
+            "throughput_per_second": (self.total_rescored / self.busy_seconds) if self.busy_seconds else 0.0,
+            "last_batch_size": self.last_batch_size,
+            "last_batch_seconds": self.last_batch_seconds,
+            "last_run_at": self.last_run_at,
+            "cpu_budget": self.cpu_budget,
+        }
@@ -11,6 +11,7 @@ Version: 1.0
 import sqlite3
 import math
 import json
+from contextlib import closing
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, asdict
@@ -18,6 +19,8 @@ from enum import Enum
 from pathlib import Path
 import logging
 
+import sqlite_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,6 +68,11 @@ class ConfidenceScore:
     calculated_at: str
     weights: Dict[str, float]
 
+    # Decay-on-read parameters
+    category: Optional[str] = None
+    freshness_reference_at: Optional[str] = None
+    half_life_days: Optional[float] = None
+
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
         result = asdict(self)
@@ -98,6 +106,11 @@ DEFAULT_FACTOR_WEIGHTS = {
 }
 
 
+# Memories scored per set-based query in calculate_confidence_batch
+# (keeps bound parameters well under SQLite's variable limit)
+BATCH_CHUNK_SIZE = 500
+
+
 # Category-specific half-lives (in days)
 CATEGORY_HALF_LIVES = {
     'infrastructure': 30,
@@ -161,6 +174,15 @@ CREATE TABLE IF NOT EXISTS memory_confidence (
     success_rate_score REAL,
     context_relevance_score REAL,
 
+    -- Decay-on-read parameters (freshness is recomputed from these at query time)
+    category TEXT,
+    freshness_reference_at TIMESTAMP,
+    half_life_days REAL,
+
+    -- Access tracking (drives background recompute priority)
+    access_count INTEGER DEFAULT 0,
+    last_accessed_at TIMESTAMP,
+
     -- Metadata
     weights_json TEXT,  -- JSON of weights used
     calculated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -170,6 +192,7 @@ CREATE TABLE IF NOT EXISTS memory_confidence (
 CREATE INDEX IF NOT EXISTS idx_confidence_score ON memory_confidence(final_score);
 CREATE INDEX IF NOT EXISTS idx_confidence_level ON memory_confidence(confidence_level);
 CREATE INDEX IF NOT EXISTS idx_confidence_updated ON memory_confidence(updated_at);
+CREATE INDEX IF NOT EXISTS idx_confidence_calculated ON memory_confidence(calculated_at);
 
 -- Memory verifications
 CREATE TABLE IF NOT EXISTS memory_verifications (
@@ -278,6 +301,38 @@ CREATE INDEX IF NOT EXISTS idx_votes_vote ON fact_votes(vote);
 """
 
 
+# Columns added after the initial release; older databases are migrated in place
+CONFIDENCE_SCHEMA_MIGRATIONS = {
+    'memory_confidence': [
+        ('category', 'TEXT'),
+        ('freshness_reference_at', 'TIMESTAMP'),
+        ('half_life_days', 'REAL'),
+        ('access_count', 'INTEGER DEFAULT 0'),
+        ('last_accessed_at', 'TIMESTAMP'),
+    ],
+}
+
+
+def decayed_freshness(reference_at: Optional[str],
+                      half_life_days: Optional[float],
+                      now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Freshness at read time from stored half-life parameters
+
+    Same curve as FreshnessCalculator, evaluated analytically so stored
+    scores never need to be rewritten just because time has passed.
+    Returns None when the parameters are missing (legacy rows).
+    """
+    if not reference_at or not half_life_days:
+        return None
+    try:
+        reference = datetime.fromisoformat(str(reference_at))
+    except ValueError:
+        return None
+    age_days = ((now or datetime.now()) - reference).days
+    return max(0.0, min(1.0, 0.5 ** (age_days / half_life_days)))
+
+
 # ============================================================================
 # Calculator Classes
 # ============================================================================
@@ -332,7 +387,7 @@ class SourceCredibilityCalculator:
         - Corrections issued
         - Time in system
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
 
             result = conn.execute("""
@@ -343,6 +398,11 @@ class SourceCredibilityCalculator:
                 WHERE agent_id = ? AND category = ?
             """, (agent_id, category)).fetchone()
 
+        return self.credibility_from_row(result)
+
+    @staticmethod
+    def credibility_from_row(result) -> float:
+        """Credibility from an agent_credibility row (None for unknown agents)"""
         if not result:
             return 0.5  # Neutral for unknown agents
 
@@ -381,7 +441,13 @@ class SourceCredibilityCalculator:
         """
         # Get agent's historical credibility in this category
         agent_cred = self.calculate_agent_credibility(agent_id, category)
+        return self.combine_source_score(agent_cred, source_type, team_role)
 
+    @staticmethod
+    def combine_source_score(agent_cred: float,
+                             source_type: Optional[str] = None,
+                             team_role: Optional[str] = None) -> float:
+        """Blend agent credibility with role and source type weights"""
         # Get role-based trust weight
         role_weight = ROLE_TRUST_WEIGHTS.get(team_role, 0.7) if team_role else 0.7
 
@@ -409,7 +475,7 @@ class VerificationCalculator:
         Returns:
             (status, verifier_count)
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             # Count verified confirmations
             confirmed = conn.execute("""
                 SELECT COUNT(DISTINCT verifier_id) as count
@@ -423,6 +489,11 @@ class VerificationCalculator:
                 WHERE memory_id = ? AND verifier_id = 'system_auto_verify'
             """, (memory_id,)).fetchone()[0]
 
+        return self.status_from_counts(confirmed, system_verified)
+
+    @staticmethod
+    def status_from_counts(confirmed: int, system_verified: int) -> Tuple[VerificationStatus, int]:
+        """Map confirmation counts to a verification status"""
         if system_verified > 0:
             return VerificationStatus.SYSTEM_VERIFIED, confirmed + 1
         elif confirmed >= 5:
@@ -441,7 +512,11 @@ class VerificationCalculator:
         More verifications = higher confidence
         """
         status, verifier_count = self.get_verification_status(memory_id)
+        return self.score_from_status(status, verifier_count)
 
+    @staticmethod
+    def score_from_status(status: VerificationStatus, verifier_count: int) -> float:
+        """Verification score for a status and verifier count"""
         base_scores = {
             VerificationStatus.UNVERIFIED: 0.3,
             VerificationStatus.SELF_VERIFIED: 0.5,
@@ -476,7 +551,7 @@ class ConsensusCalculator:
         - Diversity of agents
         - Vote counts
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
 
             # Check if memory is in a consensus cluster
@@ -504,6 +579,11 @@ class ConsensusCalculator:
         # Calculate weighted agreement
         agree_count = sum(v['count'] for v in votes if v['vote'] == 'agree')
         disagree_count = sum(v['count'] for v in votes if v['vote'] == 'disagree')
+        return self.score_from_votes(agree_count, disagree_count)
+
+    @staticmethod
+    def score_from_votes(agree_count: int, disagree_count: int) -> float:
+        """Consensus score from agree/disagree vote counts"""
         total = agree_count + disagree_count
 
         if total == 0:
@@ -534,7 +614,7 @@ class ContradictionCalculator:
         - Severity of contradictions
         - Whether memory is the likely wrong one
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
 
             contradictions = conn.execute("""
@@ -557,6 +637,11 @@ class ContradictionCalculator:
                 # Unresolved contradiction
                 penalty += 0.1 * contradiction['severity']
 
+        return self.score_from_penalty(penalty)
+
+    @staticmethod
+    def score_from_penalty(penalty: float) -> float:
+        """Convert an accumulated contradiction penalty into a factor score"""
         # Max penalty is 0.8 (minimum score of 0.2)
         penalty = min(0.8, penalty)
 
@@ -575,7 +660,7 @@ class UsageSuccessTracker:
 
         Returns: 0.0 (always fails) to 1.0 (always succeeds)
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             outcomes = conn.execute("""
                 SELECT outcome, COUNT(*) as count
                 FROM memory_usage_outcomes
@@ -584,13 +669,18 @@ class UsageSuccessTracker:
                 GROUP BY outcome
             """, (memory_id, -days_back)).fetchall()
 
-        if not outcomes:
-            return 0.5  # No data - neutral score
-
         total = sum([o[1] for o in outcomes])
         successes = sum([o[1] for o in outcomes if o[0] == 'success'])
-        partial = sum([o[1] for o in outcomes if o[0] == 'partial']) * 0.5
+        partial = sum([o[1] for o in outcomes if o[0] == 'partial'])
+        return self.score_from_outcomes(total, successes, partial)
+
+    @staticmethod
+    def score_from_outcomes(total: int, successes: int, partial: int) -> float:
+        """Success rate from outcome counts, regressed toward 0.5 for small samples"""
+        if not total:
+            return 0.5  # No data - neutral score
 
+        partial = partial * 0.5
         success_rate = (successes + partial) / total
 
         # Confidence boost for high sample size
@@ -616,7 +706,7 @@ class UsageSuccessTracker:
         import secrets
         usage_id = f"usage_{secrets.token_hex(8)}"
 
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.execute("""
                 INSERT INTO memory_usage_outcomes
                 (id, memory_id, agent_id, action, outcome, details, tracked_at)
@@ -720,13 +810,27 @@ class ConfidenceSystem:
         self.success_tracker = UsageSuccessTracker(str(self.db_path))
         self.relevance_calc = ContextRelevanceCalculator()
 
+        # Set by ConfidenceRecomputeScheduler when background recompute is running
+        self.recompute_scheduler = None
+
         logger.info(f"✅ Confidence System initialized: {self.db_path}")
 
     def _init_database(self):
         """Initialize SQLite database with schema"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
+            self._migrate_schema(conn)
             conn.executescript(CONFIDENCE_SCHEMA)
 
+    def _migrate_schema(self, conn: sqlite3.Connection):
+        """Add columns introduced after a database was first created"""
+        for table, columns in CONFIDENCE_SCHEMA_MIGRATIONS.items():
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if not existing:
+                continue  # Table is created fresh by the schema script
+            for column, column_type in columns:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
     # ========================================================================
     # Core Confidence Calculation
     # ========================================================================
@@ -797,12 +901,53 @@ class ConfidenceSystem:
         else:
             scores['context_relevance'] = 0.5  # Neutral if no context
 
+        confidence = self._build_score(memory_id, scores)
+        self._attach_decay_params(confidence, memory_data)
+
+        # Store in database
+        self._store_confidence_score(confidence)
+
+        return confidence
+
+    def _build_score(self, memory_id: str, scores: Dict[str, float],
+                     calculated_at: Optional[str] = None) -> ConfidenceScore:
+        """Combine factor scores into a weighted ConfidenceScore"""
         # Calculate weighted final score
         final_score = sum([
             scores[factor] * self.weights[factor]
             for factor in self.weights.keys()
         ])
 
+        level, description = self._classify_score(final_score)
+
+        return ConfidenceScore(
+            memory_id=memory_id,
+            final_score=final_score,
+            level=level,
+            description=description,
+            freshness_score=scores['freshness'],
+            source_score=scores['source_credibility'],
+            verification_score=scores['verification'],
+            consensus_score=scores['consensus'],
+            contradiction_score=scores['contradiction'],
+            success_rate_score=scores['success_rate'],
+            context_relevance_score=scores['context_relevance'],
+            calculated_at=calculated_at or datetime.now().isoformat(),
+            weights=self.weights
+        )
+
+    def _attach_decay_params(self, score: ConfidenceScore, memory_data: Optional[Dict]):
+        """Record the freshness reference point and half-life used for this score"""
+        if not memory_data or not memory_data.get('created_at'):
+            return
+        category = memory_data.get('category', 'global')
+        score.category = category
+        score.freshness_reference_at = memory_data.get('last_verified_at') or memory_data['created_at']
+        score.half_life_days = self.freshness_calc.half_lives.get(category, 60)
+
+    @staticmethod
+    def _classify_score(final_score: float) -> Tuple[ConfidenceLevel, str]:
+        """Map a final score to its confidence level and description"""
         # Determine confidence level
         if final_score >= 0.85:
             level = ConfidenceLevel.VERY_HIGH
@@ -820,53 +965,264 @@ class ConfidenceSystem:
             level = ConfidenceLevel.VERY_LOW
             description = 'Very low confidence - likely outdated/incorrect'
 
-        confidence = ConfidenceScore(
-            memory_id=memory_id,
-            final_score=final_score,
-            level=level,
-            description=description,
-            freshness_score=scores['freshness'],
-            source_score=scores['source_credibility'],
-            verification_score=scores['verification'],
-            consensus_score=scores['consensus'],
-            contradiction_score=scores['contradiction'],
-            success_rate_score=scores['success_rate'],
-            context_relevance_score=scores['context_relevance'],
-            calculated_at=datetime.now().isoformat(),
-            weights=self.weights
+        return level, description
+
+    def calculate_confidence_batch(self,
+                                   memory_ids: List[str],
+                                   memory_data: Optional[Dict[str, Dict]] = None,
+                                   context: Optional[Context] = None) -> Dict[str, ConfidenceScore]:
+        """
+        Calculate confidence scores for many memories at once
+
+        All database-backed factor inputs are fetched with one set-based query
+        per chunk over a single connection, and results are written back with
+        one executemany upsert.
+
+        Args:
+            memory_ids: Memories to score
+            memory_data: Optional metadata per memory ID (same shape as
+                calculate_confidence). Memories without metadata keep their
+                previously stored freshness and source scores.
+            context: Current agent context for relevance calculation
+
+        Returns:
+            Mapping of memory ID to ConfidenceScore
+        """
+        memory_data = memory_data or {}
+        memory_ids = list(dict.fromkeys(memory_ids))
+        if not memory_ids:
+            return {}
+
+        calculated_at = datetime.now().isoformat()
+        results: Dict[str, ConfidenceScore] = {}
+
+        with sqlite_pool.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+
+            for start in range(0, len(memory_ids), BATCH_CHUNK_SIZE):
+                chunk = memory_ids[start:start + BATCH_CHUNK_SIZE]
+                factor_rows = self._fetch_factor_inputs(conn, chunk, memory_data)
+
+                for memory_id in chunk:
+                    row = factor_rows[memory_id]
+                    scores = self._scores_from_inputs(row, memory_data.get(memory_id), context)
+                    score = self._build_score(memory_id, scores, calculated_at)
+                    if memory_data.get(memory_id):
+                        self._attach_decay_params(score, memory_data[memory_id])
+                    else:
+                        score.category = row['stored_category']
+                        score.freshness_reference_at = row['stored_reference_at']
+                        score.half_life_days = row['stored_half_life']
+                    results[memory_id] = score
+
+            self._store_confidence_scores(conn, list(results.values()))
+
+        return results
+
+    def _fetch_factor_inputs(self,
+                             conn: sqlite3.Connection,
+                             memory_ids: List[str],
+                             memory_data: Dict[str, Dict]) -> Dict[str, sqlite3.Row]:
+        """Fetch every database-backed factor input for a chunk in one pass"""
+        values = []
+        params: List[Any] = []
+        for memory_id in memory_ids:
+            data = memory_data.get(memory_id) or {}
+            values.append("(?, ?, ?)")
+            params.extend([memory_id,
+                           data.get('creator_id', 'unknown'),
+                           data.get('category', 'global')])
+
+        rows = conn.execute(f"""
+            WITH batch(memory_id, agent_id, category) AS (VALUES {', '.join(values)}),
+            verifications AS (
+                SELECT memory_id,
+                       COUNT(DISTINCT CASE WHEN verification_type IN ('confirmed', 'still_valid')
+                                           THEN verifier_id END) AS confirmed,
+                       SUM(verifier_id = 'system_auto_verify') AS system_verified
+                FROM memory_verifications
+                WHERE memory_id IN (SELECT memory_id FROM batch)
+                GROUP BY memory_id
+            ),
+            clusters AS (
+                SELECT j.value AS memory_id, MAX(c.agreement_level) AS agreement_level
+                FROM consensus_clusters c, json_each(c.memory_ids) j
+                WHERE c.agent_count >= 3 AND j.value IN (SELECT memory_id FROM batch)
+                GROUP BY j.value
+            ),
+            votes AS (
+                SELECT fact_id AS memory_id,
+                       SUM(vote = 'agree') AS agree_count,
+                       SUM(vote = 'disagree') AS disagree_count
+                FROM fact_votes
+                WHERE fact_id IN (SELECT memory_id FROM batch)
+                GROUP BY fact_id
+            ),
+            contradictions AS (
+                SELECT memory_id,
+                       SUM(CASE WHEN resolution_winner IS NOT NULL AND resolution_winner != ''
+                                     AND resolution_winner != memory_id
+                                THEN 0.3 ELSE 0.1 * severity END) AS penalty
+                FROM (
+                    SELECT memory_a_id AS memory_id, severity, resolution_winner
+                    FROM memory_contradictions WHERE resolved_at IS NULL
+                    UNION ALL
+                    SELECT memory_b_id, severity, resolution_winner
+                    FROM memory_contradictions WHERE resolved_at IS NULL
+                )
+                WHERE memory_id IN (SELECT memory_id FROM batch)
+                GROUP BY memory_id
+            ),
+            outcomes AS (
+                SELECT memory_id,
+                       COUNT(*) AS total,
+                       SUM(outcome = 'success') AS successes,
+                       SUM(outcome = 'partial') AS partial
+                FROM memory_usage_outcomes
+                WHERE memory_id IN (SELECT memory_id FROM batch)
+                AND tracked_at > datetime('now', '-90 days')
+                GROUP BY memory_id
+            )
+            SELECT b.memory_id,
+                   v.confirmed, v.system_verified,
+                   cl.agreement_level,
+                   vo.agree_count, vo.disagree_count,
+                   ct.penalty,
+                   o.total, o.successes, o.partial,
+                   ac.agent_id AS credibility_agent,
+                   ac.contribution_count, ac.verification_count,
+                   ac.verified_correct, ac.verified_incorrect,
+                   ac.corrections_issued, ac.days_active,
+                   mc.freshness_score AS stored_freshness,
+                   mc.source_score AS stored_source,
+                   mc.category AS stored_category,
+                   mc.freshness_reference_at AS stored_reference_at,
+                   mc.half_life_days AS stored_half_life
+            FROM batch b
+            LEFT JOIN verifications v ON v.memory_id = b.memory_id
+            LEFT JOIN clusters cl ON cl.memory_id = b.memory_id
+            LEFT JOIN votes vo ON vo.memory_id = b.memory_id
+            LEFT JOIN contradictions ct ON ct.memory_id = b.memory_id
+            LEFT JOIN outcomes o ON o.memory_id = b.memory_id
+            LEFT JOIN agent_credibility ac ON ac.agent_id = b.agent_id AND ac.category = b.category
+            LEFT JOIN memory_confidence mc ON mc.memory_id = b.memory_id
+        """, params).fetchall()
+
+        return {row['memory_id']: row for row in rows}
+
+    def _scores_from_inputs(self,
+                            row: sqlite3.Row,
+                            memory_data: Optional[Dict],
+                            context: Optional[Context]) -> Dict[str, float]:
+        """Compute all seven factor scores from a prefetched input row"""
+        scores = {}
+
+        if memory_data and memory_data.get('created_at'):
+            last_verified = memory_data.get('last_verified_at')
+            scores['freshness'] = self.freshness_calc.calculate_freshness(
+                created_at=datetime.fromisoformat(memory_data['created_at']),
+                category=memory_data.get('category', 'global'),
+                last_verified_at=datetime.fromisoformat(last_verified) if last_verified else None
+            )
+        else:
+            # Decay the stored parameters analytically; fall back to the old snapshot
+            scores['freshness'] = decayed_freshness(row['stored_reference_at'], row['stored_half_life'])
+            if scores['freshness'] is None:
+                scores['freshness'] = row['stored_freshness'] if row['stored_freshness'] is not None else 0.5
+
+        if memory_data or row['stored_source'] is None:
+            data = memory_data or {}
+            agent_cred = SourceCredibilityCalculator.credibility_from_row(
+                row if row['credibility_agent'] is not None else None
+            )
+            scores['source_credibility'] = SourceCredibilityCalculator.combine_source_score(
+                agent_cred, data.get('source_type'), data.get('creator_role')
+            )
+        else:
+            scores['source_credibility'] = row['stored_source']
+
+        status, verifier_count = VerificationCalculator.status_from_counts(
+            row['confirmed'] or 0, row['system_verified'] or 0
         )
+        scores['verification'] = VerificationCalculator.score_from_status(status, verifier_count)
 
-        # Store in database
-        self._store_confidence_score(confidence)
+        if row['agreement_level'] is not None:
+            scores['consensus'] = row['agreement_level']
+        elif row['agree_count'] is None:
+            scores['consensus'] = 0.5  # Neutral - no consensus data
+        else:
+            scores['consensus'] = ConsensusCalculator.score_from_votes(
+                row['agree_count'] or 0, row['disagree_count'] or 0
+            )
 
-        return confidence
+        scores['contradiction'] = ContradictionCalculator.score_from_penalty(row['penalty'] or 0.0)
+
+        scores['success_rate'] = UsageSuccessTracker.score_from_outcomes(
+            row['total'] or 0, row['successes'] or 0, row['partial'] or 0
+        )
+
+        if context and memory_data:
+            scores['context_relevance'] = self.relevance_calc.calculate_relevance(
+                memory_data=memory_data,
+                current_context=context
+            )
+        else:
+            scores['context_relevance'] = 0.5  # Neutral if no context
+
+        return scores
 
     def _store_confidence_score(self, score: ConfidenceScore):
         """Store confidence score in database"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO memory_confidence
-                (memory_id, final_score, confidence_level, description,
-                 freshness_score, source_score, verification_score,
-                 consensus_score, contradiction_score, success_rate_score,
-                 context_relevance_score, weights_json, calculated_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                score.memory_id,
-                score.final_score,
-                score.level.value,
-                score.description,
-                score.freshness_score,
-                score.source_score,
-                score.verification_score,
-                score.consensus_score,
-                score.contradiction_score,
-                score.success_rate_score,
-                score.context_relevance_score,
-                json.dumps(score.weights),
-                score.calculated_at,
-                datetime.now().isoformat()
-            ))
+        with sqlite_pool.connect(self.db_path) as conn:
+            self._store_confidence_scores(conn, [score])
+
+    def _store_confidence_scores(self, conn: sqlite3.Connection, scores: List[ConfidenceScore]):
+        """Upsert confidence scores with a single executemany"""
+        updated_at = datetime.now().isoformat()
+        conn.executemany("""
+            INSERT INTO memory_confidence
+            (memory_id, final_score, confidence_level, description,
+             freshness_score, source_score, verification_score,
+             consensus_score, contradiction_score, success_rate_score,
+             context_relevance_score, category, freshness_reference_at, half_life_days,
+             weights_json, calculated_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(memory_id) DO UPDATE SET
+                final_score = excluded.final_score,
+                confidence_level = excluded.confidence_level,
+                description = excluded.description,
+                freshness_score = excluded.freshness_score,
+                source_score = excluded.source_score,
+                verification_score = excluded.verification_score,
+                consensus_score = excluded.consensus_score,
+                contradiction_score = excluded.contradiction_score,
+                success_rate_score = excluded.success_rate_score,
+                context_relevance_score = excluded.context_relevance_score,
+                category = COALESCE(excluded.category, category),
+                freshness_reference_at = COALESCE(excluded.freshness_reference_at, freshness_reference_at),
+                half_life_days = COALESCE(excluded.half_life_days, half_life_days),
+                weights_json = excluded.weights_json,
+                calculated_at = excluded.calculated_at,
+                updated_at = excluded.updated_at
+        """, [(
+            score.memory_id,
+            score.final_score,
+            score.level.value,
+            score.description,
+            score.freshness_score,
+            score.source_score,
+            score.verification_score,
+            score.consensus_score,
+            score.contradiction_score,
+            score.success_rate_score,
+            score.context_relevance_score,
+            score.category,
+            score.freshness_reference_at,
+            score.half_life_days,
+            json.dumps(score.weights),
+            score.calculated_at,
+            updated_at
+        ) for score in scores])
 
     # ========================================================================
     # Verification Methods
@@ -894,7 +1250,7 @@ class ConfidenceSystem:
         import secrets
         verification_id = f"verify_{secrets.token_hex(8)}"
 
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.execute("""
                 INSERT OR REPLACE INTO memory_verifications
                 (id, memory_id, verifier_id, verification_type, confidence, notes, verified_at)
@@ -928,9 +1284,23 @@ class ConfidenceSystem:
         Returns:
             Usage record ID
         """
-        return self.success_tracker.track_usage(
+        usage_id = self.success_tracker.track_usage(
             memory_id, agent_id, action, outcome, details
         )
+        self.record_access([memory_id])
+        return usage_id
+
+    def record_access(self, memory_ids: List[str]):
+        """Bump access counters used to prioritize background recompute"""
+        if not memory_ids:
+            return
+        now = datetime.now().isoformat()
+        with sqlite_pool.connect(self.db_path) as conn:
+            conn.executemany("""
+                UPDATE memory_confidence
+                SET access_count = COALESCE(access_count, 0) + 1, last_accessed_at = ?
+                WHERE memory_id = ?
+            """, [(now, memory_id) for memory_id in memory_ids])
 
     # ========================================================================
     # Contradiction Detection
@@ -958,7 +1328,7 @@ class ConfidenceSystem:
         import secrets
         contradiction_id = f"conflict_{secrets.token_hex(8)}"
 
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.execute("""
                 INSERT INTO memory_contradictions
                 (id, memory_a_id, memory_b_id, contradiction_type, severity, details, detected_at)
@@ -987,7 +1357,7 @@ class ConfidenceSystem:
         Returns:
             True if successful
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.execute("""
                 UPDATE memory_contradictions
                 SET resolved_at = ?,
@@ -1012,7 +1382,7 @@ class ConfidenceSystem:
                                 verified_incorrect: int = 0,
                                 corrections: int = 0):
         """Update agent credibility scores"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.execute("""
                 INSERT INTO agent_credibility
                 (agent_id, category, verified_correct, verified_incorrect, corrections_issued, updated_at)
@@ -1029,59 +1399,119 @@ class ConfidenceSystem:
     # Queries
     # ========================================================================
 
+    def _connect_with_decay(self) -> sqlite3.Connection:
+        """Open a connection with the decay-on-read SQL functions registered"""
+        conn = sqlite_pool.connect(self.db_path)
+        now = datetime.now()
+
+        def _decayed_or_stored(reference_at, half_life_days, stored_freshness):
+            current = decayed_freshness(reference_at, half_life_days, now)
+            return stored_freshness if current is None else current
+
+        conn.create_function("decayed_freshness", 3, _decayed_or_stored, deterministic=True)
+        return conn
+
+    def _current_score_sql(self) -> str:
+        """SQL expression for final_score with freshness decayed to now"""
+        weight = self.weights.get('freshness', 0.0)
+        return (f"(final_score + {weight!r} * (decayed_freshness(freshness_reference_at, "
+                f"half_life_days, freshness_score) - COALESCE(freshness_score, 0)))")
+
     def get_confidence_score(self, memory_id: str) -> Optional[Dict]:
-        """Get stored confidence score"""
-        with sqlite3.connect(self.db_path) as conn:
+        """Get stored confidence score with freshness decayed to the current time"""
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             result = conn.execute("""
                 SELECT * FROM memory_confidence WHERE memory_id = ?
             """, (memory_id,)).fetchone()
 
-        if result:
-            return dict(result)
-        return None
+        if not result:
+            return None
+
+        score = dict(result)
+        current = decayed_freshness(score.get('freshness_reference_at'), score.get('half_life_days'))
+        if current is not None and score.get('freshness_score') is not None:
+            score['current_freshness_score'] = current
+            score['current_final_score'] = score['final_score'] + \
+                self.weights.get('freshness', 0.0) * (current - score['freshness_score'])
+        return score
 
     def get_high_confidence_memories(self,
                                     min_confidence: float = 0.7,
                                     limit: int = 100) -> List[str]:
-        """Get memory IDs with high confidence scores"""
-        with sqlite3.connect(self.db_path) as conn:
-            results = conn.execute("""
+        """Get memory IDs with high confidence scores (freshness decayed on read)"""
+        current_score = self._current_score_sql()
+        conn = self._connect_with_decay()
+        try:
+            # Decay only lowers a score, so the stored final_score bound uses the index
+            results = conn.execute(f"""
                 SELECT memory_id FROM memory_confidence
-                WHERE final_score >= ?
-                ORDER BY final_score DESC
+                WHERE final_score >= ? AND {current_score} >= ?
+                ORDER BY {current_score} DESC
                 LIMIT ?
-            """, (min_confidence, limit)).fetchall()
+            """, (min_confidence, min_confidence, limit)).fetchall()
+        finally:
+            conn.close()
 
         return [r[0] for r in results]
 
     def get_outdated_memories(self,
                              category: Optional[str] = None,
                              freshness_threshold: float = 0.3) -> List[str]:
-        """Get memories with low freshness scores"""
-        with sqlite3.connect(self.db_path) as conn:
-            if category:
-                results = conn.execute("""
-                    SELECT mc.memory_id
-                    FROM memory_confidence mc
-                    WHERE mc.freshness_score < ?
-                """, (freshness_threshold,)).fetchall()
-            else:
-                results = conn.execute("""
-                    SELECT memory_id FROM memory_confidence
-                    WHERE freshness_score < ?
-                    ORDER BY freshness_score ASC
-                """, (freshness_threshold,)).fetchall()
+        """Get memories whose freshness, decayed to now, is below the threshold"""
+        query = """
+            SELECT memory_id FROM memory_confidence
+            WHERE decayed_freshness(freshness_reference_at, half_life_days, freshness_score) < ?
+        """
+        params: List[Any] = [freshness_threshold]
+        if category:
+            query += " AND category = ?"
+            params.append(category)
+        query += " ORDER BY decayed_freshness(freshness_reference_at, half_life_days, freshness_score) ASC"
+
+        conn = self._connect_with_decay()
+        try:
+            results = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
 
         return [r[0] for r in results]
 
+    def get_rescore_candidates(self,
+                               stale_before: datetime,
+                               limit: int = 200) -> List[str]:
+        """
+        Memories due for recompute, most valuable first
+
+        Priority is staleness (days since calculated) weighted by access count,
+        so frequently used memories and long-unscored memories come first.
+        """
+        now = datetime.now().isoformat()
+        with sqlite_pool.connect(self.db_path) as conn:
+            results = conn.execute("""
+                SELECT memory_id FROM memory_confidence
+                WHERE calculated_at < ?
+                ORDER BY (1 + COALESCE(access_count, 0)) *
+                         (julianday(?) - julianday(calculated_at)) DESC
+                LIMIT ?
+            """, (stale_before.isoformat(), now, limit)).fetchall()
+
+        return [r[0] for r in results]
+
+    def count_rescore_backlog(self, stale_before: datetime) -> int:
+        """Number of memories whose stored score is older than stale_before"""
+        with sqlite_pool.connect(self.db_path) as conn:
+            return conn.execute("""
+                SELECT COUNT(*) FROM memory_confidence WHERE calculated_at < ?
+            """, (stale_before.isoformat(),)).fetchone()[0]
+
     # ========================================================================
     # Monitoring & Statistics
     # ========================================================================
 
     def get_confidence_stats(self) -> Dict[str, Any]:
         """Get comprehensive confidence statistics for monitoring"""
-        with sqlite3.connect(self.db_path) as conn:
+        with closing(self._connect_with_decay()) as conn:
             conn.row_factory = sqlite3.Row
 
             # Average confidence score
@@ -1109,11 +1539,11 @@ class ConfidenceSystem:
             """).fetchone()
             high_confidence_count = high_conf_result['count']
 
-            # Needs verification (low freshness)
+            # Needs verification (low freshness, decayed to now)
             needs_verify_result = conn.execute("""
                 SELECT COUNT(*) as count
                 FROM memory_confidence
-                WHERE freshness_score < 0.3
+                WHERE decayed_freshness(freshness_reference_at, half_life_days, freshness_score) < 0.3
             """).fetchone()
             needs_verification_count = needs_verify_result['count']
 
@@ -1140,7 +1570,7 @@ class ConfidenceSystem:
             """).fetchone()
             unresolved_contradictions = contradictions_result['count']
 
-        return {
+        stats = {
             "average_confidence": average_confidence,
             "total_memories": total_memories,
             "high_confidence_count": high_confidence_count,
@@ -1151,11 +1581,16 @@ class ConfidenceSystem:
             "timestamp": datetime.now().isoformat()
         }
 
+        if self.recompute_scheduler is not None:
+            stats["recompute"] = self.recompute_scheduler.get_metrics()
+
+        return stats
+
     def get_low_confidence_memories(self,
                                    threshold: float = 0.4,
                                    limit: int = 10) -> List[Dict[str, Any]]:
         """Get memories with low confidence scores for review"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
 
             results = conn.execute("""
@@ -1172,7 +1607,7 @@ class ConfidenceSystem:
 
     def get_confidence_trends(self, days: int = 30) -> Dict[str, Any]:
         """Get confidence score trends over time"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
 
             # Daily average confidence
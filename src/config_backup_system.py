@@ -15,10 +15,27 @@ from typing import Dict, List, Optional, Tuple, Any
 import logging
 import asyncio
 import difflib
+import re
+import uuid
+from collections import OrderedDict
 from dataclasses import dataclass, asdict
 
+from config_chunk_store import ConfigChunkStore
+import sqlite_pool
+
 logger = logging.getLogger(__name__)
 
+# Columns added after the initial schema; applied to existing databases on startup
+CONFIG_SNAPSHOT_MIGRATIONS = {
+    'chunk_manifest': "ALTER TABLE config_snapshots ADD COLUMN chunk_manifest TEXT",
+    'parent_snapshot_id': "ALTER TABLE config_snapshots ADD COLUMN parent_snapshot_id TEXT",
+    'stored_size': "ALTER TABLE config_snapshots ADD COLUMN stored_size INTEGER",
+}
+
+# Snapshot columns returned by listing queries (content is reassembled on demand)
+SNAPSHOT_COLUMNS = "s.id, s.system_id, s.config_type, s.config_hash, s.file_path, s.timestamp, " \
+                   "s.agent_id, s.metadata, s.size, s.stored_size, s.parent_snapshot_id"
+
 @dataclass
 class ConfigSnapshot:
     """Configuration snapshot data structure"""
@@ -55,25 +72,287 @@ class ConfigDiff:
         if not self.timestamp:
             self.timestamp = datetime.now().isoformat()
 
+def build_config_diff(prev_content: str, new_content: str, system_id: str) -> Optional[Dict]:
+    """Unified diff plus change statistics between two config versions"""
+    diff_lines = list(difflib.unified_diff(
+        prev_content.splitlines(keepends=True),
+        new_content.splitlines(keepends=True),
+        fromfile=f"previous/{system_id}",
+        tofile=f"current/{system_id}",
+        n=3
+    ))
+
+    if not diff_lines:
+        return None  # No changes
+
+    # Count changes
+    lines_added = sum(1 for line in diff_lines if line.startswith('+') and not line.startswith('+++'))
+    lines_removed = sum(1 for line in diff_lines if line.startswith('-') and not line.startswith('---'))
+
+    # Calculate risk score based on change magnitude
+    total_changes = lines_added + lines_removed
+    total_lines = len(new_content.splitlines())
+    change_ratio = total_changes / max(total_lines, 1)
+    risk_score = min(1.0, change_ratio * 2)  # Scale to 0-1
+
+    # Determine change type
+    if lines_added > 0 and lines_removed > 0:
+        change_type = "modified"
+    elif lines_added > 0:
+        change_type = "added"  
+    else:
+        change_type = "deleted"
+
+    return {
+        'diff_content': ''.join(diff_lines),
+        'change_type': change_type,
+        'risk_score': risk_score,
+        'lines_added': lines_added,
+        'lines_removed': lines_removed
+    }
+
+# Keyword lists for change pattern detection; order decides which keyword a pattern reports
+SECURITY_KEYWORDS = (
+    'password', 'auth', 'ssl', 'tls', 'cert', 'key', 'token',
+    'secret', 'credential', 'permission', 'access', 'security'
+)
+SERVICE_KEYWORDS = (
+    'enable', 'disable', 'start', 'stop', 'restart', 'service',
+    'daemon', 'process'
+)
+NETWORK_KEYWORDS = (
+    'port', 'bind', 'listen', 'host', 'ip', 'address', 'network',
+    'firewall', 'iptables'
+)
+SYSTEM_KEYWORDS = {
+    'nginx': ('nginx_routing', 'Nginx routing', 'medium', ('server_name', 'proxy_pass', 'upstream')),
+    'mysql': ('database_permission', 'Database permission', 'high', ('user', 'grant', 'privilege')),
+    'kubernetes': ('k8s_resource', 'Kubernetes resource', 'medium', ('replicas', 'image', 'resource')),
+}
+
+
+def _keyword_pattern(keywords) -> "re.Pattern":
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+
+
+# Compiled once at import (and once per worker process) so most changed lines are
+# rejected by a single regex scan instead of a substring test per keyword
+SECURITY_PATTERN = _keyword_pattern(SECURITY_KEYWORDS)
+SERVICE_PATTERN = _keyword_pattern(SERVICE_KEYWORDS)
+NETWORK_PATTERN = _keyword_pattern(NETWORK_KEYWORDS)
+SYSTEM_PATTERNS = {system_type: _keyword_pattern(spec[3]) for system_type, spec in SYSTEM_KEYWORDS.items()}
+ANY_CHANGE_PATTERN = _keyword_pattern(
+    SECURITY_KEYWORDS + SERVICE_KEYWORDS + NETWORK_KEYWORDS +
+    tuple(keyword for spec in SYSTEM_KEYWORDS.values() for keyword in spec[3])
+)
+
+
+def _first_keyword(line_lower: str, keywords, pattern) -> Optional[str]:
+    if not pattern.search(line_lower):
+        return None
+    return next(keyword for keyword in keywords if keyword in line_lower)
+
+
+def detect_change_patterns(diff_content: str, system_type: str) -> List[Dict]:
+    """Detect common configuration change patterns"""
+    patterns = []
+
+    if not diff_content:
+        return patterns
+
+    system_spec = SYSTEM_KEYWORDS.get(system_type)
+    system_pattern = SYSTEM_PATTERNS.get(system_type)
+
+    for line in diff_content.split('\n'):
+        # Skip diff headers and context lines
+        if line.startswith('@@') or line.startswith('+++') or line.startswith('---'):
+            continue
+        if not (line.startswith('+') or line.startswith('-')):
+            continue
+
+        line_lower = line.lower()
+        if not ANY_CHANGE_PATTERN.search(line_lower):
+            continue
+
+        change_type = 'added' if line.startswith('+') else 'removed'
+        content = line[1:].strip()
+
+        # Security changes
+        keyword = _first_keyword(line_lower, SECURITY_KEYWORDS, SECURITY_PATTERN)
+        if keyword:
+            patterns.append({
+                'type': 'security_change',
+                'detail': f"{keyword} configuration {change_type}",
+                'line': content,
+                'severity': 'high'
+            })
+
+        # Service changes
+        if SERVICE_PATTERN.search(line_lower):
+            if 'disable' in line_lower or 'stop' in line_lower:
+                patterns.append({
+                    'type': 'service_disable',
+                    'detail': f"Service disabled/stopped: {content}",
+                    'line': content,
+                    'severity': 'medium'
+                })
+            else:
+                patterns.append({
+                    'type': 'service_change',
+                    'detail': f"Service configuration {change_type}",
+                    'line': content,
+                    'severity': 'low'
+                })
+
+        # Network changes
+        if NETWORK_PATTERN.search(line_lower):
+            if 'port' in line_lower:
+                patterns.append({
+                    'type': 'port_change',
+                    'detail': f"Port configuration {change_type}",
+                    'line': content,
+                    'severity': 'medium'
+                })
+            else:
+                patterns.append({
+                    'type': 'network_change',
+                    'detail': f"Network configuration {change_type}",
+                    'line': content,
+                    'severity': 'medium'
+                })
+
+        # System-specific patterns
+        if system_spec and system_pattern.search(line_lower):
+            pattern_type, label, severity, _ = system_spec
+            patterns.append({
+                'type': pattern_type,
+                'detail': f"{label} {change_type}",
+                'line': content,
+                'severity': severity
+            })
+
+    return patterns
+
+def analyze_drift(diff_data: Dict, patterns: Optional[List[Dict]] = None) -> Dict:
+    """Advanced drift analysis with pattern recognition"""
+    analysis = {
+        'severity': 'low',
+        'recommendations': [],
+        'risk_factors': [],
+        'patterns_detected': [],
+        'confidence': 0.0
+    }
+
+    risk_score = diff_data.get('risk_score', 0.0)
+    change_type = diff_data.get('change_type', '')
+    lines_changed = (diff_data.get('lines_added', 0) + 
+                    diff_data.get('lines_removed', 0))
+    diff_content = diff_data.get('diff_content', '')
+    system_type = diff_data.get('system_type', '')
+
+    # Enhanced severity calculation
+    if risk_score > 0.8:
+        analysis['severity'] = 'critical'
+    elif risk_score > 0.6:
+        analysis['severity'] = 'high'
+    elif risk_score > 0.3:
+        analysis['severity'] = 'medium'
+
+    # Pattern detection in diff content
+    if patterns is None:
+        patterns = detect_change_patterns(diff_content, system_type)
+    analysis['patterns_detected'] = patterns
+
+    # Calculate confidence based on pattern recognition
+    analysis['confidence'] = min(0.95, len(patterns) * 0.2 + risk_score * 0.6)
+
+    # Enhanced risk factors
+    if lines_changed > 100:
+        analysis['risk_factors'].append('Very large configuration change')
+    elif lines_changed > 50:
+        analysis['risk_factors'].append('Large configuration change')
+    elif lines_changed > 20:
+        analysis['risk_factors'].append('Moderate configuration change')
+
+    if change_type == 'deleted':
+        analysis['risk_factors'].append('Configuration removal detected')
+        analysis['severity'] = 'high'  # Escalate deletions
+
+    # Pattern-based risk factors
+    for pattern in patterns:
+        if pattern['type'] == 'security_change':
+            analysis['risk_factors'].append(f"Security configuration change: {pattern['detail']}")
+            analysis['severity'] = 'critical'
+        elif pattern['type'] == 'service_disable':
+            analysis['risk_factors'].append(f"Service disabled: {pattern['detail']}")
+        elif pattern['type'] == 'port_change':
+            analysis['risk_factors'].append(f"Network port change: {pattern['detail']}")
+        elif pattern['type'] == 'auth_change':
+            analysis['risk_factors'].append(f"Authentication change: {pattern['detail']}")
+
+    # Enhanced recommendations
+    if analysis['severity'] == 'critical':
+        analysis['recommendations'].extend([
+            'IMMEDIATE ACTION REQUIRED',
+            'Stop all automated deployments',
+            'Verify system security and functionality',
+            'Consider emergency rollback'
+        ])
+    elif analysis['severity'] == 'high':
+        analysis['recommendations'].extend([
+            'Review change immediately',
+            'Test system functionality thoroughly',
+            'Verify security implications',
+            'Monitor system behavior closely'
+        ])
+    elif analysis['severity'] == 'medium':
+        analysis['recommendations'].extend([
+            'Review change within 4 hours',
+            'Verify functionality',
+            'Document change rationale'
+        ])
+
+    # Pattern-specific recommendations
+    if any(p['type'] == 'security_change' for p in patterns):
+        analysis['recommendations'].append('Security team review required')
+    if any(p['type'] == 'service_disable' for p in patterns):
+        analysis['recommendations'].append('Verify dependent services')
+    if any(p['type'] == 'port_change' for p in patterns):
+        analysis['recommendations'].append('Update firewall and monitoring rules')
+
+    return analysis
+
 class ConfigBackupSystem:
     """
     Core configuration backup and tracking system
     
     Features:
     - Configuration versioning with hash-based deduplication
+    - Content-addressed, compressed chunk storage shared across systems
+    - Diffs computed lazily on request and cached
+    - Retention-driven garbage collection
     - Drift detection and alerting
     - Point-in-time restore capabilities
     - Cross-system configuration correlation
     """
     
-    def __init__(self, db_path: str = "data/config_backup.db"):
+    def __init__(self, db_path: str = "data/config_backup.db", retention: Dict[str, Any] = None,
+                 diff_cache_size: int = 128):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.retention = {'keep_last': 50, 'max_age_days': 30, **(retention or {})}
+        self.chunk_store = ConfigChunkStore()
+        self._diff_cache: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+        self._diff_cache_size = diff_cache_size
+        self._fleet_engine = None
         self._init_database()
+        # Databases created before chunked storage still hold inline content; move it once
+        while self.migrate_legacy_snapshots():
+            pass
         
     def _init_database(self):
         """Initialize SQLite database with optimized schema"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.executescript("""
                 -- Systems registry table
                 CREATE TABLE IF NOT EXISTS config_systems (
@@ -94,13 +373,16 @@ class ConfigBackupSystem:
                     id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
                     system_id TEXT NOT NULL,
                     config_type TEXT NOT NULL,
-                    config_content TEXT NOT NULL,
+                    config_content TEXT NOT NULL DEFAULT '',  -- Legacy inline content; new rows use chunk_manifest
                     config_hash TEXT NOT NULL,
                     file_path TEXT,
                     timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
                     agent_id TEXT,
                     metadata TEXT DEFAULT '{}',  -- JSON metadata
                     size INTEGER,
+                    chunk_manifest TEXT,  -- JSON list of chunk hashes
+                    parent_snapshot_id TEXT,  -- Previous snapshot of the same system
+                    stored_size INTEGER,  -- Compressed bytes newly written by this snapshot
                     FOREIGN KEY (system_id) REFERENCES config_systems (system_id),
                     UNIQUE (system_id, config_hash)  -- Deduplication
                 );
@@ -145,10 +427,39 @@ class ConfigBackupSystem:
                 CREATE INDEX IF NOT EXISTS idx_systems_type ON config_systems (system_type);
                 CREATE INDEX IF NOT EXISTS idx_alerts_system ON config_drift_alerts (system_id, resolved);
                 CREATE INDEX IF NOT EXISTS idx_alerts_severity ON config_drift_alerts (severity, timestamp DESC);
+                
+                -- Lazily computed diffs between arbitrary snapshot pairs
+                CREATE TABLE IF NOT EXISTS config_diff_cache (
+                    snapshot_id_before TEXT NOT NULL,
+                    snapshot_id_after TEXT NOT NULL,
+                    diff_json TEXT NOT NULL,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (snapshot_id_before, snapshot_id_after)
+                );
+                
+                -- Fleet drift analysis per (system, snapshot pair)
+                CREATE TABLE IF NOT EXISTS config_drift_cache (
+                    system_id TEXT NOT NULL,
+                    snapshot_id_before TEXT NOT NULL,
+                    snapshot_id_after TEXT NOT NULL,
+                    result_json TEXT NOT NULL,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (snapshot_id_before, snapshot_id_after)
+                );
             """)
+            self._migrate_schema(conn)
+            ConfigChunkStore.init_schema(conn)
             
             logger.info("📊 Config backup database schema initialized")
     
+    def _migrate_schema(self, conn: sqlite3.Connection):
+        """Add chunk storage columns to databases created before they existed"""
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(config_snapshots)")}
+        for column, statement in CONFIG_SNAPSHOT_MIGRATIONS.items():
+            if column not in existing:
+                conn.execute(statement)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_parent ON config_snapshots (parent_snapshot_id)")
+    
     def register_system(self, system_id: str, system_name: str, system_type: str, 
                        agent_id: str = "", description: str = "", 
                        backup_frequency: int = 3600, metadata: Dict = None) -> bool:
@@ -157,7 +468,7 @@ class ConfigBackupSystem:
             metadata = {}
             
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with sqlite_pool.connect(self.db_path) as conn:
                 conn.execute("""
                     INSERT OR REPLACE INTO config_systems 
                     (system_id, system_name, system_type, description, agent_id, backup_frequency, metadata, updated_at)
@@ -173,9 +484,14 @@ class ConfigBackupSystem:
             return False
     
     def create_snapshot(self, snapshot: ConfigSnapshot) -> Optional[str]:
-        """Create a new configuration snapshot with deduplication"""
+        """Create a new configuration snapshot with deduplication
+        
+        Content is stored as a manifest of shared, compressed chunks; only
+        chunks not already in the store are written. The diff against the
+        previous snapshot is not computed here but on first request.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with sqlite_pool.connect(self.db_path) as conn:
                 # Check if identical config already exists (deduplication)
                 existing = conn.execute("""
                     SELECT id FROM config_snapshots 
@@ -187,106 +503,301 @@ class ConfigBackupSystem:
                     logger.debug(f"🔄 Config unchanged for {snapshot.system_id}, skipping duplicate")
                     return existing[0]
                 
-                # Insert new snapshot
-                cursor = conn.execute("""
-                    INSERT INTO config_snapshots 
-                    (system_id, config_type, config_content, config_hash, file_path, agent_id, metadata, size)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (snapshot.system_id, snapshot.config_type, snapshot.config_content,
-                      snapshot.config_hash, snapshot.file_path, snapshot.agent_id,
-                      json.dumps(snapshot.metadata), len(snapshot.config_content)))
+                parent = conn.execute("""
+                    SELECT id FROM config_snapshots
+                    WHERE system_id = ?
+                    ORDER BY timestamp DESC, rowid DESC LIMIT 1
+                """, (snapshot.system_id,)).fetchone()
+                
+                manifest, stored_size = self.chunk_store.put(conn, snapshot.config_content)
+                snapshot_id = snapshot.id or uuid.uuid4().hex
                 
-                snapshot_id = cursor.lastrowid
+                conn.execute("""
+                    INSERT INTO config_snapshots 
+                    (id, system_id, config_type, config_content, config_hash, file_path, agent_id, metadata,
+                     size, chunk_manifest, parent_snapshot_id, stored_size)
+                    VALUES (?, ?, ?, '', ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (snapshot_id, snapshot.system_id, snapshot.config_type, snapshot.config_hash,
+                      snapshot.file_path, snapshot.agent_id, json.dumps(snapshot.metadata),
+                      len(snapshot.config_content), ConfigChunkStore.encode_manifest(manifest),
+                      parent[0] if parent else None, stored_size))
                 
                 # Update system's last backup time
                 conn.execute("""
                     UPDATE config_systems SET last_backup = ? WHERE system_id = ?
                 """, (datetime.now().isoformat(), snapshot.system_id))
                 
-                # Create diff if previous snapshot exists
-                self._create_diff_if_needed(conn, snapshot_id, snapshot)
-                
-                logger.info(f"📸 Created config snapshot {snapshot_id} for {snapshot.system_id}")
-                return str(snapshot_id)
+                logger.info(f"📸 Created config snapshot {snapshot_id} for {snapshot.system_id} "
+                            f"({len(manifest)} chunks, {stored_size} new bytes)")
+                return snapshot_id
                 
         except Exception as e:
             logger.error(f"❌ Failed to create snapshot for {snapshot.system_id}: {e}")
             return None
     
-    def _create_diff_if_needed(self, conn: sqlite3.Connection, new_snapshot_id: str, 
-                              new_snapshot: ConfigSnapshot):
-        """Create diff between new snapshot and previous one"""
+    def _load_content(self, conn: sqlite3.Connection, snapshot_id: str) -> Optional[str]:
+        """Reassemble a snapshot's content from its chunk manifest (or legacy inline content)"""
+        row = conn.execute("SELECT chunk_manifest, config_content FROM config_snapshots WHERE id = ?",
+                           (snapshot_id,)).fetchone()
+        if not row:
+            return None
+        manifest, inline_content = row
+        if manifest is None:
+            return inline_content
+        return self.chunk_store.get(conn, ConfigChunkStore.decode_manifest(manifest))
+    
+    def get_snapshot_content(self, snapshot_id: str) -> Optional[str]:
+        """Get the full configuration content of a snapshot"""
         try:
-            # Get previous snapshot
-            prev_snapshot = conn.execute("""
-                SELECT id, config_content FROM config_snapshots 
-                WHERE system_id = ? AND id != ?
-                ORDER BY timestamp DESC LIMIT 1
-            """, (new_snapshot.system_id, new_snapshot_id)).fetchone()
-            
-            if not prev_snapshot:
-                return  # First snapshot, no diff needed
-                
-            prev_id, prev_content = prev_snapshot
+            with sqlite_pool.connect(self.db_path) as conn:
+                return self._load_content(conn, snapshot_id)
+        except Exception as e:
+            logger.error(f"❌ Failed to load snapshot {snapshot_id}: {e}")
+            return None
+    
+    def get_snapshot_by_id(self, snapshot_id: str) -> Optional[Dict]:
+        """Get a snapshot's metadata and content"""
+        try:
+            with sqlite_pool.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                row = conn.execute(f"SELECT {SNAPSHOT_COLUMNS} FROM config_snapshots s WHERE s.id = ?",
+                                   (snapshot_id,)).fetchone()
+                if not row:
+                    return None
+                return {**dict(row), 'config_content': self._load_content(conn, snapshot_id)}
+        except Exception as e:
+            logger.error(f"❌ Failed to get snapshot {snapshot_id}: {e}")
+            return None
+    
+    def _build_diff(self, prev_content: str, new_content: str, system_id: str) -> Optional[Dict]:
+        """Unified diff plus change statistics between two config versions"""
+        return build_config_diff(prev_content, new_content, system_id)
+    
+    def _ensure_diffs(self, conn: sqlite3.Connection, where_clause: str = "", params: tuple = ()) -> int:
+        """Compute and cache parent diffs for matching snapshots that do not have one yet
+        
+        where_clause filters config_snapshots aliased as s. The cached diff
+        carries the snapshot's own timestamp so time-windowed drift queries
+        see changes when they happened, not when they were first requested.
+        """
+        pending = conn.execute(f"""
+            SELECT s.id, s.parent_snapshot_id, s.system_id, s.timestamp
+            FROM config_snapshots s
+            JOIN config_snapshots p ON p.id = s.parent_snapshot_id
+            WHERE NOT EXISTS (SELECT 1 FROM config_diffs d WHERE d.snapshot_id_after = s.id)
+            {('AND ' + where_clause) if where_clause else ''}
+        """, params).fetchall()
+        
+        created = 0
+        for snapshot_id, parent_id, system_id, timestamp in pending:
+            try:
+                diff = self._build_diff(self._load_content(conn, parent_id) or '',
+                                        self._load_content(conn, snapshot_id) or '', system_id)
+                if not diff:
+                    continue
+                conn.execute("""
+                    INSERT INTO config_diffs 
+                    (snapshot_id_before, snapshot_id_after, diff_content, change_type, 
+                     risk_score, lines_added, lines_removed, timestamp)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (parent_id, snapshot_id, diff['diff_content'], diff['change_type'],
+                      diff['risk_score'], diff['lines_added'], diff['lines_removed'], timestamp))
+                created += 1
+                logger.info(f"📊 Created diff: {diff['change_type']}, risk: {diff['risk_score']:.2f}, "
+                            f"+{diff['lines_added']}/-{diff['lines_removed']}")
+            except Exception as e:
+                logger.error(f"❌ Failed to create diff for {snapshot_id}: {e}")
+        return created
+    
+    def compare_snapshots(self, snapshot_id_before: str, snapshot_id_after: str) -> Optional[Dict]:
+        """Diff two snapshots, computing it on first request and caching the result"""
+        key = (snapshot_id_before, snapshot_id_after)
+        if key in self._diff_cache:
+            self._diff_cache.move_to_end(key)
+            return self._diff_cache[key]
+        
+        try:
+            with sqlite_pool.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                cached = conn.execute("""
+                    SELECT diff_content, change_type, risk_score, lines_added, lines_removed
+                    FROM config_diffs WHERE snapshot_id_before = ? AND snapshot_id_after = ?
+                """, key).fetchone()
+                if cached:
+                    diff = dict(cached)
+                else:
+                    row = conn.execute("SELECT diff_json FROM config_diff_cache "
+                                       "WHERE snapshot_id_before = ? AND snapshot_id_after = ?", key).fetchone()
+                    if row:
+                        diff = json.loads(row['diff_json'])
+                    else:
+                        before = self._load_content(conn, snapshot_id_before)
+                        after = self._load_content(conn, snapshot_id_after)
+                        if before is None or after is None:
+                            return None
+                        system = conn.execute("SELECT system_id FROM config_snapshots WHERE id = ?",
+                                              (snapshot_id_after,)).fetchone()
+                        diff = self._build_diff(before, after, system['system_id']) or {
+                            'diff_content': '', 'change_type': 'unchanged', 'risk_score': 0.0,
+                            'lines_added': 0, 'lines_removed': 0
+                        }
+                        conn.execute("""
+                            INSERT OR REPLACE INTO config_diff_cache (snapshot_id_before, snapshot_id_after, diff_json)
+                            VALUES (?, ?, ?)
+                        """, (*key, json.dumps(diff)))
             
-            # Calculate diff
-            diff_lines = list(difflib.unified_diff(
-                prev_content.splitlines(keepends=True),
-                new_snapshot.config_content.splitlines(keepends=True),
-                fromfile=f"previous/{new_snapshot.system_id}",
-                tofile=f"current/{new_snapshot.system_id}",
-                n=3
-            ))
+            diff = {'snapshot_id_before': snapshot_id_before, 'snapshot_id_after': snapshot_id_after, **diff}
+            self._diff_cache[key] = diff
+            if len(self._diff_cache) > self._diff_cache_size:
+                self._diff_cache.popitem(last=False)
+            return diff
             
-            if not diff_lines:
-                return  # No changes
+        except Exception as e:
+            logger.error(f"❌ Failed to compare snapshots {snapshot_id_before} and {snapshot_id_after}: {e}")
+            return None
+    
+    def collect_garbage(self, system_id: str = None, keep_last: int = None,
+                        max_age_days: int = None) -> Dict[str, Any]:
+        """Apply retention and free chunks no remaining snapshot references
+        
+        A snapshot is removed only when it is both outside the newest
+        keep_last for its system and older than max_age_days. Snapshots
+        referenced by unresolved drift alerts are always kept. Retained
+        snapshots whose parent is removed are rebased onto their nearest
+        retained ancestor (or none), so no parent_snapshot_id dangles.
+        """
+        keep_last = self.retention['keep_last'] if keep_last is None else keep_last
+        max_age_days = self.retention['max_age_days'] if max_age_days is None else max_age_days
+        
+        try:
+            with sqlite_pool.connect(self.db_path) as conn:
+                system_filter = "AND system_id = ?" if system_id else ""
+                params = (system_id,) if system_id else ()
+                expired = conn.execute(f"""
+                    SELECT id, chunk_manifest FROM (
+                        SELECT id, chunk_manifest, timestamp,
+                               ROW_NUMBER() OVER (PARTITION BY system_id ORDER BY timestamp DESC, rowid DESC) AS position
+                        FROM config_snapshots
+                        WHERE 1 = 1 {system_filter}
+                    )
+                    WHERE position > ? AND timestamp < datetime('now', ?)
+                      AND id NOT IN (SELECT snapshot_id FROM config_drift_alerts
+                                     WHERE resolved = FALSE AND snapshot_id IS NOT NULL)
+                """, (*params, keep_last, f"-{int(max_age_days)} days")).fetchall()
                 
-            diff_content = ''.join(diff_lines)
-            
-            # Count changes
-            lines_added = sum(1 for line in diff_lines if line.startswith('+') and not line.startswith('+++'))
-            lines_removed = sum(1 for line in diff_lines if line.startswith('-') and not line.startswith('---'))
-            
-            # Calculate risk score based on change magnitude
-            total_changes = lines_added + lines_removed
-            total_lines = len(new_snapshot.config_content.splitlines())
-            change_ratio = total_changes / max(total_lines, 1)
-            risk_score = min(1.0, change_ratio * 2)  # Scale to 0-1
+                expired_ids = [row[0] for row in expired]
+                rebased = self._rebase_orphans(conn, set(expired_ids))
+                for snapshot_id, manifest in expired:
+                    if manifest:
+                        self.chunk_store.release(conn, ConfigChunkStore.decode_manifest(manifest))
+                
+                if expired_ids:
+                    conn.executemany("DELETE FROM config_diffs WHERE snapshot_id_after = ? OR snapshot_id_before = ?",
+                                     [(sid, sid) for sid in expired_ids])
+                    conn.executemany("DELETE FROM config_diff_cache WHERE snapshot_id_after = ? OR snapshot_id_before = ?",
+                                     [(sid, sid) for sid in expired_ids])
+                    conn.executemany("DELETE FROM config_drift_cache WHERE snapshot_id_after = ? OR snapshot_id_before = ?",
+                                     [(sid, sid) for sid in expired_ids])
+                    conn.executemany("DELETE FROM config_snapshots WHERE id = ?", [(sid,) for sid in expired_ids])
+                
+                chunks_freed, bytes_freed = self.chunk_store.sweep(conn)
             
-            # Determine change type
-            if lines_added > 0 and lines_removed > 0:
-                change_type = "modified"
-            elif lines_added > 0:
-                change_type = "added"  
-            else:
-                change_type = "deleted"
-                
-            # Insert diff record
-            conn.execute("""
-                INSERT INTO config_diffs 
-                (snapshot_id_before, snapshot_id_after, diff_content, change_type, 
-                 risk_score, lines_added, lines_removed)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (prev_id, new_snapshot_id, diff_content, change_type, 
-                  risk_score, lines_added, lines_removed))
+            self._diff_cache.clear()
+            logger.info(f"🧹 Config backup GC removed {len(expired_ids)} snapshots, "
+                        f"{chunks_freed} chunks ({bytes_freed} bytes)")
+            return {
+                'snapshots_removed': len(expired_ids),
+                'snapshots_rebased': rebased,
+                'chunks_freed': chunks_freed,
+                'bytes_freed': bytes_freed,
+                'keep_last': keep_last,
+                'max_age_days': max_age_days
+            }
             
-            logger.info(f"📊 Created diff: {change_type}, risk: {risk_score:.2f}, +{lines_added}/-{lines_removed}")
+        except Exception as e:
+            logger.error(f"❌ Config backup garbage collection failed: {e}")
+            return {'error': str(e)}
+    
+    def _rebase_orphans(self, conn: sqlite3.Connection, expired_ids: set) -> int:
+        """Point retained children of expired snapshots at their nearest retained ancestor"""
+        if not expired_ids:
+            return 0
+        parents = dict(conn.execute(
+            "SELECT id, parent_snapshot_id FROM config_snapshots WHERE parent_snapshot_id IS NOT NULL").fetchall())
+        updates = []
+        for snapshot_id, parent_id in parents.items():
+            if snapshot_id in expired_ids or parent_id not in expired_ids:
+                continue
+            while parent_id in expired_ids:
+                parent_id = parents.get(parent_id)
+            updates.append((parent_id, snapshot_id))
+        # The old parent diff goes with the expired snapshot; the next history read recomputes it
+        conn.executemany("UPDATE config_snapshots SET parent_snapshot_id = ? WHERE id = ?", updates)
+        return len(updates)
+    
+    def migrate_legacy_snapshots(self, batch_size: int = 100) -> int:
+        """Move inline config_content of pre-chunking snapshots into the chunk store"""
+        try:
+            with sqlite_pool.connect(self.db_path) as conn:
+                rows = conn.execute("""
+                    SELECT id, config_content FROM config_snapshots
+                    WHERE chunk_manifest IS NULL LIMIT ?
+                """, (batch_size,)).fetchall()
+                for snapshot_id, content in rows:
+                    manifest, stored_size = self.chunk_store.put(conn, content)
+                    conn.execute("""
+                        UPDATE config_snapshots SET chunk_manifest = ?, stored_size = ?, config_content = ''
+                        WHERE id = ?
+                    """, (ConfigChunkStore.encode_manifest(manifest), stored_size, snapshot_id))
+                return len(rows)
+        except Exception as e:
+            logger.error(f"❌ Failed to migrate legacy snapshots: {e}")
+            return 0
+    
+    def get_storage_stats(self) -> Dict[str, Any]:
+        """Logical vs. stored size of all snapshot history"""
+        try:
+            with sqlite_pool.connect(self.db_path) as conn:
+                snapshots, logical, legacy = conn.execute("""
+                    SELECT COUNT(*), COALESCE(SUM(size), 0),
+                           COALESCE(SUM(CASE WHEN chunk_manifest IS NULL THEN LENGTH(config_content) END), 0)
+                    FROM config_snapshots
+                """).fetchone()
+                chunk_stats = self.chunk_store.get_stats(conn)
+                diff_bytes = conn.execute(
+                    "SELECT COALESCE(SUM(LENGTH(diff_content)), 0) FROM config_diffs").fetchone()[0]
             
+            stored = chunk_stats['stored_bytes'] + legacy
+            return {
+                'snapshots': snapshots,
+                'logical_bytes': logical,
+                'stored_bytes': stored,
+                'legacy_inline_bytes': legacy,
+                'cached_diff_bytes': diff_bytes,
+                'space_saving_ratio': round(logical / stored, 2) if stored else 0.0,
+                'chunks': chunk_stats
+            }
         except Exception as e:
-            logger.error(f"❌ Failed to create diff: {e}")
+            logger.error(f"❌ Failed to get storage stats: {e}")
+            return {'error': str(e)}
     
     def get_system_history(self, system_id: str, limit: int = 50) -> List[Dict]:
         """Get configuration history for a system"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with sqlite_pool.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
                 
-                rows = conn.execute("""
-                    SELECT s.*, d.change_type, d.risk_score, d.lines_added, d.lines_removed
+                self._ensure_diffs(conn, """s.id IN (
+                    SELECT id FROM config_snapshots WHERE system_id = ?
+                    ORDER BY timestamp DESC, rowid DESC LIMIT ?
+                )""", (system_id, limit))
+                
+                rows = conn.execute(f"""
+                    SELECT {SNAPSHOT_COLUMNS}, d.change_type, d.risk_score, d.lines_added, d.lines_removed
                     FROM config_snapshots s
                     LEFT JOIN config_diffs d ON s.id = d.snapshot_id_after
                     WHERE s.system_id = ?
-                    ORDER BY s.timestamp DESC
+                    ORDER BY s.timestamp DESC, s.rowid DESC
                     LIMIT ?
                 """, (system_id, limit)).fetchall()
                 
@@ -299,16 +810,18 @@ class ConfigBackupSystem:
     def get_current_config(self, system_id: str) -> Optional[Dict]:
         """Get the most recent configuration for a system"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with sqlite_pool.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
                 
-                row = conn.execute("""
-                    SELECT * FROM config_snapshots 
-                    WHERE system_id = ?
-                    ORDER BY timestamp DESC LIMIT 1
+                row = conn.execute(f"""
+                    SELECT {SNAPSHOT_COLUMNS} FROM config_snapshots s
+                    WHERE s.system_id = ?
+                    ORDER BY s.timestamp DESC, s.rowid DESC LIMIT 1
                 """, (system_id,)).fetchone()
                 
-                return dict(row) if row else None
+                if not row:
+                    return None
+                return {**dict(row), 'config_content': self._load_content(conn, row['id'])}
                 
         except Exception as e:
             logger.error(f"❌ Failed to get current config for {system_id}: {e}")
@@ -317,7 +830,7 @@ class ConfigBackupSystem:
     def detect_drift(self, system_id: str = None, hours_back: int = 24) -> List[Dict]:
         """Detect configuration drift and potential issues"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with sqlite_pool.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
                 
                 # Build query based on system filter
@@ -328,6 +841,9 @@ class ConfigBackupSystem:
                     where_clause = "WHERE d.timestamp > datetime('now', '-{} hours')".format(hours_back)
                     params = ()
                 
+                # Diffs are computed on first request; fill in any for this window
+                self._ensure_diffs(conn, where_clause[len("WHERE "):].replace('d.timestamp', 's.timestamp'), params)
+                
                 rows = conn.execute(f"""
                     SELECT d.*, s.system_id, s.config_type, sys.system_name, sys.system_type
                     FROM config_diffs d
@@ -352,209 +868,22 @@ class ConfigBackupSystem:
             logger.error(f"❌ Failed to detect drift: {e}")
             return []
     
+    def detect_fleet_drift(self, hours_back: int = None, system_type: str = None,
+                           include_diff: bool = False) -> Dict[str, Any]:
+        """Drift across every system in one pass (see FleetDriftEngine.scan)"""
+        if self._fleet_engine is None:
+            from fleet_drift_engine import FleetDriftEngine
+            self._fleet_engine = FleetDriftEngine(self)
+        return self._fleet_engine.scan(hours_back=hours_back, system_type=system_type,
+                                       include_diff=include_diff)
+    
     def _analyze_drift(self, diff_data: Dict) -> Dict:
         """Advanced drift analysis with pattern recognition"""
-        analysis = {
-            'severity': 'low',
-            'recommendations': [],
-            'risk_factors': [],
-            'patterns_detected': [],
-            'confidence': 0.0
-        }
-        
-        risk_score = diff_data.get('risk_score', 0.0)
-        change_type = diff_data.get('change_type', '')
-        lines_changed = (diff_data.get('lines_added', 0) + 
-                        diff_data.get('lines_removed', 0))
-        diff_content = diff_data.get('diff_content', '')
-        system_type = diff_data.get('system_type', '')
-        
-        # Enhanced severity calculation
-        if risk_score > 0.8:
-            analysis['severity'] = 'critical'
-        elif risk_score > 0.6:
-            analysis['severity'] = 'high'
-        elif risk_score > 0.3:
-            analysis['severity'] = 'medium'
-            
-        # Pattern detection in diff content
-        patterns = self._detect_change_patterns(diff_content, system_type)
-        analysis['patterns_detected'] = patterns
-        
-        # Calculate confidence based on pattern recognition
-        analysis['confidence'] = min(0.95, len(patterns) * 0.2 + risk_score * 0.6)
-        
-        # Enhanced risk factors
-        if lines_changed > 100:
-            analysis['risk_factors'].append('Very large configuration change')
-        elif lines_changed > 50:
-            analysis['risk_factors'].append('Large configuration change')
-        elif lines_changed > 20:
-            analysis['risk_factors'].append('Moderate configuration change')
-            
-        if change_type == 'deleted':
-            analysis['risk_factors'].append('Configuration removal detected')
-            analysis['severity'] = 'high'  # Escalate deletions
-            
-        # Pattern-based risk factors
-        for pattern in patterns:
-            if pattern['type'] == 'security_change':
-                analysis['risk_factors'].append(f"Security configuration change: {pattern['detail']}")
-                analysis['severity'] = 'critical'
-            elif pattern['type'] == 'service_disable':
-                analysis['risk_factors'].append(f"Service disabled: {pattern['detail']}")
-            elif pattern['type'] == 'port_change':
-                analysis['risk_factors'].append(f"Network port change: {pattern['detail']}")
-            elif pattern['type'] == 'auth_change':
-                analysis['risk_factors'].append(f"Authentication change: {pattern['detail']}")
-        
-        # Enhanced recommendations
-        if analysis['severity'] == 'critical':
-            analysis['recommendations'].extend([
-                'IMMEDIATE ACTION REQUIRED',
-                'Stop all automated deployments',
-                'Verify system security and functionality',
-                'Consider emergency rollback'
-            ])
-        elif analysis['severity'] == 'high':
-            analysis['recommendations'].extend([
-                'Review change immediately',
-                'Test system functionality thoroughly',
-                'Verify security implications',
-                'Monitor system behavior closely'
-            ])
-        elif analysis['severity'] == 'medium':
-            analysis['recommendations'].extend([
-                'Review change within 4 hours',
-                'Verify functionality',
-                'Document change rationale'
-            ])
-        
-        # Pattern-specific recommendations
-        if any(p['type'] == 'security_change' for p in patterns):
-            analysis['recommendations'].append('Security team review required')
-        if any(p['type'] == 'service_disable' for p in patterns):
-            analysis['recommendations'].append('Verify dependent services')
-        if any(p['type'] == 'port_change' for p in patterns):
-            analysis['recommendations'].append('Update firewall and monitoring rules')
-            
-        return analysis
+        return analyze_drift(diff_data)
     
     def _detect_change_patterns(self, diff_content: str, system_type: str) -> List[Dict]:
         """Detect common configuration change patterns"""
-        patterns = []
-        
-        if not diff_content:
-            return patterns
-            
-        lines = diff_content.split('\n')
-        
-        # Security-related patterns
-        security_keywords = [
-            'password', 'auth', 'ssl', 'tls', 'cert', 'key', 'token', 
-            'secret', 'credential', 'permission', 'access', 'security'
-        ]
-        
-        # Service-related patterns  
-        service_keywords = [
-            'enable', 'disable', 'start', 'stop', 'restart', 'service',
-            'daemon', 'process'
-        ]
-        
-        # Network-related patterns
-        network_keywords = [
-            'port', 'bind', 'listen', 'host', 'ip', 'address', 'network',
-            'firewall', 'iptables'
-        ]
-        
-        for line in lines:
-            line_lower = line.lower()
-            
-            # Skip diff headers
-            if line.startswith('@@') or line.startswith('+++') or line.startswith('---'):
-                continue
-                
-            # Check for added or removed lines
-            if line.startswith('+') or line.startswith('-'):
-                change_type = 'added' if line.startswith('+') else 'removed'
-                content = line[1:].strip()
-                
-                # Security changes
-                for keyword in security_keywords:
-                    if keyword in line_lower:
-                        patterns.append({
-                            'type': 'security_change',
-                            'detail': f"{keyword} configuration {change_type}",
-                            'line': content,
-                            'severity': 'high'
-                        })
-                        break
-                
-                # Service changes
-                for keyword in service_keywords:
-                    if keyword in line_lower:
-                        if 'disable' in line_lower or 'stop' in line_lower:
-                            patterns.append({
-                                'type': 'service_disable',
-                                'detail': f"Service disabled/stopped: {content}",
-                                'line': content,
-                                'severity': 'medium'
-                            })
-                        else:
-                            patterns.append({
-                                'type': 'service_change',
-                                'detail': f"Service configuration {change_type}",
-                                'line': content,
-                                'severity': 'low'
-                            })
-                        break
-                
-                # Network changes
-                for keyword in network_keywords:
-                    if keyword in line_lower:
-                        if 'port' in line_lower:
-                            patterns.append({
-                                'type': 'port_change',
-                                'detail': f"Port configuration {change_type}",
-                                'line': content,
-                                'severity': 'medium'
-                            })
-                        else:
-                            patterns.append({
-                                'type': 'network_change',
-                                'detail': f"Network configuration {change_type}",
-                                'line': content,
-                                'severity': 'medium'
-                            })
-                        break
-                
-                # System-specific patterns
-                if system_type == 'nginx':
-                    if any(word in line_lower for word in ['server_name', 'proxy_pass', 'upstream']):
-                        patterns.append({
-                            'type': 'nginx_routing',
-                            'detail': f"Nginx routing {change_type}",
-                            'line': content,
-                            'severity': 'medium'
-                        })
-                elif system_type == 'mysql':
-                    if any(word in line_lower for word in ['user', 'grant', 'privilege']):
-                        patterns.append({
-                            'type': 'database_permission',
-                            'detail': f"Database permission {change_type}",
-                            'line': content,
-                            'severity': 'high'
-                        })
-                elif system_type == 'kubernetes':
-                    if any(word in line_lower for word in ['replicas', 'image', 'resource']):
-                        patterns.append({
-                            'type': 'k8s_resource',
-                            'detail': f"Kubernetes resource {change_type}",
-                            'line': content,
-                            'severity': 'medium'
-                        })
-        
-        return patterns
+        return detect_change_patterns(diff_content, system_type)
     
     def create_drift_alert_with_analysis(self, system_id: str, drift_data: Dict) -> bool:
         """Create advanced drift alert with full analysis"""
@@ -600,7 +929,7 @@ class ConfigBackupSystem:
     def get_drift_trends(self, system_id: str = None, days_back: int = 7) -> Dict:
         """Analyze drift trends over time"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with sqlite_pool.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
                 
                 # Build query based on system filter
@@ -611,6 +940,8 @@ class ConfigBackupSystem:
                     where_clause = "WHERE d.timestamp > datetime('now', '-{} days')".format(days_back)
                     params = ()
                 
+                self._ensure_diffs(conn, where_clause[len("WHERE "):].replace('d.timestamp', 's.timestamp'), params)
+                
                 rows = conn.execute(f"""
                     SELECT d.*, s.system_id, s.config_type, sys.system_name, sys.system_type,
                            DATE(d.timestamp) as drift_date
@@ -677,7 +1008,7 @@ class ConfigBackupSystem:
     def get_systems(self) -> List[Dict]:
         """Get all registered systems"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with sqlite_pool.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
                 
                 rows = conn.execute("""
@@ -700,7 +1031,7 @@ class ConfigBackupSystem:
                           description: str, snapshot_id: str = None) -> bool:
         """Create a drift alert"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with sqlite_pool.connect(self.db_path) as conn:
                 conn.execute("""
                     INSERT INTO config_drift_alerts 
                     (system_id, drift_type, severity, description, snapshot_id)
@@ -717,7 +1048,7 @@ class ConfigBackupSystem:
     def get_active_alerts(self, system_id: str = None) -> List[Dict]:
         """Get active drift alerts"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with sqlite_pool.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
                 
                 if system_id:
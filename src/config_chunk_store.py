@@ -0,0 +1,197 @@
+"""
+Config Chunk Store - Content-Addressed Storage for Config Snapshots
+
+Splits configuration content into content-defined chunks, compresses each
+chunk once and stores it under its SHA-256. A snapshot is a manifest (ordered
+list of chunk hashes), so unchanged regions of a config are shared between
+snapshots of the same system and across systems running identical configs.
+
+Features:
+- Line-anchored content-defined chunking: a rolling hash over line checksums
+  picks boundaries, so an edit only changes the chunks around it
+- zstd compression when `zstandard` is installed, zlib otherwise; the codec is
+  recorded per chunk so mixed stores read back correctly
+- Reference counts per chunk for retention-driven garbage collection
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import zlib
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Chunk size bounds in bytes; the boundary mask targets roughly one cut per 64 lines
+MIN_CHUNK_SIZE = 1024
+MAX_CHUNK_SIZE = 16384
+BOUNDARY_MASK = (1 << 6) - 1
+
+# SQLite's default bound-parameter limit is 999 on older builds
+QUERY_BATCH = 500
+
+
+def split_chunks(content: str, min_size: int = MIN_CHUNK_SIZE, max_size: int = MAX_CHUNK_SIZE,
+                 mask: int = BOUNDARY_MASK) -> List[bytes]:
+    """Split content into content-defined chunks at line boundaries"""
+    data = content.encode()
+    chunks = []
+    start = 0
+    size = 0
+    rolling = 0
+    for line in data.splitlines(keepends=True):
+        # Lines longer than max_size (minified JSON etc.) are cut at fixed offsets
+        while len(line) > max_size:
+            if size:
+                chunks.append(data[start:start + size])
+                start += size
+                size = 0
+            chunks.append(data[start:start + max_size])
+            start += max_size
+            line = line[max_size:]
+            rolling = 0
+
+        size += len(line)
+        rolling = ((rolling << 1) + zlib.crc32(line)) & 0xFFFFFFFF
+        if (size >= min_size and (rolling & mask) == 0) or size >= max_size:
+            chunks.append(data[start:start + size])
+            start += size
+            size = 0
+    if size:
+        chunks.append(data[start:start + size])
+    return chunks
+
+
+class ConfigChunkStore:
+    """Deduplicated, compressed chunk storage inside the config backup database"""
+
+    def __init__(self, compression_level: int = 3):
+        self.codec = 'zstd' if ZSTD_AVAILABLE else 'zlib'
+        self.compression_level = compression_level
+        if ZSTD_AVAILABLE:
+            self._compressor = zstandard.ZstdCompressor(level=compression_level)
+            self._decompressor = zstandard.ZstdDecompressor()
+
+    @staticmethod
+    def init_schema(conn: sqlite3.Connection):
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS config_chunks (
+                chunk_hash TEXT PRIMARY KEY,
+                codec TEXT NOT NULL,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_size INTEGER NOT NULL,
+                ref_count INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_chunks_unreferenced ON config_chunks (ref_count) WHERE ref_count <= 0;
+        """)
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == 'zstd':
+            return self._compressor.compress(data)
+        return zlib.compress(data, self.compression_level)
+
+    def _decompress(self, codec: str, data: bytes) -> bytes:
+        if codec == 'zstd':
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("zstandard is required to read zstd-compressed config chunks")
+            return self._decompressor.decompress(data)
+        if codec == 'zlib':
+            return zlib.decompress(data)
+        return data
+
+    def _existing(self, conn: sqlite3.Connection, hashes: Iterable[str]) -> set:
+        hashes = list(set(hashes))
+        found = set()
+        for i in range(0, len(hashes), QUERY_BATCH):
+            batch = hashes[i:i + QUERY_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            found.update(row[0] for row in conn.execute(
+                f"SELECT chunk_hash FROM config_chunks WHERE chunk_hash IN ({placeholders})", batch))
+        return found
+
+    def put(self, conn: sqlite3.Connection, content: str) -> Tuple[List[str], int]:
+        """Store content; returns (manifest, bytes newly written)
+
+        Only chunks not already in the store are compressed and written; every
+        reference in the manifest increments its chunk's ref_count.
+        """
+        chunks = split_chunks(content)
+        manifest = [hashlib.sha256(chunk).hexdigest() for chunk in chunks]
+        existing = self._existing(conn, manifest)
+
+        new_rows = {}
+        for chunk_hash, chunk in zip(manifest, chunks):
+            if chunk_hash not in existing and chunk_hash not in new_rows:
+                compressed = self._compress(chunk)
+                new_rows[chunk_hash] = (chunk_hash, self.codec, compressed, len(chunk), len(compressed))
+        if new_rows:
+            conn.executemany("""
+                INSERT OR IGNORE INTO config_chunks (chunk_hash, codec, data, size, stored_size, ref_count)
+                VALUES (?, ?, ?, ?, ?, 0)
+            """, list(new_rows.values()))
+
+        self._adjust_refs(conn, manifest, +1)
+        return manifest, sum(row[4] for row in new_rows.values())
+
+    def get(self, conn: sqlite3.Connection, manifest: List[str]) -> str:
+        """Reassemble content from its manifest"""
+        unique = list(set(manifest))
+        chunks: Dict[str, bytes] = {}
+        for i in range(0, len(unique), QUERY_BATCH):
+            batch = unique[i:i + QUERY_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            for chunk_hash, codec, data in conn.execute(
+                    f"SELECT chunk_hash, codec, data FROM config_chunks WHERE chunk_hash IN ({placeholders})", batch):
+                chunks[chunk_hash] = self._decompress(codec, data)
+        missing = [h for h in unique if h not in chunks]
+        if missing:
+            raise KeyError(f"Missing config chunks: {missing[:3]}")
+        return b''.join(chunks[h] for h in manifest).decode()
+
+    def _adjust_refs(self, conn: sqlite3.Connection, manifest: List[str], delta: int):
+        counts: Dict[str, int] = {}
+        for chunk_hash in manifest:
+            counts[chunk_hash] = counts.get(chunk_hash, 0) + delta
+        conn.executemany("UPDATE config_chunks SET ref_count = ref_count + ? WHERE chunk_hash = ?",
+                         [(count, chunk_hash) for chunk_hash, count in counts.items()])
+
+    def release(self, conn: sqlite3.Connection, manifest: List[str]):
+        """Drop one reference per manifest entry"""
+        self._adjust_refs(conn, manifest, -1)
+
+    def sweep(self, conn: sqlite3.Connection) -> Tuple[int, int]:
+        """Delete chunks no snapshot references; returns (chunks, stored bytes) freed"""
+        count, freed = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(stored_size), 0) FROM config_chunks WHERE ref_count <= 0").fetchone()
+        conn.execute("DELETE FROM config_chunks WHERE ref_count <= 0")
+        return count, freed
+
+    @staticmethod
+    def encode_manifest(manifest: List[str]) -> str:
+        return json.dumps(manifest, separators=(',', ':'))
+
+    @staticmethod
+    def decode_manifest(value: str) -> List[str]:
+        return json.loads(value) if value else []
+
+    def get_stats(self, conn: sqlite3.Connection) -> Dict:
+        chunks, logical, stored, refs = conn.execute("""
+            SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0), COALESCE(SUM(ref_count), 0)
+            FROM config_chunks
+        """).fetchone()
+        return {
+            'codec': self.codec,
+            'chunks': chunks,
+            'chunk_references': refs,
+            'unique_bytes': logical,
+            'stored_bytes': stored,
+            'compression_ratio': round(logical / stored, 2) if stored else 0.0,
+        }
@@ -24,6 +24,7 @@ from urllib.parse import parse_qs
 from database import ControlDatabase, UserRole, DeviceStatus, KeyStatus
 from playbook_engine import PlaybookEngine, load_playbook_content, PlaybookValidationError
 from config_generator import ConfigGenerator, ConfigFormat, create_config_generator
+from ws_broadcast import WebSocketBroadcaster
 from pathlib import Path
 import uuid
 
@@ -146,8 +147,8 @@ class DashboardServer:
         self._memory_storage = storage
         # Configuration generator (initialized lazily when needed)
         self._config_generator = None
-        # WebSocket connections for real-time updates
-        self.websocket_connections: List[WebSocket] = []
+        # WebSocket clients for real-time updates, each with its own send queue and writer
+        self.ws_broadcaster = WebSocketBroadcaster.from_config((config or {}).get('sync', {}).get('websocket'))
 
     def _get_config(self) -> dict:
         try:
@@ -332,7 +333,7 @@ class DashboardServer:
             
             # Accept WebSocket connection
             await websocket.accept()
-            self.websocket_connections.append(websocket)
+            self.ws_broadcaster.register(websocket, websocket)
             
             # Log successful WebSocket connection
             self.db.log_access(
@@ -342,8 +343,8 @@ class DashboardServer:
             )
             
             try:
-                # Send initial connection confirmation
-                await websocket.send_json({
+                # Send initial connection confirmation (replies share the client's send queue)
+                self.ws_broadcaster.send(websocket, {
                     "type": "connection_established",
                     "user": user_info,
                     "timestamp": datetime.utcnow().isoformat()
@@ -357,10 +358,10 @@ class DashboardServer:
                         
                         # Handle different message types
                         if message.get("type") == "ping":
-                            await websocket.send_json({"type": "pong", "timestamp": datetime.utcnow().isoformat()})
+                            self.ws_broadcaster.send(websocket, {"type": "pong", "timestamp": datetime.utcnow().isoformat()})
                         elif message.get("type") == "subscribe":
                             # Handle subscription to specific events
-                            await websocket.send_json({
+                            self.ws_broadcaster.send(websocket, {
                                 "type": "subscribed",
                                 "events": message.get("events", []),
                                 "timestamp": datetime.utcnow().isoformat()
@@ -368,19 +369,19 @@ class DashboardServer:
                         elif message.get("type") == "get_stats":
                             # Send current dashboard stats
                             stats = self.db.get_dashboard_stats()
-                            await websocket.send_json({
+                            self.ws_broadcaster.send(websocket, {
                                 "type": "stats_update",
                                 "data": stats,
                                 "timestamp": datetime.utcnow().isoformat()
-                            })
+                            }, coalesce_key="stats_update")
                     except json.JSONDecodeError:
-                        await websocket.send_json({
+                        self.ws_broadcaster.send(websocket, {
                             "type": "error",
                             "message": "Invalid JSON format",
                             "timestamp": datetime.utcnow().isoformat()
                         })
                     except Exception as e:
-                        await websocket.send_json({
+                        self.ws_broadcaster.send(websocket, {
                             "type": "error", 
                             "message": str(e),
                             "timestamp": datetime.utcnow().isoformat()
@@ -391,9 +392,8 @@ class DashboardServer:
             except Exception as e:
                 print(f"WebSocket error: {e}")
             finally:
-                # Remove from connections list
-                if websocket in self.websocket_connections:
-                    self.websocket_connections.remove(websocket)
+                # Stop the client's writer
+                self.ws_broadcaster.unregister(websocket, websocket)
         
         # Device Management Routes
         @self.app.post("/api/v1/devices/register")
@@ -1276,25 +1276,12 @@ class DashboardServer:
         except jwt.InvalidTokenError:
             raise HTTPException(status_code=401, detail="Invalid token")
     
-    async def broadcast_websocket_message(self, message: dict):
-        """Broadcast message to all connected WebSocket clients"""
-        if not self.websocket_connections:
-            return
-        
-        message_str = json.dumps(message)
-        disconnected = []
-        
-        for websocket in self.websocket_connections:
-            try:
-                await websocket.send_text(message_str)
-            except Exception as e:
-                print(f"Failed to send WebSocket message: {e}")
-                disconnected.append(websocket)
-        
-        # Remove disconnected websockets
-        for websocket in disconnected:
-            if websocket in self.websocket_connections:
-                self.websocket_connections.remove(websocket)
+    async def broadcast_websocket_message(self, message: dict, coalesce_key: Optional[str] = None):
+        """Broadcast message to all connected WebSocket clients
+
+        Serialized once and queued per client; a slow client never delays the others.
+        """
+        self.ws_broadcaster.broadcast(message, coalesce_key=coalesce_key)
     
     def _generate_claude_desktop_config(self, device, include_auth: bool) -> dict:
         """Generate Claude Desktop MCP configuration"""
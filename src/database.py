@@ -14,6 +14,8 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
 
+import sqlite_pool
+
 class UserRole(Enum):
     ADMIN = "admin"
     OPERATOR = "operator" 
@@ -120,7 +122,7 @@ class ControlDatabase:
         self.init_database()
     
     def get_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
     
@@ -32,6 +32,8 @@ import requests
 import paramiko
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import sqlite_pool
+
 logger = logging.getLogger(__name__)
 
 class DREvent(Enum):
@@ -110,7 +112,7 @@ class DisasterRecoverySystem:
     
     def _init_database(self):
         """Initialize SQLite database with DR management schema"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         conn.execute("PRAGMA foreign_keys = ON")
         
         try:
@@ -243,7 +245,7 @@ class DisasterRecoverySystem:
                       validation_checks: Optional[List[Dict[str, Any]]] = None,
                       rollback_steps: Optional[List[Dict[str, Any]]] = None) -> str:
         """Create a new disaster recovery plan"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         
         try:
             plan_id = hashlib.md5(f"{name}{time.time()}".encode()).hexdigest()
@@ -269,7 +271,7 @@ class DisasterRecoverySystem:
     
     def get_dr_plans(self, scenario_type: Optional[DREvent] = None) -> List[Dict[str, Any]]:
         """Get DR plans with optional filtering by scenario type"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         
         try:
@@ -304,7 +306,7 @@ class DisasterRecoverySystem:
     
     def _execute_dr_plan(self, plan_id: str, execution_type: str, triggered_by: str) -> str:
         """Execute DR plan with specified type"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         
         try:
             # Get plan details
@@ -343,7 +345,7 @@ class DisasterRecoverySystem:
     
     def _run_dr_execution(self, execution_id: str):
         """Run DR execution steps"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         
         try:
             execution_info = self.active_executions[execution_id]
@@ -656,7 +658,7 @@ class DisasterRecoverySystem:
     
     def _run_validation_checks(self, execution_id: str):
         """Run validation checks after DR execution"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         
         try:
             # Get plan validation checks
@@ -685,7 +687,7 @@ class DisasterRecoverySystem:
     
     def _log_execution(self, execution_id: str, step_name: Optional[str], level: str, message: str):
         """Log execution step"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         
         try:
             conn.execute('''
@@ -706,7 +708,7 @@ class DisasterRecoverySystem:
     
     def failback(self, plan_id: str, triggered_by: str) -> str:
         """Execute failback to primary systems"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         
         try:
             # Get rollback steps from plan
@@ -750,7 +752,7 @@ class DisasterRecoverySystem:
     def create_chaos_experiment(self, name: str, description: str, target_services: List[str],
                               experiment_type: str, configuration: Dict[str, Any]) -> str:
         """Create chaos engineering experiment"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         
         try:
             experiment_id = hashlib.md5(f"{name}{time.time()}".encode()).hexdigest()
@@ -771,7 +773,7 @@ class DisasterRecoverySystem:
     
     def run_chaos_experiment(self, experiment_id: str) -> Dict[str, Any]:
         """Execute chaos engineering experiment"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         
         try:
             experiment = conn.execute('SELECT * FROM chaos_experiments WHERE id = ?', (experiment_id,)).fetchone()
@@ -944,7 +946,7 @@ class DisasterRecoverySystem:
     
     def _store_health_check(self, health: ServiceHealth):
         """Store service health check result"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         
         try:
             conn.execute('''
@@ -963,7 +965,7 @@ class DisasterRecoverySystem:
     
     def get_dr_readiness_report(self) -> Dict[str, Any]:
         """Generate DR readiness assessment report"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         
         try:
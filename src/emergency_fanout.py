@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+hAIveMind Emergency Fan-out Dispatcher - Concurrent Direct Delivery
+
+Emergency rule updates are pushed directly to every target machine over HTTP
+in addition to the replication log. Deliveries run concurrently so one dead
+host cannot delay the rest.
+
+Features:
+- One pooled httpx.AsyncClient shared by every delivery
+- Bounded concurrency (semaphore) across the fan-out
+- Per-host circuit breakers so known-dead hosts are skipped until they cool down
+- Hedged retries: a slow attempt is raced by a second one, a fast failure is retried
+- Quorum reporting: records when the configured share of machines has acknowledged;
+  only a reply reporting {"applied": true} counts, a bare HTTP 200 does not
+
+Author: Lance James, Unit 221B Inc
+"""
+
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FanoutResult:
+    """Outcome of one emergency fan-out"""
+    targets: int
+    quorum: int
+    acknowledged: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    quorum_reached: bool = False
+    quorum_seconds: Optional[float] = None
+    total_seconds: float = 0.0
+    hedged_attempts: int = 0
+
+
+class EmergencyFanoutDispatcher:
+    """Deliver one payload to many machines concurrently with quorum tracking"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, client=None):
+        """
+        Args:
+            config: rules.emergency_fanout settings
+            client: Optional pre-built async HTTP client (anything with an async post())
+        """
+        config = config or {}
+        self.max_concurrency = config.get('max_concurrency', 16)
+        self.timeout = config.get('timeout', 5.0)
+        self.connect_timeout = config.get('connect_timeout', 2.0)
+        self.hedge_delay = config.get('hedge_delay', 0.5)
+        self.max_attempts = max(1, config.get('max_attempts', 2))
+        self.quorum = config.get('quorum', 0.5)
+        self.failure_threshold = config.get('failure_threshold', 3)
+        self.reset_timeout = config.get('reset_timeout', 30)
+
+        self._client = client
+        # Created on first dispatch so it belongs to the loop that runs deliveries
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+        self.circuit_breakers: Dict[str, Dict[str, Any]] = {}
+
+        self.total_fanouts = 0
+        self.total_deliveries = 0
+        self.total_failures = 0
+        self.last_result: Optional[FanoutResult] = None
+
+    def _get_client(self):
+        if self._client is None:
+            if not HTTPX_AVAILABLE:
+                raise RuntimeError("httpx is required for emergency fan-out")
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(max_connections=self.max_concurrency,
+                                    max_keepalive_connections=self.max_concurrency)
+            )
+        return self._client
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def aclose(self):
+        if self._client is not None and hasattr(self._client, 'aclose'):
+            await self._client.aclose()
+        self._client = None
+
+    def quorum_size(self, targets: int, quorum: Optional[float] = None) -> int:
+        """Quorum as a machine count; values below 1 are a fraction of the targets"""
+        quorum = self.quorum if quorum is None else quorum
+        if quorum < 1:
+            needed = math.ceil(targets * quorum)
+        else:
+            needed = int(quorum)
+        return max(1, min(targets, needed)) if targets else 0
+
+    # Circuit breakers
+
+    def _breaker_allows(self, host: str) -> bool:
+        breaker = self.circuit_breakers.get(host)
+        if not breaker or breaker["state"] == "closed":
+            return True
+        if breaker["state"] == "open" and time.time() - breaker["last_failure"] > breaker["reset_timeout"]:
+            # Let a single trial delivery through
+            breaker["state"] = "half_open"
+            return True
+        return False
+
+    def _record_outcome(self, host: str, success: bool):
+        breaker = self.circuit_breakers.setdefault(host, {
+            "state": "closed",
+            "failure_count": 0,
+            "last_failure": 0,
+            "reset_timeout": self.reset_timeout,
+            "failure_threshold": self.failure_threshold
+        })
+        if success:
+            breaker["failure_count"] = 0
+            breaker["state"] = "closed"
+            return
+
+        breaker["failure_count"] += 1
+        breaker["last_failure"] = time.time()
+        if breaker["state"] == "half_open" or breaker["failure_count"] >= breaker["failure_threshold"]:
+            if breaker["state"] != "open":
+                logger.warning(f"Emergency fan-out circuit breaker opened for {host}")
+            breaker["state"] = "open"
+
+    # Delivery
+
+    async def _attempt(self, url: str, payload: Dict[str, Any]):
+        response = await asyncio.wait_for(self._get_client().post(url, json=payload), self.timeout)
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        try:
+            applied = response.json().get('applied') is True
+        except Exception:
+            applied = False
+        if not applied:
+            raise RuntimeError("delivered but not applied")
+        return response
+
+    async def _deliver(self, host: str, url: str, payload: Dict[str, Any], result: FanoutResult) -> bool:
+        """Deliver to one host, hedging a slow attempt and retrying a fast failure"""
+        async with self._get_semaphore():
+            attempts = set()
+            launched = 0
+            last_error = "no attempt made"
+
+            def launch():
+                nonlocal launched
+                launched += 1
+                attempts.add(asyncio.ensure_future(self._attempt(url, payload)))
+
+            launch()
+            try:
+                while attempts:
+                    can_hedge = launched < self.max_attempts
+                    done, pending = await asyncio.wait(
+                        attempts,
+                        timeout=self.hedge_delay if can_hedge else None,
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+                    attempts = pending
+
+                    if not done:
+                        # First attempt is slow: race a hedged one instead of waiting it out
+                        result.hedged_attempts += 1
+                        launch()
+                        continue
+
+                    for task in done:
+                        if task.exception() is None:
+                            return True
+                        last_error = str(task.exception()) or type(task.exception()).__name__
+
+                    if not attempts and launched < self.max_attempts:
+                        launch()
+            finally:
+                for task in attempts:
+                    task.cancel()
+
+            result.failed[host] = last_error
+            return False
+
+    async def dispatch(self, hosts: List[str], payload: Dict[str, Any], url_template: str,
+                       quorum: Optional[float] = None,
+                       on_quorum: Optional[Callable[[FanoutResult], None]] = None) -> FanoutResult:
+        """Deliver payload to every host concurrently
+
+        Args:
+            hosts: Target machines
+            payload: JSON body to POST
+            url_template: Target URL with a {machine} placeholder
+            quorum: Override the configured quorum (count, or fraction if < 1)
+            on_quorum: Called once, as soon as the quorum has acknowledged
+        """
+        started = time.perf_counter()
+        result = FanoutResult(targets=len(hosts), quorum=self.quorum_size(len(hosts), quorum))
+
+        async def deliver(host: str):
+            if not self._breaker_allows(host):
+                result.skipped.append(host)
+                return
+            success = await self._deliver(host, url_template.format(machine=host), payload, result)
+            self._record_outcome(host, success)
+            if not success:
+                return
+            result.acknowledged.append(host)
+            if not result.quorum_reached and len(result.acknowledged) >= result.quorum:
+                result.quorum_reached = True
+                result.quorum_seconds = time.perf_counter() - started
+                if on_quorum:
+                    on_quorum(result)
+
+        await asyncio.gather(*(deliver(host) for host in hosts))
+
+        result.total_seconds = time.perf_counter() - started
+        self.total_fanouts += 1
+        self.total_deliveries += len(result.acknowledged)
+        self.total_failures += len(result.failed)
+        self.last_result = result
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        last = self.last_result
+        return {
+            "total_fanouts": self.total_fanouts,
+            "total_deliveries": self.total_deliveries,
+            "total_failures": self.total_failures,
+            "open_circuits": [host for host, breaker in self.circuit_breakers.items()
+                              if breaker["state"] == "open"],
+            "last_fanout": {
+                "targets": last.targets,
+                "acknowledged": len(last.acknowledged),
+                "failed": len(last.failed),
+                "skipped": len(last.skipped),
+                "quorum": last.quorum,
+                "quorum_reached": last.quorum_reached,
+                "quorum_seconds": last.quorum_seconds,
+                "total_seconds": last.total_seconds,
+            } if last else None,
+        }
@@ -5,16 +5,18 @@ Built on top of Vibe Kanban with advanced features for hAIveMind collective inte
 """
 
 import asyncio
+import inspect
 import json
 import logging
 import re
 import time
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from timestamp_system import EnhancedTimestampSystem
+from ticket_index import TicketIndex
 
 logger = logging.getLogger(__name__)
 
@@ -115,6 +117,16 @@ class EnhancedTicketSystem:
         self.config = config
         self.ticket_counter = 1000  # Start ticket numbers at 1000
         self.timestamp_system = EnhancedTimestampSystem()
+        
+        # Local index answers list/search/metrics; Vibe Kanban stays the source of truth
+        ticket_config = config.get('tickets', {}) if isinstance(config, dict) else {}
+        self.index = TicketIndex(ticket_config.get('index_path', 'data/ticket_index.db'))
+        self.index_refresh_interval = ticket_config.get('index_refresh_interval', 30)
+        self.sync_page_size = ticket_config.get('sync_page_size', 500)
+        # Cursor-aware refreshes never see deletions; a full ID listing catches them periodically
+        self.index_reconcile_interval = ticket_config.get('index_reconcile_interval', 600)
+        self._last_reconcile: Dict[str, float] = {}
+        self._refresh_locks: Dict[str, asyncio.Lock] = {}
         logger.info("🎫 Enhanced ticket system initialized with Vibe Kanban backend")
     
     def _generate_ticket_number(self) -> int:
@@ -163,6 +175,110 @@ class EnhancedTicketSystem:
         clean_description = '\n'.join(clean_lines).strip()
         return clean_description, metadata
     
+    def _split_ticket_title(self, title: str) -> Tuple[Optional[int], str]:
+        """Extract the ticket number from a '#1234: title' task title"""
+        ticket_match = re.match(r'#(\d+):\s*(.*)', title)
+        if ticket_match:
+            return int(ticket_match.group(1)), ticket_match.group(2)
+        return None, title
+    
+    def _task_to_ticket(self, project_id: str, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse a Vibe Kanban task into the enhanced ticket shape stored in the index"""
+        clean_desc, metadata = self._parse_ticket_metadata(task.get('description', '') or '')
+        ticket_number, clean_title = self._split_ticket_title(task.get('title', '') or '')
+        return {
+            'id': task['id'],
+            'project_id': project_id,
+            'ticket_number': ticket_number,
+            'title': clean_title,
+            'description': clean_desc,
+            'status': VIBE_STATUS_MAPPING.get(task.get('status'), task.get('status')),
+            'vibe_status': task.get('status'),
+            'metadata': asdict(metadata),
+            'created_at': task.get('created_at'),
+            'updated_at': task.get('updated_at')
+        }
+    
+    def _list_tasks_accepts(self, parameter: str) -> bool:
+        """Whether the Vibe Kanban backend's list_tasks takes a keyword argument"""
+        try:
+            parameters = inspect.signature(self.vibe.list_tasks).parameters
+        except (TypeError, ValueError):
+            return False
+        return parameter in parameters or any(p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters.values())
+    
+    async def _list_page(self, project_id: str, **kwargs) -> List[Dict[str, Any]]:
+        result = await self.vibe.list_tasks(project_id=project_id, limit=self.sync_page_size, **kwargs)
+        if not result.get('success'):
+            raise RuntimeError(result.get('error', 'Failed to list tickets'))
+        return result.get('tasks', [])
+    
+    async def _list_all_tasks(self, project_id: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """Upstream tasks paged by offset; returns (tasks, listing is complete)"""
+        pageable = self._list_tasks_accepts('offset')
+        tasks: List[Dict[str, Any]] = []
+        while True:
+            page = await self._list_page(project_id, **({'offset': len(tasks)} if pageable else {}))
+            tasks.extend(page)
+            if len(page) < self.sync_page_size:
+                return tasks, True
+            if not pageable:
+                # Only the first page is reachable, so absence from it proves nothing
+                return tasks, False
+    
+    async def _list_tasks_since(self, project_id: str, updated_since: Optional[str]) -> List[Dict[str, Any]]:
+        """Tasks changed since a cursor, paged by advancing the cursor (cursor-aware backends)"""
+        tasks: Dict[str, Dict[str, Any]] = {}
+        cursor = updated_since
+        while True:
+            page = await self._list_page(project_id, updated_since=cursor)
+            tasks.update((t['id'], t) for t in page)  # Pages overlap at the cursor boundary
+            newest = max((t.get('updated_at') or '' for t in page), default='') or None
+            # A full page may have more behind it; stop when the cursor no longer advances
+            if len(page) < self.sync_page_size or newest is None or newest == cursor:
+                return list(tasks.values())
+            cursor = newest
+    
+    async def refresh_index(self, project_id: str, force: bool = False) -> Dict[str, Any]:
+        """Pull tasks updated since the last poll into the local ticket index
+
+        Backends that filter by updated_since are polled incrementally and
+        reconciled against a full listing every index_reconcile_interval, so
+        tasks deleted upstream leave the index. Other backends are listed in
+        full (paged by offset) on each refresh, which reconciles as it goes.
+        """
+        state = self.index.get_sync_state(project_id)
+        if not force and state and time.time() - (state['last_sync'] or 0) < self.index_refresh_interval:
+            return {'success': True, 'refreshed': 0, 'skipped': True}
+        
+        lock = self._refresh_locks.setdefault(project_id, asyncio.Lock())
+        async with lock:
+            cursor = state['updated_since'] if state else None
+            removed = 0
+            try:
+                listing, complete = None, False
+                if self._list_tasks_accepts('updated_since'):
+                    tasks = await self._list_tasks_since(project_id, cursor)
+                    if force or time.time() - self._last_reconcile.get(project_id, 0) >= self.index_reconcile_interval:
+                        listing, complete = await self._list_all_tasks(project_id)
+                else:
+                    listing, complete = await self._list_all_tasks(project_id)
+                    tasks = [t for t in listing if not cursor or (t.get('updated_at') or '') >= cursor]
+                
+                refreshed = self.index.upsert_tickets(self._task_to_ticket(project_id, t) for t in tasks)
+                newest = max((t.get('updated_at') or '' for t in tasks), default='') or None
+                if newest and (cursor is None or newest > cursor):
+                    cursor = newest
+                if complete:
+                    removed = self.index.remove_missing(project_id, (t['id'] for t in listing))
+                    self._last_reconcile[project_id] = time.time()
+            except Exception as e:
+                logger.error(f"Error refreshing ticket index for {project_id}: {e}")
+                return {'success': False, 'error': str(e)}
+            
+            self.index.set_sync_state(project_id, cursor, time.time())
+            return {'success': True, 'refreshed': refreshed, 'removed': removed, 'updated_since': cursor}
+    
     def _format_ticket_description(self, description: str, metadata: TicketMetadata) -> str:
         """Format ticket with embedded metadata"""
         lines = [f"Type: {metadata.ticket_type}"]
@@ -228,6 +344,19 @@ class EnhancedTicketSystem:
             
             if result.get('success'):
                 ticket_id = result['task']['id']
+                now = datetime.now().isoformat()
+                self.index.upsert_tickets([{
+                    'id': ticket_id,
+                    'project_id': project_id,
+                    'ticket_number': ticket_number,
+                    'title': title,
+                    'description': description,
+                    'status': VIBE_STATUS_MAPPING.get(result['task'].get('status', 'todo')),
+                    'vibe_status': result['task'].get('status', 'todo'),
+                    'metadata': asdict(metadata),
+                    'created_at': result['task'].get('created_at', now),
+                    'updated_at': result['task'].get('updated_at', now)
+                }])
                 
                 # Store in hAIveMind memory for search and analytics
                 await self._store_ticket_memory(ticket_id, {
@@ -273,19 +402,8 @@ class EnhancedTicketSystem:
             
             if result.get('success'):
                 task = result['task']
-                
-                # Parse metadata from description
-                clean_desc, metadata = self._parse_ticket_metadata(task.get('description', ''))
-                
-                # Extract ticket number from title
-                title = task.get('title', '')
-                ticket_match = re.match(r'#(\d+):\s*(.*)', title)
-                if ticket_match:
-                    ticket_number = int(ticket_match.group(1))
-                    clean_title = ticket_match.group(2)
-                else:
-                    ticket_number = None
-                    clean_title = title
+                ticket = self._task_to_ticket(project_id, task)
+                self.index.upsert_tickets([ticket])
                 
                 # Get memory context
                 memory_context = await self._get_ticket_memory(ticket_id)
@@ -294,20 +412,12 @@ class EnhancedTicketSystem:
                 timestamp_info = self.timestamp_system.format_ticket_timestamps({
                     'created_at': task.get('created_at'),
                     'updated_at': task.get('updated_at'),
-                    'metadata': asdict(metadata)
+                    'metadata': ticket['metadata']
                 })
                 
                 enhanced_ticket = {
+                    **ticket,
                     'id': ticket_id,
-                    'ticket_number': ticket_number,
-                    'title': clean_title,
-                    'description': clean_desc,
-                    'status': VIBE_STATUS_MAPPING.get(task.get('status'), task.get('status')),
-                    'vibe_status': task.get('status'),
-                    'project_id': project_id,
-                    'metadata': asdict(metadata),
-                    'created_at': task.get('created_at'),
-                    'updated_at': task.get('updated_at'),
                     'timestamp_info': timestamp_info,
                     'memory_context': memory_context
                 }
@@ -336,6 +446,8 @@ class EnhancedTicketSystem:
             )
             
             if result.get('success'):
+                self.index.update_status(ticket_id, new_status, vibe_status)
+                
                 # Store status change in memory
                 await self._store_ticket_memory(ticket_id, {
                     'action': 'status_changed',
@@ -368,72 +480,34 @@ class EnhancedTicketSystem:
     async def list_tickets(self, project_id: str, status: str = None, 
                          priority: str = None, assignee: str = None,
                          ticket_type: str = None, limit: int = 50) -> Dict[str, Any]:
-        """List tickets with enhanced filtering"""
+        """List tickets with enhanced filtering
+        
+        Filters run against the local ticket index, refreshed incrementally
+        from Vibe Kanban, so every filter combination returns a full page.
+        """
         try:
-            # Get tasks from Vibe Kanban
-            vibe_status = REVERSE_STATUS_MAPPING.get(status) if status else None
-            result = await self.vibe.list_tasks(
-                project_id=project_id,
-                status=vibe_status,
-                limit=limit
+            refresh = await self.refresh_index(project_id)
+            if not refresh.get('success') and self.index.get_sync_state(project_id) is None:
+                return {'success': False, 'error': refresh.get('error', 'Failed to list tickets')}
+            
+            enhanced_tickets = self.index.list_tickets(
+                project_id, status=status, priority=priority, assignee=assignee,
+                ticket_type=ticket_type, limit=limit
             )
             
-            if result.get('success'):
-                tasks = result['tasks']
-                enhanced_tickets = []
-                
-                for task in tasks:
-                    # Parse metadata
-                    clean_desc, metadata = self._parse_ticket_metadata(task.get('description', ''))
-                    
-                    # Apply enhanced filters
-                    if priority and metadata.priority != priority:
-                        continue
-                    if assignee and metadata.assignee != assignee:
-                        continue
-                    if ticket_type and metadata.ticket_type != ticket_type:
-                        continue
-                    
-                    # Extract ticket number
-                    title = task.get('title', '')
-                    ticket_match = re.match(r'#(\d+):\s*(.*)', title)
-                    if ticket_match:
-                        ticket_number = int(ticket_match.group(1))
-                        clean_title = ticket_match.group(2)
-                    else:
-                        ticket_number = None
-                        clean_title = title
-                    
-                    enhanced_ticket = {
-                        'id': task['id'],
-                        'ticket_number': ticket_number,
-                        'title': clean_title,
-                        'status': VIBE_STATUS_MAPPING.get(task.get('status'), task.get('status')),
-                        'vibe_status': task.get('status'),
-                        'metadata': asdict(metadata),
-                        'created_at': task.get('created_at'),
-                        'updated_at': task.get('updated_at')
-                    }
-                    enhanced_tickets.append(enhanced_ticket)
-                
-                # Sort by ticket number if available
-                enhanced_tickets.sort(key=lambda x: x['ticket_number'] or 0, reverse=True)
-                
-                return {
-                    'success': True,
-                    'tickets': enhanced_tickets,
-                    'count': len(enhanced_tickets),
-                    'project_id': project_id,
-                    'applied_filters': {
-                        'status': status,
-                        'priority': priority,
-                        'assignee': assignee,
-                        'ticket_type': ticket_type,
-                        'limit': limit
-                    }
+            return {
+                'success': True,
+                'tickets': enhanced_tickets,
+                'count': len(enhanced_tickets),
+                'project_id': project_id,
+                'applied_filters': {
+                    'status': status,
+                    'priority': priority,
+                    'assignee': assignee,
+                    'ticket_type': ticket_type,
+                    'limit': limit
                 }
-            else:
-                return {'success': False, 'error': result.get('error', 'Failed to list tickets')}
+            }
                 
         except Exception as e:
             logger.error(f"Error listing tickets: {e}")
@@ -441,7 +515,7 @@ class EnhancedTicketSystem:
     
     async def search_tickets(self, project_id: str, query: str, 
                            limit: int = 20) -> Dict[str, Any]:
-        """Search tickets using hAIveMind memory and Vibe Kanban data"""
+        """Search tickets using hAIveMind memory and the local ticket index"""
         try:
             # Search in hAIveMind memory
             memory_results = await self.storage.search_memories(
@@ -450,37 +524,39 @@ class EnhancedTicketSystem:
                 limit=limit * 2  # Get more for filtering
             )
             
-            # Get all tickets from project for text search
-            all_tickets_result = await self.list_tickets(project_id, limit=200)
+            await self.refresh_index(project_id)
             
             search_results = []
             found_ticket_ids = set()
             
-            # Add memory-based results
+            # Add memory-based results, resolved from the index in one query
+            memory_hits = []
             for memory in memory_results.get('memories', []):
                 content = memory.get('content', {})
-                if 'ticket_id' in content:
-                    ticket_id = content['ticket_id']
-                    if ticket_id not in found_ticket_ids:
-                        ticket_result = await self.get_ticket(project_id, ticket_id)
-                        if ticket_result.get('success'):
-                            ticket_result['ticket']['relevance_score'] = memory.get('score', 0.0)
-                            search_results.append(ticket_result['ticket'])
-                            found_ticket_ids.add(ticket_id)
+                if isinstance(content, dict) and 'ticket_id' in content:
+                    memory_hits.append((content['ticket_id'], memory.get('score', 0.0)))
+            indexed = self.index.get_tickets([ticket_id for ticket_id, _ in memory_hits])
+            for ticket_id, score in memory_hits:
+                if ticket_id in found_ticket_ids:
+                    continue
+                ticket = indexed.get(ticket_id)
+                if ticket is None:
+                    ticket_result = await self.get_ticket(project_id, ticket_id)
+                    ticket = ticket_result['ticket'] if ticket_result.get('success') else None
+                if ticket:
+                    ticket['relevance_score'] = score
+                    search_results.append(ticket)
+                    found_ticket_ids.add(ticket_id)
             
-            # Add text-based search from ticket data
-            if all_tickets_result.get('success'):
-                query_lower = query.lower()
-                for ticket in all_tickets_result['tickets']:
-                    if ticket['id'] not in found_ticket_ids:
-                        # Simple text search in title and description
-                        title_match = query_lower in ticket['title'].lower()
-                        desc_match = query_lower in ticket.get('description', '').lower()
-                        
-                        if title_match or desc_match:
-                            ticket['relevance_score'] = 1.0 if title_match else 0.5
-                            search_results.append(ticket)
-                            found_ticket_ids.add(ticket['id'])
+            # Add full-text matches over title, description and comments
+            text_matches = self.index.search(project_id, query, limit=limit)
+            top_score = max((t['relevance_score'] for t in text_matches), default=0) or 1.0
+            for ticket in text_matches:
+                if ticket['id'] not in found_ticket_ids:
+                    # Scale rank into the 0.5-1.0 band used for text matches
+                    ticket['relevance_score'] = 0.5 + 0.5 * max(ticket['relevance_score'], 0) / top_score
+                    search_results.append(ticket)
+                    found_ticket_ids.add(ticket['id'])
             
             # Sort by relevance score
             search_results.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
@@ -525,8 +601,9 @@ class EnhancedTicketSystem:
             # Store in hAIveMind memory and get memory ID
             memory_id = await self._store_ticket_memory(ticket_id, comment_data)
             
-            # Also update the ticket description with comment if needed
-            # This could be enhanced to maintain comment threads
+            # Comments are searchable through the ticket index
+            self.index.add_comment(ticket_id, comment_id, comment, author=author,
+                                   project_id=project_id, created_at=comment_data['created_at'])
             
             logger.info(f"💬 Added comment to ticket {ticket_id} with memory ID {memory_id}")
             return {
@@ -589,81 +666,13 @@ class EnhancedTicketSystem:
     async def get_ticket_metrics(self, project_id: str, days: int = 30) -> Dict[str, Any]:
         """Get ticket metrics and analytics"""
         try:
-            # Get all tickets for the project
-            all_tickets = await self.list_tickets(project_id, limit=1000)
-            
-            if not all_tickets.get('success'):
+            refresh = await self.refresh_index(project_id)
+            if not refresh.get('success') and self.index.get_sync_state(project_id) is None:
                 return {'success': False, 'error': 'Could not fetch tickets'}
             
-            tickets = all_tickets['tickets']
-            cutoff_date = datetime.now() - timedelta(days=days)
-            
-            # Calculate metrics
-            metrics = {
-                'total_tickets': len(tickets),
-                'by_status': {},
-                'by_priority': {},
-                'by_type': {},
-                'created_in_period': 0,
-                'closed_in_period': 0,
-                'average_resolution_time': 0,
-                'overdue_tickets': 0,
-                'critical_tickets': 0
-            }
-            
-            resolution_times = []
-            
-            for ticket in tickets:
-                status = ticket['status']
-                metadata = ticket['metadata']
-                
-                # Count by status
-                metrics['by_status'][status] = metrics['by_status'].get(status, 0) + 1
-                
-                # Count by priority
-                priority = metadata.get('priority', 'medium')
-                metrics['by_priority'][priority] = metrics['by_priority'].get(priority, 0) + 1
-                
-                # Count by type
-                ticket_type = metadata.get('ticket_type', 'task')
-                metrics['by_type'][ticket_type] = metrics['by_type'].get(ticket_type, 0) + 1
-                
-                # Created in period
-                created_at = datetime.fromisoformat(ticket['created_at'].replace('Z', '+00:00'))
-                if created_at >= cutoff_date:
-                    metrics['created_in_period'] += 1
-                
-                # Closed in period
-                if status == 'done' and ticket['updated_at']:
-                    updated_at = datetime.fromisoformat(ticket['updated_at'].replace('Z', '+00:00'))
-                    if updated_at >= cutoff_date:
-                        metrics['closed_in_period'] += 1
-                        
-                        # Calculate resolution time
-                        resolution_time = (updated_at - created_at).total_seconds() / 3600  # hours
-                        resolution_times.append(resolution_time)
-                
-                # Critical tickets
-                if priority in ['critical', 'emergency']:
-                    metrics['critical_tickets'] += 1
-                
-                # Overdue tickets
-                due_date_str = metadata.get('due_date')
-                if due_date_str and status != 'done':
-                    try:
-                        due_date = datetime.fromisoformat(due_date_str)
-                        if due_date < datetime.now():
-                            metrics['overdue_tickets'] += 1
-                    except:
-                        pass
-            
-            # Calculate average resolution time
-            if resolution_times:
-                metrics['average_resolution_time'] = sum(resolution_times) / len(resolution_times)
-            
             return {
                 'success': True,
-                'metrics': metrics,
+                'metrics': self.index.metrics(project_id, days),
                 'project_id': project_id,
                 'period_days': days,
                 'generated_at': datetime.now().isoformat()
@@ -674,18 +683,26 @@ class EnhancedTicketSystem:
             return {'success': False, 'error': str(e)}
     
     async def _store_ticket_memory(self, ticket_id: str, data: Dict[str, Any]) -> Optional[str]:
-        """Store ticket event in hAIveMind memory and return memory ID"""
+        """Store ticket event in hAIveMind memory and return memory ID
+
+        Uses the storage's write-behind telemetry channel when available, so the
+        ticket operation does not wait on embedding and vector store writes.
+        """
         try:
             memory_content = f"Ticket {ticket_id}: {data.get('action', 'update')}"
             if 'title' in data:
                 memory_content = f"Ticket #{data.get('ticket_number', 'Unknown')}: {data['title']} - {data.get('action', 'update')}"
             
-            memory_id = await self.storage.store_memory(
-                content=memory_content,
-                context=json.dumps(data),
-                category='workflow',
-                tags=[f"ticket_{ticket_id}", "ticket_management", data.get('action', 'update')]
-            )
+            memory = {
+                'content': memory_content,
+                'context': json.dumps(data),
+                'category': 'workflow',
+                'tags': [f"ticket_{ticket_id}", "ticket_management", data.get('action', 'update')]
+            }
+            store_telemetry = getattr(self.storage, 'store_telemetry', None)
+            if store_telemetry:
+                return store_telemetry(**memory)
+            memory_id = await self.storage.store_memory(**memory)
             return memory_id
         except Exception as e:
             logger.warning(f"Failed to store ticket memory: {e}")
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+hAIveMind Fleet Drift Engine - Drift Detection Across Every System in One Pass
+
+ConfigBackupSystem.detect_drift works one system (or one diff) at a time. The
+fleet engine answers "what changed, and how risky is it" for every registered
+system at once:
+
+- One windowed query returns the latest two snapshots per system, their hashes
+  and any cached analysis; systems whose hashes match are never loaded
+- Content is reassembled only for snapshot pairs without a cached result, and
+  an existing config_diffs row is reused instead of re-diffing
+- Diffing and pattern analysis run in a process pool using the precompiled
+  keyword patterns from config_backup_system
+- Results are cached per (system, snapshot pair) in memory and in the
+  config_drift_cache table, so repeated scans only analyze new changes
+
+Author: Lance James, Unit 221B Inc
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from config_backup_system import analyze_drift, build_config_diff
+
+logger = logging.getLogger(__name__)
+
+# Latest two snapshots per system, with a cached analysis or diff if one exists
+LATEST_PAIRS_QUERY = """
+    WITH ranked AS (
+        SELECT id, system_id, config_hash, timestamp,
+               ROW_NUMBER() OVER (PARTITION BY system_id ORDER BY timestamp DESC, rowid DESC) AS position
+        FROM config_snapshots
+    )
+    SELECT cur.system_id, sys.system_name, sys.system_type,
+           prev.id AS snapshot_id_before, cur.id AS snapshot_id_after, cur.timestamp,
+           c.result_json,
+           d.diff_content, d.change_type, d.risk_score, d.lines_added, d.lines_removed,
+           EXISTS (SELECT 1 FROM config_diffs x WHERE x.snapshot_id_after = cur.id) AS has_diff
+    FROM ranked cur
+    JOIN ranked prev ON prev.system_id = cur.system_id AND prev.position = 2
+    JOIN config_systems sys ON sys.system_id = cur.system_id
+    LEFT JOIN config_drift_cache c
+           ON c.snapshot_id_before = prev.id AND c.snapshot_id_after = cur.id
+    LEFT JOIN config_diffs d ON d.rowid = (
+        SELECT rowid FROM config_diffs
+        WHERE snapshot_id_after = cur.id AND snapshot_id_before = prev.id LIMIT 1
+    )
+    WHERE cur.position = 1 AND cur.config_hash != prev.config_hash
+"""
+
+DIFF_FIELDS = ('change_type', 'risk_score', 'lines_added', 'lines_removed')
+
+
+def _analyze_pair(job: Tuple) -> Tuple[Optional[Dict], Dict]:
+    """Diff (if needed) and analyze one snapshot pair; runs in a worker process
+
+    job is (system_id, system_type, before_content, after_content, diff), where
+    diff is an existing config_diffs row or None.
+    """
+    system_id, system_type, before_content, after_content, diff = job
+    if diff is None:
+        diff = build_config_diff(before_content or '', after_content or '', system_id)
+        if diff is None:
+            return None, {}
+    return diff, analyze_drift({**diff, 'system_type': system_type})
+
+
+class FleetDriftEngine:
+    """Fleet-wide drift scans over a ConfigBackupSystem database"""
+
+    def __init__(self, backup, max_workers: int = None, inline_threshold: int = 64,
+                 cache_size: int = 10000):
+        """
+        Args:
+            backup: ConfigBackupSystem whose database and chunk store are scanned
+            max_workers: Analysis processes (default: CPU count); 1 disables the pool
+            inline_threshold: Fewer uncached pairs than this are analyzed in-process
+            cache_size: In-memory results kept across scans
+        """
+        self.backup = backup
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.inline_threshold = inline_threshold
+        self._cache: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+        self._cache_size = cache_size
+        self.last_stats: Dict[str, Any] = {}
+
+    def _remember(self, key: Tuple[str, str], result: Dict):
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _run_jobs(self, jobs: List[Tuple]) -> Tuple[List[Tuple[Optional[Dict], Dict]], int]:
+        """Analyze jobs, in a process pool when there are enough to pay for it"""
+        if len(jobs) < self.inline_threshold or self.max_workers <= 1:
+            return [_analyze_pair(job) for job in jobs], 1
+
+        workers = min(self.max_workers, len(jobs))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, len(jobs) // (workers * 4))
+                return list(pool.map(_analyze_pair, jobs, chunksize=chunksize)), workers
+        except (OSError, RuntimeError) as e:
+            # Sandboxed hosts may not allow worker processes
+            logger.warning(f"⚠️ Drift worker pool unavailable, analyzing inline: {e}")
+            return [_analyze_pair(job) for job in jobs], 1
+
+    def scan(self, hours_back: int = None, system_type: str = None,
+             include_diff: bool = False) -> Dict[str, Any]:
+        """Detect drift on every system whose latest snapshot differs from the previous one
+
+        Args:
+            hours_back: Only systems whose latest snapshot is this recent
+            system_type: Only systems of this type (nginx, mysql, ...)
+            include_diff: Include the unified diff text in each issue
+        """
+        started = time.perf_counter()
+        stats = {'changed_systems': 0, 'memory_hits': 0, 'cache_hits': 0,
+                 'reused_diffs': 0, 'analyzed': 0, 'workers': 1}
+
+        query = LATEST_PAIRS_QUERY
+        params: List[Any] = []
+        if hours_back is not None:
+            query += " AND cur.timestamp > datetime('now', ?)"
+            params.append(f"-{int(hours_back)} hours")
+        if system_type:
+            query += " AND sys.system_type = ?"
+            params.append(system_type)
+
+        with sqlite3.connect(self.backup.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(query, params).fetchall()
+            stats['changed_systems'] = len(rows)
+
+            issues: List[Dict] = []
+            pending: List[sqlite3.Row] = []
+            jobs: List[Tuple] = []
+            for row in rows:
+                key = (row['snapshot_id_before'], row['snapshot_id_after'])
+                if key in self._cache:
+                    stats['memory_hits'] += 1
+                    self._cache.move_to_end(key)
+                    result = self._cache[key]
+                elif row['result_json']:
+                    stats['cache_hits'] += 1
+                    result = json.loads(row['result_json'])
+                    self._remember(key, result)
+                else:
+                    pending.append(row)
+                    if row['diff_content'] is not None:
+                        stats['reused_diffs'] += 1
+                        diff = {'diff_content': row['diff_content'],
+                                **{field: row[field] for field in DIFF_FIELDS}}
+                        jobs.append((row['system_id'], row['system_type'], None, None, diff))
+                    else:
+                        jobs.append((row['system_id'], row['system_type'],
+                                     self.backup._load_content(conn, row['snapshot_id_before']),
+                                     self.backup._load_content(conn, row['snapshot_id_after']), None))
+                    continue
+                if result:
+                    issues.append(self._issue(row, result))
+
+            outcomes, stats['workers'] = self._run_jobs(jobs)
+            stats['analyzed'] = len(jobs)
+
+            cache_rows = []
+            diff_rows = []
+            for row, (diff, analysis) in zip(pending, outcomes):
+                key = (row['snapshot_id_before'], row['snapshot_id_after'])
+                result = {**{field: diff[field] for field in DIFF_FIELDS}, 'analysis': analysis} if diff else {}
+                self._remember(key, result)
+                cache_rows.append((row['system_id'], *key, json.dumps(result)))
+                if diff and not row['has_diff']:
+                    # Stamped with the snapshot's time, as _ensure_diffs does
+                    diff_rows.append((*key, diff['diff_content'], diff['change_type'], diff['risk_score'],
+                                      diff['lines_added'], diff['lines_removed'], row['timestamp']))
+                if result:
+                    issues.append(self._issue(row, result))
+
+            conn.executemany("""
+                INSERT OR REPLACE INTO config_drift_cache
+                (system_id, snapshot_id_before, snapshot_id_after, result_json)
+                VALUES (?, ?, ?, ?)
+            """, cache_rows)
+            conn.executemany("""
+                INSERT INTO config_diffs
+                (snapshot_id_before, snapshot_id_after, diff_content, change_type,
+                 risk_score, lines_added, lines_removed, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, diff_rows)
+
+            if include_diff:
+                self._attach_diffs(conn, issues)
+
+        issues.sort(key=lambda issue: (issue['risk_score'], issue['timestamp'] or ''), reverse=True)
+        summary = {'critical': 0, 'high': 0, 'medium': 0, 'low': 0}
+        for issue in issues:
+            severity = issue['analysis'].get('severity', 'low')
+            summary[severity] = summary.get(severity, 0) + 1
+
+        stats['seconds'] = round(time.perf_counter() - started, 3)
+        self.last_stats = stats
+        logger.info(f"🔍 Fleet drift scan: {len(issues)} changed systems, {stats['analyzed']} analyzed, "
+                    f"{stats['cache_hits'] + stats['memory_hits']} cached, {stats['seconds']}s")
+        return {
+            'total_issues': len(issues),
+            'issues': issues,
+            'summary': summary,
+            'stats': stats
+        }
+
+    @staticmethod
+    def _issue(row: sqlite3.Row, result: Dict) -> Dict:
+        return {
+            'system_id': row['system_id'],
+            'system_name': row['system_name'],
+            'system_type': row['system_type'],
+            'snapshot_id_before': row['snapshot_id_before'],
+            'snapshot_id_after': row['snapshot_id_after'],
+            'timestamp': row['timestamp'],
+            **{field: result[field] for field in DIFF_FIELDS},
+            'drift_detected': True,
+            'analysis': result['analysis']
+        }
+
+    @staticmethod
+    def _attach_diffs(conn: sqlite3.Connection, issues: List[Dict]):
+        by_after = {issue['snapshot_id_after']: issue for issue in issues}
+        ids = list(by_after)
+        for i in range(0, len(ids), 500):
+            batch = ids[i:i + 500]
+            placeholders = ','.join('?' * len(batch))
+            for snapshot_id_after, diff_content in conn.execute(
+                    f"SELECT snapshot_id_after, diff_content FROM config_diffs "
+                    f"WHERE snapshot_id_after IN ({placeholders})", batch):
+                by_after[snapshot_id_after]['diff_content'] = diff_content
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'max_workers': self.max_workers,
+            'inline_threshold': self.inline_threshold,
+            'cached_results': len(self._cache),
+            'last_scan': self.last_stats
+        }
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+hAIveMind Health Prober - Background MCP Service Health Checks
+
+Probes every registered remote MCP server on a schedule and keeps the latest
+results in memory, so health dashboards read a cached snapshot instead of
+triggering a sequential probe of the whole fleet on every poll.
+
+Features:
+- One pooled httpx.AsyncClient; all targets probed concurrently (bounded)
+- Per-target timeouts and a jittered probe interval
+- Up/down state with a failure threshold, plus rolling latency histograms
+- Extra in-process checks (local tools, bridges) run alongside the probes
+- Concurrent refresh requests share a single in-flight probe round
+
+Author: Lance James, Unit 221B Inc
+"""
+
+import asyncio
+import bisect
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in milliseconds (the last bucket is open-ended)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    """Latency distribution over the most recent N successful probes"""
+
+    def __init__(self, window: int = 120):
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def observe(self, latency_ms: float):
+        self.samples.append(latency_ms)
+
+    def percentile(self, ordered, pct: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        if not self.samples:
+            return {"count": 0}
+        ordered = sorted(self.samples)
+        counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        for sample in ordered:
+            counts[bisect.bisect_left(LATENCY_BUCKETS_MS, sample)] += 1
+        labels = [f"le_{bound}" for bound in LATENCY_BUCKETS_MS] + ["gt_%d" % LATENCY_BUCKETS_MS[-1]]
+        return {
+            "count": len(ordered),
+            "p50_ms": round(self.percentile(ordered, 50), 2),
+            "p95_ms": round(self.percentile(ordered, 95), 2),
+            "p99_ms": round(self.percentile(ordered, 99), 2),
+            "max_ms": round(ordered[-1], 2),
+            "buckets": {label: count for label, count in zip(labels, counts) if count},
+        }
+
+
+@dataclass
+class TargetHealth:
+    """Probe history for one remote service"""
+    name: str
+    endpoint: str
+    health_url: str
+    state: str = "unknown"  # up, down, unknown
+    status: str = "unknown"  # outcome of the last probe: healthy, unhealthy, offline
+    consecutive_failures: int = 0
+    last_checked: Optional[float] = None
+    last_change: Optional[float] = None
+    last_error: Optional[str] = None
+    http_code: Optional[int] = None
+    latency_ms: Optional[float] = None
+    checks: int = 0
+    failures: int = 0
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+class HealthProber:
+    """Probe remote MCP services concurrently in the background and cache the results"""
+
+    def __init__(self, targets: Callable[[], Dict[str, Tuple[str, str]]],
+                 config: Optional[Dict[str, Any]] = None, client=None):
+        """
+        Args:
+            targets: Returns {target_id: (name, sse_endpoint)} for the current registry
+            config: remote_server.health_probe settings
+            client: Optional pre-built async HTTP client (anything with an async get())
+        """
+        config = config or {}
+        self.targets = targets
+        self.interval = config.get('interval', 30.0)
+        self.jitter = config.get('jitter', 0.2)
+        self.timeout = config.get('timeout', 2.0)
+        self.max_concurrency = config.get('max_concurrency', 16)
+        self.failure_threshold = config.get('failure_threshold', 2)
+        self.window = config.get('window', 120)
+
+        self._client = client
+        self._checks: Dict[str, Callable[[], Awaitable[Dict[str, Any]]]] = {}
+        self._round: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.health: Dict[str, TargetHealth] = {}
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self.snapshot_at: Optional[float] = None
+        self.total_rounds = 0
+        self.last_round_seconds: Optional[float] = None
+
+    def _get_client(self):
+        if self._client is None:
+            if not HTTPX_AVAILABLE:
+                raise RuntimeError("httpx is required for health probing")
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(max_connections=self.max_concurrency,
+                                    max_keepalive_connections=self.max_concurrency)
+            )
+        return self._client
+
+    async def aclose(self):
+        await self.stop()
+        if self._client is not None and hasattr(self._client, 'aclose'):
+            await self._client.aclose()
+        self._client = None
+
+    def add_check(self, name: str, check: Callable[[], Awaitable[Dict[str, Any]]]):
+        """Run an in-process check each round; it returns a service entry with a "status" key"""
+        self._checks[name] = check
+
+    # Probing
+
+    async def _probe(self, target: TargetHealth, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(self._get_client().get(target.health_url), self.timeout)
+                latency_ms = (time.perf_counter() - started) * 1000
+                target.http_code = response.status_code
+                target.latency_ms = round(latency_ms, 2)
+                target.histogram.observe(latency_ms)
+                target.status = "healthy" if response.status_code == 200 else "unhealthy"
+                target.last_error = None if response.status_code == 200 else f"HTTP {response.status_code}"
+            except Exception as e:
+                target.status = "offline"
+                target.http_code = None
+                target.latency_ms = None
+                target.last_error = str(e) or type(e).__name__
+            target.last_checked = time.time()
+            target.checks += 1
+            self._update_state(target)
+
+    def _update_state(self, target: TargetHealth):
+        if target.status == "healthy":
+            target.consecutive_failures = 0
+            new_state = "up"
+        else:
+            target.failures += 1
+            target.consecutive_failures += 1
+            if target.state != "up" or target.consecutive_failures >= self.failure_threshold:
+                new_state = "down"
+            else:
+                new_state = target.state  # One failed probe does not flap an up target
+        if new_state != target.state:
+            if target.state != "unknown":
+                logger.warning(f"🩺 {target.name} is now {new_state.upper()}"
+                               + (f" ({target.last_error})" if target.last_error else ""))
+            target.state = new_state
+            target.last_change = target.last_checked
+
+    def _sync_targets(self) -> Dict[str, TargetHealth]:
+        current = {}
+        for target_id, (name, endpoint) in self.targets().items():
+            target = self.health.get(target_id)
+            if target is None or target.endpoint != endpoint:
+                target = TargetHealth(name, endpoint, endpoint.replace('/sse', '/health'),
+                                      histogram=LatencyHistogram(self.window))
+            current[target_id] = target
+        self.health = current
+        return current
+
+    async def _run_check(self, name: str, check) -> Dict[str, Any]:
+        try:
+            return await asyncio.wait_for(check(), self.timeout)
+        except Exception as e:
+            return {"status": "error", "error": str(e) or type(e).__name__}
+
+    async def _probe_round(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        targets = self._sync_targets()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        check_names = list(self._checks)
+        check_results = await asyncio.gather(
+            *(self._run_check(name, self._checks[name]) for name in check_names),
+            *(self._probe(target, semaphore) for target in targets.values())
+        )
+
+        services = dict(zip(check_names, check_results[:len(check_names)]))
+        overall = "healthy"
+        for entry in services.values():
+            if entry.get("status") not in (None, "healthy", "running") or entry.get("error_bridges", 0) > 0:
+                overall = "degraded"
+        for target in targets.values():
+            services[target.name] = self._describe(target)
+            if target.state == "down":
+                overall = "degraded"
+
+        self.last_round_seconds = time.perf_counter() - started
+        self.total_rounds += 1
+        self.snapshot_at = time.time()
+        self.snapshot = {
+            "timestamp": datetime.now().isoformat(),
+            "overall_status": overall,
+            "services": services,
+            "probe": {"round_seconds": round(self.last_round_seconds, 4), "targets": len(targets),
+                      "interval": self.interval},
+        }
+        return self.snapshot
+
+    def _describe(self, target: TargetHealth) -> Dict[str, Any]:
+        entry = {
+            "status": target.status,
+            "state": target.state,
+            "type": "remote_sse",
+            "endpoint": target.endpoint,
+            "latency_ms": target.latency_ms,
+            "http_code": target.http_code,
+            "last_checked": target.last_checked,
+            "last_change": target.last_change,
+            "consecutive_failures": target.consecutive_failures,
+            "availability": round(1 - target.failures / target.checks, 4) if target.checks else None,
+            "latency": target.histogram.snapshot(),
+        }
+        if target.last_error:
+            entry["error"] = target.last_error
+        return entry
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Probe everything now; concurrent callers share the same in-flight round"""
+        if self._round is None or self._round.done():
+            self._round = asyncio.ensure_future(self._probe_round())
+        return await asyncio.shield(self._round)
+
+    async def get_snapshot(self, fresh: bool = False) -> Dict[str, Any]:
+        """Cached results, probing first only when forced or nothing has been probed yet"""
+        if fresh or self.snapshot is None:
+            return await self.refresh()
+        return dict(self.snapshot, age_seconds=round(time.time() - self.snapshot_at, 3))
+
+    # Background loop
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Health probe round failed: {e}")
+            await asyncio.sleep(self.interval * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "total_rounds": self.total_rounds,
+            "last_round_seconds": self.last_round_seconds,
+            "targets": len(self.health),
+            "down": sorted(t.name for t in self.health.values() if t.state == "down"),
+        }
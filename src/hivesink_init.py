@@ -12,6 +12,9 @@ import shutil
 import hashlib
 import difflib
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Union, Callable
@@ -25,6 +28,14 @@ MAX_OUTPUT_TOKENS = 6000
 CHARS_PER_TOKEN = 4
 MAX_OUTPUT_CHARS = MAX_OUTPUT_TOKENS * CHARS_PER_TOKEN
 
+# Content hashing - files are streamed in chunks rather than read whole
+HASH_CHUNK_SIZE = 1024 * 1024
+HASH_DIGEST_SIZE = 20  # 40 hex chars, distinguishable from legacy 32-char MD5 hashes
+HASH_WORKERS = min(8, os.cpu_count() or 4)
+# Files modified this recently are hashed but not cached, since a second write
+# within the same mtime tick would otherwise go unnoticed
+RACY_MTIME_WINDOW_NS = 2_000_000_000
+
 
 @dataclass
 class OutputResult:
@@ -251,6 +262,110 @@ class SyncResult:
     dry_run: bool = False
 
 
+def hash_file(file_path: Path, legacy: bool = False) -> str:
+    """Stream a file through BLAKE2b in fixed-size chunks.
+
+    With legacy=True the file is hashed with MD5 instead, which is only used to
+    compare against hashes recorded by older releases.
+    """
+    digest = hashlib.md5() if legacy else hashlib.blake2b(digest_size=HASH_DIGEST_SIZE)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileHashCache:
+    """
+    Manifest of content hashes keyed by path and validated by stat.
+
+    A cached hash is reused while the file's (size, mtime_ns, inode) are
+    unchanged, so repeated listings and syncs only re-read files that were
+    actually modified. Misses are hashed concurrently in a thread pool.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._entries: Optional[Dict[str, List[Any]]] = None
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> Dict[str, List[Any]]:
+        if self._entries is None:
+            try:
+                with open(self.path) as f:
+                    self._entries = json.load(f).get("files", {})
+            except (OSError, ValueError, AttributeError):
+                self._entries = {}
+        return self._entries
+
+    @staticmethod
+    def _signature(stat: os.stat_result) -> List[int]:
+        return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+    def lookup(self, file_path: Path, stat: os.stat_result) -> Optional[str]:
+        """Return the cached hash if the file is unchanged since it was hashed."""
+        with self._lock:
+            entry = self._load().get(str(file_path))
+        if entry and entry[:3] == self._signature(stat):
+            return entry[3]
+        return None
+
+    def store(self, file_path: Path, stat: os.stat_result, file_hash: str) -> None:
+        """Record a hash for the given stat signature."""
+        if time.time_ns() - stat.st_mtime_ns < RACY_MTIME_WINDOW_NS:
+            return
+        with self._lock:
+            self._load()[str(file_path)] = self._signature(stat) + [file_hash]
+            self._dirty = True
+
+    def _hash_one(self, file_path: Path) -> str:
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return ""
+        cached = self.lookup(file_path, stat)
+        with self._lock:
+            if cached is not None:
+                self.hits += 1
+                return cached
+            self.misses += 1
+        file_hash = hash_file(file_path)
+        self.store(file_path, stat, file_hash)
+        return file_hash
+
+    def get(self, file_path: Path) -> str:
+        """Hash a single file, or return "" if it does not exist."""
+        return self._hash_one(file_path)
+
+    def get_many(self, paths: List[Path]) -> Dict[Path, str]:
+        """Hash many files, reading only those whose stat signature changed."""
+        unique = list(dict.fromkeys(paths))
+        if len(unique) <= 1:
+            return {p: self._hash_one(p) for p in unique}
+        with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+            return dict(zip(unique, pool.map(self._hash_one, unique)))
+
+    def save(self) -> None:
+        """Write the manifest back if anything changed, dropping deleted files."""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = {path: entry for path, entry in self._load().items() if os.path.exists(path)}
+            self._entries = entries
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({"version": 1, "algorithm": "blake2b", "files": entries}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+
 class HiveSinkInit:
     """
     Simple file-based vault sync for hAIveMind.
@@ -287,6 +402,7 @@ class HiveSinkInit:
         self.project_root = Path(project_root or os.getcwd())
         self.home = Path.home()
         self.haivemind_root = self.home / ".haivemind"
+        self.hash_cache = FileHashCache(self.haivemind_root / "hash_cache.json")
 
     def get_vault_path(self, scope: SyncScope, team_name: Optional[str] = None) -> Path:
         """Get the vault path for a given scope."""
@@ -325,17 +441,22 @@ class HiveSinkInit:
             json.dump(manifest.to_dict(), f, indent=2)
 
     def _compute_hash(self, file_path: Path) -> str:
-        """Compute MD5 hash of file contents for comparison purposes.
+        """Compute the content hash of a file for change detection.
 
-        Note: MD5 is used here for fast content comparison to detect file changes,
-        not for cryptographic security. For this use case, collision resistance
-        is not a concern as we're comparing known files, not verifying integrity
-        against malicious tampering.
+        Hashes are BLAKE2b over the streamed file contents and are served from
+        the hash cache while the file's size, mtime and inode are unchanged.
         """
-        if not file_path.exists():
-            return ""
-        with open(file_path, 'rb') as f:
-            return hashlib.md5(f.read()).hexdigest()
+        return self.hash_cache.get(file_path)
+
+    def _compute_hashes(self, paths: List[Path]) -> Dict[Path, str]:
+        """Compute hashes for many files, hashing cache misses in parallel."""
+        return self.hash_cache.get_many(paths)
+
+    def _hash_matches(self, file_path: Path, expected: str, current: Optional[str] = None) -> bool:
+        """Compare a file against a recorded hash, accepting legacy MD5 hashes."""
+        if len(expected) == 32:
+            return file_path.exists() and hash_file(file_path, legacy=True) == expected
+        return (current if current is not None else self._compute_hash(file_path)) == expected
 
     def _get_file_info(self, file_path: Path) -> Optional[FileInfo]:
         """Get information about a file."""
@@ -477,6 +598,7 @@ class HiveSinkInit:
         vault_path: Path,
         content_types: List[ContentType],
         dry_run: bool,
+        local_index: Optional[Dict[str, Path]] = None,
     ) -> bool:
         """
         Sync a single item (file) in the given direction.
@@ -487,6 +609,7 @@ class HiveSinkInit:
             vault_path: Path to the vault
             content_types: List of content types being synced
             dry_run: If True, don't make changes
+            local_index: Optional filename -> local path map to avoid rescanning per item
 
         Returns:
             True if sync was performed (or would be in dry_run), False otherwise
@@ -503,6 +626,13 @@ class HiveSinkInit:
             return True
         else:
             # UP direction - find the local file
+            if local_index is not None:
+                local_file = local_index.get(filename)
+                if local_file is None:
+                    return False
+                if not dry_run:
+                    self.sync_file(local_file, Path(item["dest"]))
+                return True
             for ctype in content_types:
                 local_files = self._find_local_files([ctype])
                 for f in local_files.get(ctype, []):
@@ -655,12 +785,15 @@ class HiveSinkInit:
             [ContentType.SKILLS, ContentType.DOCS, ContentType.CONFIGS]
         )
 
+        hashes = self._compute_hashes([f for file_list in vault_files.values() for f in file_list])
+        self.hash_cache.save()
+
         for ctype, file_list in vault_files.items():
             for file_path in file_list:
                 file_version = self._extract_version(file_path) or "1.0.0"
                 files[file_path.name] = {
                     "version": file_version,
-                    "hash": self._compute_hash(file_path),
+                    "hash": hashes[file_path],
                     "type": ctype.value,
                     "size": file_path.stat().st_size,
                 }
@@ -702,6 +835,9 @@ class HiveSinkInit:
             [ContentType.SKILLS, ContentType.DOCS, ContentType.CONFIGS]
         )
 
+        hashes = self._compute_hashes([f for file_list in local_files.values() for f in file_list])
+        self.hash_cache.save()
+
         # Check each local file against release
         for ctype, file_list in local_files.items():
             for local_file in file_list:
@@ -712,11 +848,10 @@ class HiveSinkInit:
                 if filename in release.files:
                     local_version = self._extract_version(local_file) or "0.0.0"
                     release_version = release.files[filename].get("version", "1.0.0")
-                    local_hash = self._compute_hash(local_file)
                     release_hash = release.files[filename].get("hash", "")
 
                     # Check if update available (different hash or version)
-                    if local_hash != release_hash:
+                    if not self._hash_matches(local_file, release_hash, hashes[local_file]):
                         updates.append({
                             "file": filename,
                             "type": ctype.value,
@@ -876,10 +1011,15 @@ class HiveSinkInit:
         scope: SyncScope,
         content_types: List[ContentType],
         team_name: Optional[str] = None,
+        include_diff: bool = True,
     ) -> Dict[str, Any]:
         """
         Preview what would be synced.
 
+        Files whose sizes differ are reported as changed without hashing;
+        the remaining pairs are hashed together through the hash cache.
+        Set include_diff=False to skip building diffs for changed files.
+
         Returns dict with 'new', 'changed', 'unchanged' lists.
         """
         vault_path = self.get_vault_path(scope, team_name)
@@ -889,63 +1029,52 @@ class HiveSinkInit:
             if not vault_path.exists():
                 return {"error": f"Vault not found at {vault_path}"}
 
-            vault_files = self._find_vault_files(vault_path, content_types)
-            result = {"new": [], "changed": [], "unchanged": []}
-
-            for ctype, files in vault_files.items():
-                for vault_file in files:
-                    local_dest = self._get_local_dest(vault_file, ctype)
-
-                    if not local_dest.exists():
-                        result["new"].append({
-                            "file": vault_file.name,
-                            "type": ctype.value,
-                            "dest": str(local_dest),
-                        })
-                    elif self._compute_hash(vault_file) != self._compute_hash(local_dest):
-                        result["changed"].append({
-                            "file": vault_file.name,
-                            "type": ctype.value,
-                            "dest": str(local_dest),
-                            "diff": self._get_diff(local_dest, vault_file),
-                        })
-                    else:
-                        result["unchanged"].append({
-                            "file": vault_file.name,
-                            "type": ctype.value,
-                        })
-
-            return result
-
+            pairs = [(vault_file, self._get_local_dest(vault_file, ctype), ctype)
+                     for ctype, files in self._find_vault_files(vault_path, content_types).items()
+                     for vault_file in files]
         else:  # UP
             # Pushing from local to vault
-            local_files = self._find_local_files(content_types)
-            result = {"new": [], "changed": [], "unchanged": []}
-
-            for ctype, files in local_files.items():
-                for local_file in files:
-                    vault_dest = self._get_vault_dest(local_file, ctype, vault_path)
+            pairs = [(local_file, self._get_vault_dest(local_file, ctype, vault_path), ctype)
+                     for ctype, files in self._find_local_files(content_types).items()
+                     for local_file in files]
 
-                    if not vault_dest.exists():
-                        result["new"].append({
-                            "file": local_file.name,
-                            "type": ctype.value,
-                            "dest": str(vault_dest),
-                        })
-                    elif self._compute_hash(local_file) != self._compute_hash(vault_dest):
-                        result["changed"].append({
-                            "file": local_file.name,
-                            "type": ctype.value,
-                            "dest": str(vault_dest),
-                            "diff": self._get_diff(vault_dest, local_file),
-                        })
-                    else:
-                        result["unchanged"].append({
-                            "file": local_file.name,
-                            "type": ctype.value,
-                        })
+        # Stat once; only same-size pairs need their contents compared
+        sizes = {}
+        for source, dest, _ in pairs:
+            try:
+                sizes[dest] = dest.stat().st_size
+                sizes[source] = source.stat().st_size
+            except OSError:
+                sizes.pop(dest, None)
+        candidates = [p for source, dest, _ in pairs
+                      if dest in sizes and sizes[source] == sizes[dest] for p in (source, dest)]
+        hashes = self._compute_hashes(candidates)
+        self.hash_cache.save()
+
+        result = {"new": [], "changed": [], "unchanged": []}
+        for source, dest, ctype in pairs:
+            if dest not in sizes:
+                result["new"].append({
+                    "file": source.name,
+                    "type": ctype.value,
+                    "dest": str(dest),
+                })
+            elif sizes[source] != sizes[dest] or hashes[source] != hashes[dest]:
+                item = {
+                    "file": source.name,
+                    "type": ctype.value,
+                    "dest": str(dest),
+                }
+                if include_diff:
+                    item["diff"] = self._get_diff(dest, source)
+                result["changed"].append(item)
+            else:
+                result["unchanged"].append({
+                    "file": source.name,
+                    "type": ctype.value,
+                })
 
-            return result
+        return result
 
     def preview_sync_managed(
         self,
@@ -1001,8 +1130,11 @@ class HiveSinkInit:
         # Ensure destination directory exists
         dest.parent.mkdir(parents=True, exist_ok=True)
 
-        # Copy file
+        # Copy file; the copy has the source's contents, so its hash is known
+        # without reading it back
+        source_hash = self._compute_hash(source)
         shutil.copy2(source, dest)
+        self.hash_cache.store(dest, dest.stat(), source_hash)
         return True
 
     def sync(
@@ -1052,13 +1184,20 @@ class HiveSinkInit:
                 return result
 
         # Get preview to know what needs to be done
-        preview = self.preview_sync(direction, scope, content_types, team_name)
+        preview = self.preview_sync(direction, scope, content_types, team_name, include_diff=False)
 
         if "error" in preview:
             result.success = False
             result.errors.append(preview["error"])
             return result
 
+        local_index = None
+        if direction == SyncDirection.UP:
+            local_index = {}
+            for files in self._find_local_files(content_types).values():
+                for f in files:
+                    local_index.setdefault(f.name, f)
+
         # Process new files (always sync)
         for item in preview["new"]:
             filename = item["file"]
@@ -1066,7 +1205,7 @@ class HiveSinkInit:
                 result.skipped.append(filename)
                 continue
 
-            self._sync_item(direction, item, vault_path, content_types, dry_run)
+            self._sync_item(direction, item, vault_path, content_types, dry_run, local_index)
             result.new.append(filename)
 
         # Process changed files (check decisions)
@@ -1078,7 +1217,7 @@ class HiveSinkInit:
                 result.skipped.append(filename)
                 continue
 
-            self._sync_item(direction, item, vault_path, content_types, dry_run)
+            self._sync_item(direction, item, vault_path, content_types, dry_run, local_index)
             result.synced.append(filename)
 
         # Unchanged files
@@ -1086,6 +1225,9 @@ class HiveSinkInit:
             if skip_unchanged:
                 result.skipped.append(item["file"])
 
+        if not dry_run:
+            self.hash_cache.save()
+
         # Update manifest
         if not dry_run and direction == SyncDirection.UP:
             manifest = self._load_manifest(vault_path)
@@ -1093,6 +1235,7 @@ class HiveSinkInit:
                 manifest.files[filename] = {
                     "synced": datetime.now().isoformat(),
                     "source": str(self.project_root),
+                    "hash": self._compute_hash(local_index[filename]) if filename in local_index else "",
                 }
             self._save_manifest(manifest, vault_path / "manifest.json")
 
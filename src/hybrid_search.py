@@ -0,0 +1,192 @@
+"""
+hAIveMind Hybrid Search Ranking
+
+Blends vector similarity with precomputed confidence scores and freshness so
+agents get reliable answers from a single search call.
+
+Features:
+- In-memory confidence map loaded from memory_confidence and refreshed
+  incrementally by updated_at, dropping memories whose scores were deleted
+- Configurable blend of similarity, confidence and freshness
+- Minimum-confidence cut applied before results are truncated
+"""
+
+import sqlite3
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+from confidence_system import CATEGORY_HALF_LIVES
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HybridRankingConfig:
+    """Hybrid ranking settings (config key: memory.hybrid_ranking)"""
+    enabled: bool = True
+    similarity_weight: float = 0.6
+    confidence_weight: float = 0.3
+    freshness_weight: float = 0.1
+    overfetch_factor: int = 3
+    max_candidates: int = 150
+    min_confidence: float = 0.0
+    default_confidence: float = 0.5  # Used for memories that were never scored
+    refresh_interval: float = 30.0
+    half_lives: Dict[str, int] = field(default_factory=lambda: dict(CATEGORY_HALF_LIVES))
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'HybridRankingConfig':
+        settings = config.get('memory', {}).get('hybrid_ranking', {}) or {}
+        known = {k: v for k, v in settings.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+    def weights(self, overrides: Optional[Dict[str, float]] = None) -> Tuple[float, float, float]:
+        """Return normalized (similarity, confidence, freshness) weights"""
+        overrides = overrides or {}
+        sim = overrides.get('similarity', self.similarity_weight)
+        conf = overrides.get('confidence', self.confidence_weight)
+        fresh = overrides.get('freshness', self.freshness_weight)
+        total = sim + conf + fresh
+        if total <= 0:
+            return 1.0, 0.0, 0.0
+        return sim / total, conf / total, fresh / total
+
+
+class ConfidenceScoreCache:
+    """Process-local map of memory_id -> final confidence score
+
+    The first lookup loads every stored score; later refreshes only read rows
+    whose updated_at reached the previous high-water mark. Rows stamped with
+    the high-water timestamp itself are re-read, since more can land in the
+    same timestamp after a refresh. Ids whose rows were deleted are evicted.
+    """
+
+    def __init__(self, db_path: str, refresh_interval: float = 30.0):
+        self.db_path = Path(db_path)
+        self.refresh_interval = refresh_interval
+        self._scores: Dict[str, float] = {}
+        self._high_water = ''
+        self._at_high_water: set = set()  # ids already applied at the high-water timestamp
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+        self.refresh_count = 0
+
+    def refresh(self, force: bool = False) -> int:
+        """Pull scores updated since the last refresh; returns rows applied"""
+        now = time.monotonic()
+        if not force and self._last_refresh and now - self._last_refresh < self.refresh_interval:
+            return 0
+        if not self.db_path.exists():
+            self._last_refresh = now
+            return 0
+
+        with self._lock:
+            try:
+                with sqlite3.connect(self.db_path) as conn:
+                    rows = conn.execute("""
+                        SELECT memory_id, final_score, updated_at
+                        FROM memory_confidence
+                        WHERE updated_at >= ?
+                        ORDER BY updated_at
+                    """, (self._high_water,)).fetchall()
+                    for memory_id, final_score, _ in rows:
+                        self._scores[memory_id] = final_score
+                    stored = conn.execute("SELECT COUNT(*) FROM memory_confidence").fetchone()[0]
+                    if stored < len(self._scores):
+                        present = {row[0] for row in conn.execute("SELECT memory_id FROM memory_confidence")}
+                        for memory_id in set(self._scores) - present:
+                            del self._scores[memory_id]
+            except sqlite3.Error as e:
+                logger.debug(f"Confidence cache refresh skipped: {e}")
+                self._last_refresh = now
+                return 0
+
+            previous_high_water, previous_ids = self._high_water, self._at_high_water
+            applied = 0
+            for memory_id, _, updated_at in rows:
+                if not (updated_at == previous_high_water and memory_id in previous_ids):
+                    applied += 1
+                if updated_at and updated_at > self._high_water:
+                    self._high_water = updated_at
+                    self._at_high_water = set()
+                if updated_at == self._high_water:
+                    self._at_high_water.add(memory_id)
+
+            self._last_refresh = now
+            self.refresh_count += 1
+            return applied
+
+    def get(self, memory_id: str) -> Optional[float]:
+        return self._scores.get(memory_id)
+
+    def put(self, memory_id: str, final_score: float):
+        """Write-through for scores computed in this process"""
+        self._scores[memory_id] = final_score
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+
+class HybridRanker:
+    """Re-rank vector search candidates by similarity, confidence and freshness"""
+
+    def __init__(self, config: HybridRankingConfig, cache: ConfidenceScoreCache):
+        self.config = config
+        self.cache = cache
+
+    def candidate_count(self, limit: int) -> int:
+        """How many results to request from the vector index per collection"""
+        return max(limit, min(limit * self.config.overfetch_factor, self.config.max_candidates))
+
+    def freshness(self, created_at: str, category: str, now: Optional[datetime] = None) -> float:
+        """Half-life decay computed analytically from the creation timestamp"""
+        if not created_at:
+            return 0.5
+        try:
+            created = datetime.fromisoformat(created_at)
+        except ValueError:
+            return 0.5
+        if created.tzinfo is not None:
+            created = created.replace(tzinfo=None)
+        age_days = max(0.0, ((now or datetime.now()) - created).total_seconds() / 86400)
+        half_life = self.config.half_lives.get(category, 60)
+        return 0.5 ** (age_days / half_life)
+
+    def rank(self,
+             memories: List[Dict[str, Any]],
+             limit: int,
+             min_confidence: Optional[float] = None,
+             weights: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+        """Blend scores, drop low-confidence candidates, then truncate"""
+        self.cache.refresh()
+
+        sim_w, conf_w, fresh_w = self.config.weights(weights)
+        threshold = self.config.min_confidence if min_confidence is None else min_confidence
+        now = datetime.now()
+
+        ranked = []
+        for memory in memories:
+            confidence = self.cache.get(memory['id'])
+            scored = confidence is not None
+            if not scored:
+                confidence = self.config.default_confidence
+            if confidence < threshold:
+                continue
+
+            similarity = max(0.0, min(1.0, memory.get('score', 0.0)))
+            freshness = self.freshness(memory.get('created_at', ''), memory.get('category', 'global'), now)
+
+            memory['similarity'] = similarity
+            memory['confidence'] = confidence
+            memory['confidence_scored'] = scored
+            memory['freshness'] = freshness
+            memory['score'] = sim_w * similarity + conf_w * confidence + fresh_w * freshness
+            ranked.append(memory)
+
+        ranked.sort(key=lambda m: m['score'], reverse=True)
+        return ranked[:limit]
@@ -0,0 +1,296 @@
+"""
+Log Correlation Engine for hAIveMind Log Intelligence
+
+Index-backed cross-service correlation over the ``log_entries`` table.
+
+Features:
+- Covering indexes on (trace_id, timestamp, source) and (level, timestamp, source)
+- Trace and temporal correlation aggregated entirely in SQL
+- Lightweight correlation summaries with lazily fetched, keyset-paginated log pages
+- Incremental mode that keeps open trace groups in memory as logs are ingested
+  (timestamps normalised to aware UTC; naive ones are taken as local time)
+"""
+
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Any, Tuple, Union
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Indexes the correlation queries rely on. Both include ``source`` so the
+# aggregate queries are answered from the index without touching the table.
+CORRELATION_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_logs_trace_ts ON log_entries (trace_id, timestamp, source)",
+    "CREATE INDEX IF NOT EXISTS idx_logs_level_ts_source ON log_entries (level, timestamp, source)",
+]
+
+CORRELATED_LEVELS = ('WARN', 'ERROR', 'FATAL')
+
+LOG_PAGE_COLUMNS = "id, timestamp, level, source, host, message, trace_id, user_id, session_id, pattern_id"
+
+
+def _parse_timestamp(value: Union[str, datetime, None]) -> Optional[datetime]:
+    """Parse a timestamp stored by the sqlite3 datetime adapter"""
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _to_utc(value: datetime) -> datetime:
+    """Aware UTC datetime; naive values (datetime.now() fallbacks) are local time"""
+    return value.astimezone(timezone.utc)
+
+
+@dataclass
+class OpenTraceGroup:
+    """In-memory state for a trace that is still receiving logs"""
+    trace_id: str
+    first_seen: datetime
+    last_seen: datetime
+    log_count: int = 0
+    services: Dict[str, int] = field(default_factory=dict)
+    error_count: int = 0
+
+    def to_summary(self) -> Dict[str, Any]:
+        return {
+            'correlation_type': 'trace',
+            'trace_id': self.trace_id,
+            'services': sorted(self.services),
+            'service_counts': dict(self.services),
+            'log_count': self.log_count,
+            'error_count': self.error_count,
+            'first_seen': self.first_seen.isoformat(),
+            'last_seen': self.last_seen.isoformat(),
+            'time_span_seconds': (self.last_seen - self.first_seen).total_seconds(),
+            'open': True,
+        }
+
+
+class LogCorrelationEngine:
+    """Aggregates log correlations in SQL and serves log pages on demand"""
+
+    def __init__(self, db_path: Union[str, Path], page_size: int = 50,
+                 idle_timeout_seconds: int = 300):
+        self.db_path = Path(db_path)
+        self.page_size = page_size
+        self.idle_timeout = timedelta(seconds=idle_timeout_seconds)
+
+        # Incremental mode state
+        self._open_traces: Dict[str, OpenTraceGroup] = {}
+        self._lock = threading.Lock()
+
+    def ensure_indexes(self, conn: Optional[sqlite3.Connection] = None):
+        """Create the covering indexes used by the correlation queries"""
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(self.db_path)
+        try:
+            for index_sql in CORRELATION_INDEXES:
+                conn.execute(index_sql)
+            conn.commit()
+        finally:
+            if own_conn:
+                conn.close()
+
+    # ===== SQL AGGREGATION =====
+
+    def correlate(self, time_window_minutes: int = 5, limit: int = 100,
+                  now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Return trace and temporal correlation summaries for the window"""
+        window_start = (now or datetime.now()) - timedelta(minutes=time_window_minutes)
+
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            correlations = self._trace_correlations(conn, window_start, limit)
+            correlations.extend(self._temporal_correlations(conn, window_start, limit))
+            return correlations
+        finally:
+            conn.close()
+
+    def _trace_correlations(self, conn: sqlite3.Connection, window_start: datetime,
+                            limit: int) -> List[Dict[str, Any]]:
+        """Cross-service traces, grouped and filtered inside SQLite"""
+        rows = conn.execute('''
+            SELECT trace_id,
+                   COUNT(*) AS log_count,
+                   COUNT(DISTINCT source) AS service_count,
+                   GROUP_CONCAT(DISTINCT source) AS services,
+                   SUM(level IN ('ERROR', 'FATAL')) AS error_count,
+                   MIN(timestamp) AS first_seen,
+                   MAX(timestamp) AS last_seen
+            FROM log_entries
+            WHERE trace_id IS NOT NULL AND timestamp >= ?
+            GROUP BY trace_id
+            HAVING COUNT(DISTINCT source) > 1
+            ORDER BY first_seen
+            LIMIT ?
+        ''', (window_start, limit)).fetchall()
+
+        correlations = []
+        for row in rows:
+            first_seen = _parse_timestamp(row['first_seen'])
+            last_seen = _parse_timestamp(row['last_seen'])
+            span = (last_seen - first_seen).total_seconds() if first_seen and last_seen else 0.0
+            correlations.append({
+                'correlation_type': 'trace',
+                'trace_id': row['trace_id'],
+                'services': sorted(row['services'].split(',')),
+                'log_count': row['log_count'],
+                'error_count': row['error_count'] or 0,
+                'first_seen': row['first_seen'],
+                'last_seen': row['last_seen'],
+                'time_span_seconds': span,
+                'logs_page': {'trace_id': row['trace_id'], 'after': None,
+                              'page_size': self.page_size},
+            })
+        return correlations
+
+    def _temporal_correlations(self, conn: sqlite3.Connection, window_start: datetime,
+                               limit: int) -> List[Dict[str, Any]]:
+        """WARN+ activity from several services in the same one-minute bucket"""
+        placeholders = ','.join('?' * len(CORRELATED_LEVELS))
+        rows = conn.execute(f'''
+            SELECT substr(timestamp, 1, 16) AS bucket, source, COUNT(*) AS log_count
+            FROM log_entries
+            WHERE level IN ({placeholders}) AND timestamp >= ?
+            GROUP BY bucket, source
+            ORDER BY bucket
+        ''', (*CORRELATED_LEVELS, window_start)).fetchall()
+
+        buckets: Dict[str, Dict[str, int]] = {}
+        for row in rows:
+            buckets.setdefault(row['bucket'], {})[row['source']] = row['log_count']
+
+        correlations = []
+        for bucket_time, service_counts in buckets.items():
+            if len(service_counts) < 2:
+                continue
+            correlations.append({
+                'correlation_type': 'temporal',
+                'time_bucket': bucket_time,
+                'services': sorted(service_counts),
+                'service_counts': service_counts,
+                'log_count': sum(service_counts.values()),
+                'logs_page': {'time_bucket': bucket_time, 'after': None,
+                              'page_size': self.page_size},
+            })
+            if len(correlations) >= limit:
+                break
+        return correlations
+
+    # ===== LAZY LOG PAGES =====
+
+    def get_trace_logs(self, trace_id: str, after: Optional[str] = None,
+                       page_size: Optional[int] = None) -> Dict[str, Any]:
+        """Fetch one page of logs for a trace, ordered by (timestamp, id)"""
+        return self._fetch_page('trace_id = ?', (trace_id,), after, page_size)
+
+    def get_bucket_logs(self, time_bucket: str, after: Optional[str] = None,
+                        page_size: Optional[int] = None) -> Dict[str, Any]:
+        """Fetch one page of WARN+ logs for a one-minute bucket (YYYY-MM-DD HH:MM)"""
+        bucket_start = _parse_timestamp(time_bucket)
+        if bucket_start is None:
+            raise ValueError(f"Invalid time bucket: {time_bucket}")
+        bucket_end = bucket_start + timedelta(minutes=1)
+        placeholders = ','.join('?' * len(CORRELATED_LEVELS))
+        return self._fetch_page(
+            f'level IN ({placeholders}) AND timestamp >= ? AND timestamp < ?',
+            (*CORRELATED_LEVELS, bucket_start, bucket_end), after, page_size
+        )
+
+    def _fetch_page(self, where: str, params: tuple, after: Optional[str],
+                    page_size: Optional[int]) -> Dict[str, Any]:
+        """Keyset pagination so deep pages cost the same as the first one"""
+        page_size = page_size or self.page_size
+        conditions = [where]
+        args = list(params)
+        if after:
+            after_ts, _, after_id = after.rpartition('|')
+            conditions.append('(timestamp > ? OR (timestamp = ? AND id > ?))')
+            args.extend([after_ts, after_ts, after_id])
+
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute(f'''
+                SELECT {LOG_PAGE_COLUMNS} FROM log_entries
+                WHERE {' AND '.join(conditions)}
+                ORDER BY timestamp, id
+                LIMIT ?
+            ''', (*args, page_size + 1)).fetchall()
+        finally:
+            conn.close()
+
+        logs = [dict(row) for row in rows[:page_size]]
+        next_cursor = None
+        if len(rows) > page_size and logs:
+            next_cursor = f"{logs[-1]['timestamp']}|{logs[-1]['id']}"
+        return {'logs': logs, 'next': next_cursor}
+
+    # ===== INCREMENTAL MODE =====
+
+    def observe(self, trace_id: Optional[str], source: str, level: str, timestamp: datetime):
+        """Fold a newly ingested log into the open trace groups"""
+        self.observe_many([(trace_id, source, level, timestamp)])
+
+    def observe_many(self, observations: Iterable[Tuple[Optional[str], str, str, datetime]]):
+        """Fold committed (trace_id, source, level, timestamp) logs into the open trace groups"""
+        with self._lock:
+            for trace_id, source, level, timestamp in observations:
+                if trace_id:
+                    self._observe(trace_id, source, level, _to_utc(timestamp))
+
+    def _observe(self, trace_id: str, source: str, level: str, timestamp: datetime):
+        group = self._open_traces.get(trace_id)
+        if group is None:
+            group = OpenTraceGroup(trace_id=trace_id, first_seen=timestamp, last_seen=timestamp)
+            self._open_traces[trace_id] = group
+        group.log_count += 1
+        group.services[source] = group.services.get(source, 0) + 1
+        if level in ('ERROR', 'FATAL'):
+            group.error_count += 1
+        if timestamp < group.first_seen:
+            group.first_seen = timestamp
+        if timestamp > group.last_seen:
+            group.last_seen = timestamp
+
+    def open_correlations(self, time_window_minutes: Optional[int] = None,
+                          now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Cross-service trace groups currently held in memory"""
+        now = _to_utc(now) if now else datetime.now(timezone.utc)
+        window_start = now - timedelta(minutes=time_window_minutes) if time_window_minutes else None
+        with self._lock:
+            return [
+                group.to_summary() for group in self._open_traces.values()
+                if len(group.services) > 1
+                and (window_start is None or group.last_seen >= window_start)
+            ]
+
+    def expire_idle(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Close trace groups that have been idle longer than the timeout"""
+        cutoff = (_to_utc(now) if now else datetime.now(timezone.utc)) - self.idle_timeout
+        with self._lock:
+            expired = [tid for tid, group in self._open_traces.items() if group.last_seen < cutoff]
+            closed = [self._open_traces.pop(tid) for tid in expired]
+        summaries = []
+        for group in closed:
+            if len(group.services) > 1:
+                summary = group.to_summary()
+                summary['open'] = False
+                summaries.append(summary)
+        return summaries
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'open_traces': len(self._open_traces),
+                'open_cross_service': sum(1 for g in self._open_traces.values() if len(g.services) > 1),
+            }
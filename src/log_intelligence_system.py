@@ -33,6 +33,9 @@ from sklearn.ensemble import IsolationForest
 from sklearn.decomposition import PCA
 import numpy as np
 
+from log_correlation_engine import LogCorrelationEngine, CORRELATION_INDEXES
+import sqlite_pool
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -77,11 +80,15 @@ class LogAnomaly:
 class LogIntelligenceSystem:
     """Advanced ML-powered log analysis and intelligence system"""
     
-    def __init__(self, db_path: str = "data/log_intelligence.db"):
+    def __init__(self, db_path: str = "data/log_intelligence.db", incremental_correlation: bool = False):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_database()
         
+        # Index-backed correlation; optionally tracks open trace groups as logs arrive
+        self.correlation_engine = LogCorrelationEngine(self.db_path)
+        self.incremental_correlation = incremental_correlation
+        
         # ML Components
         self.vectorizer = TfidfVectorizer(
             max_features=10000,
@@ -97,7 +104,7 @@ class LogIntelligenceSystem:
     
     def _init_database(self):
         """Initialize SQLite database with comprehensive log analysis schema"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         conn.execute("PRAGMA foreign_keys = ON")
         
         try:
@@ -214,7 +221,7 @@ class LogIntelligenceSystem:
                 "CREATE INDEX IF NOT EXISTS idx_correlations_primary ON log_correlations (primary_log_id)",
                 "CREATE INDEX IF NOT EXISTS idx_correlations_type ON log_correlations (correlation_type)",
                 "CREATE INDEX IF NOT EXISTS idx_archives_timestamp ON log_archives (start_timestamp, end_timestamp)"
-            ]
+            ] + CORRELATION_INDEXES
             
             for index_sql in indexes:
                 conn.execute(index_sql)
@@ -229,8 +236,9 @@ class LogIntelligenceSystem:
     
     def ingest_logs(self, log_entries: List[Dict[str, Any]], source: str = "unknown") -> int:
         """Ingest multiple log entries with pattern extraction and anomaly detection"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         processed_count = 0
+        observations = []
         
         try:
             for log_data in log_entries:
@@ -243,9 +251,19 @@ class LogIntelligenceSystem:
                     # Store log entry
                     self._store_log_entry(log_entry, pattern_id, conn)
                     processed_count += 1
+                    
+                    if self.incremental_correlation:
+                        observations.append(
+                            (log_entry.trace_id, log_entry.source, log_entry.level, log_entry.timestamp)
+                        )
             
             conn.commit()
             
+            # Only committed logs reach the open trace groups; idle ones close as new logs arrive
+            if self.incremental_correlation:
+                self.correlation_engine.observe_many(observations)
+                self.correlation_engine.expire_idle()
+            
             # Trigger analysis on batch
             self._analyze_batch_anomalies(log_entries)
             
@@ -483,7 +501,7 @@ class LogIntelligenceSystem:
     
     def _detect_frequency_anomalies(self):
         """Detect patterns with unusual frequency"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         
         try:
             # Get pattern frequencies in last hour vs baseline
@@ -529,7 +547,7 @@ class LogIntelligenceSystem:
     
     def _detect_error_spikes(self):
         """Detect spikes in error rates"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         
         try:
             current_time = datetime.now()
@@ -574,7 +592,7 @@ class LogIntelligenceSystem:
     
     def _detect_new_patterns(self):
         """Detect new log patterns that haven't been seen before"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         
         try:
             # Find patterns first seen in last hour
@@ -608,7 +626,7 @@ class LogIntelligenceSystem:
     
     def _create_anomaly(self, anomaly_data: Dict[str, Any]):
         """Create anomaly record"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         
         try:
             conn.execute('''
@@ -632,75 +650,35 @@ class LogIntelligenceSystem:
     
     # ===== LOG CORRELATION =====
     
-    def correlate_logs(self, time_window_minutes: int = 5) -> List[Dict[str, Any]]:
-        """Find correlated log entries across services"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+    def correlate_logs(self, time_window_minutes: int = 5, limit: int = 100,
+                       incremental: bool = False) -> List[Dict[str, Any]]:
+        """Find correlated log entries across services
         
-        try:
-            correlations = []
-            current_time = datetime.now()
-            window_start = current_time - timedelta(minutes=time_window_minutes)
-            
-            # Get recent logs with trace IDs
-            traced_logs = conn.execute('''
-                SELECT * FROM log_entries 
-                WHERE trace_id IS NOT NULL AND timestamp >= ?
-                ORDER BY timestamp
-            ''', (window_start,)).fetchall()
-            
-            # Group by trace ID
-            trace_groups = defaultdict(list)
-            for log in traced_logs:
-                trace_groups[log['trace_id']].append(dict(log))
-            
-            # Find cross-service correlations
-            for trace_id, logs in trace_groups.items():
-                if len(logs) > 1:
-                    services = set(log['source'] for log in logs)
-                    if len(services) > 1:  # Cross-service correlation
-                        correlations.append({
-                            'trace_id': trace_id,
-                            'services': list(services),
-                            'log_count': len(logs),
-                            'time_span': max(log['timestamp'] for log in logs) - min(log['timestamp'] for log in logs),
-                            'logs': logs
-                        })
-            
-            # Find temporal correlations (same time window, different services)
-            time_buckets = defaultdict(lambda: defaultdict(list))
-            
-            all_logs = conn.execute('''
-                SELECT * FROM log_entries 
-                WHERE timestamp >= ? AND level IN ('WARN', 'ERROR', 'FATAL')
-                ORDER BY timestamp
-            ''', (window_start,)).fetchall()
-            
-            for log in all_logs:
-                # 1-minute buckets
-                bucket = log['timestamp'][:16]  # YYYY-MM-DD HH:MM
-                time_buckets[bucket][log['source']].append(dict(log))
-            
-            for bucket_time, services_logs in time_buckets.items():
-                if len(services_logs) > 1:  # Multiple services in same time bucket
-                    correlations.append({
-                        'correlation_type': 'temporal',
-                        'time_bucket': bucket_time,
-                        'services': list(services_logs.keys()),
-                        'service_logs': dict(services_logs)
-                    })
-            
-            return correlations
-            
-        finally:
-            conn.close()
+        Returns correlation summaries only; fetch the underlying logs page by page
+        with get_correlation_logs(). With incremental=True the open trace groups
+        maintained during ingestion are returned without querying the database.
+        """
+        if incremental and self.incremental_correlation:
+            self.correlation_engine.expire_idle()
+            return self.correlation_engine.open_correlations(time_window_minutes)[:limit]
+        
+        return self.correlation_engine.correlate(time_window_minutes, limit=limit)
+    
+    def get_correlation_logs(self, trace_id: Optional[str] = None, time_bucket: Optional[str] = None,
+                             after: Optional[str] = None, page_size: int = 50) -> Dict[str, Any]:
+        """Fetch one page of logs behind a correlation summary"""
+        if trace_id:
+            return self.correlation_engine.get_trace_logs(trace_id, after=after, page_size=page_size)
+        if time_bucket:
+            return self.correlation_engine.get_bucket_logs(time_bucket, after=after, page_size=page_size)
+        raise ValueError("Either trace_id or time_bucket is required")
     
     # ===== DEBUG REPORT GENERATION =====
     
     def generate_debug_report(self, issue_description: str, services: List[str], 
                             hours_back: int = 2) -> Dict[str, Any]:
         """Generate automated debug report with root cause analysis"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         
         try:
@@ -827,7 +805,7 @@ class LogIntelligenceSystem:
     
     def archive_logs(self, older_than_days: int = 30, compress: bool = True) -> Dict[str, Any]:
         """Archive and compress old logs based on retention policy"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_pool.connect(self.db_path)
         
         try:
             cutoff_date = datetime.now() - timedelta(days=older_than_days)
@@ -0,0 +1,348 @@
+"""
+hAIveMind Memory Analytics - Incremental Counters for the Analytics Dashboard
+
+Keeps the numbers behind /admin/api/memory/analytics up to date as memories
+are written, so reading them never scans a ChromaDB collection.
+
+Features:
+- Live totals per category x machine: memories, content characters, tagged
+  memories and memories with context
+- Daily added/removed flows per category x machine for growth and activity
+  (flows are dated when the change happens on this node; a rebuild dates
+  each memory by its created_at)
+- Content length histogram and per-tag counts
+- Updated on store, delete, recover, update, merge and sync; stored in the
+  shared SQLite pool, so every process on the machine adds to the same counts
+- rebuild() recomputes everything with one paged streaming scan
+"""
+
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import sqlite_pool
+
+logger = logging.getLogger(__name__)
+
+# Content length bucket upper bounds in characters (the last bucket is open-ended)
+LENGTH_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000)
+
+# (content, metadata) as held in ChromaDB
+MemoryRecord = Tuple[Optional[str], Dict[str, Any]]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analytics_totals (
+    category TEXT NOT NULL,
+    machine_id TEXT NOT NULL,
+    memories INTEGER NOT NULL DEFAULT 0,
+    content_chars INTEGER NOT NULL DEFAULT 0,
+    tagged INTEGER NOT NULL DEFAULT 0,
+    with_context INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (category, machine_id)
+);
+CREATE TABLE IF NOT EXISTS analytics_daily (
+    day TEXT NOT NULL,
+    category TEXT NOT NULL,
+    machine_id TEXT NOT NULL,
+    added INTEGER NOT NULL DEFAULT 0,
+    removed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, category, machine_id)
+);
+CREATE TABLE IF NOT EXISTS analytics_lengths (
+    bucket INTEGER PRIMARY KEY,
+    memories INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS analytics_tags (
+    tag TEXT PRIMARY KEY,
+    memories INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS analytics_events (
+    event TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS analytics_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def parse_tags(value: Any) -> List[str]:
+    """Tags as stored in metadata: comma separated string, JSON list string or list"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        if value.startswith('['):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                value = value.strip('[]').split(',')
+        else:
+            value = value.split(',')
+    return sorted({str(tag).strip() for tag in value if str(tag).strip()})
+
+
+class _Delta:
+    """Counter changes accumulated in memory and applied in one transaction"""
+
+    def __init__(self):
+        self.totals: Dict[Tuple[str, str], List[int]] = {}
+        self.daily: Dict[Tuple[str, str, str], List[int]] = {}
+        self.lengths: Counter = Counter()
+        self.tags: Counter = Counter()
+
+    def add(self, content: Optional[str], metadata: Dict[str, Any], sign: int, day: Optional[str]):
+        category = metadata.get('category') or 'global'
+        machine_id = metadata.get('machine_id') or 'unknown'
+        length = len(content or '')
+        tags = parse_tags(metadata.get('tags'))
+
+        totals = self.totals.setdefault((category, machine_id), [0, 0, 0, 0])
+        totals[0] += sign
+        totals[1] += sign * length
+        totals[2] += sign if tags else 0
+        totals[3] += sign if metadata.get('context') else 0
+        if day:
+            flows = self.daily.setdefault((day, category, machine_id), [0, 0])
+            flows[0 if sign > 0 else 1] += 1
+        self.lengths[bisect_left(LENGTH_BUCKETS, length)] += sign
+        for tag in tags:
+            self.tags[tag] += sign
+
+
+class MemoryAnalytics:
+    """Incrementally maintained memory statistics backed by SQLite"""
+
+    def __init__(self, db_path: str = "data/memory_analytics.db", top_tags: int = 10):
+        self.db_path = Path(db_path)
+        self.top_tags = top_tags
+        self.rebuilding = False
+        self._rebuild_lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite_pool.connect(self.db_path)
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'MemoryAnalytics':
+        settings = config.get('memory', {}).get('analytics', {})
+        return cls(
+            db_path=settings.get('db_path', 'data/memory_analytics.db'),
+            top_tags=settings.get('top_tags', 10)
+        )
+
+    # Recording
+
+    def _apply(self, delta: _Delta, events: Optional[Dict[str, int]] = None, reset: bool = False):
+        conn = sqlite_pool.connect(self.db_path)
+        try:
+            with conn:
+                if reset:
+                    for table in ('analytics_totals', 'analytics_daily', 'analytics_lengths', 'analytics_tags'):
+                        conn.execute(f"DELETE FROM {table}")
+                conn.executemany("""
+                    INSERT INTO analytics_totals (category, machine_id, memories, content_chars, tagged, with_context)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(category, machine_id) DO UPDATE SET
+                        memories = memories + excluded.memories,
+                        content_chars = content_chars + excluded.content_chars,
+                        tagged = tagged + excluded.tagged,
+                        with_context = with_context + excluded.with_context
+                """, [key + tuple(values) for key, values in delta.totals.items()])
+                conn.executemany("""
+                    INSERT INTO analytics_daily (day, category, machine_id, added, removed) VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(day, category, machine_id) DO UPDATE SET
+                        added = added + excluded.added, removed = removed + excluded.removed
+                """, [key + tuple(values) for key, values in delta.daily.items()])
+                conn.executemany("""
+                    INSERT INTO analytics_lengths (bucket, memories) VALUES (?, ?)
+                    ON CONFLICT(bucket) DO UPDATE SET memories = memories + excluded.memories
+                """, [item for item in delta.lengths.items() if item[1]])
+                conn.executemany("""
+                    INSERT INTO analytics_tags (tag, memories) VALUES (?, ?)
+                    ON CONFLICT(tag) DO UPDATE SET memories = memories + excluded.memories
+                """, [item for item in delta.tags.items() if item[1]])
+                if delta.tags:
+                    conn.execute("DELETE FROM analytics_tags WHERE memories <= 0")
+                conn.executemany("""
+                    INSERT INTO analytics_events (event, count) VALUES (?, ?)
+                    ON CONFLICT(event) DO UPDATE SET count = count + excluded.count
+                """, list((events or {}).items()))
+        finally:
+            conn.close()
+
+    def _record(self, changes: Iterable[Tuple[MemoryRecord, int]], flow: bool, event: str, count: int = None):
+        """Apply (record, +1/-1) changes; soft-deleted records are not live and are skipped"""
+        delta = _Delta()
+        today = date.today().isoformat() if flow else None
+        applied = 0
+        for (content, metadata), sign in changes:
+            if metadata and not metadata.get('deleted_at'):
+                delta.add(content, metadata, sign, today)
+                applied += 1
+        if not applied:
+            return
+        try:
+            self._apply(delta, {event: applied if count is None else count})
+        except Exception as e:
+            logger.warning(f"⚠️ Memory analytics update failed: {e}")
+
+    def record_added(self, records: Iterable[MemoryRecord], event: str = 'stored'):
+        """Count memories that became live here today (stored, synced in or recovered)"""
+        self._record(((record, 1) for record in records), True, event)
+
+    def record_removed(self, records: Iterable[MemoryRecord], event: str = 'deleted'):
+        """Remove live memories from the counts (soft or hard delete)"""
+        self._record(((record, -1) for record in records), True, event)
+
+    def record_replaced(self, old: MemoryRecord, new: MemoryRecord, event: str = 'updated'):
+        """Swap a memory's old content/metadata for the new version without counting growth"""
+        self.record_replaced_many([(old, new)], event)
+
+    def record_replaced_many(self, pairs: Iterable[Tuple[MemoryRecord, MemoryRecord]], event: str = 'updated'):
+        pairs = list(pairs)
+        self._record((change for old, new in pairs for change in ((old, -1), (new, 1))), False, event,
+                     count=len(pairs))
+
+    # Rebuild
+
+    def rebuild(self, collections: Dict[str, Any], page_size: int = 500) -> Dict[str, Any]:
+        """
+        Recompute every counter with one paged scan of the collections.
+
+        Memories written while the scan runs may be counted twice; run it when
+        the counters are missing or known to have drifted.
+        """
+        if not self._rebuild_lock.acquire(blocking=False):
+            return {"status": "already_running"}
+        started = time.perf_counter()
+        self.rebuilding = True
+        try:
+            delta = _Delta()
+            scanned = 0
+            for category, collection in collections.items():
+                offset = 0
+                while True:
+                    page = collection.get(limit=page_size, offset=offset, include=['documents', 'metadatas'])
+                    ids = page.get('ids') or []
+                    if not ids:
+                        break
+                    for content, metadata in zip(page.get('documents') or [], page.get('metadatas') or []):
+                        metadata = dict(metadata or {})
+                        metadata.setdefault('category', category)
+                        if not metadata.get('deleted_at'):
+                            delta.add(content, metadata, 1, str(metadata.get('created_at') or '')[:10] or None)
+                    scanned += len(ids)
+                    offset += len(ids)
+                    if len(ids) < page_size:
+                        break
+            self._apply(delta, reset=True)
+            self._set_meta('built_at', datetime.now().isoformat())
+            seconds = time.perf_counter() - started
+            logger.info(f"📊 Memory analytics rebuilt from {scanned} memories in {seconds:.2f}s")
+            return {"status": "rebuilt", "scanned": scanned, "seconds": round(seconds, 3)}
+        finally:
+            self.rebuilding = False
+            self._rebuild_lock.release()
+
+    def _set_meta(self, key: str, value: str):
+        conn = sqlite_pool.connect(self.db_path)
+        try:
+            with conn:
+                conn.execute("INSERT INTO analytics_meta (key, value) VALUES (?, ?) "
+                             "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, value))
+        finally:
+            conn.close()
+
+    # Reading
+
+    def summary(self, today: Optional[date] = None) -> Dict[str, Any]:
+        """Dashboard numbers; cost depends on categories, machines and 30 days, not on memory count"""
+        today = today or date.today()
+        since = (today - timedelta(days=59)).isoformat()
+        conn = sqlite_pool.connect(self.db_path)
+        try:
+            totals = conn.execute("SELECT category, machine_id, memories, content_chars, tagged, with_context "
+                                  "FROM analytics_totals").fetchall()
+            daily = conn.execute("SELECT day, SUM(added), SUM(removed) FROM analytics_daily WHERE day >= ? "
+                                 "GROUP BY day", (since,)).fetchall()
+            lengths = dict(conn.execute("SELECT bucket, memories FROM analytics_lengths").fetchall())
+            tags = conn.execute("SELECT tag, memories FROM analytics_tags ORDER BY memories DESC, tag LIMIT ?",
+                                (self.top_tags,)).fetchall()
+            events = dict(conn.execute("SELECT event, count FROM analytics_events").fetchall())
+            built_at = conn.execute("SELECT value FROM analytics_meta WHERE key = 'built_at'").fetchone()
+        finally:
+            conn.close()
+
+        by_category: Counter = Counter()
+        by_machine: Counter = Counter()
+        chars = tagged = with_context = 0
+        for category, machine_id, memories, content_chars, tagged_count, context_count in totals:
+            by_category[category] += memories
+            by_machine[machine_id] += memories
+            chars += content_chars
+            tagged += tagged_count
+            with_context += context_count
+        total = sum(by_category.values())
+
+        def share(count: int) -> float:
+            return round(count / total * 100, 1) if total > 0 else 0
+
+        def window(days: int, offset: int = 0) -> Tuple[int, int]:
+            first = (today - timedelta(days=offset + days - 1)).isoformat()
+            last = (today - timedelta(days=offset)).isoformat()
+            rows = [row for row in daily if first <= row[0] <= last]
+            return sum(row[1] for row in rows), sum(row[2] for row in rows)
+
+        windows = {days: window(days) for days in (1, 7, 30)}
+        this_week = windows[7][0] - windows[7][1]
+        last_week = window(7, offset=7)
+        last_week = last_week[0] - last_week[1]
+        trend = "increasing" if this_week > last_week else "decreasing" if this_week < last_week else "flat"
+
+        labels = [f"le_{bound}" for bound in LENGTH_BUCKETS] + [f"gt_{LENGTH_BUCKETS[-1]}"]
+        return {
+            "total_memories": total,
+            "category_distribution": {
+                category: {"count": count, "percentage": share(count)}
+                for category, count in sorted(by_category.items()) if count
+            },
+            "machine_contributions": {
+                machine_id: {"count": count, "percentage": share(count)}
+                for machine_id, count in by_machine.most_common() if count
+            },
+            "growth_analytics": {
+                "daily_growth": windows[1][0] - windows[1][1],
+                "weekly_growth": this_week,
+                "monthly_growth": windows[30][0] - windows[30][1],
+                "previous_week_growth": last_week,
+                "trend": trend,
+            },
+            "recent_activity": {
+                "last_24h": windows[1][0],  # Calendar days: today, the last 7 and 30 days
+                "last_7d": windows[7][0],
+                "last_30d": windows[30][0],
+                "removed_last_30d": windows[30][1],
+            },
+            "quality_metrics": {
+                "avg_content_length": round(chars / total) if total > 0 else 0,
+                "tagged_memories_percentage": share(tagged),
+                "memories_with_context": share(with_context),
+                "content_length_histogram": {
+                    label: lengths.get(index, 0) for index, label in enumerate(labels) if lengths.get(index, 0)
+                },
+                "top_tags": {tag: count for tag, count in tags},
+                "merged_duplicates": events.get('merged', 0),
+            },
+            "events": events,
+            "built_at": built_at[0] if built_at else None,
+            "rebuilding": self.rebuilding,
+        }
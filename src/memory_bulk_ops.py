@@ -0,0 +1,474 @@
+"""
+hAIveMind Bulk Memory Operations - Batched Deletes, Tag Edits, Moves and Exports
+
+Applies one operation to many memory IDs with a handful of ChromaDB round
+trips instead of a retrieve/update/audit cycle per ID.
+
+Features:
+- IDs are resolved to their collections in one pass: one locator lookup for
+  all IDs, then one collection.get per collection (per batch_size IDs)
+- Deletes (soft or hard), tag edits and category moves use one batched
+  update/delete/add per collection; moves keep the stored embeddings
+- Redis cache and recycle bin changes go through a single pipeline
+- Exports stream as NDJSON, resolving one batch at a time
+- One audit record per job (deletion audits for deletes, operation audits
+  for tag edits, moves and exports); large jobs run in the background and
+  report progress by job ID
+- Bulk deletes broadcast one memory_bulk_deletion event carrying the deleted IDs
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from memory_analytics import parse_tags
+
+logger = logging.getLogger(__name__)
+
+BULK_OPERATIONS = ('delete', 'tag', 'categorize', 'export')
+TAG_MODES = ('add', 'remove', 'set')
+RECYCLE_TTL_SECONDS = 2592000  # 30 days, as for single deletes
+MAX_REPORTED_ERRORS = 100
+AUDIT_SAMPLE_IDS = 100
+
+
+class BulkOperationError(ValueError):
+    """Invalid bulk operation request"""
+
+
+@dataclass
+class BulkJob:
+    """Progress of one bulk operation"""
+    job_id: str
+    operation: str
+    total: int
+    processed: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    round_trips: int = 0
+    status: str = "running"  # running, completed, failed
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    errors: List[Dict[str, str]] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def fail(self, memory_id: str, message: str):
+        self.failed += 1
+        self.processed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"memory_id": memory_id, "error": message})
+
+    def succeed(self, count: int):
+        self.succeeded += count
+        self.processed += count
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result.update({
+            "total_processed": self.total,
+            "successful": self.succeeded,
+            "progress": round(self.processed / self.total, 4) if self.total else 1.0,
+            "seconds": round((self.finished_at or time.time()) - self.started_at, 3),
+        })
+        return result
+
+
+@dataclass
+class ResolvedBatch:
+    """Memories found in one collection, in parallel lists as ChromaDB returns them"""
+    ids: List[str] = field(default_factory=list)
+    documents: List[Optional[str]] = field(default_factory=list)
+    metadatas: List[Dict[str, Any]] = field(default_factory=list)
+    embeddings: List[Any] = field(default_factory=list)
+
+
+class BulkMemoryOperations:
+    """Batched bulk operations over MemoryStorage collections"""
+
+    def __init__(self, storage, batch_size: int = 1000, background_threshold: int = 1000, max_jobs: int = 50):
+        """
+        Args:
+            storage: MemoryStorage (collections, memory_locator, hot_cache, redis_client, analytics)
+            batch_size: IDs per ChromaDB call
+            background_threshold: Jobs with at least this many IDs run in the background
+        """
+        self.storage = storage
+        self.batch_size = batch_size
+        self.background_threshold = background_threshold
+        self.max_jobs = max_jobs
+        self.jobs: 'OrderedDict[str, BulkJob]' = OrderedDict()
+
+    @classmethod
+    def from_config(cls, storage, config: Dict[str, Any]) -> 'BulkMemoryOperations':
+        settings = config.get('memory', {}).get('bulk_operations', {})
+        return cls(
+            storage,
+            batch_size=settings.get('batch_size', 1000),
+            background_threshold=settings.get('background_threshold', 1000),
+            max_jobs=settings.get('max_jobs', 50)
+        )
+
+    def _chunks(self, items: List[str]):
+        for start in range(0, len(items), self.batch_size):
+            yield items[start:start + self.batch_size]
+
+    # Resolution
+
+    def resolve(self, memory_ids: List[str], include: List[str],
+                job: Optional[BulkJob] = None) -> Tuple[Dict[str, ResolvedBatch], List[str]]:
+        """
+        Find every ID's collection and load it: returns ({category: batch}, missing IDs).
+
+        Located IDs are fetched from their collection only; unlocated (or stale)
+        IDs are tried against every collection in the same batched get.
+        """
+        collections = self.storage.collections
+        locations = self.storage.memory_locator.get_many(memory_ids)
+        by_category: Dict[str, List[str]] = {category: [] for category in collections}
+        unlocated = []
+        for memory_id in memory_ids:
+            category = locations.get(memory_id)
+            if category in by_category:
+                by_category[category].append(memory_id)
+            else:
+                unlocated.append(memory_id)
+
+        resolved: Dict[str, ResolvedBatch] = {}
+        remaining = set(memory_ids)
+        backfill: Dict[str, str] = {}
+
+        def fetch(category: str, candidates: List[str]):
+            for chunk in self._chunks(candidates):
+                page = collections[category].get(ids=chunk, include=include)
+                if job is not None:
+                    job.round_trips += 1
+                ids = page.get('ids') or []
+                if not ids:
+                    continue
+                batch = resolved.setdefault(category, ResolvedBatch())
+                documents = page.get('documents')
+                metadatas = page.get('metadatas')
+                embeddings = page.get('embeddings')
+                for index, memory_id in enumerate(ids):
+                    if memory_id not in remaining:
+                        continue
+                    remaining.discard(memory_id)
+                    if locations.get(memory_id) != category:
+                        backfill[memory_id] = category
+                    batch.ids.append(memory_id)
+                    batch.documents.append(documents[index] if documents is not None else None)
+                    batch.metadatas.append(dict(metadatas[index] or {}) if metadatas is not None else {})
+                    batch.embeddings.append(embeddings[index] if embeddings is not None else None)
+
+        for category, located in by_category.items():
+            candidates = located + [memory_id for memory_id in unlocated if memory_id in remaining]
+            if candidates:
+                fetch(category, candidates)
+
+        # Locator entries that pointed at the wrong collection get one more pass
+        stale = [memory_id for memory_id in memory_ids if memory_id in remaining and memory_id in locations]
+        if stale:
+            for category in collections:
+                fetch(category, [memory_id for memory_id in stale if memory_id in remaining])
+
+        if backfill:
+            self.storage.memory_locator.set_many(backfill)
+        return resolved, [memory_id for memory_id in memory_ids if memory_id in remaining]
+
+    # Operations (run in the executor)
+
+    def _redis_pipeline(self):
+        redis_client = self.storage.redis_client
+        return redis_client.pipeline(transaction=False) if redis_client else None
+
+    def _delete(self, job: BulkJob, memory_ids: List[str], parameters: Dict[str, Any]):
+        hard = bool(parameters.get('hard_delete', False))
+        reason = parameters.get('reason', 'Bulk deletion')
+        now = datetime.now()
+        resolved, missing = self.resolve(memory_ids, ['documents', 'metadatas'], job)
+        for memory_id in missing:
+            job.fail(memory_id, "Memory not found")
+
+        pipe = self._redis_pipeline()
+        removed_records = []
+        removed_ids = []
+        for category, batch in resolved.items():
+            collection = self.storage.collections[category]
+            live = [i for i, metadata in enumerate(batch.metadatas) if not metadata.get('deleted_at')]
+            if not hard:
+                for i in range(len(batch.ids)):
+                    if batch.metadatas[i].get('deleted_at'):
+                        job.fail(batch.ids[i], "Memory already deleted")
+            targets = list(range(len(batch.ids))) if hard else live
+            if not targets:
+                continue
+            ids = [batch.ids[i] for i in targets]
+            try:
+                if hard:
+                    for chunk in self._chunks(ids):
+                        collection.delete(ids=chunk)
+                        job.round_trips += 1
+                else:
+                    marked = []
+                    for i in targets:
+                        metadata = dict(batch.metadatas[i], deleted_at=now.isoformat(),
+                                        deleted_by=self.storage.machine_id, deletion_reason=reason,
+                                        recoverable_until=(now + timedelta(days=30)).isoformat())
+                        marked.append(metadata)
+                        if pipe is not None:
+                            pipe.setex(f"deleted_memory:{batch.ids[i]}", RECYCLE_TTL_SECONDS, json.dumps({
+                                "memory_id": batch.ids[i],
+                                "content": batch.documents[i],
+                                "metadata": metadata,
+                                "deleted_at": now.isoformat(),
+                                "recoverable_until": metadata['recoverable_until']
+                            }))
+                    for start in range(0, len(ids), self.batch_size):
+                        collection.update(ids=ids[start:start + self.batch_size],
+                                          metadatas=marked[start:start + self.batch_size])
+                        job.round_trips += 1
+            except Exception as e:
+                for memory_id in ids:
+                    job.fail(memory_id, str(e))
+                continue
+            job.succeed(len(ids))
+            removed_ids.extend(ids)
+            removed_records.extend((batch.documents[i], dict(batch.metadatas[i], category=category))
+                                   for i in targets)
+
+        self.storage.hot_cache.invalidate_many(removed_ids)
+        for memory_id in removed_ids:
+            if pipe is not None:
+                pipe.delete(f"memory:{memory_id}")
+                if hard:
+                    pipe.delete(f"deleted_memory:{memory_id}")
+        if hard:
+            self.storage.memory_locator.remove_many(removed_ids)
+        self._execute_pipeline(pipe)
+        self.storage.analytics.record_removed(removed_records, event='deleted')
+        return removed_ids
+
+    def _tag(self, job: BulkJob, memory_ids: List[str], parameters: Dict[str, Any]):
+        tags = parse_tags(parameters.get('tags'))
+        mode = parameters.get('mode', 'add')
+        resolved, missing = self.resolve(memory_ids, ['documents', 'metadatas'], job)
+        for memory_id in missing:
+            job.fail(memory_id, "Memory not found")
+
+        pipe = self._redis_pipeline()
+        replaced = []
+        now = datetime.now().isoformat()
+        for category, batch in resolved.items():
+            updated = []
+            for metadata in batch.metadatas:
+                current = [tag.strip() for tag in str(metadata.get('tags') or '').split(',') if tag.strip()]
+                if mode == 'set':
+                    new_tags = tags
+                elif mode == 'remove':
+                    new_tags = [tag for tag in current if tag not in tags]
+                else:
+                    new_tags = current + [tag for tag in tags if tag not in current]
+                updated.append(dict(metadata, tags=",".join(new_tags), updated_at=now,
+                                    updated_by=self.storage.machine_id))
+            if not self._update(job, category, batch, updated):
+                continue
+            self.storage.hot_cache.invalidate_many(batch.ids)
+            for memory_id in batch.ids:
+                if pipe is not None:
+                    pipe.delete(f"memory:{memory_id}")
+            replaced.extend(((document, dict(old, category=category)), (document, dict(new, category=category)))
+                            for document, old, new in zip(batch.documents, batch.metadatas, updated))
+        self._execute_pipeline(pipe)
+        self.storage.analytics.record_replaced_many(replaced, event='tagged')
+
+    def _update(self, job: BulkJob, category: str, batch: ResolvedBatch, metadatas: List[Dict[str, Any]]) -> bool:
+        collection = self.storage.collections[category]
+        try:
+            for start in range(0, len(batch.ids), self.batch_size):
+                collection.update(ids=batch.ids[start:start + self.batch_size],
+                                  metadatas=metadatas[start:start + self.batch_size])
+                job.round_trips += 1
+        except Exception as e:
+            for memory_id in batch.ids:
+                job.fail(memory_id, str(e))
+            return False
+        job.succeed(len(batch.ids))
+        return True
+
+    def _categorize(self, job: BulkJob, memory_ids: List[str], parameters: Dict[str, Any]):
+        target = parameters.get('category')
+        if target not in self.storage.collections:
+            raise BulkOperationError(f"Unknown category: {target}")
+        resolved, missing = self.resolve(memory_ids, ['documents', 'metadatas', 'embeddings'], job)
+        for memory_id in missing:
+            job.fail(memory_id, "Memory not found")
+
+        pipe = self._redis_pipeline()
+        replaced = []
+        moved: Dict[str, str] = {}
+        target_collection = self.storage.collections[target]
+        now = datetime.now().isoformat()
+        for category, batch in resolved.items():
+            if category == target:
+                job.succeed(len(batch.ids))  # Already there
+                continue
+            metadatas = [dict(metadata, category=target, updated_at=now, updated_by=self.storage.machine_id)
+                         for metadata in batch.metadatas]
+            try:
+                # Add to the target before deleting from the source, reusing the stored embeddings
+                for start in range(0, len(batch.ids), self.batch_size):
+                    end = start + self.batch_size
+                    add_kwargs = {'ids': batch.ids[start:end], 'documents': batch.documents[start:end],
+                                  'metadatas': metadatas[start:end]}
+                    embeddings = batch.embeddings[start:end]
+                    if all(embedding is not None for embedding in embeddings):
+                        add_kwargs['embeddings'] = [list(embedding) for embedding in embeddings]
+                    target_collection.add(**add_kwargs)
+                    job.round_trips += 1
+                for chunk in self._chunks(batch.ids):
+                    self.storage.collections[category].delete(ids=chunk)
+                    job.round_trips += 1
+            except Exception as e:
+                for memory_id in batch.ids:
+                    job.fail(memory_id, str(e))
+                continue
+            job.succeed(len(batch.ids))
+            self.storage.hot_cache.invalidate_many(batch.ids)
+            for memory_id in batch.ids:
+                moved[memory_id] = target
+                if pipe is not None:
+                    pipe.delete(f"memory:{memory_id}")
+            replaced.extend(((document, dict(old, category=category)), (document, new))
+                            for document, old, new in zip(batch.documents, batch.metadatas, metadatas))
+        self.storage.memory_locator.set_many(moved)
+        self._execute_pipeline(pipe)
+        self.storage.analytics.record_replaced_many(replaced, event='categorized')
+
+    def _execute_pipeline(self, pipe):
+        if pipe is None or not len(pipe):
+            return
+        try:
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Bulk operation Redis update failed: {e}")
+
+    # Jobs
+
+    def _new_job(self, operation: str, total: int) -> BulkJob:
+        job = BulkJob(job_id=str(uuid.uuid4()), operation=operation, total=total)
+        self.jobs[job.job_id] = job
+        while len(self.jobs) > self.max_jobs:
+            oldest = next(iter(self.jobs.values()))
+            if oldest.status == "running":
+                break
+            self.jobs.popitem(last=False)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        return job.to_dict() if job else None
+
+    async def _execute(self, job: BulkJob, memory_ids: List[str], parameters: Dict[str, Any]):
+        handler = {'delete': self._delete, 'tag': self._tag, 'categorize': self._categorize}[job.operation]
+        removed_ids = None
+        try:
+            removed_ids = await asyncio.get_event_loop().run_in_executor(None, handler, job, memory_ids, parameters)
+            job.status = "completed"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error(f"💥 Bulk {job.operation} failed: {e}")
+        job.finished_at = time.time()
+        await self._audit(job, memory_ids, parameters)
+        if job.operation == 'delete' and removed_ids:
+            await self.storage._broadcast_bulk_deletion_event(
+                removed_ids, "bulk_hard_delete" if parameters.get('hard_delete') else "bulk_soft_delete",
+                parameters.get('reason', 'Bulk deletion'), job_id=job.job_id
+            )
+        logger.info(f"📦 Bulk {job.operation}: {job.succeeded}/{job.total} succeeded in "
+                    f"{job.round_trips} ChromaDB round trips ({job.finished_at - job.started_at:.2f}s)")
+
+    async def _audit(self, job: BulkJob, memory_ids: List[str], parameters: Dict[str, Any]):
+        """One audit record per job: counts, a sample of IDs and a digest of the full ID list"""
+        record = {
+            "action": f"bulk_{job.operation}",
+            "job_id": job.job_id,
+            "status": job.status,
+            "parameters": parameters,
+            "requested": job.total,
+            "succeeded": job.succeeded,
+            "failed": job.failed,
+            "memory_ids_sample": memory_ids[:AUDIT_SAMPLE_IDS],
+            "memory_ids_sha256": hashlib.sha256("\n".join(sorted(memory_ids)).encode()).hexdigest(),
+            "timestamp": datetime.now().isoformat(),
+            "machine_id": self.storage.machine_id
+        }
+        if job.operation == 'delete':
+            await self.storage._log_deletion_audit(record, audit_type="bulk_delete")
+        else:
+            await self.storage._log_operation_audit(record, audit_type=f"bulk_{job.operation}",
+                                                    operation=job.operation)
+
+    async def run(self, operation: str, memory_ids: List[str], parameters: Optional[Dict[str, Any]] = None,
+                  background: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Apply a delete, tag or categorize operation to memory_ids.
+
+        Jobs at or above background_threshold return immediately with a job_id
+        whose progress is available from get_job(); smaller jobs are awaited.
+        """
+        parameters = parameters or {}
+        if operation not in BULK_OPERATIONS or operation == 'export':
+            raise BulkOperationError(f"Unknown bulk operation: {operation}")
+        if operation == 'tag':
+            if parameters.get('mode', 'add') not in TAG_MODES:
+                raise BulkOperationError(f"mode must be one of {', '.join(TAG_MODES)}")
+            if not parse_tags(parameters.get('tags')) and parameters.get('mode', 'add') != 'set':
+                raise BulkOperationError("tags required")
+        if operation == 'categorize' and parameters.get('category') not in self.storage.collections:
+            raise BulkOperationError(f"Unknown category: {parameters.get('category')}")
+
+        memory_ids = list(dict.fromkeys(memory_ids))
+        job = self._new_job(operation, len(memory_ids))
+        task = asyncio.ensure_future(self._execute(job, memory_ids, parameters))
+        if background is None:
+            background = len(memory_ids) >= self.background_threshold
+        if not background:
+            await task
+        return job.to_dict()
+
+    async def export(self, memory_ids: List[str]) -> AsyncIterator[bytes]:
+        """Stream memories as NDJSON, resolving batch_size IDs at a time; missing IDs get an error line"""
+        memory_ids = list(dict.fromkeys(memory_ids))
+        job = self._new_job('export', len(memory_ids))
+        loop = asyncio.get_event_loop()
+        try:
+            for chunk in self._chunks(memory_ids):
+                resolved, missing = await loop.run_in_executor(
+                    None, self.resolve, chunk, ['documents', 'metadatas'], job)
+                lines = []
+                for category, batch in resolved.items():
+                    for memory_id, document, metadata in zip(batch.ids, batch.documents, batch.metadatas):
+                        lines.append(json.dumps({"id": memory_id, "category": category, "content": document,
+                                                 "metadata": metadata}, default=str))
+                    job.succeed(len(batch.ids))
+                for memory_id in missing:
+                    job.fail(memory_id, "Memory not found")
+                    lines.append(json.dumps({"id": memory_id, "error": "Memory not found"}))
+                if lines:
+                    yield ("\n".join(lines) + "\n").encode()
+            job.status = "completed"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            raise
+        finally:
+            job.finished_at = time.time()
+            await self._audit(job, memory_ids, {})
@@ -0,0 +1,326 @@
+"""
+hAIveMind Memory Tier Cache
+
+Fast point lookups for retrieve_memory without scanning every collection.
+
+Features:
+- MemoryLocator: id -> category index kept in a Redis hash (shared by every
+  process on the machine) or a local SQLite table when Redis is unavailable
+- TinyLFU admission over an LRU: a count-min sketch tracks access frequency,
+  so frequently read memories stay resident regardless of when they were written
+- Hot entries expire after ttl_seconds and are invalidated across processes
+  through a Redis channel (sync merges, writes in another server process)
+- Per-category hit/miss accounting for each lookup tier
+"""
+
+import json
+import sqlite3
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable
+
+logger = logging.getLogger(__name__)
+
+LOCATOR_REDIS_KEY = "memory_locator"
+INVALIDATION_CHANNEL = "memory_cache:invalidate"
+
+# Lookup tiers reported in cache statistics
+LOOKUP_TIERS = ('hot', 'redis', 'locator', 'scan', 'miss')
+
+
+class MemoryLocator:
+    """Maps memory IDs to the category collection that holds them"""
+
+    def __init__(self, redis_client=None, db_path: str = "data/memory_locator.db"):
+        self.redis_client = redis_client
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        if self.redis_client is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS memory_locations (
+                        memory_id TEXT PRIMARY KEY,
+                        category TEXT NOT NULL
+                    )
+                """)
+
+    def get(self, memory_id: str) -> Optional[str]:
+        if self.redis_client is not None:
+            try:
+                return self.redis_client.hget(LOCATOR_REDIS_KEY, memory_id)
+            except Exception as e:
+                logger.debug(f"Locator lookup failed for {memory_id}: {e}")
+                return None
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute("SELECT category FROM memory_locations WHERE memory_id = ?",
+                               (memory_id,)).fetchone()
+        return row[0] if row else None
+
+    def get_many(self, memory_ids: Iterable[str]) -> Dict[str, str]:
+        """Locations for many IDs in one round trip; unknown IDs are left out"""
+        memory_ids = list(memory_ids)
+        if not memory_ids:
+            return {}
+        if self.redis_client is not None:
+            try:
+                categories = self.redis_client.hmget(LOCATOR_REDIS_KEY, memory_ids)
+            except Exception as e:
+                logger.debug(f"Locator bulk lookup failed: {e}")
+                return {}
+            return {memory_id: category for memory_id, category in zip(memory_ids, categories) if category}
+        found = {}
+        with sqlite3.connect(self.db_path) as conn:
+            for start in range(0, len(memory_ids), 500):
+                chunk = memory_ids[start:start + 500]
+                found.update(conn.execute(
+                    f"SELECT memory_id, category FROM memory_locations WHERE memory_id IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall())
+        return found
+
+    def set(self, memory_id: str, category: str):
+        self.set_many({memory_id: category})
+
+    def set_many(self, locations: Dict[str, str]):
+        if not locations:
+            return
+        if self.redis_client is not None:
+            try:
+                self.redis_client.hset(LOCATOR_REDIS_KEY, mapping=locations)
+            except Exception as e:
+                logger.debug(f"Locator update failed: {e}")
+            return
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            conn.executemany("""
+                INSERT INTO memory_locations (memory_id, category) VALUES (?, ?)
+                ON CONFLICT(memory_id) DO UPDATE SET category = excluded.category
+            """, list(locations.items()))
+
+    def remove(self, memory_id: str):
+        self.remove_many([memory_id])
+
+    def remove_many(self, memory_ids: Iterable[str]):
+        memory_ids = list(memory_ids)
+        if not memory_ids:
+            return
+        if self.redis_client is not None:
+            try:
+                self.redis_client.hdel(LOCATOR_REDIS_KEY, *memory_ids)
+            except Exception as e:
+                logger.debug(f"Locator removal failed: {e}")
+            return
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            conn.executemany("DELETE FROM memory_locations WHERE memory_id = ?",
+                             [(memory_id,) for memory_id in memory_ids])
+
+
+class FrequencySketch:
+    """Count-min sketch with periodic halving so old popularity fades"""
+
+    def __init__(self, width: int = 4096, depth: int = 4, sample_size: Optional[int] = None):
+        self.width = width
+        self.depth = depth
+        self.table = [[0] * width for _ in range(depth)]
+        self.sample_size = sample_size or width * 10
+        self.additions = 0
+
+    def _indexes(self, key: str):
+        h = hash(key)
+        for i in range(self.depth):
+            yield i, (h ^ (h >> (8 * (i + 1))) ^ (i * 0x9E3779B1)) % self.width
+
+    def increment(self, key: str):
+        for row, col in self._indexes(key):
+            if self.table[row][col] < 15:  # 4-bit counters as in TinyLFU
+                self.table[row][col] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self._reset()
+
+    def estimate(self, key: str) -> int:
+        return min(self.table[row][col] for row, col in self._indexes(key))
+
+    def _reset(self):
+        for row in self.table:
+            for col in range(self.width):
+                row[col] >>= 1
+        self.additions //= 2
+
+
+class TinyLFUCache:
+    """LRU cache whose admission is gated by estimated access frequency"""
+
+    def __init__(self, capacity: int = 2048):
+        self.capacity = capacity
+        self.sketch = FrequencySketch(width=max(64, capacity * 4))
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.admissions = 0
+        self.rejections = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            self.sketch.increment(key)
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any) -> bool:
+        """Insert if the candidate is at least as popular as the LRU victim"""
+        with self._lock:
+            if key in self._data:
+                self._data[key] = value
+                self._data.move_to_end(key)
+                return True
+            if len(self._data) >= self.capacity:
+                victim = next(iter(self._data))
+                if self.sketch.estimate(key) < self.sketch.estimate(victim):
+                    self.rejections += 1
+                    return False
+                del self._data[victim]
+                self.evictions += 1
+            self._data[key] = value
+            self.admissions += 1
+            return True
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_many(self, keys: Iterable[str]) -> int:
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def publish_invalidations(redis_client, memory_ids: Iterable[str]):
+    """Tell every process's hot cache to drop these memories"""
+    memory_ids = list(memory_ids)
+    if redis_client is None or not memory_ids:
+        return
+    try:
+        redis_client.publish(INVALIDATION_CHANNEL, json.dumps(memory_ids))
+    except Exception as e:
+        logger.debug(f"Hot cache invalidation publish failed: {e}")
+
+
+def _copy_memory(memory: Dict[str, Any]) -> Dict[str, Any]:
+    # Chroma metadata values are primitives, so one level of copying isolates callers
+    copied = dict(memory)
+    if isinstance(copied.get('metadata'), dict):
+        copied['metadata'] = dict(copied['metadata'])
+    return copied
+
+
+class HotMemoryCache:
+    """Frequency-admitted memory cache with per-category tier statistics"""
+
+    def __init__(self, capacity: int = 2048, ttl_seconds: float = 300):
+        self.cache = TinyLFUCache(capacity)
+        self.ttl_seconds = ttl_seconds
+        self.redis_client = None
+        self._pubsub = None
+        self._listener = None
+        self.expirations = 0
+        self.remote_invalidations = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'HotMemoryCache':
+        settings = config.get('memory', {}).get('hot_cache', {}) or {}
+        return cls(capacity=settings.get('capacity', 2048), ttl_seconds=settings.get('ttl_seconds', 300))
+
+    def attach(self, redis_client):
+        """Share invalidations with other processes through Redis pub/sub"""
+        if redis_client is None or self._listener is not None:
+            return
+        self.redis_client = redis_client
+        try:
+            self._pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(**{INVALIDATION_CHANNEL: self._on_invalidation})
+            self._listener = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        except Exception as e:
+            logger.warning(f"⚠️ Hot cache invalidation listener unavailable, relying on TTL: {e}")
+            self._pubsub = None
+
+    def _on_invalidation(self, message: Dict[str, Any]):
+        try:
+            memory_ids = json.loads(message['data'])
+        except (TypeError, ValueError, KeyError):
+            return
+        self.remote_invalidations += self.cache.invalidate_many(memory_ids)
+
+    def close(self):
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+
+    def get(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """A copy of the cached memory, or None if absent or older than ttl_seconds"""
+        entry = self.cache.get(memory_id)
+        if entry is None:
+            return None
+        expires_at, memory = entry
+        if expires_at <= time.monotonic():
+            self.cache.invalidate(memory_id)
+            self.expirations += 1
+            return None
+        return _copy_memory(memory)
+
+    def offer(self, memory: Dict[str, Any]) -> bool:
+        """Offer a freshly loaded memory for admission"""
+        return self.cache.put(memory['id'], (time.monotonic() + self.ttl_seconds, _copy_memory(memory)))
+
+    def invalidate(self, memory_id: str):
+        self.invalidate_many([memory_id])
+
+    def invalidate_many(self, memory_ids: Iterable[str]):
+        """Drop memories here and in every other attached process"""
+        memory_ids = list(memory_ids)
+        self.cache.invalidate_many(memory_ids)
+        publish_invalidations(self.redis_client, memory_ids)
+
+    def record(self, category: Optional[str], tier: str):
+        """Count a lookup answered by tier ('hot', 'redis', 'locator', 'scan', 'miss')"""
+        category = category or 'unknown'
+        with self._stats_lock:
+            counts = self._stats.setdefault(category, dict.fromkeys(LOOKUP_TIERS, 0))
+            counts[tier] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            per_category = {}
+            for category, counts in self._stats.items():
+                lookups = sum(counts.values())
+                per_category[category] = {
+                    **counts,
+                    'lookups': lookups,
+                    'hot_hit_ratio': counts['hot'] / lookups if lookups else 0.0,
+                    'scan_ratio': counts['scan'] / lookups if lookups else 0.0,
+                }
+        return {
+            'size': len(self.cache),
+            'capacity': self.cache.capacity,
+            'admissions': self.cache.admissions,
+            'rejections': self.cache.rejections,
+            'evictions': self.cache.evictions,
+            'expirations': self.expirations,
+            'remote_invalidations': self.remote_invalidations,
+            'ttl_seconds': self.ttl_seconds,
+            'categories': per_category,
+        }
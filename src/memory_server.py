@@ -14,13 +14,11 @@ import uuid
 import re
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 import logging
 import socket
 
 import redis
-import chromadb
-from chromadb.config import Settings
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import (
@@ -80,11 +78,30 @@ except ImportError as e:
 try:
     from confidence_system import ConfidenceSystem
     from confidence_mcp_tools import get_confidence_tools, ConfidenceMCPTools
+    from confidence_recompute import ConfidenceRecomputeScheduler
     CONFIDENCE_AVAILABLE = True
 except ImportError as e:
     CONFIDENCE_AVAILABLE = False
     logger.warning(f"Confidence system not available: {e}")
 
+# Import memory locator and hot-set cache for point lookups
+from memory_cache import MemoryLocator, HotMemoryCache
+from telemetry_queue import TelemetryQueue, TelemetryEvent
+from response_encoder import ResponseEncoder
+from memory_analytics import MemoryAnalytics
+from memory_bulk_ops import BulkMemoryOperations
+from chroma_registry import shared_chroma
+from metrics import (REGISTRY as METRICS, InstrumentedCollection, InstrumentedRedis,
+                     instrument_dispatch, instrument_sqlite, start_http_server as start_metrics_server)
+
+# Import Hybrid Search Ranking (similarity + confidence + freshness)
+try:
+    from hybrid_search import HybridRanker, HybridRankingConfig, ConfidenceScoreCache
+    HYBRID_SEARCH_AVAILABLE = True
+except ImportError as e:
+    HYBRID_SEARCH_AVAILABLE = False
+    logger.warning(f"Hybrid search ranking not available: {e}")
+
 # Import Memory Format System for token optimization
 try:
     from memory_format_system import get_format_system, FORMAT_VERSION, FORMAT_GUIDE_COMPACT
@@ -142,6 +159,37 @@ class MemoryStorage:
         if config['storage']['redis']['enable_cache']:
             self._init_redis()
         
+        # id -> category locator and frequency-admitted hot cache for retrieve_memory
+        self.memory_locator = MemoryLocator(
+            self.redis_client,
+            config['storage'].get('locator_db', 'data/memory_locator.db')
+        )
+        self.hot_cache = HotMemoryCache.from_config(config)
+        # Writes here, in other server processes and sync merges invalidate every process's hot cache
+        self.hot_cache.attach(self.redis_client)
+
+        # Set by MemoryMCPServer when confidence scoring is on; reads bump recompute priority
+        self.confidence_system = None
+
+        # Write-behind channel so telemetry memories never block request handling
+        self.telemetry = TelemetryQueue.from_config(config, self.store_memories_batch)
+
+        # Projects and packs memory tool results into compact, token-budgeted JSON
+        self.response_encoder = ResponseEncoder.from_config(config)
+
+        # Incremental counters behind the analytics dashboard
+        self.analytics = MemoryAnalytics.from_config(config)
+
+        # Batched delete/tag/categorize/export over many memory IDs
+        self.bulk_ops = BulkMemoryOperations.from_config(self, config)
+
+        # Latency histograms for pooled SQLite queries, plus the stats above on /metrics
+        instrument_sqlite()
+        METRICS.add_collector('memory_cache', self.get_cache_stats)
+        METRICS.add_collector('telemetry_queue', self.get_telemetry_stats)
+        METRICS.add_collector('responses', self.get_response_stats)
+        METRICS.add_collector('chroma', self.chroma_client.get_stats)
+
         # Initialize agent registry
         self._init_agent_registry()
 
@@ -153,6 +201,19 @@ class MemoryStorage:
         if FORMAT_SYSTEM_AVAILABLE:
             self.format_system = get_format_system(self.redis_client)
             logger.info(f"Format system initialized (v{FORMAT_VERSION})")
+
+        # Initialize hybrid ranker (reads precomputed scores from the confidence DB)
+        self.hybrid_ranker = None
+        if HYBRID_SEARCH_AVAILABLE:
+            ranking_config = HybridRankingConfig.from_config(config)
+            if ranking_config.enabled:
+                self.hybrid_ranker = HybridRanker(
+                    ranking_config,
+                    ConfidenceScoreCache(
+                        config.get('confidence_db_path', 'data/confidence.db'),
+                        refresh_interval=ranking_config.refresh_interval
+                    )
+                )
     
     def _get_machine_id(self) -> str:
         """Get unique machine identifier"""
@@ -466,20 +527,9 @@ class MemoryStorage:
     def _init_chromadb(self):
         """Initialize ChromaDB client and collections"""
         try:
-            chroma_config = self.config['storage']['chromadb']
-            db_path = chroma_config['path']
-            
-            # Create data directory
-            Path(db_path).mkdir(parents=True, exist_ok=True)
-            
-            # Initialize persistent ChromaDB client
-            self.chroma_client = chromadb.PersistentClient(
-                path=db_path,
-                settings=Settings(
-                    anonymized_telemetry=chroma_config.get('anonymized_telemetry', False),
-                    allow_reset=True
-                )
-            )
+            # Process-wide client, collection handles and embedding model, shared with
+            # sync and rules consumers running in this process
+            self.chroma_client = shared_chroma(self.config)
             
             # Create collections for each memory category
             categories = self.config['memory']['categories']
@@ -496,7 +546,7 @@ class MemoryStorage:
                     )
                     logger.info(f"Created new collection: {collection_name}")
                 
-                self.collections[category] = collection
+                self.collections[category] = InstrumentedCollection(collection, category)
             
             logger.info(f"🧠 Memory matrix initialized - {len(self.collections)} knowledge clusters active in collective consciousness")
             
@@ -508,13 +558,13 @@ class MemoryStorage:
         """Initialize Redis connection"""
         try:
             redis_config = self.config['storage']['redis']
-            self.redis_client = redis.Redis(
+            self.redis_client = InstrumentedRedis(redis.Redis(
                 host=redis_config['host'],
                 port=redis_config['port'],
                 db=redis_config['db'],
                 password=redis_config.get('password'),
                 decode_responses=True
-            )
+            ))
             self.redis_client.ping()
             logger.info("🔗 Neural network bridge established - hive mind synchronization active")
         except Exception as e:
@@ -592,29 +642,13 @@ class MemoryStorage:
         
         return content
     
-    async def store_memory(self,
-                          content: str,
-                          category: str = "global",
-                          context: Optional[str] = None,
-                          metadata: Optional[Dict[str, Any]] = None,
-                          tags: Optional[List[str]] = None,
-                          user_id: str = "default",
-                          scope: Optional[str] = None,
-                          share_with: Optional[List[str]] = None,
-                          exclude_from: Optional[List[str]] = None,
-                          sensitive: bool = False,
-                          confidentiality_level: str = "normal") -> str:
-        """Store a memory with comprehensive system tracking and sharing control
-
-        Args:
-            confidentiality_level: Controls data distribution (default: "normal")
-                - normal: Full sync, broadcast, search visibility
-                - internal: No sync to external machines, limited broadcast
-                - confidential: Local machine only, no sync, no broadcast
-                - pii: Local only, audit logged, blocked from all external distribution
-        """
-        memory_id = str(uuid.uuid4())
-
+    def _prepare_memory(self, memory_id: str, content: str, category: str, context: Optional[str],
+                        metadata: Optional[Dict[str, Any]], tags: Optional[List[str]], user_id: str,
+                        scope: Optional[str], share_with: Optional[List[str]],
+                        exclude_from: Optional[List[str]], sensitive: bool, confidentiality_level: str,
+                        system_context: Optional[Dict[str, Any]] = None,
+                        project_context: Optional[Dict[str, Any]] = None):
+        """Apply directives, resolve the category and build full metadata for a new memory"""
         # Validate confidentiality level
         if confidentiality_level not in CONFIDENTIALITY_LEVELS:
             logger.warning(f"Invalid confidentiality_level '{confidentiality_level}', defaulting to 'normal'")
@@ -624,8 +658,8 @@ class MemoryStorage:
         content = self._apply_authorship_directives(content)
 
         # Get system and project context
-        system_context = self._get_system_context()
-        project_context = self._get_project_context()
+        system_context = system_context or self._get_system_context()
+        project_context = project_context or self._get_project_context()
 
         # Determine sharing scope and rules
         sharing_info = self._determine_sharing_scope(
@@ -642,8 +676,6 @@ class MemoryStorage:
             logger.warning(f"🤔 Unknown memory cluster '{category}' - redirecting to global hive knowledge")
             category = "global"
         
-        collection = self.collections[category]
-        
         # Prepare comprehensive metadata
         memory_metadata = {
             # Basic info
@@ -687,6 +719,148 @@ class MemoryStorage:
         if metadata:
             memory_metadata.update(metadata)
         
+        return content, category, memory_metadata
+
+    def _cache_memories_in_redis(self, entries: List[tuple]) -> None:
+        """Cache (memory_id, content, category, context, metadata, user_id) entries in one pipeline"""
+        if not self.redis_client or not entries:
+            return
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for memory_id, content, category, context, memory_metadata, user_id in entries:
+                cache_data = {
+                    'id': memory_id,
+                    'content': content,
+                    'category': category,
+                    'context': context,
+                    'metadata': json.dumps(memory_metadata),
+                    'created_at': memory_metadata['created_at']
+                }
+                
+                # Cache the memory
+                pipe.setex(f"memory:{memory_id}", 3600, json.dumps(cache_data))
+                
+                # Add to user's recent memories list
+                pipe.lpush(f"user_memories:{user_id}", memory_id)
+                pipe.expire(f"user_memories:{user_id}", 3600)
+                
+                # Add to category index
+                pipe.lpush(f"category_memories:{category}", memory_id)
+                pipe.expire(f"category_memories:{category}", 3600)
+            pipe.execute()
+            
+        except Exception as e:
+            logger.warning(f"Failed to cache memory in Redis: {e}")
+    
+    def _prepare_memory_batch(self, events: List[TelemetryEvent]) -> Dict[str, List[tuple]]:
+        """Build metadata for queued events, grouped by resolved category"""
+        system_context = self._get_system_context()
+        project_context = self._get_project_context()
+        by_category: Dict[str, List[tuple]] = {}
+        for event in events:
+            metadata = dict(event.metadata)
+            if event.occurrences > 1:
+                metadata.update({
+                    "occurrences": event.occurrences,
+                    "first_seen": datetime.fromtimestamp(event.first_seen).isoformat(),
+                    "last_seen": datetime.fromtimestamp(event.last_seen).isoformat(),
+                })
+            content, category, memory_metadata = self._prepare_memory(
+                event.memory_id, event.content, event.category, event.context, metadata, event.tags,
+                "default", event.scope, None, None, False, "normal",
+                system_context=system_context, project_context=project_context
+            )
+            by_category.setdefault(category, []).append((event.memory_id, content, category, event.context,
+                                                         memory_metadata, "default"))
+        return by_category
+
+    async def store_memories_batch(self, events: List[TelemetryEvent]) -> List[str]:
+        """Store many memories with one embedding and ChromaDB add per category
+
+        System and project context are collected once for the whole batch, off
+        the event loop. Coalesced events carry their occurrence count and time
+        span in metadata.
+        """
+        by_category = await asyncio.get_event_loop().run_in_executor(None, self._prepare_memory_batch, events)
+        stored = []
+        for category, entries in by_category.items():
+            collection = self.collections[category]
+            await asyncio.wait_for(
+                asyncio.get_event_loop().run_in_executor(
+                    None,
+                    lambda: collection.add(
+                        documents=[entry[1] for entry in entries],
+                        metadatas=[_serialize_metadata(entry[4]) for entry in entries],
+                        ids=[entry[0] for entry in entries]
+                    )
+                ),
+                timeout=60.0
+            )
+            for entry in entries:
+                self.memory_locator.set(entry[0], category)
+            self._cache_memories_in_redis(entries)
+            self.analytics.record_added([(entry[1], entry[4]) for entry in entries])
+            stored.extend(entry[0] for entry in entries)
+        
+        logger.debug(f"📝 Telemetry batch of {len(stored)} memories absorbed into hive mind")
+        return stored
+    
+    def store_telemetry(self,
+                        content: str,
+                        category: str = "global",
+                        context: Optional[str] = None,
+                        metadata: Optional[Dict[str, Any]] = None,
+                        tags: Optional[List[str]] = None,
+                        scope: Optional[str] = None,
+                        durable: bool = False) -> Optional[str]:
+        """Queue a telemetry memory for write-behind storage without awaiting it
+
+        Identical events pending in the queue are coalesced. Under overload the
+        oldest droppable events are shed. Returns the memory ID, or None when the
+        event was not queued; a durable event (audit record) that gets None back
+        must be written with store_memory instead.
+        """
+        return self.telemetry.enqueue(TelemetryEvent(
+            memory_id=str(uuid.uuid4()), content=content, category=category, context=context,
+            metadata=metadata or {}, tags=tags or [], scope=scope, durable=durable
+        ))
+    
+    async def flush_telemetry(self) -> int:
+        """Write all pending telemetry now (used on shutdown and in tests)"""
+        return await self.telemetry.flush()
+    
+    def get_telemetry_stats(self) -> Dict[str, Any]:
+        """Queue depth plus enqueued, coalesced, dropped and written counters"""
+        return self.telemetry.get_stats()
+    
+    async def store_memory(self,
+                          content: str,
+                          category: str = "global",
+                          context: Optional[str] = None,
+                          metadata: Optional[Dict[str, Any]] = None,
+                          tags: Optional[List[str]] = None,
+                          user_id: str = "default",
+                          scope: Optional[str] = None,
+                          share_with: Optional[List[str]] = None,
+                          exclude_from: Optional[List[str]] = None,
+                          sensitive: bool = False,
+                          confidentiality_level: str = "normal") -> str:
+        """Store a memory with comprehensive system tracking and sharing control
+
+        Args:
+            confidentiality_level: Controls data distribution (default: "normal")
+                - normal: Full sync, broadcast, search visibility
+                - internal: No sync to external machines, limited broadcast
+                - confidential: Local machine only, no sync, no broadcast
+                - pii: Local only, audit logged, blocked from all external distribution
+        """
+        memory_id = str(uuid.uuid4())
+        content, category, memory_metadata = self._prepare_memory(
+            memory_id, content, category, context, metadata, tags, user_id, scope,
+            share_with, exclude_from, sensitive, confidentiality_level
+        )
+        collection = self.collections[category]
+        
         # Store in ChromaDB (embedding is generated automatically) with timeout protection
         try:
             await asyncio.wait_for(
@@ -702,41 +876,47 @@ class MemoryStorage:
             )
             
             logger.info(f"📝 Knowledge absorbed into hive mind - memory {memory_id} integrated into {category} cluster")
+            self.memory_locator.set(memory_id, category)
+            self.analytics.record_added([(content, memory_metadata)])
             
         except Exception as e:
             logger.error(f"💥 Memory integration failed: {e} - knowledge lost to the void")
             raise
         
-        # Cache in Redis for fast access
-        if self.redis_client:
-            try:
-                cache_data = {
-                    'id': memory_id,
-                    'content': content,
-                    'category': category,
-                    'context': context,
-                    'metadata': json.dumps(memory_metadata),
-                    'created_at': memory_metadata['created_at']
-                }
-                
-                # Cache the memory
-                self.redis_client.setex(f"memory:{memory_id}", 3600, json.dumps(cache_data))
-                
-                # Add to user's recent memories list
-                self.redis_client.lpush(f"user_memories:{user_id}", memory_id)
-                self.redis_client.expire(f"user_memories:{user_id}", 3600)
-                
-                # Add to category index
-                self.redis_client.lpush(f"category_memories:{category}", memory_id)
-                self.redis_client.expire(f"category_memories:{category}", 3600)
-                
-            except Exception as e:
-                logger.warning(f"Failed to cache memory in Redis: {e}")
+        self._cache_memories_in_redis([(memory_id, content, category, context, memory_metadata, user_id)])
         
         return memory_id
     
     async def retrieve_memory(self, memory_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve a specific memory by ID"""
+        """Retrieve a specific memory by ID
+
+        Lookup order: hot cache, Redis write cache, locator-directed collection
+        get, and finally a scan of every collection (which backfills the locator).
+        """
+        memory = await self._lookup_memory(memory_id)
+        if memory:
+            self._record_access([memory_id])
+        return memory
+
+    def _record_access(self, memory_ids: List[str]):
+        """Bump confidence access counters in the background so reads never wait on SQLite"""
+        if self.confidence_system is None or not memory_ids:
+            return
+
+        def _done(future):
+            if future.exception():
+                logger.debug(f"Failed to record memory access: {future.exception()}")
+
+        asyncio.get_running_loop().run_in_executor(
+            None, self.confidence_system.record_access, memory_ids
+        ).add_done_callback(_done)
+
+    async def _lookup_memory(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        hot = self.hot_cache.get(memory_id)
+        if hot is not None:
+            self.hot_cache.record(hot['category'], 'hot')
+            return hot
+
         # Try Redis cache first
         if self.redis_client:
             try:
@@ -751,7 +931,7 @@ class MemoryStorage:
                     if metadata.get('deleted_at'):
                         return None
                         
-                    return {
+                    memory = {
                         'id': cache_data['id'],
                         'content': cache_data['content'],
                         'category': cache_data['category'],
@@ -759,34 +939,149 @@ class MemoryStorage:
                         'metadata': metadata,
                         'created_at': cache_data['created_at']
                     }
+                    self.hot_cache.record(memory['category'], 'redis')
+                    self.hot_cache.offer(memory)
+                    return memory
             except Exception as e:
                 logger.warning(f"Failed to retrieve from Redis cache: {e}")
         
+        # Go straight to the owning collection when the locator knows it
+        located = self.memory_locator.get(memory_id)
+        if located in self.collections:
+            memory, found = self._get_from_collection(located, memory_id)
+            if found:
+                self.hot_cache.record(located, 'locator')
+                if memory:
+                    self.hot_cache.offer(memory)
+                return memory
+        
         # Search all collections for the memory
-        for category, collection in self.collections.items():
-            try:
-                result = collection.get(ids=[memory_id])
-                if result['documents']:
-                    metadata = result['metadatas'][0] if result['metadatas'] else {}
-                    
-                    # Check if memory is soft deleted
-                    if metadata.get('deleted_at'):
-                        return None
-                        
-                    return {
-                        'id': memory_id,
-                        'content': result['documents'][0],
-                        'category': category,
-                        'context': metadata.get('context', ''),
-                        'metadata': metadata,
-                        'created_at': metadata.get('created_at', metadata.get('timestamp', ''))
-                    }
-            except Exception as e:
-                logger.debug(f"Memory {memory_id} not found in {category}: {e}")
+        for category in self.collections:
+            if category == located:
                 continue
+            memory, found = self._get_from_collection(category, memory_id)
+            if found:
+                self.memory_locator.set(memory_id, category)
+                self.hot_cache.record(category, 'scan')
+                if memory:
+                    self.hot_cache.offer(memory)
+                return memory
         
+        self.hot_cache.record(None, 'miss')
         return None
     
+    def _get_from_collection(self, category: str, memory_id: str):
+        """Fetch a memory from one collection; returns (memory or None, found)"""
+        try:
+            result = self.collections[category].get(ids=[memory_id])
+        except Exception as e:
+            logger.debug(f"Memory {memory_id} not found in {category}: {e}")
+            return None, False
+        if not result['documents']:
+            return None, False
+        
+        metadata = result['metadatas'][0] if result['metadatas'] else {}
+        
+        # Check if memory is soft deleted
+        if metadata.get('deleted_at'):
+            return None, True
+        
+        return {
+            'id': memory_id,
+            'content': result['documents'][0],
+            'category': category,
+            'context': metadata.get('context', ''),
+            'metadata': metadata,
+            'created_at': metadata.get('created_at', metadata.get('timestamp', ''))
+        }, True
+
+    async def get_memories(self, memory_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Retrieve several memories by ID; deleted or unknown IDs are left out
+
+        Hot cache hits are served directly; the rest are fetched with one
+        collection get per category the locator knows, falling back to
+        retrieve_memory for IDs it does not.
+        """
+        found = {}
+        by_category: Dict[str, List[str]] = {}
+        unlocated = []
+        for memory_id in memory_ids:
+            hot = self.hot_cache.get(memory_id)
+            if hot is not None:
+                self.hot_cache.record(hot['category'], 'hot')
+                found[memory_id] = hot
+                continue
+            located = self.memory_locator.get(memory_id)
+            if located in self.collections:
+                by_category.setdefault(located, []).append(memory_id)
+            else:
+                unlocated.append(memory_id)
+
+        loop = asyncio.get_event_loop()
+        for category, ids in by_category.items():
+            collection = self.collections[category]
+            try:
+                result = await loop.run_in_executor(None, lambda: collection.get(ids=ids))
+            except Exception as e:
+                logger.debug(f"Batch get from {category} failed: {e}")
+                unlocated.extend(ids)
+                continue
+            returned = set()
+            for memory_id, doc, metadata in zip(result['ids'], result['documents'], result['metadatas']):
+                returned.add(memory_id)
+                metadata = metadata or {}
+                if metadata.get('deleted_at'):
+                    continue
+                memory = {
+                    'id': memory_id,
+                    'content': doc,
+                    'category': category,
+                    'context': metadata.get('context', ''),
+                    'metadata': metadata,
+                    'created_at': metadata.get('created_at', metadata.get('timestamp', ''))
+                }
+                self.hot_cache.record(category, 'locator')
+                self.hot_cache.offer(memory)
+                found[memory_id] = memory
+            unlocated.extend(memory_id for memory_id in ids if memory_id not in returned)
+
+        for memory_id in unlocated:
+            memory = await self.retrieve_memory(memory_id)
+            if memory:
+                found[memory_id] = memory
+        return found
+
+    @staticmethod
+    def _analytics_record(memory: Dict[str, Any]) -> tuple:
+        """(content, metadata) of a retrieved memory for the analytics counters"""
+        metadata = dict(memory.get('metadata') or {})
+        metadata.setdefault('category', memory.get('category'))
+        return memory.get('content'), metadata
+
+    def _invalidate_memory(self, memory_id: str, category: Optional[str] = None, removed: bool = False):
+        """Keep the hot cache and locator consistent after a write"""
+        self.hot_cache.invalidate(memory_id)
+        if removed:
+            self.memory_locator.remove(memory_id)
+        elif category:
+            self.memory_locator.set(memory_id, category)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hot cache size and per-category hit ratios"""
+        return self.hot_cache.get_stats()
+
+    def get_response_stats(self) -> Dict[str, Any]:
+        """Per-tool response sizes and serialization times"""
+        return self.response_encoder.get_stats()
+
+    def get_memory_analytics(self) -> Dict[str, Any]:
+        """Dashboard analytics from the incremental counters (no collection scan)"""
+        return self.analytics.summary()
+
+    async def rebuild_memory_analytics(self) -> Dict[str, Any]:
+        """Recompute the analytics counters with one streaming scan of every collection"""
+        return await asyncio.get_event_loop().run_in_executor(None, self.analytics.rebuild, self.collections)
+    
     async def search_memories(self,
                              query: str,
                              category: Optional[str] = None,
@@ -798,14 +1093,27 @@ class MemoryStorage:
                              from_machines: Optional[List[str]] = None,
                              exclude_machines: Optional[List[str]] = None,
                              exclude_confidential: bool = False,
-                             max_confidentiality_level: Optional[str] = None) -> List[Dict[str, Any]]:
+                             max_confidentiality_level: Optional[str] = None,
+                             rank_by_confidence: Optional[bool] = None,
+                             min_confidence: Optional[float] = None,
+                             ranking_weights: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
         """Search memories with comprehensive filtering including machine, project, and sharing scope
 
         Args:
             exclude_confidential: If True, exclude confidential and pii level memories (for remote/public contexts)
             max_confidentiality_level: Maximum confidentiality level to include (normal, internal, confidential, pii)
+            rank_by_confidence: Blend similarity with confidence and freshness (defaults to
+                memory.hybrid_ranking.enabled; forced on when min_confidence is given)
+            min_confidence: Drop candidates below this confidence before truncation
+            ranking_weights: Per-call overrides for similarity/confidence/freshness weights
         """
         memories = []
+
+        use_hybrid = self.hybrid_ranker is not None and (
+            rank_by_confidence is not False or min_confidence is not None
+        )
+        # Over-fetch candidates so the confidence-aware re-rank has room to reorder
+        n_candidates = self.hybrid_ranker.candidate_count(limit) if use_hybrid else min(limit, 50)
         
         # Get current context
         current_project = self._get_project_context()
@@ -847,7 +1155,7 @@ class MemoryStorage:
                         None,
                         lambda: collection.query(
                             query_texts=[query],
-                            n_results=min(limit, 50),  # ChromaDB limit per query
+                            n_results=n_candidates,
                             where=where_filter if where_filter else None
                         )
                     ),
@@ -908,9 +1216,16 @@ class MemoryStorage:
                 logger.error(f"Search failed in collection {cat_name}: {e}")
                 continue
         
-        # Sort by relevance score and limit results
-        memories.sort(key=lambda x: x.get('score', 0), reverse=True)
-        return memories[:limit]
+        if use_hybrid:
+            memories = self.hybrid_ranker.rank(memories, limit, min_confidence=min_confidence,
+                                               weights=ranking_weights)
+        else:
+            # Sort by relevance score and limit results
+            memories.sort(key=lambda x: x.get('score', 0), reverse=True)
+            memories = memories[:limit]
+
+        self._record_access([m['id'] for m in memories])
+        return memories
     
     async def get_recent_memories(self,
                                  user_id: Optional[str] = None,
@@ -2103,6 +2418,9 @@ class MemoryStorage:
                     except Exception as e:
                         logger.warning(f"Failed to delete from collection {collection_name}: {e}")
                 
+                self._invalidate_memory(memory_id, removed=True)
+                self.analytics.record_removed([self._analytics_record(memory)])
+                
                 # Remove from Redis cache
                 if self.redis_client:
                     try:
@@ -2147,6 +2465,9 @@ class MemoryStorage:
                     'recoverable_until': (current_time + timedelta(days=30)).isoformat()
                 })
                 
+                self._invalidate_memory(memory_id)
+                self.analytics.record_removed([self._analytics_record(memory)], event='soft_deleted')
+                
                 # Update in ChromaDB with soft delete markers
                 for collection_name, collection in self.collections.items():
                     try:
@@ -2306,6 +2627,10 @@ class MemoryStorage:
                     logger.error(f"Failed to update memory in collection: {e}")
                     return {"error": f"Failed to update memory: {e}", "memory_id": memory_id}
 
+            self._invalidate_memory(memory_id, new_category)
+            self.analytics.record_replaced(self._analytics_record(existing_memory),
+                                           (updated_content, dict(updated_metadata, category=new_category)))
+
             # Update Redis cache
             if self.redis_client:
                 try:
@@ -2441,6 +2766,8 @@ class MemoryStorage:
                 logger.error(f"Failed to update confidentiality in ChromaDB: {e}")
                 return {"error": f"Failed to update: {e}", "memory_id": memory_id}
 
+            self._invalidate_memory(memory_id)
+
             # Update Redis cache
             if self.redis_client:
                 try:
@@ -2560,36 +2887,10 @@ class MemoryStorage:
                     "message": "No memories found matching the criteria"
                 }
             
-            # Perform deletions
-            deleted_count = 0
-            failed_deletions = []
-            
-            for memory in matching_memories:
-                try:
-                    result = await self.delete_memory(
-                        memory['id'], 
-                        hard_delete=hard_delete, 
-                        reason=f"{reason} (bulk operation)"
-                    )
-                    if result.get('success'):
-                        deleted_count += 1
-                    else:
-                        failed_deletions.append({
-                            'memory_id': memory['id'],
-                            'error': result.get('error', 'Unknown error')
-                        })
-                except Exception as e:
-                    failed_deletions.append({
-                        'memory_id': memory['id'],
-                        'error': str(e)
-                    })
-            
-            # Log bulk deletion event
-            bulk_log = {
-                "action": "bulk_delete",
-                "deleted_count": deleted_count,
-                "failed_count": len(failed_deletions),
+            # One batched job: a get/update (or delete) per collection and a single audit record
+            job = await self.bulk_ops.run('delete', [memory['id'] for memory in matching_memories], {
                 "hard_delete": hard_delete,
+                "reason": f"{reason} (bulk operation)",
                 "filters": {
                     "category": category,
                     "project": project,
@@ -2597,19 +2898,14 @@ class MemoryStorage:
                     "date_from": date_from,
                     "date_to": date_to,
                     "tags": tags
-                },
-                "reason": reason,
-                "timestamp": datetime.now().isoformat(),
-                "machine_id": self.machine_id
-            }
-            
-            await self._log_deletion_audit(bulk_log)
+                }
+            }, background=False)
             
             return {
                 "success": True,
-                "deleted_count": deleted_count,
-                "failed_count": len(failed_deletions),
-                "failed_deletions": failed_deletions,
+                "deleted_count": job['succeeded'],
+                "failed_count": job['failed'],
+                "failed_deletions": job['errors'],
                 "action": "hard_delete" if hard_delete else "soft_delete"
             }
             
@@ -2671,6 +2967,8 @@ class MemoryStorage:
             
             # Remove from recycle bin and restore to active cache
             self.redis_client.delete(recycle_key)
+            self._invalidate_memory(memory_id, category)
+            self.analytics.record_added([(deleted_memory['content'], restored_metadata)], event='recovered')
             
             restored_memory = {
                 'id': memory_id,
@@ -2858,6 +3156,10 @@ class MemoryStorage:
                 ids=[keep_id],
                 metadatas=[_serialize_metadata(merged_metadata)]
             )
+            self._invalidate_memory(keep_id, category)
+            self.analytics.record_replaced(self._analytics_record(keep_mem),
+                                           (keep_mem['content'], dict(merged_metadata, category=category)),
+                                           event='merged')
 
             # Delete the duplicate memory
             delete_result = await self.delete_memory(
@@ -2976,25 +3278,39 @@ class MemoryStorage:
             logger.error(f"Cleanup error: {e}")
             return {"error": str(e)}
 
-    async def _log_deletion_audit(self, log_data: Dict[str, Any]) -> None:
+    async def _log_deletion_audit(self, log_data: Dict[str, Any], audit_type: str = "memory_deletion") -> None:
         """Log deletion activities for audit trails"""
+        await self._log_audit(log_data, audit_type, "Memory Deletion Audit Log", "deletion")
+
+    async def _log_operation_audit(self, log_data: Dict[str, Any], audit_type: str, operation: str) -> None:
+        """Log non-deleting memory operations (tag edits, moves, exports) for audit trails"""
+        await self._log_audit(log_data, audit_type, f"Memory {operation.title()} Audit Log", operation)
+
+    async def _log_audit(self, log_data: Dict[str, Any], audit_type: str, title: str, operation_tag: str) -> None:
+        """Store one audit record
+
+        Audit records go through the telemetry queue as durable events, so bulk
+        operations do not pay an embedding and ChromaDB write per ID; they are
+        only written inline when the queue is full.
+        """
         try:
-            audit_memory_id = str(uuid.uuid4())
-            await self.store_memory(
-                content=f"Memory Deletion Audit Log: {json.dumps(log_data, indent=2)}",
-                category="security",
-                context="audit_log",
-                metadata={
-                    "audit_type": "memory_deletion",
+            audit = {
+                "content": f"{title}: {json.dumps(log_data, indent=2)}",
+                "category": "security",
+                "context": "audit_log",
+                "metadata": {
+                    "audit_type": audit_type,
                     "action": log_data.get("action", "unknown"),
                     "machine_id": self.machine_id,
                     "timestamp": datetime.now().isoformat()
                 },
-                tags=["audit", "deletion", "compliance"],
-                scope="team-global"  # Audit logs should be widely accessible
-            )
+                "tags": ["audit", operation_tag, "compliance"],
+                "scope": "team-global"  # Audit logs should be widely accessible
+            }
+            if self.store_telemetry(durable=True, **audit) is None:
+                await self.store_memory(**audit)
         except Exception as e:
-            logger.error(f"Failed to log deletion audit: {e}")
+            logger.error(f"Failed to log {operation_tag} audit: {e}")
 
     async def _broadcast_deletion_event(self, memory_id: str, action: str, reason: str) -> None:
         """Broadcast memory deletion events to hAIveMind network"""
@@ -3028,6 +3344,37 @@ class MemoryStorage:
         except Exception as e:
             logger.error(f"Failed to broadcast deletion event: {e}")
 
+    async def _broadcast_bulk_deletion_event(self, memory_ids: List[str], action: str, reason: str,
+                                             job_id: Optional[str] = None) -> None:
+        """Broadcast one bulk deletion to the hAIveMind network, listing every deleted ID"""
+        try:
+            timestamp = datetime.now().isoformat()
+            if self.redis_client:
+                try:
+                    # Chunked so no single pub/sub message grows with the job size
+                    for start in range(0, len(memory_ids), 1000):
+                        self.redis_client.publish("claudeops:memory_events", json.dumps({
+                            "event_type": "memory_bulk_deletion",
+                            "memory_ids": memory_ids[start:start + 1000],
+                            "total": len(memory_ids),
+                            "job_id": job_id,
+                            "action": action,
+                            "reason": reason,
+                            "machine_id": self.machine_id,
+                            "timestamp": timestamp
+                        }))
+                except Exception as e:
+                    logger.warning(f"Failed to broadcast bulk deletion event: {e}")
+
+            await self.broadcast_discovery(
+                message=f"Memory {action}: {len(memory_ids)} memories (job {job_id}) - {reason}",
+                category="infrastructure",
+                severity="warning"
+            )
+
+        except Exception as e:
+            logger.error(f"Failed to broadcast bulk deletion event: {e}")
+
     async def gdpr_delete_user_data(self, user_id: str, confirm: bool = False) -> Dict[str, Any]:
         """GDPR compliant deletion of all data for a specific user (right to be forgotten)"""
         if not confirm:
@@ -3345,6 +3692,7 @@ class MemoryMCPServer:
         # Initialize Confidence System if available
         self.confidence_tools = None
         self.confidence_system = None
+        self.confidence_recompute = None
         if CONFIDENCE_AVAILABLE:
             try:
                 # Initialize the confidence system
@@ -3355,13 +3703,24 @@ class MemoryMCPServer:
                 # Initialize the MCP tools wrapper
                 self.confidence_tools = ConfidenceMCPTools(
                     system=self.confidence_system,
-                    default_agent_id=self.storage.agent_id
+                    default_agent_id=self.storage.agent_id,
+                    storage=self.storage
                 )
                 logger.info("📊 Confidence System initialized - Multi-dimensional reliability scoring active")
+                self.storage.confidence_system = self.confidence_system
+
+                # Keep stored scores current in the background
+                recompute_config = self.config.get('confidence', {}).get('recompute', {})
+                if recompute_config.get('enabled', True):
+                    self.confidence_recompute = ConfidenceRecomputeScheduler.from_config(
+                        self.confidence_system, recompute_config
+                    )
+                    self.confidence_recompute.start()
             except Exception as e:
                 logger.error(f"Failed to initialize Confidence System: {e}")
                 self.confidence_tools = None
                 self.confidence_system = None
+                self.storage.confidence_system = None
 
         # Register tools
         self._register_tools()
@@ -3443,6 +3802,7 @@ class MemoryMCPServer:
                             "category": {"type": "string", "description": "Filter by category", "enum": ["project", "conversation", "agent", "global", "infrastructure", "incidents", "deployments", "monitoring", "runbooks", "security"]},
                             "user_id": {"type": "string", "description": "Filter by user ID"},
                             "limit": {"type": "integer", "description": "Maximum results", "default": 10},
+                            "offset": {"type": "integer", "description": "Skip this many results; pass next_offset from the previous response to continue", "default": 0},
                             "semantic": {"type": "boolean", "description": "Use semantic search", "default": True},
                             "scope": {"type": "string", "description": "Search scope", "enum": ["project", "machine-local", "project-shared", "user-global"], "default": "project-shared"},
                             "include_global": {"type": "boolean", "description": "Include global memories in searches", "default": True},
@@ -4107,14 +4467,29 @@ class MemoryMCPServer:
 
             return tools
 
-        def _enhance_memory_response(data: Any, tool_name: str) -> str:
-            """Enhance memory tool responses with format guidance on first access."""
+        def _enhance_memory_response(data: Any, tool_name: str, query: Optional[str] = None,
+                                     page: Optional[Dict[str, Any]] = None,
+                                     on_omitted: Optional[Callable[[Dict[str, Any], int], None]] = None) -> str:
+            """Enhance memory tool responses with format guidance on first access.
+
+            Result lists are always encoded as {"results": [...], ...page}, with
+            the format metadata alongside rather than wrapping the list.
+            """
+            encoder = self.storage.response_encoder
+            if isinstance(data, dict):
+                data = encoder.project(tool_name, data)
+                if self.storage.format_system:
+                    data = self.storage.format_system.enhance_response(data, tool_name)
+                    return encoder.encode(tool_name, data, items_key='data', query=query)
+                return encoder.encode(tool_name, data, query=query)
+            envelope = {'results': data, **(page or {})}
             if self.storage.format_system:
-                enhanced = self.storage.format_system.enhance_response(data, tool_name)
-                return json.dumps(enhanced, indent=2)
-            return json.dumps(data, indent=2)
+                envelope['_haivemind_meta'] = self.storage.format_system.enhance_response(
+                    data, tool_name)['_haivemind_meta']
+            return encoder.encode(tool_name, envelope, items_key='results', query=query, on_omitted=on_omitted)
 
         @self.server.call_tool()
+        @instrument_dispatch("stdio")
         async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
             try:
                 if name == "store_memory":
@@ -4138,9 +4513,21 @@ class MemoryMCPServer:
                     return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
                 elif name == "search_memories":
-                    memories = await self.storage.search_memories(**arguments)
-                    # Enhance with format guidance on first access
-                    return [TextContent(type="text", text=_enhance_memory_response(memories, "search_memories"))]
+                    arguments = dict(arguments)
+                    offset = max(0, int(arguments.pop("offset", 0) or 0))
+                    limit = int(arguments.get("limit", 10))
+                    # Results beyond the token budget are reached by calling again with next_offset
+                    memories = await self.storage.search_memories(**{**arguments, "limit": offset + limit})
+                    page = memories[offset:]
+                    more = len(memories) == offset + limit
+                    pagination = {"offset": offset, "next_offset": offset + len(page) if more else None}
+
+                    def resume_after(envelope: Dict[str, Any], included: int):
+                        envelope["next_offset"] = offset + included
+
+                    return [TextContent(type="text", text=_enhance_memory_response(
+                        page, "search_memories", query=arguments.get("query"),
+                        page=pagination, on_omitted=resume_after))]
 
                 elif name == "get_recent_memories":
                     memories = await self.storage.get_recent_memories(**arguments)
@@ -4720,14 +5107,31 @@ class MemoryMCPServer:
                 logger.error(f"💥 Hive tool malfunction in {name}: {e} - collective capability impaired")
                 return [TextContent(type="text", text=f"Error: {str(e)}")]
     
+    def _start_metrics_listener(self):
+        """Serve /metrics over HTTP when configured (stdio has no HTTP app of its own)"""
+        listener = self.config.get('metrics', {}).get('stdio_http', {})
+        if not listener.get('enabled', False):
+            return
+        try:
+            start_metrics_server(listener.get('port', 9465), listener.get('host', '127.0.0.1'))
+        except OSError as e:
+            logger.warning(f"⚠️ Metrics listener unavailable on port {listener.get('port', 9465)}: {e}")
+
     async def run(self):
         """Run the MCP server"""
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                self.server.create_initialization_options()
-            )
+        self._start_metrics_listener()
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    self.server.create_initialization_options()
+                )
+        finally:
+            if self.confidence_recompute:
+                self.confidence_recompute.stop()
+            await self.storage.telemetry.close()
+            self.storage.hot_cache.close()
 
 def main():
     """Main entry point"""
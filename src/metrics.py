@@ -0,0 +1,600 @@
+#!/usr/bin/env python3
+"""
+hAIveMind Metrics - Counters and Latency Histograms in Prometheus Format
+
+One process-wide registry for the hot paths (MCP tool calls, ChromaDB
+operations, embeddings, Redis, SQLite and sync cycles), rendered in the
+Prometheus text exposition format on /metrics by both servers.
+
+Features:
+- Labelled Counter, Gauge and Histogram families; label children are cached,
+  so an instrumented call costs a dict lookup, two perf_counter() reads and
+  a bisect (well under a microsecond, see scripts/benchmark_metrics.py)
+- Wrappers for FastMCP tools, ChromaDB collections, embedding functions and
+  Redis clients, plus a sqlite_pool query hook
+- Collectors export the existing get_stats() dictionaries as gauges at
+  scrape time, so ad hoc stats show up on the same endpoint
+- Standalone /metrics HTTP listener for the stdio memory server
+
+Author: Lance James, Unit 221B Inc
+"""
+
+import functools
+import inspect
+import logging
+import math
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency bucket upper bounds in seconds (+Inf is implicit)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NAME_RE = re.compile(r"[^a-zA-Z0-9_]")
+
+perf_counter = time.perf_counter
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Sharded:
+    """
+    Per-thread value arrays summed at scrape time.
+
+    Each thread only ever writes its own shard, so the hot path needs no lock
+    (an uncontended threading.Lock costs more than the rest of observe()).
+    """
+    __slots__ = ('_size', '_local', '_shards')
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._shards: List[list] = []
+
+    def _shard(self) -> list:
+        shard = self._local.__dict__.get('shard')
+        if shard is None:
+            shard = self._local.shard = [0] * self._size
+            self._shards.append(shard)  # list.append is atomic
+        return shard
+
+    def _totals(self) -> list:
+        totals = [0] * self._size
+        for shard in list(self._shards):
+            for index, value in enumerate(shard):
+                totals[index] += value
+        return totals
+
+
+class _CounterChild(_Sharded):
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount: float = 1.0):
+        try:
+            self._local.shard[0] += amount
+        except AttributeError:
+            self._shard()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._totals()[0]
+
+
+class _GaugeChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        self.value = float(value)
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+
+class _HistogramChild(_Sharded):
+    __slots__ = ('bounds',)
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        super().__init__(len(bounds) + 2)  # one count per bucket, +Inf, then the sum
+        self.bounds = bounds
+
+    def observe(self, seconds: float):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        shard[bisect_left(self.bounds, seconds)] += 1
+        shard[-1] += seconds
+
+    def time(self) -> '_Timer':
+        """Context manager observing the elapsed time of its block"""
+        return _Timer(self)
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        totals = self._totals()
+        return totals[:-1], totals[-1]
+
+
+class _Timer:
+    __slots__ = ('_child', '_started')
+
+    def __init__(self, child: _HistogramChild):
+        self._child = child
+
+    def __enter__(self):
+        self._started = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._child.observe(perf_counter() - self._started)
+        return False
+
+
+class _Family:
+    """A metric name with a fixed set of label names and one child per label combination"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values) -> Any:
+        """Child for these label values (positional, in labelnames order)"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child()
+        return child
+
+    def children(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        with self._lock:
+            items = [(tuple(str(value) for value in values), child) for values, child in self._children.items()]
+        return sorted(items, key=lambda item: item[0])
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in self.children():
+            lines.append(f"{self.name}{_label_text(self.labelnames, values)} {_format_value(child.value)}")
+        return lines
+
+
+class Counter(_Family):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+
+class Gauge(_Family):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+
+class Histogram(_Family):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, seconds: float):
+        self.labels().observe(seconds)
+
+    def time(self) -> _Timer:
+        return self.labels().time()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in self.children():
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = 'le="%s"' % _format_value(bound)
+                lines.append(f"{self.name}_bucket{_label_text(self.labelnames, values, le)} {cumulative}")
+            labels = _label_text(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metric families plus scrape-time collectors, rendered together"""
+
+    def __init__(self, prefix: str = "haivemind"):
+        self.prefix = prefix
+        self._families: Dict[str, _Family] = {}
+        self._collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(family, cls) or family.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered as {family.kind} {family.labelnames}")
+            return family
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Family]:
+        return self._families.get(name)
+
+    def add_collector(self, name: str, collect: Callable[[], Dict[str, Any]]):
+        """
+        Export a stats dictionary as gauges on every scrape.
+
+        Numeric leaves of collect() become {prefix}_{name}_{path} gauges;
+        nested dictionary keys are joined into the metric name.
+        """
+        self._collectors[name] = collect
+
+    def remove_collector(self, name: str):
+        self._collectors.pop(name, None)
+
+    def _collected_lines(self) -> List[str]:
+        lines = []
+        for name, collect in list(self._collectors.items()):
+            try:
+                stats = collect()
+            except Exception as e:
+                logger.debug(f"Metrics collector {name} failed: {e}")
+                continue
+            for metric, value in _flatten(f"{self.prefix}_{name}", stats or {}):
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f"{metric} {_format_value(value)}")
+        return lines
+
+    def render(self) -> str:
+        """Prometheus text exposition of every family and collector"""
+        with self._lock:
+            families = sorted(self._families.values(), key=lambda family: family.name)
+        lines = []
+        for family in families:
+            lines.extend(family.render())
+        lines.extend(self._collected_lines())
+        return "\n".join(lines) + "\n"
+
+
+def _flatten(prefix: str, stats: Dict[str, Any]) -> Iterable[Tuple[str, float]]:
+    for key, value in stats.items():
+        name = f"{prefix}_{_NAME_RE.sub('_', str(key))}"
+        if isinstance(value, dict):
+            yield from _flatten(name, value)
+        elif isinstance(value, bool):
+            yield name, float(value)
+        elif isinstance(value, (int, float)) and not (isinstance(value, float) and math.isnan(value)):
+            yield name, value
+
+
+REGISTRY = MetricsRegistry()
+
+# Hot path metrics shared by both servers
+TOOL_SECONDS = REGISTRY.histogram("haivemind_tool_call_seconds", "MCP tool call latency", ("server", "tool"))
+TOOL_ERRORS = REGISTRY.counter("haivemind_tool_call_errors_total", "MCP tool calls that raised", ("server", "tool"))
+CHROMA_SECONDS = REGISTRY.histogram("haivemind_chromadb_op_seconds", "ChromaDB collection operation latency",
+                                    ("op", "collection"))
+CHROMA_ERRORS = REGISTRY.counter("haivemind_chromadb_op_errors_total", "ChromaDB operations that raised",
+                                 ("op", "collection"))
+EMBEDDING_SECONDS = REGISTRY.histogram("haivemind_embedding_seconds", "Embedding function call latency", ("model",))
+EMBEDDING_TEXTS = REGISTRY.counter("haivemind_embedding_texts_total", "Texts embedded", ("model",))
+REDIS_SECONDS = REGISTRY.histogram("haivemind_redis_op_seconds", "Redis command latency", ("op",))
+REDIS_ERRORS = REGISTRY.counter("haivemind_redis_op_errors_total", "Redis commands that raised", ("op",))
+SQLITE_SECONDS = REGISTRY.histogram("haivemind_sqlite_query_seconds", "Pooled SQLite statement latency",
+                                    ("db", "statement"))
+SYNC_CYCLE_SECONDS = REGISTRY.histogram("haivemind_sync_cycle_seconds", "Sync fan-out cycle duration",
+                                        buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+SYNC_PEERS = REGISTRY.counter("haivemind_sync_peers_total", "Peer sync outcomes per cycle", ("result",))
+
+
+def render_prometheus(registry: MetricsRegistry = REGISTRY) -> str:
+    return registry.render()
+
+
+def _timed(fn: Callable, seconds: _HistogramChild, errors: _CounterChild) -> Callable:
+    observe = seconds.observe
+
+    def call(*args, **kwargs):
+        started = perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            errors.inc()
+            raise
+        finally:
+            observe(perf_counter() - started)
+    return call
+
+
+# MCP tools
+
+def instrument_tool(fn: Callable, server: str, name: Optional[str] = None) -> Callable:
+    """Wrap a tool function so each call is timed; the signature is preserved for FastMCP"""
+    tool = name or fn.__name__
+    observe = TOOL_SECONDS.labels(server, tool).observe
+    errors = TOOL_ERRORS.labels(server, tool)
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            started = perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                observe(perf_counter() - started)
+        return async_wrapper
+
+    return functools.wraps(fn)(_timed(fn, TOOL_SECONDS.labels(server, tool), errors))
+
+
+def instrument_dispatch(server: str) -> Callable:
+    """Decorator for an async (name, arguments) tool dispatcher such as the stdio call_tool handler"""
+    def decorator(dispatch: Callable) -> Callable:
+        @functools.wraps(dispatch)
+        async def wrapper(name: str, arguments: Dict[str, Any]):
+            started = perf_counter()
+            try:
+                return await dispatch(name, arguments)
+            except Exception:
+                TOOL_ERRORS.labels(server, name).inc()
+                raise
+            finally:
+                TOOL_SECONDS.labels(server, name).observe(perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def instrument_fastmcp(mcp, server: str):
+    """Time every tool registered on a FastMCP instance from now on (tool() goes through add_tool())"""
+    add_tool = mcp.add_tool
+
+    @functools.wraps(add_tool)
+    def instrumented_add_tool(fn, name: Optional[str] = None, *args, **kwargs):
+        return add_tool(instrument_tool(fn, server, name), name, *args, **kwargs)
+
+    mcp.add_tool = instrumented_add_tool
+    return mcp
+
+
+# ChromaDB
+
+_embedding_classes: Dict[type, type] = {}
+
+
+def instrument_embedding_function(embedding_function):
+    """
+    Time calls to a ChromaDB embedding function in place.
+
+    The instance is moved to a cached subclass that times __call__, so type
+    checks and the function's name()/config stay what ChromaDB expects.
+    """
+    cls = type(embedding_function)
+    if getattr(cls, '_haivemind_instrumented', False):
+        return embedding_function
+    subclass = _embedding_classes.get(cls)
+    if subclass is None:
+        seconds = EMBEDDING_SECONDS.labels(cls.__name__)
+        texts = EMBEDDING_TEXTS.labels(cls.__name__)
+
+        def __call__(self, input):
+            started = perf_counter()
+            try:
+                return cls.__call__(self, input)
+            finally:
+                seconds.observe(perf_counter() - started)
+                texts.inc(len(input) if isinstance(input, (list, tuple)) else 1)
+
+        subclass = _embedding_classes[cls] = type(cls.__name__, (cls,), {
+            '__call__': __call__, '__module__': cls.__module__, '_haivemind_instrumented': True
+        })
+    try:
+        embedding_function.__class__ = subclass
+    except TypeError as e:
+        logger.debug(f"Embedding function {cls.__name__} cannot be instrumented: {e}")
+    return embedding_function
+
+
+class InstrumentedCollection:
+    """ChromaDB collection proxy that times reads and writes; everything else passes through"""
+
+    OPS = ('add', 'upsert', 'query', 'get', 'update', 'delete', 'count', 'peek')
+
+    def __init__(self, collection, label: Optional[str] = None):
+        self._collection = collection
+        label = label or getattr(collection, 'name', 'unknown')
+        for op in self.OPS:
+            method = getattr(collection, op, None)
+            if method is not None:
+                setattr(self, op, _timed(method, CHROMA_SECONDS.labels(op, label), CHROMA_ERRORS.labels(op, label)))
+        embedding_function = getattr(collection, '_embedding_function', None)
+        if embedding_function is not None:
+            instrument_embedding_function(embedding_function)
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    def __repr__(self):
+        return f"<InstrumentedCollection {self._collection!r}>"
+
+
+# Redis
+
+class _InstrumentedPipeline:
+    __slots__ = ('_pipeline', 'execute')
+
+    def __init__(self, pipeline):
+        self._pipeline = pipeline
+        self.execute = _timed(pipeline.execute, REDIS_SECONDS.labels('pipeline'), REDIS_ERRORS.labels('pipeline'))
+
+    def __getattr__(self, name):
+        return getattr(self._pipeline, name)
+
+    def __enter__(self):
+        self._pipeline.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._pipeline.__exit__(exc_type, exc_value, traceback)
+
+    def __len__(self):
+        return len(self._pipeline)
+
+
+class InstrumentedRedis:
+    """Redis client proxy that times each command by name; pipelines are timed on execute()"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not callable(attr) or name.startswith('_'):
+            return attr
+        if name == 'pipeline':
+            def wrapped(*args, **kwargs):
+                return _InstrumentedPipeline(attr(*args, **kwargs))
+        else:
+            wrapped = _timed(attr, REDIS_SECONDS.labels(name), REDIS_ERRORS.labels(name))
+        self.__dict__[name] = wrapped  # Resolved once per command name
+        return wrapped
+
+    def __bool__(self):
+        return True
+
+    def __repr__(self):
+        return f"<InstrumentedRedis {self._client!r}>"
+
+
+# SQLite
+
+@functools.lru_cache(maxsize=4096)
+def _sqlite_child(db_path: str, sql: str) -> _HistogramChild:
+    words = sql.split(None, 1)
+    return SQLITE_SECONDS.labels(os.path.basename(db_path), words[0].upper() if words else "")
+
+
+def sqlite_query_hook(db_path: str, sql: str, seconds: float) -> None:
+    """sqlite_pool query hook recording statement latency by database file and statement type"""
+    _sqlite_child(db_path, sql).observe(seconds)
+
+
+_sqlite_installed = False
+
+
+def instrument_sqlite():
+    """Register the query hook with the shared SQLite pools (idempotent)"""
+    global _sqlite_installed
+    if not _sqlite_installed:
+        from sqlite_pool import add_query_hook
+        add_query_hook(sqlite_query_hook)
+        _sqlite_installed = True
+
+
+# Sync
+
+def record_sync_cycle(cycle_seconds: float, synced: int, failed: int, backing_off: int):
+    SYNC_CYCLE_SECONDS.observe(cycle_seconds)
+    for result, count in (('synced', synced), ('failed', failed), ('backing_off', backing_off)):
+        if count:
+            SYNC_PEERS.labels(result).inc(count)
+
+
+# Standalone exposition
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port: int, host: str = "127.0.0.1",
+                      registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """Serve /metrics from a daemon thread (for processes without an HTTP app of their own)"""
+    handler = type('MetricsHandler', (_MetricsHandler,), {'registry': registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"📈 Metrics exposed on http://{host}:{server.server_address[1]}/metrics")
+    return server
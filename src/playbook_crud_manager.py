@@ -664,7 +664,7 @@ class PlaybookCRUDManager:
             
             # Store search in hAIveMind for learning
             if self.haivemind_client:
-                await self._store_haivemind_memory(
+                await self._store_haivemind_telemetry(
                     f"Resource search: '{search_filter.query}' returned {len(resources)} results",
                     "crud_operations",
                     {
@@ -1062,6 +1062,18 @@ class PlaybookCRUDManager:
                 return ""
         return ""
 
+    async def _store_haivemind_telemetry(self, content: str, category: str, metadata: Dict[str, Any]) -> None:
+        """Record telemetry in hAIveMind without waiting for the write when supported"""
+        store_telemetry = getattr(self.haivemind_client, 'store_telemetry', None)
+        if store_telemetry is None:
+            await self._store_haivemind_memory(content, category, metadata)
+            return
+        try:
+            store_telemetry(content=content, category=category, metadata=metadata,
+                            tags=["crud", "playbook", "management"])
+        except Exception as e:
+            logger.error(f"Failed to queue hAIveMind telemetry: {e}")
+
     async def _log_audit_event(self, event_type: str, user_id: str, resource_id: str, details: Dict[str, Any]):
         """Log audit event for compliance and tracking"""
         try:
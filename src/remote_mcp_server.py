@@ -26,14 +26,13 @@ except ImportError:
     print("Error: MCP package not found. Install with: pip install mcp")
     sys.exit(1)
 
-from memory_server import MemoryStorage
+# Heavy subsystems (memory storage, installers, bridges, directives) are imported
+# by their service factories so the module imports quickly
 from auth import AuthManager
-from command_installer import CommandInstaller
-from mcp_bridge import get_bridge_manager
-from sync_hooks import SyncHooks
-from enhanced_ticket_system import EnhancedTicketSystem
-from agent_directives import AgentDirectiveSystem
-from comet_integration import CometDirectiveSystem
+from metrics import REGISTRY as METRICS, CONTENT_TYPE as METRICS_CONTENT_TYPE, instrument_fastmcp
+from memory_bulk_ops import BulkOperationError
+from result_set_cache import CursorError, ResultSetCache
+from service_registry import ServiceRegistry, readiness_gate
 
 # Agent Authentication System imports
 try:
@@ -69,9 +68,12 @@ class RemoteMemoryMCPServer:
         with open(config_path) as f:
             self.config = json.load(f)
         
-        # Initialize memory storage and auth
-        self.storage = MemoryStorage(self.config)
+        # Heavy subsystems are proxies: built on first use or warmed in the
+        # background once the port is bound (see _register_services)
+        self.services = ServiceRegistry()
+        self._register_services()
         self.auth = AuthManager(self.config)
+        self.result_sets = ResultSetCache.from_config(self.config)
         
         # Initialize MCP server registry (in-memory for now)
         self.server_registry = {
@@ -88,21 +90,10 @@ class RemoteMemoryMCPServer:
                 "created_at": time.time()
             }
         }
-        self.command_installer = CommandInstaller(self.storage, self.config)
-        self.bridge_manager = get_bridge_manager(self.storage)
-        
-        # Initialize sync hooks system
-        self.sync_hooks = SyncHooks(self.storage, self.config, self.command_installer)
-        self.sync_hooks.setup_default_hooks()
         
         # Initialize enhanced ticket system
         self.enhanced_tickets = None  # Will be initialized on first use
-        
-        # Initialize agent directive system
-        self.agent_directives = AgentDirectiveSystem(self.storage)
-        
-        # Initialize Comet integration system
-        self.comet_system = CometDirectiveSystem(self.config.get('comet', {}), self.storage)
+        self.agent_kanban = None  # Shared so the task scheduler's in-memory index persists across requests
         
         # Get remote server config
         remote_config = self.config.get('remote_server', {})
@@ -129,6 +120,8 @@ class RemoteMemoryMCPServer:
             # Enable sessions for MCP tool functionality - required for hAIveMind tools
             stateless_http=False
         )
+        # Every tool registered below is timed into the /metrics histograms
+        instrument_fastmcp(self.mcp, "remote")
         
         # Add session recovery system  
         self._add_session_recovery_middleware()
@@ -173,8 +166,11 @@ class RemoteMemoryMCPServer:
         # Register skills.sh integration tools
         self._register_skills_sh_tools()
 
-        # Initialize agent authentication system
-        self._init_agent_auth_system()
+        # Initialize agent authentication system (warmed in the background)
+        self.agent_identity_system = None
+        self.access_control_system = None
+        self.firebase_auth = None
+        self.services.register('agent_auth', self._init_agent_auth_system, required=False)
 
         # Register agent authentication MCP tools
         self._register_agent_auth_tools()
@@ -182,14 +178,58 @@ class RemoteMemoryMCPServer:
         # Initialize dashboard functionality
         self._init_dashboard_functionality()
 
-        # Initialize admin bootstrap system for secure credential management
-        self._init_admin_bootstrap()
+        # Initialize admin bootstrap system for secure credential management;
+        # decrypting the vault credentials is deferred to warm-up
+        self.admin_bootstrap = None
+        self.admin_system_initialized = False
+        self.services.register('admin_bootstrap', self._init_admin_bootstrap)
 
         # Track server start time for uptime calculation
         # _start_time already set as datetime above
         
         logger.info(f"🌐 hAIveMind network portal initialized on {self.host}:{self.port} - remote access enabled")
     
+    def _register_services(self):
+        """Register the heavy subsystems with the service registry
+
+        Each attribute is a LazyService proxy, so existing code keeps using
+        self.storage etc.; the real object is built on first access or during
+        background warm-up, whichever comes first.
+        """
+        def create_storage():
+            from memory_server import MemoryStorage
+            return MemoryStorage(self.config)
+
+        def create_command_installer():
+            from command_installer import CommandInstaller
+            return CommandInstaller(self.services.get('storage'), self.config)
+
+        def create_bridge_manager():
+            from mcp_bridge import get_bridge_manager
+            return get_bridge_manager(self.services.get('storage'))
+
+        def create_sync_hooks():
+            from sync_hooks import SyncHooks
+            sync_hooks = SyncHooks(self.services.get('storage'), self.config,
+                                   self.services.get('command_installer'))
+            sync_hooks.setup_default_hooks()
+            return sync_hooks
+
+        def create_agent_directives():
+            from agent_directives import AgentDirectiveSystem
+            return AgentDirectiveSystem(self.services.get('storage'))
+
+        def create_comet_system():
+            from comet_integration import CometDirectiveSystem
+            return CometDirectiveSystem(self.config.get('comet', {}), self.services.get('storage'))
+
+        self.storage = self.services.register('storage', create_storage)
+        self.command_installer = self.services.register('command_installer', create_command_installer)
+        self.bridge_manager = self.services.register('bridge_manager', create_bridge_manager)
+        self.sync_hooks = self.services.register('sync_hooks', create_sync_hooks)
+        self.agent_directives = self.services.register('agent_directives', create_agent_directives)
+        self.comet_system = self.services.register('comet_system', create_comet_system)
+
     def _add_context_resources(self):
         """Add context resources and instructions for connecting Claudes"""
         
@@ -287,27 +327,75 @@ NETWORK TOPOLOGY:
             except Exception as e:
                 return f"Error getting machine context: {e}"
     
-    def _truncate_response(self, response: str, max_tokens: int = 20000) -> str:
-        """Truncate response if it exceeds token limit"""
-        # Rough estimate: 1 token ≈ 4 characters
-        max_chars = max_tokens * 4
-        
-        if len(response) <= max_chars:
-            return response
-        
-        truncated = response[:max_chars]
-        
-        # Try to truncate at a natural boundary (line break)
-        last_newline = truncated.rfind('\n')
-        if last_newline > max_chars * 0.8:  # If we can truncate at 80% or more
-            truncated = truncated[:last_newline]
-        
-        # Add truncation notice
-        truncated += f"\n\n⚠️ Response truncated due to size limit ({len(response):,} chars > {max_chars:,} chars limit)\n"
-        truncated += f"📄 Use pagination parameters (limit, offset) for full results\n"
-        truncated += f"💡 Try reducing limit or adding specific filters"
-        
-        return truncated
+    async def _paginate(self, tool: str, params: Dict[str, Any], limit: int, offset: int,
+                        cursor: Optional[str], run_query, query: Optional[str] = None) -> str:
+        """Serve one page of a ranked result set, running the query only for a new result set
+
+        A first page (no cursor, offset 0) runs the query and snapshots the ranked
+        (id, score) list; cursors and later offsets page through that snapshot with
+        ID lookups only, so the order stays fixed across pages. A cursor that runs
+        past a snapshot cut off at the query depth re-queries deeper and appends the
+        new IDs. The page is encoded within the response token budget; results that
+        do not fit are left for the next cursor.
+        """
+        memories = None
+        result_set = None
+        if cursor:
+            result_set, offset = self.result_sets.resolve(cursor)
+            if offset + limit > len(result_set.ranked) and not result_set.exhausted:
+                if result_set.fingerprint != self.result_sets.fingerprint(tool, params):
+                    raise CursorError("Cursor belongs to a different query")
+                depth = max(len(result_set.ranked) + self.result_sets.window, offset + limit)
+                deeper = await run_query(depth)
+                self.result_sets.extend(result_set, [(memory['id'], memory.get('score')) for memory in deeper],
+                                        exhausted=len(deeper) < depth)
+        else:
+            fingerprint = self.result_sets.fingerprint(tool, params)
+            if offset:
+                result_set = self.result_sets.get(fingerprint)
+            if result_set is None or (offset + limit > len(result_set.ranked) and not result_set.exhausted):
+                depth = max(self.result_sets.window, offset + limit)
+                memories = await run_query(depth)
+                result_set = self.result_sets.put(
+                    fingerprint, [(memory['id'], memory.get('score')) for memory in memories],
+                    exhausted=len(memories) < depth
+                )
+
+        window = result_set.page(offset, limit)
+        if memories is not None:
+            page = memories[offset:offset + limit]
+        else:
+            found = await self.storage.get_memories([memory_id for memory_id, _ in window])
+            page = []
+            for memory_id, score in window:
+                memory = found.get(memory_id)
+                if memory is None:
+                    continue  # Deleted since the snapshot was taken
+                memory = dict(memory)
+                if score is not None:
+                    memory['score'] = score
+                page.append(memory)
+
+        total_count = len(result_set.ranked)
+        # A snapshot cut off at the query depth has more results behind its last entry
+        has_more = offset + limit < total_count or not result_set.exhausted
+        result = {
+            "memories": page,
+            "pagination": {
+                "total": total_count,
+                "total_is_exact": result_set.exhausted,
+                "limit": limit,
+                "offset": offset,
+                "has_more": has_more,
+                "next_cursor": self.result_sets.encode_cursor(result_set, offset + limit) if has_more else None
+            }
+        }
+
+        def resume_after(envelope: Dict[str, Any], included: int):
+            envelope["pagination"] = dict(envelope["pagination"], has_more=True,
+                                          next_cursor=self.result_sets.encode_cursor(result_set, offset + included))
+
+        return self.storage.response_encoder.encode(tool, result, query=query, on_omitted=resume_after)
 
     def _register_tools(self):
         """Register all memory tools with FastMCP"""
@@ -341,7 +429,7 @@ NETWORK TOPOLOGY:
             try:
                 memory = await self.storage.retrieve_memory(memory_id)
                 if memory:
-                    return json.dumps(memory, indent=2)
+                    return self.storage.response_encoder.encode("retrieve_memory", memory)
                 else:
                     return "Memory not found"
             except Exception as e:
@@ -384,46 +472,34 @@ NETWORK TOPOLOGY:
             include_global: bool = True,
             from_machines: Optional[List[str]] = None,
             exclude_machines: Optional[List[str]] = None,
-            max_confidentiality_level: Optional[str] = "internal"
+            max_confidentiality_level: Optional[str] = "internal",
+            cursor: Optional[str] = None
         ) -> str:
             """Search memories with comprehensive filtering including machine, project, and sharing scope
 
+            Pass the returned pagination.next_cursor as cursor to fetch the next page of the
+            same ranked result set without re-running the search.
+
             Note: Remote access excludes confidential/pii memories by default for data protection.
             """
             try:
-                # Get more results to handle pagination
-                extended_limit = limit + offset + 50  # Get extra to ensure we have enough for pagination
                 # Remote access: exclude confidential/pii memories by default
-                memories = await self.storage.search_memories(
-                    query=query,
-                    category=category,
-                    user_id=user_id,
-                    limit=extended_limit,
-                    semantic=semantic,
-                    scope=scope,
-                    include_global=include_global,
-                    from_machines=from_machines,
-                    exclude_machines=exclude_machines,
-                    exclude_confidential=True,  # Always filter confidential in remote context
-                    max_confidentiality_level=max_confidentiality_level
-                )
-                
-                # Apply pagination
-                total_count = len(memories)
-                paginated_memories = memories[offset:offset + limit]
-                
-                result = {
-                    "memories": paginated_memories,
-                    "pagination": {
-                        "total": total_count,
-                        "limit": limit,
-                        "offset": offset,
-                        "has_more": offset + limit < total_count
-                    }
+                params = {
+                    "query": query, "category": category, "user_id": user_id, "semantic": semantic,
+                    "scope": scope, "include_global": include_global, "from_machines": from_machines,
+                    "exclude_machines": exclude_machines, "max_confidentiality_level": max_confidentiality_level
                 }
-                
-                response = json.dumps(result, indent=2)
-                return self._truncate_response(response)
+                return await self._paginate(
+                    "search_memories", params, limit, offset, cursor,
+                    lambda depth: self.storage.search_memories(
+                        limit=depth,
+                        exclude_confidential=True,  # Always filter confidential in remote context
+                        **params
+                    ),
+                    query=query
+                )
+            except CursorError as e:
+                return f"Error searching memories: {e}"
             except Exception as e:
                 logger.error(f"Error searching memories: {e}")
                 return f"Error searching memories: {str(e)}"
@@ -435,40 +511,31 @@ NETWORK TOPOLOGY:
             hours: int = 24,
             limit: int = 5,
             offset: int = 0,
-            max_confidentiality_level: Optional[str] = "internal"
+            max_confidentiality_level: Optional[str] = "internal",
+            cursor: Optional[str] = None
         ) -> str:
             """Get recent memories within a time window
 
+            Pass the returned pagination.next_cursor as cursor to fetch the next page.
+
             Note: Remote access excludes confidential/pii memories by default for data protection.
             """
             try:
-                # Get more results to handle pagination
-                extended_limit = limit + offset + 50
                 # Remote access: exclude confidential/pii memories by default
-                memories = await self.storage.get_recent_memories(
-                    user_id=user_id,
-                    category=category,
-                    hours=hours,
-                    limit=extended_limit,
-                    exclude_confidential=True,  # Always filter confidential in remote context
-                    max_confidentiality_level=max_confidentiality_level
-                )
-                
-                # Apply pagination
-                total_count = len(memories)
-                paginated_memories = memories[offset:offset + limit]
-                
-                result = {
-                    "memories": paginated_memories,
-                    "pagination": {
-                        "total": total_count,
-                        "limit": limit,
-                        "offset": offset,
-                        "has_more": offset + limit < total_count
-                    }
+                params = {
+                    "user_id": user_id, "category": category, "hours": hours,
+                    "max_confidentiality_level": max_confidentiality_level
                 }
-                
-                return json.dumps(result, indent=2)
+                return await self._paginate(
+                    "get_recent_memories", params, limit, offset, cursor,
+                    lambda depth: self.storage.get_recent_memories(
+                        limit=depth,
+                        exclude_confidential=True,  # Always filter confidential in remote context
+                        **params
+                    )
+                )
+            except CursorError as e:
+                return f"Error getting recent memories: {e}"
             except Exception as e:
                 logger.error(f"Error getting recent memories: {e}")
                 return f"Error getting recent memories: {str(e)}"
@@ -488,33 +555,28 @@ NETWORK TOPOLOGY:
             category: Optional[str] = None,
             user_id: Optional[str] = None,
             limit: int = 50,
-            offset: int = 0
+            offset: int = 0,
+            cursor: Optional[str] = None
         ) -> str:
-            """Get all memories for the current project"""
+            """Get all memories for the current project
+
+            Pass the returned pagination.next_cursor as cursor to fetch the next page.
+            """
             try:
-                # Get more results to handle pagination
-                extended_limit = limit + offset + 50
-                memories = await self.storage.get_project_memories(
-                    category=category,
-                    user_id=user_id,
-                    limit=extended_limit
-                )
-                
-                # Apply pagination
-                total_count = len(memories)
-                paginated_memories = memories[offset:offset + limit]
-                
-                result = {
-                    "memories": paginated_memories,
-                    "pagination": {
-                        "total": total_count,
-                        "limit": limit,
-                        "offset": offset,
-                        "has_more": offset + limit < total_count
-                    }
+                params = {
+                    "category": category, "user_id": user_id,
+                    "project": self.storage._get_project_context().get("project_path", "")
                 }
-                
-                return json.dumps(result, indent=2)
+                return await self._paginate(
+                    "get_project_memories", params, limit, offset, cursor,
+                    lambda depth: self.storage.get_project_memories(
+                        category=category,
+                        user_id=user_id,
+                        limit=depth
+                    )
+                )
+            except CursorError as e:
+                return f"Error getting project memories: {e}"
             except Exception as e:
                 logger.error(f"Error getting project memories: {e}")
                 return f"Error getting project memories: {str(e)}"
@@ -613,8 +675,7 @@ NETWORK TOPOLOGY:
                     # Fallback for error responses
                     result = roster
                 
-                response = json.dumps(result, indent=2)
-                return self._truncate_response(response)
+                return self.storage.response_encoder.encode("get_agent_roster", result, items_key="agents")
             except Exception as e:
                 logger.error(f"Error getting agent roster: {e}")
                 return f"Error getting agent roster: {str(e)}"
@@ -4496,7 +4557,11 @@ function load(id) {
                     "active_agents": active_agents,
                     "total_memories": total_memories,
                     "uptime": "Running",
-                    "network_status": "Connected"
+                    "network_status": "Connected",
+                    "memory_cache": self.storage.get_cache_stats(),
+                    "telemetry_queue": self.storage.get_telemetry_stats(),
+                    "result_sets": self.result_sets.get_stats(),
+                    "responses": self.storage.get_response_stats()
                 })
             except Exception as e:
                 logger.error(f"Error getting stats: {e}")
@@ -6568,6 +6633,33 @@ function load(id) {
             except Exception as e:
                 return JSONResponse({"error": str(e)}, status_code=500)
         
+        @self.mcp.custom_route("/api/config/backup/gc", methods=["POST"])
+        async def collect_config_garbage(request):
+            """Apply snapshot retention and free unreferenced chunks"""
+            try:
+                body = await request.json()
+                from config_backup_system import ConfigBackupSystem
+                loop = asyncio.get_event_loop()
+                result = await loop.run_in_executor(
+                    None, lambda: ConfigBackupSystem().collect_garbage(
+                        system_id=body.get("system_id"),
+                        keep_last=body.get("keep_last"),
+                        max_age_days=body.get("max_age_days")))
+                return JSONResponse({"status": "completed", "result": result})
+            except Exception as e:
+                return JSONResponse({"error": str(e)}, status_code=500)
+        
+        @self.mcp.custom_route("/api/config/backup/storage", methods=["GET"])
+        async def get_config_storage_stats(request):
+            """Get snapshot storage usage and deduplication ratio"""
+            try:
+                from config_backup_system import ConfigBackupSystem
+                loop = asyncio.get_event_loop()
+                storage = await loop.run_in_executor(None, lambda: ConfigBackupSystem().get_storage_stats())
+                return JSONResponse({"storage": storage})
+            except Exception as e:
+                return JSONResponse({"error": str(e)}, status_code=500)
+        
         @self.mcp.custom_route("/api/config/backup/history/{system_id}", methods=["GET"])
         async def get_config_history(request):
             """Get configuration change history for a system"""
@@ -6583,6 +6675,26 @@ function load(id) {
             except Exception as e:
                 return JSONResponse({"error": str(e)}, status_code=500)
         
+        @self.mcp.custom_route("/api/config/backup/drift", methods=["GET"])
+        async def detect_fleet_config_drift(request):
+            """Detect configuration drift across every system in one pass"""
+            try:
+                query_params = dict(request.query_params)
+                hours = query_params.get("hours")
+                include_diff = query_params.get("include_diff", "false").lower() == "true"
+
+                from config_backup_system import ConfigBackupSystem
+                config_backup = ConfigBackupSystem()
+                loop = asyncio.get_event_loop()
+                drift = await loop.run_in_executor(
+                    None, lambda: config_backup.detect_fleet_drift(
+                        hours_back=int(hours) if hours else None,
+                        system_type=query_params.get("system_type"),
+                        include_diff=include_diff))
+                return JSONResponse(drift)
+            except Exception as e:
+                return JSONResponse({"error": str(e)}, status_code=500)
+
         @self.mcp.custom_route("/api/config/backup/drift/{system_id}", methods=["GET"])
         async def detect_config_drift(request):
             """Detect configuration drift for a system"""
@@ -6637,9 +6749,8 @@ function load(id) {
         async def register_kanban_agent(request):
             """Register new agent with capabilities"""
             try:
-                from agent_kanban_system import AgentKanbanSystem
                 body = await request.json()
-                kanban = AgentKanbanSystem()
+                kanban = self._get_agent_kanban()
                 
                 success = kanban.register_agent(
                     agent_id=body["agent_id"],
@@ -6658,12 +6769,11 @@ function load(id) {
         async def get_available_agents(request):
             """Get available agents with optional capability filtering"""
             try:
-                from agent_kanban_system import AgentKanbanSystem
                 query_params = dict(request.query_params)
                 required_capabilities = query_params.get("capabilities", "").split(",") if query_params.get("capabilities") else None
                 min_level = int(query_params.get("min_level", 1))
                 
-                kanban = AgentKanbanSystem()
+                kanban = self._get_agent_kanban()
                 agents = kanban.get_available_agents(required_capabilities, min_level)
                 
                 return JSONResponse({"agents": agents})
@@ -6674,11 +6784,11 @@ function load(id) {
         async def update_agent_status(request):
             """Update agent status and workload"""
             try:
-                from agent_kanban_system import AgentKanbanSystem, AgentStatus
+                from agent_kanban_system import AgentStatus
                 agent_id = request.path_params["agent_id"]
                 body = await request.json()
                 
-                kanban = AgentKanbanSystem()
+                kanban = self._get_agent_kanban()
                 success = kanban.update_agent_status(
                     agent_id=agent_id,
                     status=AgentStatus(body["status"]),
@@ -6693,9 +6803,9 @@ function load(id) {
         async def create_kanban_task(request):
             """Create a new kanban task"""
             try:
-                from agent_kanban_system import AgentKanbanSystem, TaskPriority
+                from agent_kanban_system import TaskPriority
                 body = await request.json()
-                kanban = AgentKanbanSystem()
+                kanban = self._get_agent_kanban()
                 
                 task_id = kanban.create_task(
                     title=body["title"],
@@ -6707,22 +6817,56 @@ function load(id) {
                     estimated_hours=body.get("estimated_hours"),
                     due_date=body.get("due_date"),
                     tags=body.get("tags", []),
-                    metadata=body.get("metadata", {})
+                    metadata=body.get("metadata", {}),
+                    required_capabilities=body.get("required_capabilities"),
+                    min_capability_level=body.get("min_capability_level", 1)
                 )
                 
                 return JSONResponse({"task_id": task_id, "success": True})
             except Exception as e:
                 return JSONResponse({"error": str(e)}, status_code=500)
         
+        @self.mcp.custom_route("/api/kanban/tasks/assign-batch", methods=["POST"])
+        async def assign_pending_kanban_tasks(request):
+            """Assign ready backlog tasks to qualified agents in one pass"""
+            try:
+                body = await request.json() if await request.body() else {}
+                kanban = self._get_agent_kanban()
+                result = kanban.assign_pending_tasks(limit=body.get("limit"))
+                
+                return JSONResponse({"success": True, **result})
+            except Exception as e:
+                return JSONResponse({"error": str(e)}, status_code=500)
+        
+        @self.mcp.custom_route("/api/kanban/agents/{agent_id}/claim-next", methods=["POST"])
+        async def claim_next_kanban_task(request):
+            """Let an agent claim the highest priority task it can serve"""
+            try:
+                agent_id = request.path_params["agent_id"]
+                kanban = self._get_agent_kanban()
+                task_id = kanban.claim_next_task(agent_id)
+                
+                return JSONResponse({"success": task_id is not None, "task_id": task_id})
+            except Exception as e:
+                return JSONResponse({"error": str(e)}, status_code=500)
+        
+        @self.mcp.custom_route("/api/kanban/scheduler/stats", methods=["GET"])
+        async def get_kanban_scheduler_stats(request):
+            """Get task scheduler queue and claim statistics"""
+            try:
+                kanban = self._get_agent_kanban()
+                return JSONResponse({"scheduler": kanban.get_scheduler().get_stats()})
+            except Exception as e:
+                return JSONResponse({"error": str(e)}, status_code=500)
+        
         @self.mcp.custom_route("/api/kanban/tasks/{task_id}/assign", methods=["PUT"])
         async def assign_kanban_task(request):
             """Assign task to agent"""
             try:
-                from agent_kanban_system import AgentKanbanSystem
                 task_id = request.path_params["task_id"]
                 body = await request.json()
                 
-                kanban = AgentKanbanSystem()
+                kanban = self._get_agent_kanban()
                 success = kanban.assign_task(
                     task_id=task_id,
                     agent_id=body.get("agent_id"),
@@ -6737,11 +6881,11 @@ function load(id) {
         async def move_kanban_task(request):
             """Move task between kanban columns"""
             try:
-                from agent_kanban_system import AgentKanbanSystem, TaskStatus
+                from agent_kanban_system import TaskStatus
                 task_id = request.path_params["task_id"]
                 body = await request.json()
                 
-                kanban = AgentKanbanSystem()
+                kanban = self._get_agent_kanban()
                 success = kanban.move_task(
                     task_id=task_id,
                     new_status=TaskStatus(body["status"]),
@@ -6756,12 +6900,11 @@ function load(id) {
         async def get_kanban_board(request):
             """Get complete kanban board state"""
             try:
-                from agent_kanban_system import AgentKanbanSystem
                 board_id = request.path_params["board_id"]
                 query_params = dict(request.query_params)
                 include_metrics = query_params.get("metrics", "true").lower() == "true"
                 
-                kanban = AgentKanbanSystem()
+                kanban = self._get_agent_kanban()
                 board_data = kanban.get_kanban_board(board_id, include_metrics)
                 
                 return JSONResponse({"board": board_data})
@@ -6772,8 +6915,7 @@ function load(id) {
         async def get_agent_workload_report(request):
             """Get agent workload and performance report"""
             try:
-                from agent_kanban_system import AgentKanbanSystem
-                kanban = AgentKanbanSystem()
+                kanban = self._get_agent_kanban()
                 report = kanban.get_agent_workload_report()
                 
                 return JSONResponse({"report": report})
@@ -6784,11 +6926,10 @@ function load(id) {
         async def get_task_analytics(request):
             """Get task analytics for specified time period"""
             try:
-                from agent_kanban_system import AgentKanbanSystem
                 query_params = dict(request.query_params)
                 days = int(query_params.get("days", 30))
                 
-                kanban = AgentKanbanSystem()
+                kanban = self._get_agent_kanban()
                 analytics = kanban.get_task_analytics(days)
                 
                 return JSONResponse({"analytics": analytics})
@@ -7510,71 +7651,50 @@ function load(id) {
         logger.info("🌉 MCP bridge SSE proxy routes registered")
 
     def _add_health_all_route(self):
-        """Add unified health check endpoint for all MCP services"""
+        """Add unified health check endpoint for all MCP services
+
+        Remote servers are probed by a background HealthProber; the endpoint
+        serves its cached snapshot, or forces a concurrent refresh with ?fresh=1.
+        """
+        from health_prober import HealthProber
+
+        def probe_targets():
+            return {
+                server_id: (info['name'], info['endpoint'])
+                for server_id, info in self.server_registry.items()
+                if server_id != "memory-server"  # skip self
+            }
+
+        self.health_prober = HealthProber(
+            probe_targets, self.config.get('remote_server', {}).get('health_probe', {})
+        )
+
+        # 1. Local haivemind tools
+        async def check_haivemind():
+            tools = await self.mcp.list_tools()
+            return {
+                "status": "healthy",
+                "type": "local",
+                "tools_count": len(tools),
+                "version": "2.1.5"
+            }
+
+        # 2. Bridged servers
+        async def check_bridges():
+            bridge_manager = self.services.peek('bridge_manager')  # never wait on warm-up here
+            if bridge_manager is None:
+                return {"status": "initializing"}
+            return await bridge_manager.health_check()
+
+        self.health_prober.add_check("haivemind", check_haivemind)
+        self.health_prober.add_check("bridges", check_bridges)
         
         @self.mcp.custom_route("/admin/api/mcp/health-all", methods=["GET"])
         async def health_all(request):
             """Unified health check for local and remote MCP services"""
             # No auth for now to allow monitoring tools, or check if user is admin
-            
-            results = {
-                "timestamp": datetime.now().isoformat(),
-                "overall_status": "healthy",
-                "services": {}
-            }
-            
-            # 1. Local haivemind tools
-            try:
-                tools = await self.mcp.list_tools()
-                results["services"]["haivemind"] = {
-                    "status": "healthy",
-                    "type": "local",
-                    "tools_count": len(tools),
-                    "version": "2.1.5"
-                }
-            except Exception as e:
-                results["services"]["haivemind"] = {"status": "error", "error": str(e)}
-                results["overall_status"] = "degraded"
-
-            # 2. Bridged servers
-            try:
-                bridge_health = await self.bridge_manager.health_check()
-                results["services"]["bridges"] = bridge_health
-                if bridge_health.get("error_bridges", 0) > 0:
-                    results["overall_status"] = "degraded"
-            except Exception as e:
-                results["services"]["bridges"] = {"status": "error", "error": str(e)}
-
-            # 3. Remote SSE servers from registry
-            for server_id, info in self.server_registry.items():
-                if server_id == "memory-server": continue # skip self
-                
-                try:
-                    import httpx
-                    start = time.time()
-                    async with httpx.AsyncClient() as client:
-                        # Try to get health if available, or just check endpoint
-                        health_url = info['endpoint'].replace('/sse', '/health')
-                        resp = await client.get(health_url, timeout=2.0)
-                        latency = (time.time() - start) * 1000
-                        
-                        results["services"][info['name']] = {
-                            "status": "healthy" if resp.status_code == 200 else "unhealthy",
-                            "type": "remote_sse",
-                            "endpoint": info['endpoint'],
-                            "latency_ms": round(latency, 2),
-                            "http_code": resp.status_code
-                        }
-                except Exception as e:
-                    results["services"][info['name']] = {
-                        "status": "offline",
-                        "type": "remote_sse",
-                        "endpoint": info['endpoint'],
-                        "error": str(e)
-                    }
-                    results["overall_status"] = "degraded"
-
-            return JSONResponse(results)
+            fresh = request.query_params.get("fresh", "").lower() in ("1", "true", "yes")
+            return JSONResponse(await self.health_prober.get_snapshot(fresh=fresh))
 
     def _init_dashboard_functionality(self):
         """Initialize enhanced dashboard functionality from dashboard_server"""
@@ -7583,8 +7703,10 @@ function load(id) {
             from database import ControlDatabase, UserRole, DeviceStatus, KeyStatus
             from config_generator import ConfigGenerator, ConfigFormat
             
-            # Initialize dashboard database
-            self.dashboard_db = ControlDatabase("database/haivemind.db")
+            # Initialize dashboard database on first use
+            self.dashboard_db = self.services.register(
+                'dashboard_db', lambda: ControlDatabase("database/haivemind.db"), required=False
+            )
             
             # Initialize configuration generator
             self._config_generator = None
@@ -7809,63 +7931,37 @@ function load(id) {
                 if not operation or not memory_ids:
                     return JSONResponse({"error": "Operation and memory_ids required"}, status_code=400)
                 
-                results = []
-                success_count = 0
+                if not isinstance(memory_ids, list):
+                    return JSONResponse({"error": "memory_ids must be a list"}, status_code=400)
                 
-                for memory_id in memory_ids:
-                    try:
-                        if operation == 'delete':
-                            # Store deletion record for audit
-                            deletion_record = {
-                                "memory_id": memory_id,
-                                "deleted_at": datetime.utcnow().isoformat(),
-                                "deleted_by": "admin",  # TODO: Get from auth
-                                "operation": "bulk_delete"
-                            }
-                            await self.storage.store_memory(
-                                content=json.dumps(deletion_record),
-                                category="global",
-                                context="Bulk Memory Deletion",
-                                tags=["bulk_delete", "audit"]
-                            )
-                            
-                            results.append({"memory_id": memory_id, "status": "deleted"})
-                            success_count += 1
-                            
-                        elif operation == 'categorize':
-                            new_category = parameters.get('category', 'global')
-                            # This would update the memory category - simplified implementation
-                            results.append({"memory_id": memory_id, "status": "categorized", "new_category": new_category})
-                            success_count += 1
-                            
-                        elif operation == 'tag':
-                            new_tags = parameters.get('tags', [])
-                            # This would add tags to the memory - simplified implementation
-                            results.append({"memory_id": memory_id, "status": "tagged", "tags": new_tags})
-                            success_count += 1
-                            
-                        elif operation == 'export':
-                            # This would export memories - simplified implementation
-                            results.append({"memory_id": memory_id, "status": "exported"})
-                            success_count += 1
-                            
-                        else:
-                            results.append({"memory_id": memory_id, "status": "error", "message": "Unknown operation"})
-                            
-                    except Exception as e:
-                        results.append({"memory_id": memory_id, "status": "error", "message": str(e)})
+                if operation == 'export':
+                    from starlette.responses import StreamingResponse
+                    filename = f"haivemind-memories-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.ndjson"
+                    return StreamingResponse(
+                        self.storage.bulk_ops.export(memory_ids),
+                        media_type="application/x-ndjson",
+                        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+                    )
                 
-                return JSONResponse({
-                    "operation": operation,
-                    "total_processed": len(memory_ids),
-                    "successful": success_count,
-                    "failed": len(memory_ids) - success_count,
-                    "results": results
-                })
+                # Large jobs return 202 with a job_id to poll; small ones return the finished job
+                job = await self.storage.bulk_ops.run(operation, memory_ids, parameters)
+                return JSONResponse(job, status_code=202 if job["status"] == "running" else 200)
                 
+            except BulkOperationError as e:
+                return JSONResponse({"error": str(e)}, status_code=400)
             except Exception as e:
                 return JSONResponse({"error": str(e)}, status_code=500)
         
+        @self.mcp.custom_route("/admin/api/memory/bulk-operations/{job_id}", methods=["GET"])
+        async def bulk_memory_operation_status(request):
+            if not await self._check_admin_auth(request):
+                return JSONResponse({"error": "Unauthorized"}, status_code=401)
+            
+            job = self.storage.bulk_ops.get_job(request.path_params.get('job_id'))
+            if job is None:
+                return JSONResponse({"error": "Unknown job"}, status_code=404)
+            return JSONResponse(job)
+        
         # Memory relationships mapping
         @self.mcp.custom_route("/admin/api/memory/relationships", methods=["GET"])
         async def memory_relationships(request):
@@ -7937,55 +8033,28 @@ function load(id) {
                 return JSONResponse({"error": "Unauthorized"}, status_code=401)
             
             try:
-                # Get collection info
-                collection_stats = self.storage.get_collection_info()
-                
-                # Calculate analytics
-                total_memories = sum(collection.get('count', 0) for collection in collection_stats.values())
-                
-                category_distribution = {}
-                for collection_name, stats in collection_stats.items():
-                    category = collection_name.replace('_memories', '')
-                    category_distribution[category] = {
-                        "count": stats.get('count', 0),
-                        "percentage": (stats.get('count', 0) / total_memories * 100) if total_memories > 0 else 0
-                    }
-                
-                # Memory growth analytics (simplified)
-                growth_trend = {
-                    "daily_growth": 5,  # Simplified - would calculate actual growth
-                    "weekly_growth": 35,
-                    "monthly_growth": 150,
-                    "trend": "increasing"
-                }
-                
-                # Quality metrics (simplified)
-                quality_metrics = {
-                    "avg_content_length": 250,  # Simplified
-                    "tagged_memories_percentage": 75,
-                    "memories_with_context": 60,
-                    "duplicate_detection_score": 92
-                }
-                
-                return JSONResponse({
-                    "total_memories": total_memories,
-                    "category_distribution": category_distribution,
-                    "growth_analytics": growth_trend,
-                    "quality_metrics": quality_metrics,
-                    "machine_contributions": {
-                        "lance-dev": {"count": total_memories, "percentage": 100}  # Simplified
-                    },
-                    "recent_activity": {
-                        "last_24h": 8,
-                        "last_7d": 45,
-                        "last_30d": 180
-                    },
-                    "generated_at": datetime.utcnow().isoformat()
-                })
+                # Served from incremental counters; the first request on a node
+                # without them starts a one-off background rebuild
+                analytics = self.storage.get_memory_analytics()
+                if analytics["built_at"] is None and not analytics["rebuilding"]:
+                    asyncio.ensure_future(self.storage.rebuild_memory_analytics())
+                    analytics["rebuilding"] = True
+                analytics["generated_at"] = datetime.utcnow().isoformat()
+                return JSONResponse(analytics)
                 
             except Exception as e:
                 return JSONResponse({"error": str(e)}, status_code=500)
         
+        @self.mcp.custom_route("/admin/api/memory/analytics/rebuild", methods=["POST"])
+        async def rebuild_memory_analytics(request):
+            if not await self._check_admin_auth(request):
+                return JSONResponse({"error": "Unauthorized"}, status_code=401)
+            
+            try:
+                return JSONResponse(await self.storage.rebuild_memory_analytics())
+            except Exception as e:
+                return JSONResponse({"error": str(e)}, status_code=500)
+        
         # Duplicate detection
         @self.mcp.custom_route("/admin/api/memory/deduplicate", methods=["POST"])
         async def detect_duplicates(request):
@@ -8297,17 +8366,29 @@ function load(id) {
             try:
                 server_id = request.path_params["server_id"]
                 
-                # TODO: Implement actual health check
-                health = {
-                    "server_id": server_id,
-                    "status": "healthy",
-                    "last_check": time.time(),
-                    "response_time": 50,  # ms
-                    "uptime": time.time() - self._start_time if server_id == "memory-server" else 0,
-                    "errors_count": 0
-                }
+                if server_id == "memory-server":
+                    return JSONResponse({
+                        "server_id": server_id,
+                        "status": "healthy" if self.services.is_ready() else "starting",
+                        "last_check": time.time(),
+                        "uptime": time.time() - self._start_time,
+                        "errors_count": 0
+                    })
                 
-                return JSONResponse(health)
+                # Remote servers: latest result from the background prober
+                prober = getattr(self, 'health_prober', None)
+                target = prober.health.get(server_id) if prober else None
+                if target is None:
+                    return JSONResponse({"server_id": server_id, "status": "unknown"}, status_code=404)
+                return JSONResponse({
+                    "server_id": server_id,
+                    "status": target.status,
+                    "state": target.state,
+                    "last_check": target.last_checked,
+                    "response_time": target.latency_ms,  # ms
+                    "errors_count": target.failures,
+                    "latency": target.histogram.snapshot()
+                })
                 
             except Exception as e:
                 logger.error(f"Error checking server health: {e}")
@@ -10092,17 +10173,45 @@ main "$@" """,
             @self.mcp.custom_route("/health", methods=["GET"])
             async def health(request):
                 from starlette.responses import JSONResponse
+                storage = self.services.peek('storage')  # Never block a probe on warm-up
                 return JSONResponse({
                     "status": "healthy",
+                    "ready": self.services.is_ready(),
                     "server": "remote-memory-mcp",
                     "version": "2.1.5",
-                    "machine_id": self.storage.machine_id,
+                    "machine_id": storage.machine_id if storage else None,
                     "endpoints": {
                         "sse": f"{protocol}://{self.host}:{self.port}/sse",
                         "streamable_http": f"{protocol}://{self.host}:{self.port}/mcp"
                     },
                     "ssl_enabled": ssl_enabled
                 })
+
+            # Liveness: the process is up and serving HTTP
+            @self.mcp.custom_route("/health/live", methods=["GET"])
+            async def health_live(request):
+                from starlette.responses import JSONResponse
+                return JSONResponse({"status": "alive", "uptime_seconds": time.time() - self._start_time})
+
+            # Readiness: required subsystems finished initializing
+            @self.mcp.custom_route("/health/ready", methods=["GET"])
+            async def health_ready(request):
+                from starlette.responses import JSONResponse
+                status = self.services.status()
+                return JSONResponse(status, status_code=200 if status["ready"] else 503)
+            
+            # Prometheus scrape endpoint; answers during warm-up like the health probes
+            @self.mcp.custom_route("/metrics", methods=["GET"])
+            async def metrics(request):
+                from starlette.responses import Response
+                return Response(METRICS.render(), media_type=METRICS_CONTENT_TYPE)
+
+            METRICS.add_collector('result_sets', self.result_sets.get_stats)
+            METRICS.add_collector('health_probe', self.health_prober.get_stats)
+            METRICS.add_collector('services', lambda: {
+                name: {'ready': service['status'] == 'ready', 'init_seconds': service['seconds']}
+                for name, service in self.services.status()['services'].items()
+            })
             
             # Suppress MCP framework warnings about early requests  
             logging.getLogger("root").setLevel(logging.ERROR)
@@ -10111,20 +10220,29 @@ main "$@" """,
             import uvicorn
             
             async def start_all():
-                # 1. Start bridges
-                await self._setup_mcp_bridges()
-                
-                # 2. Get the SSE app (this will include the custom routes registered above)
+                # 1. Get the SSE app (this will include the custom routes registered above)
                 app = self.mcp.sse_app()
                 
-                # 3. Register startup message
+                # 2. Warm subsystems and start bridges in the background so the port binds immediately
                 @app.on_event("startup")
                 async def on_startup():
-                    logger.info("🚀 hAIveMind SSE server started and ready for connections")
-
-                # 4. Run server
+                    self.services.start_warm_up(after=self._setup_mcp_bridges)
+                    self.health_prober.start()
+                    logger.info("🚀 hAIveMind SSE server started - warming subsystems in the background")
+
+                # Drain queued telemetry (deletion audits included) before the process exits
+                @app.on_event("shutdown")
+                async def on_shutdown():
+                    await self.health_prober.stop()
+                    storage = self.services.peek('storage')  # Nothing to drain if warm-up never built it
+                    if storage:
+                        await storage.telemetry.close()
+                        storage.hot_cache.close()
+                        logger.info(f"🛑 Telemetry drained on shutdown: {storage.get_telemetry_stats()}")
+
+                # 3. Run server; requests other than health probes wait for warm-up
                 config = uvicorn.Config(
-                    app, 
+                    readiness_gate(app, self.services, exempt_prefixes=("/health", "/metrics", "/admin/api/mcp/health-all")), 
                     host=self.host, 
                     port=self.port,
                     log_level="info",
@@ -10185,7 +10303,8 @@ main "$@" """,
                             'old_status': 'todo'
                         }
                     
-                    async def list_tasks(self, project_id: str, status: str = None, limit: int = 50):
+                    async def list_tasks(self, project_id: str, status: str = None, limit: int = 50,
+                                         updated_since: str = None, offset: int = 0):
                         return {
                             'success': True,
                             'tasks': [],
@@ -10220,10 +10339,18 @@ main "$@" """,
             
             return ErrorWrapper()
     
+    def _get_agent_kanban(self):
+        """Lazy initialization of the agent kanban system"""
+        if self.agent_kanban is None:
+            from agent_kanban_system import AgentKanbanSystem
+            self.agent_kanban = AgentKanbanSystem()
+        return self.agent_kanban
+    
     def _get_enhanced_ticket_system(self):
         """Lazy initialization of enhanced ticket system"""
         if self.enhanced_tickets is None:
             vibe_tools = self._get_vibe_kanban_tools()
+            from enhanced_ticket_system import EnhancedTicketSystem
             self.enhanced_tickets = EnhancedTicketSystem(vibe_tools, self.storage, self.config)
         return self.enhanced_tickets
     
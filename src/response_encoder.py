@@ -0,0 +1,233 @@
+"""
+hAIveMind Response Encoder - Token-Budgeted Tool Output
+
+Turns memory tool results into compact JSON that fits a token budget, instead
+of pretty-printing every metadata field and chopping the string afterwards.
+
+Features:
+- Per-tool field projection (which memory fields and metadata keys to return)
+- Content snippets centred on query hits, with the original length reported
+- Compact encoding (no indentation, no empty fields)
+- Budget-aware packing: as many whole results as fit, plus an "omitted" count
+- Result lists are always wrapped as {"results": [...]}, trimmed or not
+- Per-tool response size and serialization time metrics
+"""
+
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# System/sharing metadata that is rarely useful to an agent reading results
+DEFAULT_METADATA_FIELDS = ('machine_id', 'project_name', 'tags', 'scope', 'confidentiality_level', 'user_id')
+
+# Query term occurrences considered when placing a snippet window
+MAX_SNIPPET_HITS = 64
+
+_ITEMS_PLACEHOLDER = "\x00items\x00"
+_WORD_RE = re.compile(r"\w{3,}")
+
+
+@dataclass(frozen=True)
+class Projection:
+    """Which parts of a memory a tool returns"""
+    fields: Tuple[str, ...] = ('id', 'category', 'score', 'created_at', 'content', 'context')
+    metadata_fields: Optional[Tuple[str, ...]] = DEFAULT_METADATA_FIELDS  # None keeps all metadata
+    content_chars: Optional[int] = 600  # None returns full content
+
+    @classmethod
+    def from_dict(cls, settings: Dict[str, Any], base: 'Projection') -> 'Projection':
+        metadata = settings.get('metadata', base.metadata_fields)
+        return cls(fields=tuple(settings.get('fields', base.fields)),
+                   metadata_fields=None if metadata is None else tuple(metadata),
+                   content_chars=settings.get('content_chars', base.content_chars))
+
+
+DEFAULT_PROJECTIONS = {
+    'search_memories': Projection(),
+    'get_recent_memories': Projection(content_chars=400),
+    'get_project_memories': Projection(content_chars=400),
+    'retrieve_memory': Projection(metadata_fields=None, content_chars=None),
+}
+
+
+def snippet(content: str, query: Optional[str], max_chars: int) -> str:
+    """Cut content down to max_chars, centred on the densest cluster of query terms"""
+    if len(content) <= max_chars:
+        return content
+    start = 0
+    terms = sorted({term.lower() for term in _WORD_RE.findall(query or '')}, key=len, reverse=True)
+    if terms:
+        pattern = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+        hits = [match.start() for match in islice(pattern.finditer(content), MAX_SNIPPET_HITS)]
+        if hits:
+            # Two-pointer sweep for the window start covering the most hits
+            span = max_chars * 3 // 4
+            best, best_count, end = hits[0], 0, 0
+            for i, position in enumerate(hits):
+                while end < len(hits) and hits[end] < position + span:
+                    end += 1
+                if end - i > best_count:
+                    best, best_count = position, end - i
+            start = max(0, min(best - max_chars // 4, len(content) - max_chars))
+    text = content[start:start + max_chars]
+    return ('…' if start else '') + text + ('…' if start + max_chars < len(content) else '')
+
+
+def project_memory(memory: Dict[str, Any], projection: Projection, query: Optional[str] = None) -> Dict[str, Any]:
+    """Reduce a memory dict to the projected fields, dropping empty values"""
+    projected = {}
+    for name in projection.fields:
+        value = memory.get(name)
+        if value in (None, '', [], {}):
+            continue
+        if name == 'content' and projection.content_chars is not None and len(value) > projection.content_chars:
+            projected['content'] = snippet(value, query, projection.content_chars)
+            projected['content_length'] = len(value)
+            continue
+        if name == 'score' and isinstance(value, float):
+            value = round(value, 4)
+        projected[name] = value
+    metadata = memory.get('metadata')
+    if isinstance(metadata, dict):
+        keys = metadata.keys() if projection.metadata_fields is None else projection.metadata_fields
+        kept = {key: metadata[key] for key in keys if metadata.get(key) not in (None, '', [], {})}
+        if kept:
+            projected['metadata'] = kept
+    return projected
+
+
+def compact_dumps(data: Any) -> str:
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+class ResponseEncoder:
+    """Project, pack and encode tool responses within a token budget"""
+
+    def __init__(self, max_tokens: int = 20000, chars_per_token: int = 4,
+                 projections: Optional[Dict[str, Projection]] = None):
+        self.max_tokens = max_tokens
+        self.chars_per_token = chars_per_token
+        self.projections = dict(DEFAULT_PROJECTIONS)
+        self.projections.update(projections or {})
+        self._lock = threading.Lock()
+        self.metrics: Dict[str, Dict[str, float]] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'ResponseEncoder':
+        settings = config.get('memory', {}).get('responses', {}) or {}
+        projections = {
+            tool: Projection.from_dict(overrides, DEFAULT_PROJECTIONS.get(tool, Projection()))
+            for tool, overrides in (settings.get('tools') or {}).items()
+        }
+        return cls(max_tokens=settings.get('max_tokens', 20000),
+                   chars_per_token=settings.get('chars_per_token', 4),
+                   projections=projections)
+
+    def project(self, tool: str, memory: Dict[str, Any], query: Optional[str] = None) -> Dict[str, Any]:
+        """Apply the tool's projection to a single memory"""
+        projection = self.projections.get(tool)
+        return project_memory(memory, projection, query) if projection else memory
+
+    def encode(self, tool: str, payload: Any, items_key: str = 'memories', query: Optional[str] = None,
+               max_tokens: Optional[int] = None,
+               on_omitted: Optional[Callable[[Dict[str, Any], int], None]] = None) -> str:
+        """
+        Encode a tool result compactly within the token budget.
+
+        payload is either a list of results, a single memory dict, or a dict
+        holding the result list under items_key. A bare list is encoded as
+        {"results": [...]} so callers always see one shape. Results are
+        projected for the tool and packed whole; when some do not fit, the
+        envelope gets an "omitted" count and on_omitted(envelope, included)
+        may adjust it (e.g. to point the next-page cursor at the first
+        omitted result).
+        """
+        started = time.perf_counter()
+        budget = (max_tokens or self.max_tokens) * self.chars_per_token
+        projection = self.projections.get(tool)
+
+        if isinstance(payload, list):
+            envelope, items, items_key = {}, payload, 'results'
+        elif isinstance(payload, dict) and isinstance(payload.get(items_key), list):
+            envelope, items = dict(payload), payload[items_key]
+        else:
+            if projection and isinstance(payload, dict) and 'content' in payload:
+                payload = project_memory(payload, projection, query)
+            encoded = compact_dumps(payload)
+            self._record(tool, len(encoded), time.perf_counter() - started, 1, 0)
+            return encoded
+
+        if projection:
+            items = [project_memory(item, projection, query) if isinstance(item, dict) else item
+                     for item in items]
+        parts = [compact_dumps(item) for item in items]
+
+        def frame(envelope_data):
+            return compact_dumps({**envelope_data, items_key: _ITEMS_PLACEHOLDER})
+
+        # Reserve room for the envelope and an "omitted" marker
+        overhead = len(frame(envelope)) + 32
+        used, included = overhead, 0
+        for part in parts:
+            if used + len(part) + 1 > budget:
+                break
+            used += len(part) + 1
+            included += 1
+
+        if included == 0 and parts:
+            # Never return an empty page because one result is large; shorten its content instead
+            first = dict(items[0]) if isinstance(items[0], dict) else items[0]
+            if isinstance(first, dict) and isinstance(first.get('content'), str):
+                room = max(200, budget - overhead - (len(parts[0]) - len(first['content'])))
+                first.setdefault('content_length', len(first['content']))
+                first['content'] = snippet(first['content'], query, room)
+            parts[0] = compact_dumps(first)
+            included = 1
+
+        omitted = len(parts) - included
+        if omitted:
+            envelope['omitted'] = omitted
+            if on_omitted:
+                on_omitted(envelope, included)
+
+        # The placeholder is a JSON-escaped control string, so it cannot collide with real values
+        encoded = frame(envelope).replace(
+            compact_dumps(_ITEMS_PLACEHOLDER), '[' + ','.join(parts[:included]) + ']', 1
+        )
+        self._record(tool, len(encoded), time.perf_counter() - started, included, omitted)
+        return encoded
+
+    def encode_json(self, tool: str, data: Any) -> str:
+        """Compact encoding with metrics for results that are not memory lists"""
+        started = time.perf_counter()
+        encoded = compact_dumps(data)
+        self._record(tool, len(encoded), time.perf_counter() - started, 0, 0)
+        return encoded
+
+    def _record(self, tool: str, size: int, seconds: float, included: int, omitted: int):
+        with self._lock:
+            metrics = self.metrics.setdefault(tool, {
+                'responses': 0, 'bytes': 0, 'max_bytes': 0, 'seconds': 0.0,
+                'results': 0, 'omitted': 0, 'budget_hits': 0
+            })
+            metrics['responses'] += 1
+            metrics['bytes'] += size
+            metrics['max_bytes'] = max(metrics['max_bytes'], size)
+            metrics['seconds'] += seconds
+            metrics['results'] += included
+            metrics['omitted'] += omitted
+            metrics['budget_hits'] += 1 if omitted else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                tool: {
+                    **metrics,
+                    'avg_bytes': metrics['bytes'] / metrics['responses'],
+                    'avg_ms': metrics['seconds'] * 1000 / metrics['responses'],
+                } for tool, metrics in self.metrics.items()
+            }
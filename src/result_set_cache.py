@@ -0,0 +1,161 @@
+"""
+hAIveMind Result Set Cache - Snapshot Pagination for Search Tools
+
+Keeps the ranked (id, score) list behind a search for a short time so agents
+can page through it with opaque cursors instead of re-running the
+multi-collection vector search for every page.
+
+Features:
+- One ranked snapshot per query fingerprint; every page of a cursor walks the
+  same snapshot, so results never shift between pages
+- Short TTL and a byte budget with LRU eviction
+- Cursors are opaque tokens naming a snapshot and an offset; an expired or
+  evicted snapshot is reported as CursorError rather than silently re-searched
+- Snapshots cut off at the query depth are extended in place when a cursor
+  reaches their end, so earlier pages keep their order
+"""
+
+import base64
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Rough per-entry overhead of a cached (id, score) tuple beyond the id string itself
+ENTRY_OVERHEAD_BYTES = 120
+
+
+class CursorError(ValueError):
+    """Cursor is malformed or its result set has expired"""
+
+
+@dataclass
+class ResultSet:
+    """Ranked snapshot of one query's results"""
+    set_id: str
+    fingerprint: str
+    ranked: List[Tuple[str, Optional[float]]]
+    exhausted: bool = True  # False when the query was cut off at the requested depth
+    created_at: float = field(default_factory=time.time)
+    size_bytes: int = 0
+
+    def __post_init__(self):
+        if not self.size_bytes:
+            self.size_bytes = sum(len(memory_id) for memory_id, _ in self.ranked) + \
+                ENTRY_OVERHEAD_BYTES * (len(self.ranked) + 1)
+
+    def page(self, offset: int, limit: int) -> List[Tuple[str, Optional[float]]]:
+        return self.ranked[offset:offset + limit]
+
+
+class ResultSetCache:
+    """TTL + LRU cache of ranked result sets, bounded by estimated memory"""
+
+    def __init__(self, ttl: float = 120.0, max_bytes: int = 8 * 1024 * 1024, window: int = 100):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.window = window
+        self._sets: 'OrderedDict[str, ResultSet]' = OrderedDict()
+        self._by_fingerprint: Dict[str, str] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'extended': 0, 'evicted': 0, 'expired': 0}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'ResultSetCache':
+        settings = config.get('memory', {}).get('result_sets', {}) or {}
+        return cls(ttl=settings.get('ttl_seconds', 120.0),
+                   max_bytes=settings.get('max_bytes', 8 * 1024 * 1024),
+                   window=settings.get('window', 100))
+
+    @staticmethod
+    def fingerprint(tool: str, params: Dict[str, Any]) -> str:
+        payload = json.dumps([tool, params], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def put(self, fingerprint: str, ranked: List[Tuple[str, Optional[float]]],
+            exhausted: bool = True) -> ResultSet:
+        """Store a fresh snapshot for a fingerprint
+
+        Older snapshots of the same query stay reachable through their cursors
+        until they expire or are evicted.
+        """
+        result_set = ResultSet(uuid.uuid4().hex[:16], fingerprint, list(ranked), exhausted)
+        with self._lock:
+            self._sets[result_set.set_id] = result_set
+            self._by_fingerprint[fingerprint] = result_set.set_id
+            self._bytes += result_set.size_bytes
+            self.stats['stored'] += 1
+            while self._bytes > self.max_bytes and len(self._sets) > 1:
+                self._remove(next(iter(self._sets)))
+                self.stats['evicted'] += 1
+        return result_set
+
+    def extend(self, result_set: ResultSet, ranked: List[Tuple[str, Optional[float]]], exhausted: bool):
+        """Append the IDs of a deeper run of the same query that the snapshot does not hold yet"""
+        with self._lock:
+            seen = {memory_id for memory_id, _ in result_set.ranked}
+            added = [(memory_id, score) for memory_id, score in ranked if memory_id not in seen]
+            result_set.ranked.extend(added)
+            result_set.exhausted = exhausted
+            grown = sum(len(memory_id) for memory_id, _ in added) + ENTRY_OVERHEAD_BYTES * len(added)
+            result_set.size_bytes += grown
+            if result_set.set_id in self._sets:
+                self._bytes += grown
+            self.stats['extended'] += 1
+
+    def get(self, fingerprint: str) -> Optional[ResultSet]:
+        """Live snapshot for a fingerprint, if any"""
+        with self._lock:
+            set_id = self._by_fingerprint.get(fingerprint)
+            result_set = self._live(set_id) if set_id else None
+            self.stats['hits' if result_set else 'misses'] += 1
+            return result_set
+
+    def encode_cursor(self, result_set: ResultSet, offset: int) -> str:
+        token = json.dumps({'s': result_set.set_id, 'o': offset}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(token.encode()).decode().rstrip('=')
+
+    def resolve(self, cursor: str) -> Tuple[ResultSet, int]:
+        """Snapshot and offset a cursor points at"""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            token = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            set_id, offset = str(token['s']), int(token['o'])
+        except Exception:
+            raise CursorError("Invalid cursor")
+        with self._lock:
+            result_set = self._live(set_id)
+            self.stats['hits' if result_set else 'misses'] += 1
+        if result_set is None:
+            raise CursorError("Cursor expired; repeat the query without a cursor to start a new result set")
+        return result_set, max(0, offset)
+
+    def _live(self, set_id: str) -> Optional[ResultSet]:
+        """Return an unexpired set and mark it recently used; caller holds the lock"""
+        result_set = self._sets.get(set_id)
+        if result_set is None:
+            return None
+        if time.time() - result_set.created_at > self.ttl:
+            self._remove(set_id)
+            self.stats['expired'] += 1
+            return None
+        self._sets.move_to_end(set_id)
+        return result_set
+
+    def _remove(self, set_id: str):
+        result_set = self._sets.pop(set_id, None)
+        if result_set is None:
+            return
+        self._bytes -= result_set.size_bytes
+        if self._by_fingerprint.get(result_set.fingerprint) == set_id:
+            del self._by_fingerprint[result_set.fingerprint]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'result_sets': len(self._sets), 'bytes': self._bytes,
+                    'max_bytes': self.max_bytes, 'ttl_seconds': self.ttl, **self.stats}
@@ -0,0 +1,658 @@
+#!/usr/bin/env python3
+"""
+hAIveMind Rules Replication Log - Durable, Replayable Rule Change Stream
+
+Rule changes are appended to a Redis Stream instead of being published with
+fire-and-forget PUBLISH. Each machine reads through its own consumer group,
+so a node that was offline or slow resumes from its last acknowledged entry
+and applies only the changes it missed.
+
+Features:
+- Per-machine consumer groups with acknowledged, at-least-once delivery;
+  an entry is acknowledged only once it applied, failures are retried in
+  order with backoff and left pending after max_delivery_attempts
+- Compacted snapshot (latest change per rule) plus the stream offset it covers;
+  entries past the retention window or beyond max_length are trimmed only once
+  folded in, and nodes that fell behind the trim point (at start-up or while
+  lagging) catch up from the snapshot
+- asyncio consumer that never blocks the event loop
+- Per-machine replication lag (entries and seconds behind the stream head)
+- Local SQLite stand-in with the same semantics when Redis is unavailable
+
+Author: Lance James, Unit 221B Inc
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from . import sqlite_pool
+except ImportError:
+    import sqlite_pool
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "haivemind:rules:stream"
+SNAPSHOT_KEY = "haivemind:rules:snapshot"
+SNAPSHOT_META_KEY = "haivemind:rules:snapshot:meta"
+COMPACTION_LOCK_KEY = "haivemind:rules:snapshot:lock"
+GROUP_PREFIX = "rules:"
+
+# A stream entry as delivered to consumers: (entry_id, serialized sync message)
+StreamEntry = Tuple[str, str]
+
+
+class RedisStreamBackend:
+    """Rule change stream stored in Redis Streams"""
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+
+    @staticmethod
+    def id_key(entry_id: str) -> Tuple[int, int]:
+        ms, _, seq = entry_id.partition('-')
+        return int(ms), int(seq or 0)
+
+    @staticmethod
+    def id_millis(entry_id: str) -> int:
+        return int(entry_id.partition('-')[0])
+
+    def id_millis_many(self, entry_ids: Iterable[str]) -> Dict[str, int]:
+        return {entry_id: self.id_millis(entry_id) for entry_id in entry_ids}
+
+    def append(self, payload: str) -> str:
+        # No MAXLEN: trimming belongs to compact(), which folds entries into the snapshot first
+        return self.redis.xadd(STREAM_KEY, {"message": payload})
+
+    def ensure_group(self, group: str) -> bool:
+        """Create the group at the start of the stream; False if it already exists"""
+        try:
+            self.redis.xgroup_create(STREAM_KEY, group, id='0', mkstream=True)
+            return True
+        except Exception as e:
+            if 'BUSYGROUP' in str(e):
+                return False
+            raise
+
+    def read(self, group: str, consumer: str, count: int, block_ms: int,
+             pending: bool = False, after: str = '0') -> List[StreamEntry]:
+        """New entries, or with pending=True this consumer's unacknowledged entries after `after`"""
+        response = self.redis.xreadgroup(group, consumer, {STREAM_KEY: after if pending else '>'},
+                                         count=count, block=None if pending else block_ms)
+        entries = []
+        for _stream, messages in response or []:
+            for entry_id, fields in messages:
+                if fields:  # Pending entries trimmed from the stream come back empty
+                    entries.append((entry_id, fields.get('message')))
+                else:
+                    self.redis.xack(STREAM_KEY, group, entry_id)
+        return entries
+
+    def ack(self, group: str, entry_ids: List[str]):
+        if entry_ids:
+            self.redis.xack(STREAM_KEY, group, *entry_ids)
+
+    def range_after(self, entry_id: Optional[str], count: int) -> List[StreamEntry]:
+        start = f"({entry_id}" if entry_id else '-'
+        return [(eid, fields.get('message')) for eid, fields in
+                self.redis.xrange(STREAM_KEY, min=start, max='+', count=count)]
+
+    def head(self) -> Optional[str]:
+        latest = self.redis.xrevrange(STREAM_KEY, max='+', min='-', count=1)
+        return latest[0][0] if latest else None
+
+    def groups(self) -> List[Dict[str, Any]]:
+        try:
+            info = self.redis.xinfo_groups(STREAM_KEY)
+        except Exception:
+            return []
+        return [{
+            'name': group['name'],
+            'last_delivered': group.get('last-delivered-id'),
+            'pending': group.get('pending', 0),
+            'lag': group.get('lag'),
+        } for group in info]
+
+    def length(self) -> int:
+        return self.redis.xlen(STREAM_KEY)
+
+    def count_after(self, entry_id: Optional[str], page_size: int = 1000) -> int:
+        if not entry_id or entry_id == '0-0':
+            return self.redis.xlen(STREAM_KEY)
+        # Page through the tail rather than loading it in one XRANGE
+        total = 0
+        while True:
+            page = self.redis.xrange(STREAM_KEY, min=f"({entry_id}", max='+', count=page_size)
+            total += len(page)
+            if len(page) < page_size:
+                return total
+            entry_id = page[-1][0]
+
+    def set_group_position(self, group: str, entry_id: str, page_size: int = 1000):
+        self.redis.xgroup_setid(STREAM_KEY, group, entry_id)
+        # Entries up to the new position are covered by the snapshot; drop them from the PEL
+        while True:
+            stale = self.redis.xpending_range(STREAM_KEY, group, min='-', max=entry_id, count=page_size)
+            if not stale:
+                return
+            self.redis.xack(STREAM_KEY, group, *[item['message_id'] for item in stale])
+
+    def trim_before(self, entry_id: str) -> int:
+        return self.redis.xtrim(STREAM_KEY, minid=entry_id, approximate=False)
+
+    def snapshot_items(self) -> Dict[str, str]:
+        return self.redis.hgetall(SNAPSHOT_KEY)
+
+    def snapshot_meta(self) -> Dict[str, str]:
+        return self.redis.hgetall(SNAPSHOT_META_KEY)
+
+    def save_snapshot(self, changes: Dict[str, str], meta: Dict[str, str]):
+        pipe = self.redis.pipeline()
+        if changes:
+            pipe.hset(SNAPSHOT_KEY, mapping=changes)
+        pipe.hset(SNAPSHOT_META_KEY, mapping=meta)
+        pipe.execute()
+
+    def acquire_compaction_lock(self, owner: str, ttl_seconds: int) -> bool:
+        return bool(self.redis.set(COMPACTION_LOCK_KEY, owner, nx=True, ex=ttl_seconds))
+
+    def release_compaction_lock(self, owner: str):
+        if self.redis.get(COMPACTION_LOCK_KEY) == owner:
+            self.redis.delete(COMPACTION_LOCK_KEY)
+
+
+class SQLiteStreamBackend:
+    """Local stand-in for the rule change stream when Redis is unavailable"""
+
+    def __init__(self, db_path: str = "data/rules_replication.db", poll_interval: float = 0.5):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._compaction_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS rule_stream (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    payload TEXT NOT NULL,
+                    created_ms INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS rule_stream_groups (
+                    group_name TEXT PRIMARY KEY,
+                    last_delivered INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS rule_stream_pending (
+                    group_name TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    PRIMARY KEY (group_name, seq)
+                );
+                CREATE TABLE IF NOT EXISTS rule_snapshot (
+                    rule_id TEXT PRIMARY KEY,
+                    message TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS rule_snapshot_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite_pool.connect(self.db_path)
+
+    @staticmethod
+    def id_key(entry_id: str) -> Tuple[int, int]:
+        return int(entry_id), 0
+
+    def id_millis(self, entry_id: str) -> int:
+        return self.id_millis_many([entry_id]).get(entry_id, 0)
+
+    def id_millis_many(self, entry_ids: Iterable[str]) -> Dict[str, int]:
+        """created_ms for many entries in one query per 500 ids; missing entries map to 0"""
+        entry_ids = list(dict.fromkeys(entry_ids))
+        millis = {entry_id: 0 for entry_id in entry_ids}
+        with self._connect() as conn:
+            for start in range(0, len(entry_ids), 500):
+                chunk = [int(entry_id) for entry_id in entry_ids[start:start + 500]]
+                rows = conn.execute(f"SELECT seq, created_ms FROM rule_stream WHERE seq IN "
+                                    f"({','.join('?' * len(chunk))})", chunk).fetchall()
+                millis.update((str(seq), created_ms) for seq, created_ms in rows)
+        return millis
+
+    def append(self, payload: str) -> str:
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute("INSERT INTO rule_stream (payload, created_ms) VALUES (?, ?)",
+                                  (payload, int(time.time() * 1000)))
+            return str(cursor.lastrowid)
+
+    def ensure_group(self, group: str) -> bool:
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute("INSERT OR IGNORE INTO rule_stream_groups (group_name) VALUES (?)", (group,))
+            return cursor.rowcount == 1
+
+    def read(self, group: str, consumer: str, count: int, block_ms: int,
+             pending: bool = False, after: str = '0') -> List[StreamEntry]:
+        if pending:
+            with self._connect() as conn:
+                rows = conn.execute("""
+                    SELECT s.seq, s.payload FROM rule_stream_pending p
+                    JOIN rule_stream s ON s.seq = p.seq
+                    WHERE p.group_name = ? AND s.seq > ? ORDER BY s.seq LIMIT ?
+                """, (group, int(after), count)).fetchall()
+            return [(str(seq), payload) for seq, payload in rows]
+
+        deadline = time.monotonic() + block_ms / 1000
+        while True:
+            with self._lock, self._connect() as conn:
+                rows = conn.execute("""
+                    SELECT seq, payload FROM rule_stream
+                    WHERE seq > (SELECT last_delivered FROM rule_stream_groups WHERE group_name = ?)
+                    ORDER BY seq LIMIT ?
+                """, (group, count)).fetchall()
+                if rows:
+                    conn.execute("UPDATE rule_stream_groups SET last_delivered = ? WHERE group_name = ?",
+                                 (rows[-1][0], group))
+                    conn.executemany("INSERT OR IGNORE INTO rule_stream_pending (group_name, seq) VALUES (?, ?)",
+                                     [(group, seq) for seq, _ in rows])
+                    return [(str(seq), payload) for seq, payload in rows]
+            if time.monotonic() >= deadline:
+                return []
+            time.sleep(min(self.poll_interval, max(0.0, deadline - time.monotonic())))
+
+    def ack(self, group: str, entry_ids: List[str]):
+        with self._lock, self._connect() as conn:
+            conn.executemany("DELETE FROM rule_stream_pending WHERE group_name = ? AND seq = ?",
+                             [(group, int(entry_id)) for entry_id in entry_ids])
+
+    def range_after(self, entry_id: Optional[str], count: int) -> List[StreamEntry]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT seq, payload FROM rule_stream WHERE seq > ? ORDER BY seq LIMIT ?",
+                                (int(entry_id or 0), count)).fetchall()
+        return [(str(seq), payload) for seq, payload in rows]
+
+    def head(self) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT MAX(seq) FROM rule_stream").fetchone()
+        return str(row[0]) if row and row[0] is not None else None
+
+    def groups(self) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute("""
+                SELECT g.group_name, g.last_delivered,
+                       (SELECT COUNT(*) FROM rule_stream_pending p WHERE p.group_name = g.group_name),
+                       (SELECT COUNT(*) FROM rule_stream s WHERE s.seq > g.last_delivered)
+                FROM rule_stream_groups g
+            """).fetchall()
+        return [{'name': name, 'last_delivered': str(last), 'pending': pending, 'lag': lag}
+                for name, last, pending, lag in rows]
+
+    def length(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM rule_stream").fetchone()[0]
+
+    def count_after(self, entry_id: Optional[str]) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM rule_stream WHERE seq > ?",
+                                (int(entry_id or 0),)).fetchone()[0]
+
+    def set_group_position(self, group: str, entry_id: str):
+        with self._lock, self._connect() as conn:
+            conn.execute("UPDATE rule_stream_groups SET last_delivered = ? WHERE group_name = ?",
+                         (int(entry_id), group))
+            conn.execute("DELETE FROM rule_stream_pending WHERE group_name = ? AND seq <= ?",
+                         (group, int(entry_id)))
+
+    def trim_before(self, entry_id: str) -> int:
+        with self._lock, self._connect() as conn:
+            return conn.execute("DELETE FROM rule_stream WHERE seq < ?", (int(entry_id),)).rowcount
+
+    def snapshot_items(self) -> Dict[str, str]:
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT rule_id, message FROM rule_snapshot").fetchall())
+
+    def snapshot_meta(self) -> Dict[str, str]:
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT key, value FROM rule_snapshot_meta").fetchall())
+
+    def save_snapshot(self, changes: Dict[str, str], meta: Dict[str, str]):
+        with self._lock, self._connect() as conn:
+            conn.executemany("""
+                INSERT INTO rule_snapshot (rule_id, message) VALUES (?, ?)
+                ON CONFLICT(rule_id) DO UPDATE SET message = excluded.message
+            """, list(changes.items()))
+            conn.executemany("""
+                INSERT INTO rule_snapshot_meta (key, value) VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value
+            """, list(meta.items()))
+
+    def acquire_compaction_lock(self, owner: str, ttl_seconds: int) -> bool:
+        return self._compaction_lock.acquire(blocking=False)
+
+    def release_compaction_lock(self, owner: str):
+        try:
+            self._compaction_lock.release()
+        except RuntimeError:
+            pass
+
+
+class RuleReplicationLog:
+    """Appends rule changes to the replication stream and replays them per machine"""
+
+    def __init__(self, redis_client, machine_id: str, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            redis_client: Redis client (decode_responses=True) or None for the SQLite stand-in
+            machine_id: This machine's identifier; also names its consumer group
+            config: rules.replication settings
+        """
+        config = config or {}
+        self.machine_id = machine_id
+        self.group = f"{GROUP_PREFIX}{machine_id}"
+        self.consumer = machine_id
+        self.batch_size = config.get('batch_size', 100)
+        self.block_ms = config.get('block_ms', 5000)
+        self.retention_seconds = config.get('retention_seconds', 86400)
+        self.max_length = config.get('max_length', 100000)
+        self.compaction_batch = config.get('compaction_batch', 1000)
+        self.max_delivery_attempts = config.get('max_delivery_attempts', 5)
+        self.retry_backoff_seconds = config.get('retry_backoff_seconds', 1.0)
+        self.max_retry_backoff_seconds = config.get('max_retry_backoff_seconds', 30.0)
+
+        if redis_client is not None:
+            self.backend = RedisStreamBackend(redis_client)
+        else:
+            self.backend = SQLiteStreamBackend(config.get('local_db_path', 'data/rules_replication.db'))
+
+        self._running = False
+        self.entries_appended = 0
+        self.entries_applied = 0
+        self.snapshot_restores = 0
+        self.failed_applies = 0
+        self.last_applied_id: Optional[str] = None
+        # entry_id -> failed attempts; entries past max_delivery_attempts stay pending (parked)
+        self._attempts: Dict[str, int] = {}
+        self._parked: set = set()
+
+    # Producer side
+
+    def append(self, message_data: Dict[str, Any]) -> str:
+        """Append a serialized sync message; returns its stream entry id"""
+        entry_id = self.backend.append(json.dumps(message_data))
+        self.entries_appended += 1
+        return entry_id
+
+    # Consumer side
+
+    def _needs_snapshot(self, created: bool) -> bool:
+        """True when entries this group has not seen were trimmed from the stream"""
+        trimmed_to = self.backend.snapshot_meta().get('trimmed_to')
+        if not trimmed_to:
+            return False
+        if created:
+            return True
+        for group in self.backend.groups():
+            if group['name'] == self.group:
+                last = group.get('last_delivered') or '0-0'
+                return self.backend.id_key(last) < self.backend.id_key(trimmed_to)
+        return True
+
+    def catch_up_entries(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """Join the stream; returns snapshot messages to apply first and whether a snapshot was used"""
+        return self.restore_if_trimmed(self.backend.ensure_group(self.group))
+
+    def restore_if_trimmed(self, created: bool = False) -> Tuple[List[Dict[str, Any]], bool]:
+        """Snapshot messages when entries this group never read were trimmed; moves the group past them"""
+        if not self._needs_snapshot(created):
+            return [], False
+
+        meta = self.backend.snapshot_meta()
+        messages = [json.loads(message) for message in self.backend.snapshot_items().values()]
+        messages.sort(key=lambda m: m.get('timestamp', ''))
+        self.backend.set_group_position(self.group, meta['offset'])
+        self.snapshot_restores += 1
+        logger.info(f"Rules replication: restored {len(messages)} rules from snapshot at {meta['offset']}")
+        return messages, True
+
+    def read_batch(self, pending: bool = False, after: str = '0') -> List[StreamEntry]:
+        return self.backend.read(self.group, self.consumer, self.batch_size, self.block_ms,
+                                 pending=pending, after=after)
+
+    def ack(self, entry_ids: List[str]):
+        self.backend.ack(self.group, entry_ids)
+        if entry_ids:
+            self.entries_applied += len(entry_ids)
+            self.last_applied_id = entry_ids[-1]
+
+    async def _apply_snapshot(self, handler: Callable[[Dict[str, Any]], Awaitable[None]],
+                              messages: List[Dict[str, Any]]):
+        for message_data in messages:
+            try:
+                await handler(message_data)
+            except Exception as e:
+                # Snapshot entries hold the latest state per rule; the next change to the rule supersedes it
+                self.failed_applies += 1
+                logger.error(f"Failed to apply snapshot rule change {message_data.get('sync_id')}: {e}")
+
+    def _retry_delay(self, attempts: int) -> float:
+        return min(self.max_retry_backoff_seconds, self.retry_backoff_seconds * 2 ** (attempts - 1))
+
+    async def consume(self, handler: Callable[[Dict[str, Any]], Awaitable[None]]):
+        """Apply missed and new changes with handler until stop() is called
+
+        Entries are acknowledged only after the handler returns. When it
+        raises, the entry stays pending and is redelivered (in stream order,
+        after a backoff) up to max_delivery_attempts; after that it is parked:
+        left pending for XCLAIM or the next restart while later entries flow.
+        """
+        self._running = True
+        loop = asyncio.get_event_loop()
+        snapshot_messages, _ = await loop.run_in_executor(None, self.catch_up_entries)
+        await self._apply_snapshot(handler, snapshot_messages)
+
+        # Redeliver anything read but not acknowledged before the last shutdown;
+        # pending_after is the paging cursor while replaying pending entries
+        pending_after: Optional[str] = '0'
+        while self._running:
+            try:
+                if pending_after is None:
+                    # A lagging group whose unread entries were trimmed catches up from the snapshot
+                    snapshot_messages, _ = await loop.run_in_executor(None, self.restore_if_trimmed)
+                    await self._apply_snapshot(handler, snapshot_messages)
+                entries = await loop.run_in_executor(
+                    None, self.read_batch, pending_after is not None, pending_after or '0')
+            except Exception as e:
+                logger.error(f"Rules replication read failed: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            if pending_after is not None and not entries:
+                pending_after = None
+                continue
+
+            for entry_id, payload in entries:
+                if pending_after is not None:
+                    pending_after = entry_id
+                if entry_id in self._parked:
+                    continue
+                try:
+                    await handler(json.loads(payload))
+                except Exception as e:
+                    self.failed_applies += 1
+                    attempts = self._attempts[entry_id] = self._attempts.get(entry_id, 0) + 1
+                    if attempts >= self.max_delivery_attempts:
+                        self._parked.add(entry_id)
+                        self._attempts.pop(entry_id, None)
+                        logger.error(f"Parking replicated rule change {entry_id} after {attempts} attempts "
+                                     f"(left pending for redelivery): {e}")
+                        continue
+                    delay = self._retry_delay(attempts)
+                    logger.warning(f"Failed to apply replicated rule change {entry_id} "
+                                   f"(attempt {attempts}, retrying in {delay:.1f}s): {e}")
+                    # Replay pending entries from the start so later changes never overtake this one
+                    await asyncio.sleep(delay)
+                    pending_after = '0'
+                    break
+                self._attempts.pop(entry_id, None)
+                await loop.run_in_executor(None, self.ack, [entry_id])
+
+    def stop(self):
+        self._running = False
+
+    # Compaction
+
+    @staticmethod
+    def _snapshot_message(message_data: Dict[str, Any], rule_data: Dict[str, Any],
+                          operation: str) -> Dict[str, Any]:
+        return {
+            **message_data,
+            "sync_id": f"snapshot:{message_data.get('sync_id')}",
+            "operation": operation,
+            "rule_data": rule_data,
+            "checksum": hashlib.sha256(json.dumps(rule_data, sort_keys=True).encode()).hexdigest(),
+            "requires_acknowledgment": False,
+            "expires_at": None,
+            "metadata": {**(message_data.get('metadata') or {}), "snapshot": True},
+        }
+
+    @classmethod
+    def fold(cls, snapshot: Dict[str, str], message_data: Dict[str, Any]):
+        """Fold one change into the per-rule snapshot (latest state wins)"""
+        operation = message_data.get('operation')
+        rule_data = message_data.get('rule_data') or {}
+
+        if operation == 'bulk_sync':
+            for rule in rule_data.get('rules', []):
+                if rule.get('id'):
+                    snapshot[rule['id']] = json.dumps(cls._snapshot_message(message_data, rule, 'update'))
+            return
+
+        rule_id = rule_data.get('id')
+        if not rule_id:
+            return
+        if operation in ('delete', 'emergency_update'):
+            folded = operation
+        else:
+            # Create/update/activate/deactivate all carry the full exported rule,
+            # including its status, so replaying them as an update reproduces the state
+            folded = 'update'
+        snapshot[rule_id] = json.dumps(cls._snapshot_message(message_data, rule_data, folded))
+
+    def compact(self) -> Dict[str, Any]:
+        """Fold new entries into the snapshot and trim entries past retention or beyond max_length"""
+        if not self.backend.acquire_compaction_lock(self.machine_id, ttl_seconds=300):
+            return {"compacted": 0, "trimmed": 0, "skipped": True}
+
+        try:
+            meta = self.backend.snapshot_meta()
+            offset = meta.get('offset')
+            folded = 0
+            while True:
+                entries = self.backend.range_after(offset, self.compaction_batch)
+                if not entries:
+                    break
+                changes: Dict[str, str] = {}
+                for entry_id, payload in entries:
+                    try:
+                        self.fold(changes, json.loads(payload))
+                    except (TypeError, ValueError) as e:
+                        logger.warning(f"Skipping unreadable replication entry {entry_id}: {e}")
+                offset = entries[-1][0]
+                folded += len(entries)
+                self.backend.save_snapshot(changes, {"offset": offset})
+
+            trimmed = 0
+            if offset:
+                # Only trim entries folded into the snapshot that are past retention or over max_length
+                cutoff_ms = int((time.time() - self.retention_seconds) * 1000)
+                excess = max(0, self.backend.length() - self.max_length)
+                trim_to, cursor, counted = None, meta.get('trimmed_to'), 0
+                while True:
+                    entries = self.backend.range_after(cursor, self.compaction_batch)
+                    millis = self.backend.id_millis_many(entry_id for entry_id, _ in entries)
+                    for entry_id, _ in entries:
+                        if self.backend.id_key(entry_id) > self.backend.id_key(offset):
+                            break
+                        if counted >= excess and millis[entry_id] > cutoff_ms:  # Age == retention is expired
+                            break
+                        trim_to, counted = entry_id, counted + 1
+                    else:
+                        if entries:
+                            cursor = entries[-1][0]
+                            continue
+                    break
+                if trim_to:
+                    # trimmed_to marks the newest entry removed; groups behind it need the snapshot
+                    trimmed = self.backend.trim_before(self._next_id(trim_to))
+                    self.backend.save_snapshot({}, {"offset": offset, "trimmed_to": trim_to})
+
+            return {"compacted": folded, "trimmed": trimmed, "offset": offset, "skipped": False}
+        finally:
+            self.backend.release_compaction_lock(self.machine_id)
+
+    def _next_id(self, entry_id: str) -> str:
+        if isinstance(self.backend, RedisStreamBackend):
+            ms, seq = self.backend.id_key(entry_id)
+            return f"{ms}-{seq + 1}"
+        return str(int(entry_id) + 1)
+
+    # Metrics
+
+    def get_replication_lag(self) -> Dict[str, Dict[str, Any]]:
+        """Per-machine lag behind the stream head"""
+        head = self.backend.head()
+        groups = []
+        for group in self.backend.groups():
+            if not group['name'].startswith(GROUP_PREFIX):
+                continue
+            entries_behind = group.get('lag')
+            if entries_behind is None:
+                entries_behind = self.backend.count_after(group.get('last_delivered'))
+            groups.append((group, entries_behind))
+
+        # Every timestamp the lag needs, read in one go
+        oldest = self.backend.range_after(None, 1) if head else []
+        oldest_id = oldest[0][0] if oldest else None
+        millis = self.backend.id_millis_many(
+            [entry_id for entry_id in [head, oldest_id] if entry_id] +
+            [group.get('last_delivered') for group, _ in groups
+             if group.get('last_delivered') not in (None, '0-0', '0')])
+        head_ms = millis.get(head, 0)
+
+        lag = {}
+        for group, entries_behind in groups:
+            last = group.get('last_delivered')
+            if entries_behind and last and last != '0-0' and last != '0':
+                seconds_behind = max(0.0, (head_ms - millis[last]) / 1000)
+            elif entries_behind and oldest_id:
+                seconds_behind = max(0.0, (head_ms - millis[oldest_id]) / 1000)
+            else:
+                seconds_behind = 0.0
+            lag[group['name'][len(GROUP_PREFIX):]] = {
+                "entries_behind": entries_behind,
+                "unacknowledged": group.get('pending', 0),
+                "seconds_behind": round(seconds_behind, 3),
+                "last_delivered_id": last,
+            }
+        return lag
+
+    def get_stats(self) -> Dict[str, Any]:
+        meta = self.backend.snapshot_meta()
+        return {
+            "backend": "redis_stream" if isinstance(self.backend, RedisStreamBackend) else "sqlite",
+            "head": self.backend.head(),
+            "snapshot_offset": meta.get('offset'),
+            "trimmed_to": meta.get('trimmed_to'),
+            "entries_appended": self.entries_appended,
+            "entries_applied": self.entries_applied,
+            "snapshot_restores": self.snapshot_restores,
+            "failed_applies": self.failed_applies,
+            "parked_entries": sorted(self._parked),
+            "last_applied_id": self.last_applied_id,
+            "lag": self.get_replication_lag(),
+        }
@@ -129,21 +129,23 @@ class RulesSyncAPI:
         
         @self.router.post("/emergency-sync")
         async def handle_emergency_sync(sync_data: Dict[str, Any]):
-            """Handle incoming emergency sync from another machine"""
+            """Apply an emergency sync pushed directly by another machine
+            
+            The sender counts this machine towards its quorum only when the
+            reply reports applied=True, i.e. the rule change is in effect here.
+            """
             try:
-                # This endpoint is called directly by other machines for emergency updates
                 sync_message_data = sync_data.get('sync_message', {})
                 source_machine = sync_data.get('source')
                 
-                # Process the emergency sync message
-                # This would typically be handled by the Redis listener, but for direct HTTP calls
-                # we need to handle it here
-                
                 logger.warning(f"Received direct emergency sync from {source_machine}")
+                applied = await self.sync_service.apply_direct_emergency_sync(sync_message_data)
                 
                 return {
                     "success": True,
-                    "message": "Emergency sync received and will be processed"
+                    "applied": applied,
+                    "sync_id": sync_message_data.get('sync_id'),
+                    "machine_id": self.sync_service.machine_id
                 }
                 
             except Exception as e:
@@ -161,6 +163,19 @@ class RulesSyncAPI:
                 logger.error(f"Sync status error: {e}")
                 raise HTTPException(status_code=500, detail=str(e))
         
+        @self.router.get("/replication-lag")
+        async def get_replication_lag(_: str = Depends(self._verify_token)):
+            """Get per-machine replication lag behind the rule change stream"""
+            try:
+                return {
+                    "machine_id": self.sync_service.machine_id,
+                    "lag": await self.sync_service.get_replication_lag_async()
+                }
+                
+            except Exception as e:
+                logger.error(f"Replication lag error: {e}")
+                raise HTTPException(status_code=500, detail=str(e))
+        
         @self.router.get("/conflicts")
         async def get_conflicts(conflict_id: Optional[str] = None, _: str = Depends(self._verify_token)):
             """Get rule synchronization conflicts"""
@@ -15,17 +15,19 @@ import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
+from collections import OrderedDict
 from dataclasses import dataclass, asdict
 from enum import Enum
 
 import redis
-import httpx
 from fastapi import HTTPException
 
 from .rules_engine import RulesEngine, Rule, RuleType, RuleScope, RulePriority, RuleStatus
 from .rules_database import RulesDatabase, RuleChangeType
 from .rules_haivemind_integration import RulesHAIveMindIntegration
 from .rule_management_service import RuleManagementService
+from .rules_replication_log import RuleReplicationLog
+from .emergency_fanout import EmergencyFanoutDispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -123,6 +125,20 @@ class RulesSyncService:
             self.redis_client
         )
         
+        # Durable replication log (Redis Stream, or local SQLite stand-in without Redis)
+        self.replication_log = RuleReplicationLog(
+            self.redis_client,
+            self.machine_id,
+            config.get('rules', {}).get('replication', {})
+        )
+        
+        # Concurrent direct delivery for emergency updates
+        fanout_config = config.get('rules', {}).get('emergency_fanout', {})
+        self.emergency_port = fanout_config.get('port', 8899)
+        self.emergency_dispatcher = EmergencyFanoutDispatcher(fanout_config)
+        # Emergency syncs arrive twice (direct push and the replication log); apply once
+        self._applied_emergency_syncs: "OrderedDict[str, None]" = OrderedDict()
+        
         # Sync state management
         self.active_syncs: Dict[str, RuleSyncStatus] = {}
         self.pending_conflicts: Dict[str, RuleSyncConflict] = {}
@@ -138,8 +154,11 @@ class RulesSyncService:
             'successful_syncs': 0,
             'failed_syncs': 0,
             'conflicts_resolved': 0,
-            'avg_sync_time': 0.0
+            'avg_sync_time': 0.0,
+            'replication_lag': {}
         }
+        # Replication log stats, refreshed off the event loop by the health check
+        self.replication_stats: Dict[str, Any] = {}
         
         # Start background tasks
         self._start_background_tasks()
@@ -179,10 +198,9 @@ class RulesSyncService:
     
     def _start_background_tasks(self):
         """Start background sync tasks"""
-        if self.redis_client:
-            asyncio.create_task(self._listen_for_sync_messages())
-            asyncio.create_task(self._periodic_sync_health_check())
-            asyncio.create_task(self._cleanup_expired_syncs())
+        asyncio.create_task(self._listen_for_sync_messages())
+        asyncio.create_task(self._periodic_sync_health_check())
+        asyncio.create_task(self._cleanup_expired_syncs())
     
     async def sync_rule_to_network(self, rule_id: str, operation: RuleSyncOperation, 
                                   priority: RuleSyncPriority = RuleSyncPriority.NORMAL,
@@ -352,10 +370,7 @@ class RulesSyncService:
             raise
     
     async def _broadcast_sync_message(self, message: RuleSyncMessage, immediate: bool = False):
-        """Broadcast sync message to the network"""
-        if not self.redis_client:
-            raise RuntimeError("Redis client not available for sync broadcasting")
-        
+        """Append sync message to the replication log for every machine to consume"""
         try:
             # Serialize message
             message_data = {
@@ -372,92 +387,86 @@ class RulesSyncService:
                 "expires_at": message.expires_at.isoformat() if message.expires_at else None
             }
             
-            # Choose channel based on priority
-            if message.priority == RuleSyncPriority.EMERGENCY:
-                channel = "haivemind:rules:emergency"
-            elif message.priority.value >= RuleSyncPriority.HIGH.value:
-                channel = "haivemind:rules:priority"
-            else:
-                channel = "haivemind:rules:sync"
-            
-            # Broadcast message
-            self.redis_client.publish(channel, json.dumps(message_data))
+            # Durable append; machines that are offline replay it when they reconnect
+            entry_id = await asyncio.get_event_loop().run_in_executor(None, self.replication_log.append, message_data)
             
             # For emergency updates, also send direct HTTP requests
             if immediate and message.priority == RuleSyncPriority.EMERGENCY:
-                await self._send_direct_emergency_sync(message)
+                await self._send_direct_emergency_sync(message, message_data)
             
-            logger.info(f"Sync message broadcasted on {channel}: {message.sync_id}")
+            logger.info(f"Sync message appended to replication log at {entry_id}: {message.sync_id}")
             
         except Exception as e:
             logger.error(f"Failed to broadcast sync message: {e}")
             raise
     
-    async def _send_direct_emergency_sync(self, message: RuleSyncMessage):
-        """Send emergency sync directly to known machines via HTTP"""
-        target_machines = message.target_machines or list(self.known_machines)
-        
-        for machine in target_machines:
-            if machine == self.machine_id:
-                continue
-                
-            try:
-                async with httpx.AsyncClient(timeout=10.0) as client:
-                    url = f"http://{machine}:8899/api/rules/emergency-sync"
-                    response = await client.post(url, json={
-                        "sync_message": asdict(message),
-                        "source": self.machine_id
-                    })
-                    
-                    if response.status_code == 200:
-                        logger.info(f"Emergency sync sent directly to {machine}")
-                    else:
-                        logger.warning(f"Failed to send emergency sync to {machine}: {response.status_code}")
-                        
-            except Exception as e:
-                logger.error(f"Failed to send direct emergency sync to {machine}: {e}")
-    
-    async def _listen_for_sync_messages(self):
-        """Listen for incoming sync messages from the network"""
-        if not self.redis_client:
+    async def _send_direct_emergency_sync(self, message: RuleSyncMessage, message_data: Dict[str, Any]):
+        """Send emergency sync directly to known machines via HTTP, concurrently"""
+        target_machines = [machine for machine in (message.target_machines or list(self.known_machines))
+                           if machine != self.machine_id]
+        if not target_machines:
             return
         
-        pubsub = self.redis_client.pubsub()
-        pubsub.subscribe("haivemind:rules:sync", "haivemind:rules:priority", "haivemind:rules:emergency")
+        def report_quorum(result):
+            logger.warning(f"Emergency sync {message.sync_id} reached quorum: "
+                           f"{len(result.acknowledged)}/{result.targets} machines in {result.quorum_seconds:.2f}s")
         
-        logger.info("Started listening for rule sync messages")
+        result = await self.emergency_dispatcher.dispatch(
+            target_machines,
+            {"sync_message": message_data, "source": self.machine_id},
+            f"http://{{machine}}:{self.emergency_port}/api/rules/emergency-sync",
+            on_quorum=report_quorum
+        )
+        
+        for machine, error in result.failed.items():
+            logger.error(f"Failed to send direct emergency sync to {machine}: {error}")
+        if result.skipped:
+            logger.warning(f"Emergency sync skipped {len(result.skipped)} machines with open circuits: {result.skipped}")
+        if not result.quorum_reached:
+            logger.error(f"Emergency sync {message.sync_id} did not reach quorum: "
+                         f"{len(result.acknowledged)}/{result.quorum} required")
+    
+    async def _listen_for_sync_messages(self):
+        """Consume this machine's replication log group, starting with missed changes"""
+        logger.info(f"Started consuming rule replication log as group {self.replication_log.group}")
         
         try:
-            async for message in pubsub.listen():
-                if message['type'] == 'message':
-                    try:
-                        await self._process_incoming_sync_message(message)
-                    except Exception as e:
-                        logger.error(f"Error processing sync message: {e}")
+            await self.replication_log.consume(self._process_replicated_sync_message)
         except Exception as e:
             logger.error(f"Error in sync message listener: {e}")
-        finally:
-            pubsub.close()
     
-    async def _process_incoming_sync_message(self, redis_message):
-        """Process incoming sync message"""
+    async def _process_replicated_sync_message(self, message_data: Dict[str, Any]):
+        """Apply a replication log entry; raises so the log leaves failed entries pending"""
+        # The log is replayed after outages, so expiry (meant for live delivery) does not apply
+        await self._process_incoming_sync_message(message_data, check_expiry=False)
+    
+    async def apply_direct_emergency_sync(self, message_data: Dict[str, Any]) -> bool:
+        """Apply an emergency sync pushed over HTTP; True once the change is in effect here"""
+        return await self._process_incoming_sync_message(message_data)
+    
+    async def _process_incoming_sync_message(self, message_data: Dict[str, Any], check_expiry: bool = True) -> bool:
+        """Process incoming sync message; returns False if skipped, raises if it could not be applied"""
         try:
-            message_data = json.loads(redis_message['data'])
-            
+
             # Skip messages from self
             if message_data.get('source_machine') == self.machine_id:
-                return
+                return False
             
             # Check if message is targeted to this machine
             target_machines = message_data.get('target_machines')
             if target_machines and self.machine_id not in target_machines:
-                return
+                return False
             
             # Check if message has expired
             expires_at = message_data.get('expires_at')
-            if expires_at and datetime.fromisoformat(expires_at) < datetime.now():
+            if check_expiry and expires_at and datetime.fromisoformat(expires_at) < datetime.now():
                 logger.warning(f"Received expired sync message: {message_data.get('sync_id')}")
-                return
+                return False
+            
+            # Already applied via the other delivery path
+            sync_id = message_data.get('sync_id')
+            if sync_id in self._applied_emergency_syncs:
+                return True
             
             # Parse sync message
             sync_message = RuleSyncMessage(
@@ -476,9 +485,15 @@ class RulesSyncService:
             
             # Process the sync operation
             await self._apply_sync_operation(sync_message)
+            if sync_message.priority == RuleSyncPriority.EMERGENCY:
+                self._applied_emergency_syncs[sync_id] = None
+                while len(self._applied_emergency_syncs) > 1000:
+                    self._applied_emergency_syncs.popitem(last=False)
+            return True
             
         except Exception as e:
             logger.error(f"Failed to process incoming sync message: {e}")
+            raise
     
     async def _apply_sync_operation(self, sync_message: RuleSyncMessage):
         """Apply sync operation to local rules database"""
@@ -517,6 +532,7 @@ class RulesSyncService:
             # Send failure acknowledgment if required
             if sync_message.requires_acknowledgment:
                 await self._send_sync_acknowledgment(sync_message, "failed", str(e))
+            raise
     
     async def _apply_bulk_sync(self, sync_message: RuleSyncMessage):
         """Apply bulk sync operation"""
@@ -839,6 +855,7 @@ class RulesSyncService:
     
     async def _periodic_sync_health_check(self):
         """Periodic health check for sync operations"""
+        await self._refresh_replication_state()
         while True:
             try:
                 await asyncio.sleep(300)  # Check every 5 minutes
@@ -856,12 +873,18 @@ class RulesSyncService:
                 for sync_id in completed_syncs:
                     del self.active_syncs[sync_id]
                 
-                # Update metrics
+                # Update metrics (replication log reads are blocking Redis/SQLite I/O)
+                await self._refresh_replication_state()
                 self._update_sync_metrics()
                 
                 # Check for stale conflicts
                 await self._check_stale_conflicts()
                 
+                # Fold replicated changes into the snapshot and trim old entries
+                compaction = await asyncio.get_event_loop().run_in_executor(None, self.replication_log.compact)
+                if compaction.get('trimmed'):
+                    logger.info(f"Rules replication log compacted: {compaction}")
+                
             except Exception as e:
                 logger.error(f"Error in sync health check: {e}")
     
@@ -932,6 +955,19 @@ class RulesSyncService:
             'avg_sync_time': avg_sync_time
         })
     
+    async def _refresh_replication_state(self):
+        """Read replication lag and log stats in the executor and cache them for status reads"""
+        loop = asyncio.get_event_loop()
+        self.sync_metrics['replication_lag'] = await loop.run_in_executor(None, self.get_replication_lag)
+        try:
+            self.replication_stats = await loop.run_in_executor(None, self.replication_log.get_stats)
+        except Exception as e:
+            logger.error(f"Failed to read replication log stats: {e}")
+    
+    async def get_replication_lag_async(self) -> Dict[str, Dict[str, Any]]:
+        """get_replication_lag for coroutines: runs the log reads in the executor"""
+        return await asyncio.get_event_loop().run_in_executor(None, self.get_replication_lag)
+    
     def _calculate_rule_checksum(self, rule_data: Dict[str, Any]) -> str:
         """Calculate checksum for rule data"""
         # Create deterministic string representation
@@ -960,9 +996,19 @@ class RulesSyncService:
             return {
                 "active_syncs": {sid: asdict(status) for sid, status in self.active_syncs.items()},
                 "pending_conflicts": len(self.pending_conflicts),
-                "metrics": self.sync_metrics
+                "metrics": self.sync_metrics,
+                "replication": self.replication_stats,
+                "emergency_fanout": self.emergency_dispatcher.get_stats()
             }
     
+    def get_replication_lag(self) -> Dict[str, Dict[str, Any]]:
+        """Per-machine replication lag behind the rule change stream"""
+        try:
+            return self.replication_log.get_replication_lag()
+        except Exception as e:
+            logger.error(f"Failed to read replication lag: {e}")
+            return {}
+    
     def get_conflict_status(self, conflict_id: Optional[str] = None) -> Dict[str, Any]:
         """Get conflict resolution status"""
         if conflict_id:
@@ -0,0 +1,196 @@
+"""
+hAIveMind Service Registry - Lazy Subsystem Initialization
+
+Lets servers bind their port and answer liveness checks before heavy
+subsystems (ChromaDB, embedding models, credential vaults) are built.
+
+Features:
+- Services are registered as factories and built on first use
+- LazyService proxies stand in for the real objects, so existing attribute
+  access keeps working unchanged
+- Background warm-up after the server starts, with per-service timings
+- Readiness separate from liveness, plus an ASGI gate that holds requests
+  (without blocking the event loop) until warm-up finishes
+
+Author: Lance James, Unit 221B Inc
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ServiceEntry:
+    """A registered subsystem and its initialization state"""
+    name: str
+    factory: Callable[[], Any]
+    warm: bool = True
+    required: bool = True
+    instance: Any = None
+    status: str = "pending"  # pending, initializing, ready, failed
+    error: Optional[str] = None
+    seconds: Optional[float] = None
+    lock: threading.RLock = field(default_factory=threading.RLock)
+
+
+class LazyService:
+    """Proxy that builds its service on first attribute access"""
+
+    __slots__ = ('_registry', '_name')
+
+    def __init__(self, registry: 'ServiceRegistry', name: str):
+        object.__setattr__(self, '_registry', registry)
+        object.__setattr__(self, '_name', name)
+
+    def __getattr__(self, attr):
+        return getattr(self._registry.get(self._name), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._registry.get(self._name), attr, value)
+
+    def __bool__(self):
+        return bool(self._registry.get(self._name))
+
+    def __repr__(self):
+        return f"<LazyService {self._name} ({self._registry.entry(self._name).status})>"
+
+
+class ServiceRegistry:
+    """Factories for heavy subsystems, built lazily or warmed in the background"""
+
+    def __init__(self):
+        self._services: 'OrderedDict[str, ServiceEntry]' = OrderedDict()
+        self._warm_task: Optional[asyncio.Task] = None
+        self.created_at = time.time()
+        self.warmed_at: Optional[float] = None
+
+    def register(self, name: str, factory: Callable[[], Any], warm: bool = True,
+                 required: bool = True) -> LazyService:
+        """
+        Register a factory and return a proxy for it.
+
+        Args:
+            warm: Build during background warm-up (otherwise only on first use)
+            required: Readiness depends on this service initializing successfully
+        """
+        self._services[name] = ServiceEntry(name, factory, warm, required)
+        return LazyService(self, name)
+
+    def entry(self, name: str) -> ServiceEntry:
+        return self._services[name]
+
+    def get(self, name: str) -> Any:
+        """Return the service, building it now if needed (blocks while another thread builds it)"""
+        entry = self._services[name]
+        if entry.status == "ready":
+            return entry.instance
+        with entry.lock:
+            if entry.status != "ready":
+                entry.status = "initializing"
+                started = time.perf_counter()
+                try:
+                    entry.instance = entry.factory()
+                except Exception as e:
+                    entry.status = "failed"
+                    entry.error = str(e)
+                    entry.seconds = time.perf_counter() - started
+                    logger.error(f"💥 Service {name} failed to initialize: {e}")
+                    raise
+                entry.seconds = time.perf_counter() - started
+                entry.error = None
+                entry.status = "ready"
+                logger.info(f"⚡ Service {name} ready in {entry.seconds:.2f}s")
+        return entry.instance
+
+    def peek(self, name: str) -> Any:
+        """The service if it is already built, else None (never triggers initialization)"""
+        entry = self._services.get(name)
+        return entry.instance if entry is not None and entry.status == "ready" else None
+
+    # Warm-up and readiness
+
+    async def warm_up(self, after: Optional[Callable[[], Awaitable[None]]] = None):
+        """Build every warm service in registration order off the event loop, then run after()"""
+        loop = asyncio.get_event_loop()
+        for entry in list(self._services.values()):
+            if not entry.warm or entry.status == "ready":
+                continue
+            try:
+                await loop.run_in_executor(None, self.get, entry.name)
+            except Exception:
+                pass  # Recorded on the entry and reported by readiness
+        if after is not None:
+            try:
+                await after()
+            except Exception as e:
+                logger.error(f"Post warm-up step failed: {e}")
+        self.warmed_at = time.time()
+        logger.info(f"🚀 Warm-up finished in {self.warmed_at - self.created_at:.2f}s since startup")
+
+    def start_warm_up(self, after: Optional[Callable[[], Awaitable[None]]] = None) -> asyncio.Task:
+        if self._warm_task is None:
+            self._warm_task = asyncio.ensure_future(self.warm_up(after))
+        return self._warm_task
+
+    def is_ready(self) -> bool:
+        if self._warm_task is not None and not self._warm_task.done():
+            return False
+        return all(entry.status == "ready" for entry in self._services.values() if entry.required and entry.warm)
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait for warm-up (or build warm services if it never started); True when ready"""
+        if self._warm_task is None:
+            self.start_warm_up()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._warm_task), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return self.is_ready()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.is_ready(),
+            "uptime_seconds": time.time() - self.created_at,
+            "warm_up_seconds": None if self.warmed_at is None else self.warmed_at - self.created_at,
+            "services": {
+                name: {"status": entry.status, "required": entry.required,
+                       "seconds": entry.seconds, "error": entry.error}
+                for name, entry in self._services.items()
+            }
+        }
+
+
+def readiness_gate(app, registry: ServiceRegistry, exempt_prefixes: Iterable[str] = ("/health",),
+                   timeout: float = 120.0):
+    """
+    ASGI wrapper that holds requests until the registry is ready.
+
+    Requests under exempt_prefixes (liveness/readiness probes) pass straight
+    through; others wait for warm-up and get a 503 if it fails or times out.
+    """
+    exempt = tuple(exempt_prefixes)
+
+    async def gated(scope, receive, send):
+        if scope["type"] in ("http", "websocket") and not registry.is_ready() \
+                and not scope.get("path", "").startswith(exempt):
+            if not await registry.wait_ready(timeout):
+                if scope["type"] == "http":
+                    body = json.dumps({"error": "Service not ready", **registry.status()}, default=str).encode()
+                    await send({"type": "http.response.start", "status": 503,
+                                "headers": [(b"content-type", b"application/json"),
+                                            (b"retry-after", b"5")]})
+                    await send({"type": "http.response.body", "body": body})
+                else:
+                    await send({"type": "websocket.close", "code": 1013})
+                return
+        await app(scope, receive, send)
+
+    return gated
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Shared SQLite Access Layer for hAIveMind
+Pooled, tuned SQLite connections shared by every subsystem database.
+
+Subsystems used to open a fresh sqlite3 connection for every method call,
+paying for the open, schema parse and statement compilation each time and
+running in rollback-journal mode. connect() is a drop-in replacement for
+sqlite3.connect that hands out connections from per-thread pools:
+
+- WAL journal mode with synchronous=NORMAL, a larger page cache, in-memory
+  temp storage and a busy timeout, applied once per connection
+- connections live across calls, so sqlite3's prepared statement cache
+  (cached_statements) actually gets reused
+- close() (or dropping the last reference) returns the connection to the
+  pool after rolling back anything uncommitted and resetting per-call state
+- query hooks receive (db_path, sql, seconds) for timing and slow query logs
+- AsyncDatabase offers the same access from coroutines via the executor
+
+Author: Lance James, Unit 221B Inc
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Applied to every new pooled connection
+DEFAULT_PRAGMAS = {
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,  # KiB, i.e. 16MB per connection
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,
+}
+STATEMENT_CACHE_SIZE = 256
+MAX_IDLE_PER_THREAD = 4
+
+QueryHook = Callable[[str, str, float], None]
+
+
+class _TimedCursor:
+    """Cursor wrapper that reports execute timings to the pool's query hooks"""
+
+    __slots__ = ('_cursor', '_pool')
+
+    def __init__(self, cursor: sqlite3.Cursor, pool: 'ConnectionPool'):
+        self._cursor = cursor
+        self._pool = pool
+
+    def execute(self, sql: str, parameters: Sequence = ()):
+        started = time.perf_counter()
+        try:
+            self._cursor.execute(sql, parameters)
+        finally:
+            self._pool._report(sql, time.perf_counter() - started)
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            self._cursor.executemany(sql, seq_of_parameters)
+        finally:
+            self._pool._report(sql, time.perf_counter() - started)
+        return self
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class PooledConnection:
+    """
+    Proxy around a pooled sqlite3.Connection.
+
+    Behaves like the connection itself, including `with conn:` committing or
+    rolling back without closing. The connection goes back to the pool on
+    close() or when the proxy is garbage collected.
+    """
+
+    __slots__ = ('_conn', '_pool', '_released')
+
+    def __init__(self, conn: sqlite3.Connection, pool: 'ConnectionPool'):
+        object.__setattr__(self, '_conn', conn)
+        object.__setattr__(self, '_pool', pool)
+        object.__setattr__(self, '_released', False)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._conn.__exit__(exc_type, exc_value, traceback)
+
+    def cursor(self, *args, **kwargs):
+        cursor = self._conn.cursor(*args, **kwargs)
+        return _TimedCursor(cursor, self._pool) if self._pool.hooks else cursor
+
+    def execute(self, sql: str, parameters: Sequence = ()):
+        if not self._pool.hooks:
+            return self._conn.execute(sql, parameters)
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters):
+        if not self._pool.hooks:
+            return self._conn.executemany(sql, seq_of_parameters)
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def close(self) -> None:
+        if not self._released:
+            object.__setattr__(self, '_released', True)
+            self._pool._release(self._conn)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Per-thread pool of tuned connections to one SQLite database file"""
+
+    def __init__(self, db_path: str, pragmas: Optional[Dict[str, Any]] = None):
+        self.db_path = db_path
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.hooks: List[QueryHook] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._identity = None
+        self._generation = 0
+        self._wal_checked = False
+        self.stats = {'opened': 0, 'reused': 0, 'discarded': 0}
+
+    def _file_identity(self):
+        try:
+            stat = os.stat(self.db_path)
+            return (stat.st_dev, stat.st_ino)
+        except OSError:
+            return None
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        with self._lock:
+            if not self._wal_checked:
+                try:
+                    mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+                    if mode.lower() != 'wal':
+                        logger.debug(f"SQLite journal mode for {self.db_path} stays {mode}")
+                except sqlite3.DatabaseError as e:
+                    logger.debug(f"Could not enable WAL for {self.db_path}: {e}")
+                self._wal_checked = True
+                self._identity = self._file_identity()
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        self.stats['opened'] += 1
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        """Check out a connection for the calling thread"""
+        # A replaced or recreated database file invalidates every pooled handle
+        if self._wal_checked and self._file_identity() != self._identity:
+            with self._lock:
+                self._generation += 1
+                self._wal_checked = False
+        idle = getattr(self._local, 'idle', None)
+        if idle is None or getattr(self._local, 'generation', None) != self._generation:
+            for conn in idle or ():
+                conn.close()
+            idle = self._local.idle = []
+            self._local.generation = self._generation
+        if idle:
+            self.stats['reused'] += 1
+            return PooledConnection(idle.pop(), self)
+        return PooledConnection(self._open(), self)
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+            conn.text_factory = str
+            conn.isolation_level = ''
+            conn.execute("PRAGMA foreign_keys = OFF")
+        except sqlite3.Error:
+            conn.close()
+            self.stats['discarded'] += 1
+            return
+        idle = getattr(self._local, 'idle', None)
+        if (idle is None or len(idle) >= MAX_IDLE_PER_THREAD
+                or getattr(self._local, 'generation', None) != self._generation):
+            conn.close()
+            self.stats['discarded'] += 1
+            return
+        idle.append(conn)
+
+    def _report(self, sql: str, seconds: float) -> None:
+        for hook in self.hooks:
+            try:
+                hook(self.db_path, sql, seconds)
+            except Exception as e:
+                logger.debug(f"Query hook failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'db_path': self.db_path, 'pragmas': self.pragmas, **self.stats}
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+_global_hooks: List[QueryHook] = []
+
+
+def get_pool(db_path) -> ConnectionPool:
+    """Return the shared pool for a database file, creating it on first use"""
+    key = os.path.abspath(os.fspath(db_path))
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(key)
+                pool.hooks.extend(_global_hooks)
+                _pools[key] = pool
+    return pool
+
+
+def connect(db_path) -> sqlite3.Connection:
+    """
+    Drop-in replacement for sqlite3.connect(db_path) backed by the shared pool.
+
+    In-memory databases are private to each connection, so they bypass the pool.
+    """
+    if os.fspath(db_path) == ':memory:':
+        return sqlite3.connect(':memory:')
+    return get_pool(db_path).acquire()
+
+
+def add_query_hook(hook: QueryHook) -> None:
+    """Register a callback receiving (db_path, sql, seconds) for every pooled query"""
+    with _pools_lock:
+        _global_hooks.append(hook)
+        for pool in _pools.values():
+            pool.hooks.append(hook)
+
+
+def remove_query_hook(hook: QueryHook) -> None:
+    with _pools_lock:
+        if hook in _global_hooks:
+            _global_hooks.remove(hook)
+        for pool in _pools.values():
+            if hook in pool.hooks:
+                pool.hooks.remove(hook)
+
+
+def slow_query_logger(threshold_seconds: float = 0.25) -> QueryHook:
+    """Build a query hook that logs statements slower than the threshold"""
+    def hook(db_path: str, sql: str, seconds: float) -> None:
+        if seconds >= threshold_seconds:
+            logger.warning(f"🐢 Slow query on {os.path.basename(db_path)} "
+                           f"({seconds * 1000:.0f}ms): {' '.join(sql.split())[:200]}")
+    return hook
+
+
+def get_pool_stats() -> List[Dict[str, Any]]:
+    return [pool.get_stats() for pool in list(_pools.values())]
+
+
+class AsyncDatabase:
+    """Coroutine facade over the shared pool; queries run in the default executor"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    def _run(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                return fn(conn)
+        finally:
+            conn.close()
+
+    async def run(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run fn(conn) inside a transaction on a pooled connection"""
+        return await asyncio.get_event_loop().run_in_executor(None, self._run, fn)
+
+    async def execute(self, sql: str, parameters: Sequence = ()) -> int:
+        return await self.run(lambda conn: conn.execute(sql, parameters).rowcount)
+
+    async def executemany(self, sql: str, seq_of_parameters) -> int:
+        rows = list(seq_of_parameters)
+        return await self.run(lambda conn: conn.executemany(sql, rows).rowcount)
+
+    async def fetchall(self, sql: str, parameters: Sequence = ()) -> List[Dict[str, Any]]:
+        def query(conn):
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(sql, parameters).fetchall()]
+        return await self.run(query)
+
+    async def fetchone(self, sql: str, parameters: Sequence = ()) -> Optional[Dict[str, Any]]:
+        def query(conn):
+            conn.row_factory = sqlite3.Row
+            row = conn.execute(sql, parameters).fetchone()
+            return dict(row) if row else None
+        return await self.run(query)
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+hAIveMind Sync Fan-out Scheduler - Fleet-wide Memory Sync Cycles
+
+Drives MemorySyncService against every known peer on a schedule instead of
+one sync_with_machine call at a time.
+
+Features:
+- The outbound change set is built once per cycle and shared by every peer;
+  each peer only receives memories changed since its last successful sync
+  (minus a safety overlap, since memories are stamped before they are
+  committed), and identical payloads are serialized once
+- Bounded concurrency plus a fleet-wide bandwidth limit (token bucket on bytes)
+- Peers are synced most-stale first
+- Unreachable peers back off exponentially (with jitter) instead of being
+  retried every cycle
+- Per-cycle timing and transfer statistics
+- Peers that answer in the binary wire format (sync_wire) are sent binary
+  payloads from then on, and their replies are merged frame by frame
+
+Author: Lance James, Unit 221B Inc
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+from metrics import record_sync_cycle
+from sync_wire import (CODECS_HEADER, WIRE_CONTENT_TYPE, SyncWireEncoder, available_codecs, choose_codec,
+                       decode, decode_stream)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PeerState:
+    """Sync bookkeeping for one peer"""
+    machine: str
+    last_success: Optional[float] = None
+    last_success_marker: Optional[str] = None  # change set timestamp the peer is known to have
+    consecutive_failures: int = 0
+    next_attempt: float = 0.0
+    last_error: Optional[str] = None
+    last_duration: Optional[float] = None
+    wire_codecs: Optional[str] = None  # codecs the peer advertised; None until it answers in binary
+
+    def staleness(self, now: float) -> float:
+        return float('inf') if self.last_success is None else now - self.last_success
+
+
+@dataclass
+class SyncCycleResult:
+    """Outcome of one fleet sync cycle"""
+    peers: int
+    changeset_size: int = 0
+    build_seconds: float = 0.0
+    synced: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    backing_off: List[str] = field(default_factory=list)
+    bytes_sent: int = 0
+    payloads_serialized: int = 0
+    cycle_seconds: float = 0.0
+
+
+class TokenBucket:
+    """Async token bucket limiting bytes per second across concurrent uploads"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def consume(self, amount: int):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                # Payloads larger than the burst size go through once the bucket is full
+                needed = min(amount, self.capacity)
+                if self.tokens >= needed:
+                    self.tokens -= needed
+                    return
+                await asyncio.sleep((needed - self.tokens) / self.rate)
+
+
+def _changed_at(memory: Dict[str, Any]) -> str:
+    """Latest local change: written here (created/updated) or merged in from a peer (synced_at)"""
+    metadata = memory.get('metadata') or {}
+    return max(str(metadata.get(key) or '') for key in ('updated_at', 'created_at', 'synced_at'))
+
+
+class SyncFanoutScheduler:
+    """Run sync cycles against many peers concurrently"""
+
+    def __init__(self, service, config: Optional[Dict[str, Any]] = None, client=None,
+                 wire: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            service: MemorySyncService (or anything exposing machine_id, vector_clock,
+                     get_outbound_changeset() and _process_sync_response())
+            config: sync.fanout settings
+            client: Optional pre-built async HTTP client (anything with an async post();
+                    clients with stream() get binary replies merged as they arrive)
+            wire: sync.wire settings
+        """
+        config = config or {}
+        wire = wire or {}
+        self.service = service
+        self.port = config.get('port', 8899)
+        self.max_concurrency = config.get('max_concurrency', 8)
+        self.timeout = config.get('timeout', 30.0)
+        self.connect_timeout = config.get('connect_timeout', 3.0)
+        self.backoff_base = config.get('backoff_base', 30.0)
+        self.backoff_max = config.get('backoff_max', 1800.0)
+        # A memory stamped before a cycle's marker may commit after its change set was read;
+        # resending this much history catches it (the receiver dedupes)
+        self.delta_overlap = timedelta(seconds=config.get('delta_overlap_seconds', 120.0))
+        self.bucket = TokenBucket(config.get('max_bytes_per_second', 0))
+        self.url_template = config.get('url_template', "http://{machine}:{port}/api/sync")
+        self.wire_enabled = wire.get('enabled', True)
+        self.wire_settings = {'sync': {'wire': wire}}
+        self._encoders: Dict[str, SyncWireEncoder] = {}
+
+        self._client = client
+        self._merge_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.peers: Dict[str, PeerState] = {}
+
+        self.total_cycles = 0
+        self.last_result: Optional[SyncCycleResult] = None
+
+    def _get_client(self):
+        if self._client is None:
+            if not HTTPX_AVAILABLE:
+                raise RuntimeError("httpx is required for sync fan-out")
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(max_connections=self.max_concurrency,
+                                    max_keepalive_connections=self.max_concurrency)
+            )
+        return self._client
+
+    async def aclose(self):
+        await self.stop()
+        if self._client is not None and hasattr(self._client, 'aclose'):
+            await self._client.aclose()
+        self._client = None
+
+    # Peer scheduling
+
+    def _peer(self, machine: str) -> PeerState:
+        peer = self.peers.get(machine)
+        if peer is None:
+            peer = self.peers[machine] = PeerState(machine)
+        return peer
+
+    def _schedule(self, machines: List[str], now: float, result: SyncCycleResult) -> List[PeerState]:
+        """Peers due this cycle, most stale first"""
+        due = []
+        for machine in machines:
+            peer = self._peer(machine)
+            if peer.next_attempt > now:
+                result.backing_off.append(machine)
+            else:
+                due.append(peer)
+        due.sort(key=lambda p: p.staleness(now), reverse=True)
+        return due
+
+    def _record_failure(self, peer: PeerState, error: str):
+        peer.consecutive_failures += 1
+        peer.last_error = error
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (peer.consecutive_failures - 1))
+        peer.next_attempt = time.time() + delay * random.uniform(0.8, 1.2)
+        if peer.consecutive_failures == 1 or delay >= self.backoff_max:
+            logger.warning(f"Sync with {peer.machine} failed ({error}); retrying in {delay:.0f}s")
+
+    # Delivery
+
+    def _headers(self, binary_body: bool) -> Dict[str, str]:
+        headers = {'Content-Type': WIRE_CONTENT_TYPE if binary_body else 'application/json'}
+        if self.wire_enabled:
+            headers['Accept'] = f"{WIRE_CONTENT_TYPE}, application/json"
+            headers[CODECS_HEADER] = ", ".join(available_codecs())
+        return headers
+
+    async def _merge(self, remote_data: Dict[str, Any]):
+        # Merges touch the local store and vector clock; keep them one at a time
+        async with self._merge_lock:
+            await self.service._process_sync_response(remote_data)
+
+    async def _exchange(self, peer: PeerState, body: bytes, binary_body: bool):
+        """POST the payload and merge the reply, frame by frame when the peer streams binary"""
+        url = self.url_template.format(machine=peer.machine, port=self.port)
+        client = self._get_client()
+        headers = self._headers(binary_body)
+        if not hasattr(client, 'stream'):
+            response = await client.post(url, content=body, headers=headers)
+            if response.status_code != 200:
+                raise RuntimeError(f"HTTP {response.status_code}")
+            if getattr(response, 'headers', {}).get('content-type', '').startswith(WIRE_CONTENT_TYPE):
+                peer.wire_codecs = response.headers.get(CODECS_HEADER, 'zlib')
+                await self._merge(decode(response.content))
+            else:
+                await self._merge(response.json())
+            return
+        async with client.stream('POST', url, content=body, headers=headers) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"HTTP {response.status_code}")
+            if not response.headers.get('content-type', '').startswith(WIRE_CONTENT_TYPE):
+                await self._merge(json.loads(await response.aread()))
+                return
+            peer.wire_codecs = response.headers.get(CODECS_HEADER, 'zlib')
+            async for kind, value in decode_stream(response.aiter_bytes()):
+                await self._merge({'vector_clock': value.get('vector_clock', {})} if kind == 'meta'
+                                  else {'memories': value})
+
+    async def _sync_peer(self, peer: PeerState, body: bytes, binary_body: bool, marker: str,
+                         result: SyncCycleResult, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            await self.bucket.consume(len(body))
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(self._exchange(peer, body, binary_body), self.timeout)
+            except Exception as e:
+                error = str(e) or type(e).__name__
+                result.failed[peer.machine] = error
+                self._record_failure(peer, error)
+                return
+            finally:
+                peer.last_duration = time.perf_counter() - started
+
+            result.bytes_sent += len(body)
+            peer.last_success = time.time()
+            peer.last_success_marker = marker
+            peer.consecutive_failures = 0
+            peer.next_attempt = 0.0
+            peer.last_error = None
+            result.synced.append(peer.machine)
+
+    def _peer_codec(self, peer: PeerState) -> Optional[str]:
+        """Binary codec for payloads to peer, or None to send JSON"""
+        return choose_codec(peer.wire_codecs) if self.wire_enabled and peer.wire_codecs else None
+
+    def _encoder(self, codec: str) -> SyncWireEncoder:
+        if codec not in self._encoders:
+            self._encoders[codec] = SyncWireEncoder.from_config(self.wire_settings, codec)
+        return self._encoders[codec]
+
+    async def run_cycle(self, machines: Optional[List[str]] = None) -> SyncCycleResult:
+        """Sync with every due peer once and return the cycle statistics"""
+        started = time.perf_counter()
+        machines = sorted(set(machines if machines is not None else self.service.get_sync_peers()))
+        result = SyncCycleResult(peers=len(machines))
+        due = self._schedule(machines, time.time(), result)
+
+        if due:
+            marker = datetime.now().isoformat()
+            build_started = time.perf_counter()
+            memories = await self.service.get_outbound_changeset(max_age=0)
+            result.build_seconds = time.perf_counter() - build_started
+            result.changeset_size = len(memories)
+
+            # Peers that last synced at the same marker (and take the same encoding) get
+            # the same payload; serialize it once
+            bodies: Dict[tuple, bytes] = {}
+            changed_at = [_changed_at(memory) for memory in memories]
+
+            def body_for(peer: PeerState) -> bytes:
+                since = peer.last_success_marker
+                codec = self._peer_codec(peer)
+                if (since, codec) not in bodies:
+                    cutoff = since and (datetime.fromisoformat(since) - self.delta_overlap).isoformat()
+                    delta = memories if since is None else [
+                        memory for memory, changed in zip(memories, changed_at) if not changed or changed >= cutoff
+                    ]
+                    meta = {'machine_id': self.service.machine_id, 'vector_clock': self.service.vector_clock}
+                    if codec is None:
+                        bodies[(since, codec)] = json.dumps(dict(meta, memories=delta), default=str).encode()
+                    else:
+                        bodies[(since, codec)] = self._encoder(codec).encode(meta, delta)
+                return bodies[(since, codec)]
+
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            await asyncio.gather(*(
+                self._sync_peer(peer, body_for(peer), self._peer_codec(peer) is not None, marker, result, semaphore)
+                for peer in due
+            ))
+            result.payloads_serialized = len(bodies)
+
+        result.cycle_seconds = time.perf_counter() - started
+        self.total_cycles += 1
+        record_sync_cycle(result.cycle_seconds, len(result.synced), len(result.failed), len(result.backing_off))
+        self.last_result = result
+        logger.info(f"🔄 Sync cycle: {len(result.synced)}/{result.peers} peers synced, "
+                    f"{len(result.failed)} failed, {len(result.backing_off)} backing off "
+                    f"in {result.cycle_seconds:.2f}s")
+        return result
+
+    # Background loop
+
+    async def _run(self, interval: float):
+        while True:
+            try:
+                await self.run_cycle()
+            except Exception as e:
+                logger.error(f"Sync cycle failed: {e}")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run(interval))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        last = self.last_result
+        now = time.time()
+        return {
+            "total_cycles": self.total_cycles,
+            "peers": {
+                machine: {
+                    "last_success": peer.last_success,
+                    "staleness_seconds": None if peer.last_success is None else now - peer.last_success,
+                    "consecutive_failures": peer.consecutive_failures,
+                    "next_attempt_in": max(0.0, peer.next_attempt - now),
+                    "last_error": peer.last_error,
+                    "last_duration": peer.last_duration,
+                    "wire_format": self._peer_codec(peer) or "json",
+                } for machine, peer in self.peers.items()
+            },
+            "last_cycle": {
+                "peers": last.peers,
+                "synced": len(last.synced),
+                "failed": len(last.failed),
+                "backing_off": len(last.backing_off),
+                "changeset_size": last.changeset_size,
+                "build_seconds": last.build_seconds,
+                "bytes_sent": last.bytes_sent,
+                "payloads_serialized": last.payloads_serialized,
+                "cycle_seconds": last.cycle_seconds,
+            } if last else None,
+        }
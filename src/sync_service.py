@@ -16,12 +16,21 @@ from typing import Any, Dict, List, Optional, Set
 
 import redis
 import uvicorn
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends, Security
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect, Depends, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
 import httpx
 
+from memory_analytics import MemoryAnalytics
+from memory_cache import MemoryLocator, publish_invalidations
+from chroma_registry import ChromaRegistry, close_shared_chroma, shared_chroma
+from sync_scheduler import SyncFanoutScheduler
+from sync_wire import (CODECS_HEADER, WIRE_CONTENT_TYPE, SyncWireEncoder, WireFormatError, accepts_wire_format,
+                       available_codecs, choose_codec, decode_stream, stream_frames)
+from ws_broadcast import WebSocketBroadcaster
+
 # Import rules sync components (disabled for basic operation)
 RulesSyncService = None
 create_rules_sync_router = None
@@ -56,58 +65,71 @@ class SyncRequest(BaseModel):
     vector_clock: Dict[str, int]
 
 class ConnectionManager:
-    """Manages WebSocket connections for real-time sync"""
+    """Manages WebSocket connections for real-time sync
+
+    Each machine gets its own bounded send queue and writer task, so a broadcast
+    never waits on a slow peer.
+    """
     
-    def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        self.broadcaster = WebSocketBroadcaster.from_config(settings, on_disconnect=self._forget)
         self.machine_subscriptions: Dict[str, Set[str]] = {}
     
+    @property
+    def active_connections(self) -> Dict[str, WebSocket]:
+        return {machine_id: outbox.websocket for machine_id, outbox in self.broadcaster.outboxes.items()}
+    
+    def configure(self, settings: Optional[Dict[str, Any]]):
+        """Apply sync.websocket settings to connections made from now on"""
+        settings = settings or {}
+        self.broadcaster.max_queue = settings.get('max_queue', self.broadcaster.max_queue)
+        self.broadcaster.send_timeout = settings.get('send_timeout', self.broadcaster.send_timeout)
+        self.broadcaster.heartbeat_interval = settings.get('heartbeat_interval', self.broadcaster.heartbeat_interval)
+    
     async def connect(self, websocket: WebSocket, machine_id: str):
         await websocket.accept()
-        self.active_connections[machine_id] = websocket
+        self.broadcaster.register(machine_id, websocket)
         logger.info(f"Machine {machine_id} connected via WebSocket")
     
-    def disconnect(self, machine_id: str):
-        if machine_id in self.active_connections:
-            del self.active_connections[machine_id]
-        if machine_id in self.machine_subscriptions:
-            del self.machine_subscriptions[machine_id]
+    def _forget(self, machine_id: str):
+        self.machine_subscriptions.pop(machine_id, None)
         logger.info(f"Machine {machine_id} disconnected")
     
+    def disconnect(self, machine_id: str, websocket: Optional[WebSocket] = None):
+        if machine_id in self.broadcaster and (websocket is None or
+                                               self.broadcaster.outboxes[machine_id].websocket is websocket):
+            self.broadcaster.unregister(machine_id)
+            self._forget(machine_id)
+    
     async def send_personal_message(self, message: str, machine_id: str):
-        if machine_id in self.active_connections:
-            try:
-                await self.active_connections[machine_id].send_text(message)
-            except Exception as e:
-                logger.error(f"Failed to send message to {machine_id}: {e}")
-                self.disconnect(machine_id)
+        self.broadcaster.send(machine_id, message)
     
     async def broadcast_sync_event(self, event_data: Dict[str, Any], exclude_machine: Optional[str] = None):
-        """Broadcast sync events to all connected machines"""
-        message = json.dumps({
+        """Broadcast sync events to all connected machines
+
+        Serialized once and queued per machine; a backed-up machine keeps only
+        the latest event of each type from each originating machine.
+        """
+        self.broadcaster.broadcast({
             "type": "sync_event",
             "data": event_data,
             "timestamp": datetime.now().isoformat()
-        })
-        
-        disconnected = []
-        for machine_id, connection in self.active_connections.items():
-            if machine_id != exclude_machine:
-                try:
-                    await connection.send_text(message)
-                except Exception as e:
-                    logger.error(f"Failed to broadcast to {machine_id}: {e}")
-                    disconnected.append(machine_id)
-        
-        # Clean up disconnected machines
-        for machine_id in disconnected:
-            self.disconnect(machine_id)
+        }, coalesce_key=f"sync_event:{event_data.get('type')}:{event_data.get('from_machine')}",
+            exclude=exclude_machine)
 
 class MemorySyncService:
     """Service for synchronizing memories across machines"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], chroma: Optional[ChromaRegistry] = None):
+        """
+        Args:
+            config: Server configuration
+            chroma: ChromaDB registry to share; defaults to the process-wide one for
+                    storage.chromadb.path, so in the memory server process sync uses
+                    MemoryStorage's client, collections and embedding model
+        """
         self.config = config
+        self.chroma = chroma or shared_chroma(config)
         self.machine_id = self._get_machine_id()
         self.redis_client = None
         self.known_machines: Set[str] = set()
@@ -116,6 +138,23 @@ class MemorySyncService:
         # Initialize Redis
         self._init_redis()
         
+        # Shared id -> category locator (same Redis hash / sqlite file as MemoryStorage)
+        self.memory_locator = MemoryLocator(
+            self.redis_client,
+            config['storage'].get('locator_db', 'data/memory_locator.db')
+        )
+        # Analytics counters shared with MemoryStorage; synced-in memories count as growth here
+        self.analytics = MemoryAnalytics.from_config(config)
+        
+        # Outbound change set shared by every peer in a cycle
+        self._changeset: List[Dict[str, Any]] = []
+        self._changeset_built_at = 0.0
+        self._changeset_lock = asyncio.Lock()
+        
+        # Concurrent, staleness-ordered sync with every peer
+        self.scheduler = SyncFanoutScheduler(self, config.get('sync', {}).get('fanout', {}),
+                                             wire=config.get('sync', {}).get('wire'))
+        
         # Discover other machines via Tailscale
         if config.get('sync', {}).get('discovery', {}).get('tailscale_enabled'):
             asyncio.create_task(self._discover_machines())
@@ -171,12 +210,31 @@ class MemorySyncService:
             
             await asyncio.sleep(300)  # Check every 5 minutes
     
+    def get_sync_peers(self) -> List[str]:
+        """Discovered machines plus the configured machine list, excluding this one"""
+        configured = self.config.get('sync', {}).get('discovery', {}).get('machines', [])
+        return sorted((self.known_machines | set(configured)) - {self.machine_id})
+    
+    async def get_outbound_changeset(self, max_age: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Local memories to offer peers, rebuilt at most once per max_age seconds
+
+        Defaults to the configured sync_interval, so incoming sync requests and
+        scheduler cycles share one ChromaDB read instead of each doing their own.
+        """
+        if max_age is None:
+            max_age = self.config.get('sync', {}).get('sync_interval', 30)
+        async with self._changeset_lock:
+            if time.time() - self._changeset_built_at >= max_age or not self._changeset_built_at:
+                self._changeset = await self._get_local_memories_for_sync()
+                self._changeset_built_at = time.time()
+            return self._changeset
+    
     async def sync_with_machine(self, target_machine: str, port: int = 8899) -> bool:
         """Sync memories with a specific machine"""
         try:
             # Get recent memories from local storage
             # This would integrate with the MemoryStorage class
-            local_memories = await self._get_local_memories_for_sync()
+            local_memories = await self.get_outbound_changeset()
             
             sync_data = SyncRequest(
                 machine_id=self.machine_id,
@@ -202,22 +260,14 @@ class MemorySyncService:
             logger.error(f"Failed to sync with {target_machine}: {e}")
             return False
     
+    def _get_chroma_client(self):
+        """The process-wide ChromaDB registry (cached collection handles, one embedding model)"""
+        return self.chroma
+    
     async def _get_local_memories_for_sync(self) -> List[Dict[str, Any]]:
         """Get local memories that need to be synced"""
         try:
-            # Import ChromaDB here to avoid circular imports
-            import chromadb
-            from chromadb.config import Settings
-            
-            # Connect to local ChromaDB
-            chroma_config = self.config['storage']['chromadb']
-            client = chromadb.PersistentClient(
-                path=chroma_config['path'],
-                settings=Settings(
-                    anonymized_telemetry=chroma_config.get('anonymized_telemetry', False),
-                    allow_reset=True
-                )
-            )
+            client = self._get_chroma_client()
             
             memories = []
             categories = self.config['memory']['categories']
@@ -297,19 +347,7 @@ class MemorySyncService:
     async def _merge_remote_memories(self, remote_memories: List[Dict[str, Any]]):
         """Merge remote memories into local ChromaDB collections"""
         try:
-            # Import ChromaDB here to avoid circular imports
-            import chromadb
-            from chromadb.config import Settings
-            
-            # Connect to local ChromaDB
-            chroma_config = self.config['storage']['chromadb']
-            client = chromadb.PersistentClient(
-                path=chroma_config['path'],
-                settings=Settings(
-                    anonymized_telemetry=chroma_config.get('anonymized_telemetry', False),
-                    allow_reset=True
-                )
-            )
+            client = self._get_chroma_client()
             
             # Group memories by category, filtering out confidential/pii
             memories_by_category = {}
@@ -380,6 +418,8 @@ class MemorySyncService:
                                 remote_time = clean_remote_meta.get('created_at', '')
                                 
                                 if remote_time > existing_time:
+                                    # Local arrival time, so the change is relayed to peers synced earlier
+                                    clean_remote_meta['synced_at'] = datetime.now().isoformat()
                                     # Remote is newer, update with timeout protection
                                     await asyncio.wait_for(
                                         asyncio.get_event_loop().run_in_executor(
@@ -392,6 +432,11 @@ class MemorySyncService:
                                         ),
                                         timeout=20.0
                                     )
+                                    self.analytics.record_replaced(
+                                        (existing['documents'][0], dict(existing_meta, category=category)),
+                                        (memory['content'], dict(clean_remote_meta, category=category)),
+                                        event='synced_update'
+                                    )
                                     logger.info(f"Updated existing memory {memory_id}")
                                 continue
                                 
@@ -411,6 +456,7 @@ class MemorySyncService:
                             else:
                                 # Convert other types to strings
                                 clean_metadata[key] = str(value)
+                        clean_metadata['synced_at'] = datetime.now().isoformat()
                         
                         documents.append(memory['content'])
                         metadatas.append(clean_metadata)
@@ -440,7 +486,15 @@ class MemorySyncService:
                             ),
                             timeout=30.0
                         )
+                        self.analytics.record_added(
+                            [(document, dict(metadata, category=category))
+                             for document, metadata in zip(documents, metadatas)],
+                            event='synced'
+                        )
                         logger.info(f"Added {len(documents)} new memories to {collection_name}")
+                    
+                    self.memory_locator.set_many({memory['id']: category for memory in memories})
+                    self._invalidate_cached([memory['id'] for memory in memories])
                 
                 except Exception as e:
                     logger.error(f"Failed to merge memories into {collection_name}: {e}")
@@ -451,6 +505,16 @@ class MemorySyncService:
         except Exception as e:
             logger.error(f"Failed to merge remote memories: {e}")
     
+    def _invalidate_cached(self, memory_ids: List[str]):
+        """Drop merged memories from the Redis read cache and every server's hot cache"""
+        if not self.redis_client or not memory_ids:
+            return
+        try:
+            self.redis_client.delete(*[f"memory:{memory_id}" for memory_id in memory_ids])
+        except Exception as e:
+            logger.warning(f"Failed to drop cached copies of synced memories: {e}")
+        publish_invalidations(self.redis_client, memory_ids)
+    
     def increment_vector_clock(self):
         """Increment vector clock for this machine"""
         self.vector_clock[self.machine_id] = int(time.time())
@@ -489,6 +553,12 @@ async def startup_event():
         config = json.load(f)
     
     sync_service = MemorySyncService(config)
+    connection_manager.configure(config.get('sync', {}).get('websocket'))
+    
+    # Periodic fleet sync cycles
+    sync_config = config.get('sync', {})
+    if sync_config.get('enable_remote_sync'):
+        sync_service.scheduler.start(sync_config.get('sync_interval', 30))
     
     # Initialize rules sync service if enabled (disabled for basic operation)
     # if config.get('rules', {}).get('enable_haivemind_integration', True):
@@ -506,6 +576,14 @@ async def startup_event():
     
     logger.info("Memory Sync Service started")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop scheduled sync cycles, close pooled peer connections and the shared ChromaDB client"""
+    if sync_service:
+        await sync_service.scheduler.aclose()
+    await connection_manager.broadcaster.aclose()
+    close_shared_chroma()
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -518,58 +596,94 @@ async def get_status():
         "machine_id": sync_service.machine_id if sync_service else "unknown",
         "known_machines": list(sync_service.known_machines) if sync_service else [],
         "vector_clock": sync_service.vector_clock if sync_service else {},
-        "connected_websockets": len(connection_manager.active_connections)
+        "connected_websockets": len(connection_manager.broadcaster),
+        "websocket_broadcast": connection_manager.broadcaster.get_stats(),
+        "chroma": sync_service.chroma.get_stats() if sync_service else None,
+        "sync_scheduler": sync_service.scheduler.get_stats() if sync_service else None
     }
 
 @app.post("/api/sync")
-async def handle_sync(sync_request: SyncRequest, _: str = Depends(verify_token)):
-    """Handle sync request from another machine"""
+async def handle_sync(request: Request, _: str = Depends(verify_token)):
+    """Handle sync request from another machine
+
+    Accepts the JSON SyncRequest body or the binary sync_wire stream (applied
+    frame by frame as it arrives), and answers in binary when the caller's
+    Accept header asks for it.
+    """
     try:
         if not sync_service:
             raise HTTPException(status_code=500, detail="Sync service not initialized")
         
-        # Process incoming sync request
-        await sync_service._process_sync_response({
-            "memories": sync_request.memories,
-            "vector_clock": sync_request.vector_clock
-        })
+        if request.headers.get('content-type', '').startswith(WIRE_CONTENT_TYPE):
+            from_machine, memory_count = None, 0
+            async for kind, value in decode_stream(request.stream()):
+                if kind == 'meta':
+                    from_machine = value.get('machine_id')
+                    await sync_service._process_sync_response({"vector_clock": value.get('vector_clock', {})})
+                else:
+                    memory_count += len(value)
+                    await sync_service._process_sync_response({"memories": value})
+        else:
+            sync_request = SyncRequest(**await request.json())
+            from_machine, memory_count = sync_request.machine_id, len(sync_request.memories)
+            
+            # Process incoming sync request
+            await sync_service._process_sync_response({
+                "memories": sync_request.memories,
+                "vector_clock": sync_request.vector_clock
+            })
         
-        # Get local memories to send back
-        local_memories = await sync_service._get_local_memories_for_sync()
+        # Get local memories to send back (shared with the scheduler's current change set)
+        local_memories = await sync_service.get_outbound_changeset()
         
         # Broadcast sync event to connected WebSockets
         await connection_manager.broadcast_sync_event({
             "type": "external_sync",
-            "from_machine": sync_request.machine_id,
-            "memory_count": len(sync_request.memories)
-        }, exclude_machine=sync_request.machine_id)
+            "from_machine": from_machine,
+            "memory_count": memory_count
+        }, exclude_machine=from_machine)
         
-        return {
+        meta = {
             "status": "success",
             "machine_id": sync_service.machine_id,
-            "memories": local_memories,
             "vector_clock": sync_service.vector_clock
         }
+        if accepts_wire_format(request.headers.get('accept')):
+            encoder = SyncWireEncoder.from_config(config, choose_codec(request.headers.get(CODECS_HEADER)))
+            return StreamingResponse(
+                stream_frames(encoder, meta, local_memories),
+                media_type=WIRE_CONTENT_TYPE,
+                headers={CODECS_HEADER: ", ".join(available_codecs())}
+            )
+        return dict(meta, memories=local_memories)
         
+    except WireFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Sync error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/trigger-sync")
 async def trigger_sync(_: str = Depends(verify_token)):
-    """Manually trigger sync with all known machines"""
+    """Manually trigger a sync cycle with all known machines"""
     if not sync_service:
         raise HTTPException(status_code=500, detail="Sync service not initialized")
     
-    results = {}
-    for machine in sync_service.known_machines:
-        try:
-            success = await sync_service.sync_with_machine(machine)
-            results[machine] = "success" if success else "failed"
-        except Exception as e:
-            results[machine] = f"error: {str(e)}"
+    cycle = await sync_service.scheduler.run_cycle()
+    results = {machine: "success" for machine in cycle.synced}
+    results.update({machine: f"error: {error}" for machine, error in cycle.failed.items()})
+    results.update({machine: "backing off" for machine in cycle.backing_off})
     
-    return {"sync_results": results}
+    return {
+        "sync_results": results,
+        "cycle_seconds": cycle.cycle_seconds,
+        "changeset_size": cycle.changeset_size,
+        "bytes_sent": cycle.bytes_sent
+    }
 
 @app.websocket("/ws/{machine_id}")
 async def websocket_endpoint(websocket: WebSocket, machine_id: str):
@@ -582,7 +696,8 @@ async def websocket_endpoint(websocket: WebSocket, machine_id: str):
             message = json.loads(data)
             
             if message.get("type") == "ping":
-                await websocket.send_text(json.dumps({"type": "pong"}))
+                # Replies go through the machine's queue so they never interleave with broadcasts
+                await connection_manager.send_personal_message(json.dumps({"type": "pong"}), machine_id)
             elif message.get("type") == "sync_request":
                 # Handle real-time sync request
                 await connection_manager.broadcast_sync_event({
@@ -591,10 +706,10 @@ async def websocket_endpoint(websocket: WebSocket, machine_id: str):
                 }, exclude_machine=machine_id)
                 
     except WebSocketDisconnect:
-        connection_manager.disconnect(machine_id)
+        connection_manager.disconnect(machine_id, websocket)
     except Exception as e:
         logger.error(f"WebSocket error for {machine_id}: {e}")
-        connection_manager.disconnect(machine_id)
+        connection_manager.disconnect(machine_id, websocket)
 
 def main():
     """Run the sync service"""
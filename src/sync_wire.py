@@ -0,0 +1,301 @@
+"""
+hAIveMind Sync Wire Format - Compact Binary Encoding for Memory Sync Payloads
+
+Negotiated alternative to the JSON body of /api/sync. Peers that send
+Accept: application/x-haivemind-sync get a framed binary stream back and may
+send one themselves.
+
+Features:
+- Length-prefixed frames: a meta frame (machine_id, vector_clock), record
+  frames of up to frame_records memories, and an end frame that marks a
+  complete stream
+- Embeddings travel as raw little-endian float32 buffers, or float16 /
+  int8-quantized (per-vector scale) when configured
+- Each frame's JSON section is compressed on its own (zstd when the
+  zstandard package is installed on both peers, zlib otherwise), so senders
+  stream frames as they are encoded and receivers decode and apply them as
+  they arrive; embedding buffers are already dense and are sent raw
+- Standard library only apart from the optional zstandard codec
+
+Stream layout:
+    b"HVS1" codec:u8 dtype:u8
+    frame*: kind:u8 length:u32 payload[length]
+    meta payload: compressed json
+    record payload: json_length:u32 compressed json[memories without embeddings]
+                    then per memory: dim:u32 [scale:f32 for int8] vector
+"""
+
+import asyncio
+import json
+import logging
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+WIRE_CONTENT_TYPE = "application/x-haivemind-sync"
+CODECS_HEADER = "X-Haivemind-Sync-Codecs"
+MAGIC = b"HVS1"
+
+CODECS = {'none': 0, 'zlib': 1, 'zstd': 2}
+DTYPES = {'float32': 0, 'float16': 1, 'int8': 2}
+
+FRAME_META = ord('M')
+FRAME_RECORDS = ord('R')
+FRAME_END = ord('E')
+
+_HEADER = struct.Struct('<4sBB')
+_FRAME = struct.Struct('<BI')
+_U32 = struct.Struct('<I')
+_F32 = struct.Struct('<f')
+_BIG_ENDIAN = sys.byteorder == 'big'
+_DECOMPRESS_ERRORS = (zlib.error, zstandard.ZstdError) if ZSTD_AVAILABLE else (zlib.error,)
+
+
+class WireFormatError(ValueError):
+    """Malformed or truncated sync stream"""
+
+
+def available_codecs() -> List[str]:
+    """Codecs this process can read and write, most preferred first"""
+    return (['zstd'] if ZSTD_AVAILABLE else []) + ['zlib', 'none']
+
+
+def choose_codec(offered: Optional[str]) -> str:
+    """Best codec both sides support, given the peer's CODECS_HEADER value"""
+    peer = {codec.strip() for codec in (offered or 'zlib').split(',')}
+    for codec in available_codecs():
+        if codec in peer:
+            return codec
+    return 'none'
+
+
+def accepts_wire_format(accept: Optional[str]) -> bool:
+    return WIRE_CONTENT_TYPE in (accept or '')
+
+
+# Embeddings
+
+def _pack_embedding(embedding, dtype: int) -> bytes:
+    if embedding is None:
+        return _U32.pack(0)
+    if dtype == 1:
+        values = list(embedding)
+        return _U32.pack(len(values)) + struct.pack(f'<{len(values)}e', *values)
+    vector = array('f', embedding)
+    if dtype == 2:
+        peak = max(map(abs, vector), default=0.0)
+        scale = peak / 127 if peak else 1.0
+        quantized = array('b', [round(value / scale) for value in vector])
+        return _U32.pack(len(vector)) + _F32.pack(scale) + quantized.tobytes()
+    if _BIG_ENDIAN:
+        vector.byteswap()
+    return _U32.pack(len(vector)) + vector.tobytes()
+
+
+def _unpack_embedding(buffer: memoryview, offset: int, dtype: int) -> Tuple[Optional[List[float]], int]:
+    (dim,) = _U32.unpack_from(buffer, offset)
+    offset += 4
+    if dim == 0:
+        return None, offset
+    if dtype == 1:
+        end = offset + 2 * dim
+        return list(struct.unpack_from(f'<{dim}e', buffer, offset)), end
+    if dtype == 2:
+        (scale,) = _F32.unpack_from(buffer, offset)
+        offset += 4
+        quantized = array('b')
+        quantized.frombytes(buffer[offset:offset + dim])
+        return [value * scale for value in quantized], offset + dim
+    end = offset + 4 * dim
+    vector = array('f')
+    vector.frombytes(buffer[offset:end])
+    if _BIG_ENDIAN:
+        vector.byteswap()
+    return vector.tolist(), end
+
+
+# Encoding
+
+class SyncWireEncoder:
+    """Encodes a sync payload as a stream of compressed frames"""
+
+    def __init__(self, codec: str = 'zlib', embedding_dtype: str = 'float32', frame_records: int = 256,
+                 level: Optional[int] = None):
+        if codec not in available_codecs():
+            raise WireFormatError(f"Codec not available: {codec}")
+        if embedding_dtype not in DTYPES:
+            raise WireFormatError(f"Unknown embedding dtype: {embedding_dtype}")
+        self.codec = codec
+        self.dtype = DTYPES[embedding_dtype]
+        self.frame_records = frame_records
+        self.level = level if level is not None else (3 if codec == 'zstd' else 1)
+        self._zstd = zstandard.ZstdCompressor(level=self.level) if codec == 'zstd' else None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], codec: str) -> 'SyncWireEncoder':
+        settings = config.get('sync', {}).get('wire', {})
+        return cls(
+            codec=codec,
+            embedding_dtype=settings.get('embedding_dtype', 'float32'),
+            frame_records=settings.get('frame_records', 256),
+            level=settings.get('compression_level')
+        )
+
+    def _compress(self, payload: bytes) -> bytes:
+        if self._zstd is not None:
+            return self._zstd.compress(payload)
+        if self.codec == 'zlib':
+            return zlib.compress(payload, self.level)
+        return payload
+
+    @staticmethod
+    def _frame(kind: int, payload: bytes) -> bytes:
+        return _FRAME.pack(kind, len(payload)) + payload
+
+    def header(self) -> bytes:
+        return _HEADER.pack(MAGIC, CODECS[self.codec], self.dtype)
+
+    def meta_frame(self, meta: Dict[str, Any]) -> bytes:
+        return self._frame(FRAME_META, self._compress(json.dumps(meta, separators=(',', ':'), default=str).encode()))
+
+    def records_frame(self, memories: List[Dict[str, Any]]) -> bytes:
+        fields = [{key: value for key, value in memory.items() if key != 'embedding'} for memory in memories]
+        encoded = self._compress(json.dumps(fields, separators=(',', ':'), default=str).encode())
+        parts = [_U32.pack(len(encoded)), encoded]
+        parts.extend(_pack_embedding(memory.get('embedding'), self.dtype) for memory in memories)
+        return self._frame(FRAME_RECORDS, b''.join(parts))
+
+    def end_frame(self) -> bytes:
+        return _FRAME.pack(FRAME_END, 0)
+
+    def iter_frames(self, meta: Dict[str, Any], memories: List[Dict[str, Any]]) -> Iterator[bytes]:
+        """Header, meta, one frame per frame_records memories, end"""
+        yield self.header() + self.meta_frame(meta)
+        for start in range(0, len(memories), self.frame_records):
+            yield self.records_frame(memories[start:start + self.frame_records])
+        yield self.end_frame()
+
+    def encode(self, meta: Dict[str, Any], memories: List[Dict[str, Any]]) -> bytes:
+        return b''.join(self.iter_frames(meta, memories))
+
+
+# Decoding
+
+class SyncWireDecoder:
+    """Incremental decoder: feed() bytes as they arrive, get back complete frames"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.codec: Optional[int] = None
+        self.dtype: Optional[int] = None
+        self.finished = False
+        self._zstd = None
+
+    def _decompress(self, payload: bytes) -> bytes:
+        try:
+            if self.codec == CODECS['zstd']:
+                if self._zstd is None:
+                    if not ZSTD_AVAILABLE:
+                        raise WireFormatError("zstd stream received but zstandard is not installed")
+                    self._zstd = zstandard.ZstdDecompressor()
+                return self._zstd.decompress(payload)
+            if self.codec == CODECS['zlib']:
+                return zlib.decompress(payload)
+        except _DECOMPRESS_ERRORS as e:
+            raise WireFormatError(f"Corrupt frame: {e}") from e
+        return payload
+
+    def _decode_records(self, payload: bytes) -> List[Dict[str, Any]]:
+        buffer = memoryview(payload)
+        (json_length,) = _U32.unpack_from(buffer, 0)
+        memories = json.loads(self._decompress(bytes(buffer[4:4 + json_length])))
+        offset = 4 + json_length
+        for memory in memories:
+            memory['embedding'], offset = _unpack_embedding(buffer, offset, self.dtype)
+        return memories
+
+    def feed(self, data: bytes) -> List[Tuple[str, Any]]:
+        """Returns ('meta', dict) and ('memories', list) items for every frame completed by data"""
+        if self.finished:
+            if data:
+                raise WireFormatError("Data after end of stream")
+            return []
+        self._buffer.extend(data)
+        items = []
+        if self.codec is None:
+            if len(self._buffer) < _HEADER.size:
+                return items
+            magic, self.codec, self.dtype = _HEADER.unpack_from(self._buffer)
+            if magic != MAGIC:
+                raise WireFormatError("Not a hAIveMind sync stream")
+            if self.codec not in CODECS.values() or self.dtype not in DTYPES.values():
+                raise WireFormatError(f"Unsupported codec {self.codec} or dtype {self.dtype}")
+            del self._buffer[:_HEADER.size]
+        while len(self._buffer) >= _FRAME.size:
+            kind, length = _FRAME.unpack_from(self._buffer)
+            end = _FRAME.size + length
+            if len(self._buffer) < end:
+                break
+            payload = bytes(self._buffer[_FRAME.size:end])
+            del self._buffer[:end]
+            if kind == FRAME_END:
+                self.finished = True
+                if self._buffer:
+                    raise WireFormatError("Data after end of stream")
+                break
+            if kind == FRAME_META:
+                items.append(('meta', json.loads(self._decompress(payload))))
+            elif kind == FRAME_RECORDS:
+                items.append(('memories', self._decode_records(payload)))
+            else:
+                raise WireFormatError(f"Unknown frame kind {kind}")
+        return items
+
+    def close(self):
+        """Raise if the stream ended before its end frame"""
+        if not self.finished:
+            raise WireFormatError("Truncated sync stream")
+
+
+async def stream_frames(encoder: SyncWireEncoder, meta: Dict[str, Any],
+                        memories: List[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode frames in the default executor and yield each one as soon as it is ready"""
+    loop = asyncio.get_event_loop()
+    frames = encoder.iter_frames(meta, memories)
+    while True:
+        frame = await loop.run_in_executor(None, next, frames, None)
+        if frame is None:
+            return
+        yield frame
+
+
+async def decode_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[str, Any]]:
+    """Yield decoded frames from an async byte stream as soon as each one is complete"""
+    decoder = SyncWireDecoder()
+    async for chunk in chunks:
+        for item in decoder.feed(chunk):
+            yield item
+    decoder.close()
+
+
+def decode(data: bytes) -> Dict[str, Any]:
+    """Decode a complete stream into the JSON-shaped payload ({..meta, 'memories': [...]})"""
+    decoder = SyncWireDecoder()
+    payload: Dict[str, Any] = {'memories': []}
+    for kind, value in decoder.feed(data):
+        if kind == 'meta':
+            payload.update(value)
+        else:
+            payload['memories'].extend(value)
+    decoder.close()
+    return payload
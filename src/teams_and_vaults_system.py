@@ -19,6 +19,8 @@ import logging
 import secrets
 import hmac
 
+import sqlite_pool
+
 logger = logging.getLogger(__name__)
 
 # Use simple encryption for now (cryptography has compatibility issues)
@@ -144,7 +146,7 @@ class TeamsAndVaultsSystem:
 
     def _init_database(self):
         """Initialize SQLite database with schema from design doc"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.executescript("""
                 -- Teams table
                 CREATE TABLE IF NOT EXISTS teams (
@@ -312,7 +314,7 @@ class TeamsAndVaultsSystem:
             metadata=metadata or {}
         )
 
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.execute("""
                 INSERT INTO teams (team_id, name, description, owner_id, settings, metadata)
                 VALUES (?, ?, ?, ?, ?, ?)
@@ -347,7 +349,7 @@ class TeamsAndVaultsSystem:
 
     def get_team(self, team_id: str) -> Optional[Team]:
         """Get team by ID"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             row = conn.execute("""
                 SELECT * FROM teams WHERE team_id = ?
@@ -368,7 +370,7 @@ class TeamsAndVaultsSystem:
 
     def list_teams(self, user_id: Optional[str] = None) -> List[Team]:
         """List all teams, optionally filtered by user membership"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
 
             if user_id:
@@ -413,7 +415,7 @@ class TeamsAndVaultsSystem:
             capabilities=capabilities or []
         )
 
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.execute("""
                 INSERT INTO team_members (team_id, user_id, role, invited_by, capabilities)
                 VALUES (?, ?, ?, ?, ?)
@@ -441,7 +443,7 @@ class TeamsAndVaultsSystem:
 
     def remove_team_member(self, team_id: str, user_id: str, removed_by: str) -> bool:
         """Remove a member from a team"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             cursor = conn.execute("""
                 DELETE FROM team_members
                 WHERE team_id = ? AND user_id = ?
@@ -463,7 +465,7 @@ class TeamsAndVaultsSystem:
 
     def get_team_members(self, team_id: str) -> List[TeamMember]:
         """Get all members of a team"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             rows = conn.execute("""
                 SELECT * FROM team_members
@@ -485,7 +487,7 @@ class TeamsAndVaultsSystem:
 
     def check_team_membership(self, team_id: str, user_id: str) -> Optional[TeamMember]:
         """Check if user is a member of team"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             row = conn.execute("""
                 SELECT * FROM team_members
@@ -534,7 +536,7 @@ class TeamsAndVaultsSystem:
             metadata=metadata or {}
         )
 
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.execute("""
                 INSERT INTO vaults (vault_id, name, vault_type, owner_id, team_id,
                                    encryption_key_id, access_policy, metadata)
@@ -566,7 +568,7 @@ class TeamsAndVaultsSystem:
 
     def get_vault(self, vault_id: str) -> Optional[Vault]:
         """Get vault by ID"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             row = conn.execute("""
                 SELECT * FROM vaults WHERE vault_id = ?
@@ -589,7 +591,7 @@ class TeamsAndVaultsSystem:
 
     def list_vaults(self, user_id: Optional[str] = None) -> List[Vault]:
         """List all vaults accessible by user"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
 
             if user_id:
@@ -644,7 +646,7 @@ class TeamsAndVaultsSystem:
 
         secret_id = f"secret_{secrets.token_hex(8)}"
 
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             # Upsert secret (update if exists, insert if not)
             conn.execute("""
                 INSERT INTO vault_secrets (secret_id, vault_id, key, encrypted_value,
@@ -699,7 +701,7 @@ class TeamsAndVaultsSystem:
         if not vault:
             raise ValueError(f"Vault {vault_id} not found")
 
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             row = conn.execute("""
                 SELECT encrypted_value FROM vault_secrets
@@ -732,7 +734,7 @@ class TeamsAndVaultsSystem:
 
     def list_vault_secrets(self, vault_id: str) -> List[Dict]:
         """List all secret keys in a vault (not values)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             rows = conn.execute("""
                 SELECT secret_id, key, created_at, updated_at, created_by, metadata, expires_at
@@ -756,7 +758,7 @@ class TeamsAndVaultsSystem:
 
     def delete_vault_secret(self, vault_id: str, key: str, actor_id: str) -> bool:
         """Delete a secret from a vault"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             cursor = conn.execute("""
                 DELETE FROM vault_secrets
                 WHERE vault_id = ? AND key = ?
@@ -801,7 +803,7 @@ class TeamsAndVaultsSystem:
             expires_at=expires_at
         )
 
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.execute("""
                 INSERT INTO vault_access (grant_id, vault_id, grantee_id, grantee_type,
                                          access_level, granted_by, expires_at)
@@ -856,7 +858,7 @@ class TeamsAndVaultsSystem:
         }
         required_level_value = access_levels.get(required_level, 1)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
 
             # Check direct user access
@@ -897,7 +899,7 @@ class TeamsAndVaultsSystem:
         """Set agent operating mode"""
         session_id = f"{agent_id}_{user_id}"
 
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.execute("""
                 INSERT INTO session_modes (session_id, agent_id, user_id, current_mode,
                                           context_id, metadata)
@@ -931,7 +933,7 @@ class TeamsAndVaultsSystem:
         """Get current agent operating mode"""
         session_id = f"{agent_id}_{user_id}"
 
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             row = conn.execute("""
                 SELECT * FROM session_modes WHERE session_id = ?
@@ -984,7 +986,7 @@ class TeamsAndVaultsSystem:
         """Get vault audit log entries"""
         cutoff_time = (datetime.now() - timedelta(hours=hours)).isoformat()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             rows = conn.execute("""
                 SELECT * FROM vault_audit
@@ -1037,7 +1039,7 @@ class TeamsAndVaultsSystem:
         """Get team activity log entries"""
         cutoff_time = (datetime.now() - timedelta(hours=hours)).isoformat()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             rows = conn.execute("""
                 SELECT * FROM team_activity
@@ -1106,7 +1108,7 @@ class VaultEncryption:
         key_id = f"vaultkey_{secrets.token_hex(8)}"
 
         # Save to database
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             conn.execute("""
                 INSERT INTO encryption_keys (key_id, encrypted_key)
                 VALUES (?, ?)
@@ -1121,7 +1123,7 @@ class VaultEncryption:
         if not self.enabled:
             return b"disabled"
 
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite_pool.connect(self.db_path) as conn:
             row = conn.execute("""
                 SELECT encrypted_key FROM encryption_keys WHERE key_id = ?
             """, (key_id,)).fetchone()
@@ -0,0 +1,218 @@
+"""
+hAIveMind Telemetry Write-Behind Queue
+
+Keeps telemetry memories ("search returned N results", ticket events, deletion
+audit records) off the request path. Callers enqueue and return immediately;
+a background task flushes batches through a single batched store.
+
+Features:
+- Bounded queue; under overload the oldest droppable event is discarded
+- Identical pending events are coalesced into one memory with an occurrence count
+- Durable events (audit records) are never dropped: when the queue is full the
+  caller is told to write them directly instead, and a failed flush puts them
+  back at the head of the queue to be retried with exponential backoff
+- Memory IDs are assigned at enqueue time, so callers still get an ID back
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TelemetryEvent:
+    """A memory waiting to be written by the telemetry flusher"""
+    memory_id: str
+    content: str
+    category: str
+    context: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    tags: List[str] = field(default_factory=list)
+    scope: Optional[str] = None
+    durable: bool = False
+    attempts: int = 0
+    occurrences: int = 1
+    first_seen: float = field(default_factory=time.time)
+    last_seen: float = field(default_factory=time.time)
+
+    def coalesce_key(self) -> str:
+        payload = json.dumps([self.category, self.content, self.context, self.metadata,
+                              self.tags, self.scope], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class TelemetryQueue:
+    """Bounded, coalescing write-behind queue flushed in batches by an asyncio task"""
+
+    def __init__(self, flush_batch: Callable[[List[TelemetryEvent]], Awaitable[None]],
+                 max_size: int = 5000, batch_size: int = 100, flush_interval: float = 1.0,
+                 retry_backoff: float = 1.0, max_retry_backoff: float = 60.0, close_timeout: float = 10.0):
+        self.flush_batch = flush_batch
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self.close_timeout = close_timeout
+        self._retry_at = 0.0
+        self._pending: 'OrderedDict[str, TelemetryEvent]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing = False
+        self.stats = {'enqueued': 0, 'coalesced': 0, 'dropped': 0, 'rejected': 0,
+                      'written': 0, 'batches': 0, 'failed': 0, 'retried': 0}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any],
+                    flush_batch: Callable[[List[TelemetryEvent]], Awaitable[None]]) -> 'TelemetryQueue':
+        settings = config.get('memory', {}).get('telemetry', {}) or {}
+        return cls(flush_batch,
+                   max_size=settings.get('max_queue_size', 5000),
+                   batch_size=settings.get('batch_size', 100),
+                   flush_interval=settings.get('flush_interval', 1.0),
+                   retry_backoff=settings.get('retry_backoff_seconds', 1.0),
+                   max_retry_backoff=settings.get('max_retry_backoff_seconds', 60.0),
+                   close_timeout=settings.get('close_timeout_seconds', 10.0))
+
+    def enqueue(self, event: TelemetryEvent) -> Optional[str]:
+        """
+        Queue an event without blocking.
+
+        Returns the memory ID the event will be stored under (the pending ID when
+        it coalesced with an identical event), or None when it was not queued:
+        a droppable event was shed, or a durable one must be written by the caller.
+        """
+        key = event.coalesce_key()
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                pending.occurrences += 1
+                pending.last_seen = event.last_seen
+                pending.durable = pending.durable or event.durable
+                self.stats['coalesced'] += 1
+                return pending.memory_id
+            if len(self._pending) >= self.max_size and not self._make_room():
+                if event.durable:
+                    self.stats['rejected'] += 1
+                    return None
+                self.stats['dropped'] += 1
+                return None
+            self._pending[key] = event
+            self.stats['enqueued'] += 1
+            ready = len(self._pending) >= self.batch_size
+        self._ensure_worker(ready)
+        return event.memory_id
+
+    def _make_room(self) -> bool:
+        """Drop the oldest droppable event; caller holds the lock"""
+        for key, pending in self._pending.items():
+            if not pending.durable:
+                del self._pending[key]
+                self.stats['dropped'] += 1
+                return True
+        return False
+
+    def _ensure_worker(self, wake: bool) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop in this thread; flushed by the next enqueue on the loop or flush()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._worker = loop.create_task(self._run())
+        if wake:
+            self._wakeup.set()
+
+    def _take_batch(self) -> List[TelemetryEvent]:
+        with self._lock:
+            batch = []
+            while self._pending and len(batch) < self.batch_size:
+                batch.append(self._pending.popitem(last=False)[1])
+            return batch
+
+    def _requeue(self, events: List[TelemetryEvent]) -> None:
+        """Put failed durable events back at the head of the queue and schedule a retry"""
+        with self._lock:
+            for event in reversed(events):
+                event.attempts += 1
+                # Keyed by memory ID so a retry never merges into (and loses the ID of) a newer event
+                self._pending[event.memory_id] = event
+                self._pending.move_to_end(event.memory_id, last=False)
+            attempts = max(event.attempts for event in events)
+        self.stats['retried'] += len(events)
+        self._retry_at = time.monotonic() + min(self.max_retry_backoff, self.retry_backoff * 2 ** (attempts - 1))
+
+    async def _write(self, batch: List[TelemetryEvent]) -> bool:
+        try:
+            await self.flush_batch(batch)
+        except Exception as e:
+            durable = [event for event in batch if event.durable]
+            self.stats['failed'] += len(batch) - len(durable)
+            logger.error(f"💥 Telemetry flush failed for {len(batch)} events "
+                         f"({len(durable)} durable, retrying): {e}")
+            if durable:
+                self._requeue(durable)
+            return False
+        self.stats['written'] += len(batch)
+        self.stats['batches'] += 1
+        return True
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if time.monotonic() < self._retry_at:
+                continue  # Backing off after a failed flush
+            while not self._closing:
+                batch = self._take_batch()
+                if not batch or not await self._write(batch):
+                    break
+
+    async def flush(self) -> int:
+        """Write everything pending now; returns the number written (stops at the first failed batch)"""
+        written = 0
+        while True:
+            batch = self._take_batch()
+            if not batch or not await self._write(batch):
+                return written
+            written += len(batch)
+
+    async def close(self) -> None:
+        """Stop the background flusher and write everything queued, retrying durable events up to close_timeout"""
+        self._closing = True
+        if self._worker is not None and not self._worker.done():
+            self._wakeup.set()
+            await self._worker
+        self._worker = None
+        deadline = time.monotonic() + self.close_timeout
+        while True:
+            await self.flush()
+            with self._lock:
+                remaining = len(self._pending)
+            now = time.monotonic()
+            if not remaining:
+                return
+            if now >= deadline:
+                logger.error(f"💥 Telemetry queue closed with {remaining} durable events unwritten")
+                return
+            await asyncio.sleep(min(max(0.0, self._retry_at - now), deadline - now))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            depth = len(self._pending)
+        return {'queue_depth': depth, 'max_size': self.max_size, **self.stats}
+
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+hAIveMind Ticket Index - Local Search and Filter Index for Enhanced Tickets
+
+Vibe Kanban stores ticket metadata embedded in task descriptions, so every
+filter used to mean fetching tasks and re-parsing them. The index keeps one
+row per ticket with the parsed metadata as columns, plus an FTS5 table over
+title, description and comments:
+
+- Structured filters (status, priority, assignee, type) are indexed queries
+- Full-text search is ranked with bm25, falling back to LIKE when the SQLite
+  build has no FTS5
+- Metrics are computed with SQL aggregates
+- A per-project cursor records the newest upstream updated_at seen, so
+  refreshes only pull tasks changed since the last poll; tasks deleted
+  upstream are removed by reconciling against the full upstream ID set
+
+Author: Lance James, Unit 221B Inc
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TICKET_COLUMNS = (
+    'id', 'project_id', 'ticket_number', 'title', 'description', 'status', 'vibe_status',
+    'ticket_type', 'priority', 'severity', 'assignee', 'reporter', 'due_date',
+    'metadata', 'created_at', 'updated_at'
+)
+
+
+def _fts5_available() -> bool:
+    try:
+        conn = sqlite3.connect(':memory:')
+        conn.execute("CREATE VIRTUAL TABLE probe USING fts5(body)")
+        conn.close()
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+FTS5_AVAILABLE = _fts5_available()
+
+
+class TicketIndex:
+    """SQLite index of enhanced tickets, kept current by EnhancedTicketSystem"""
+
+    def __init__(self, db_path: str = "data/ticket_index.db"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.fts_enabled = FTS5_AVAILABLE
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_database()
+
+    def _init_database(self):
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS tickets (
+                    id TEXT PRIMARY KEY,
+                    project_id TEXT NOT NULL,
+                    ticket_number INTEGER,
+                    title TEXT NOT NULL DEFAULT '',
+                    description TEXT NOT NULL DEFAULT '',
+                    status TEXT,
+                    vibe_status TEXT,
+                    ticket_type TEXT,
+                    priority TEXT,
+                    severity TEXT,
+                    assignee TEXT,
+                    reporter TEXT,
+                    due_date TEXT,
+                    metadata TEXT NOT NULL DEFAULT '{}',  -- Full TicketMetadata as JSON
+                    created_at TEXT,
+                    updated_at TEXT
+                );
+
+                CREATE TABLE IF NOT EXISTS ticket_comments (
+                    comment_id TEXT PRIMARY KEY,
+                    ticket_id TEXT NOT NULL,
+                    project_id TEXT,
+                    author TEXT,
+                    content TEXT NOT NULL,
+                    created_at TEXT
+                );
+
+                -- Newest upstream updated_at seen per project
+                CREATE TABLE IF NOT EXISTS ticket_sync_state (
+                    project_id TEXT PRIMARY KEY,
+                    updated_since TEXT,
+                    last_sync REAL
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_tickets_number ON tickets (project_id, ticket_number DESC);
+                CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets (project_id, status);
+                CREATE INDEX IF NOT EXISTS idx_tickets_priority ON tickets (project_id, priority);
+                CREATE INDEX IF NOT EXISTS idx_tickets_assignee ON tickets (project_id, assignee);
+                CREATE INDEX IF NOT EXISTS idx_tickets_type ON tickets (project_id, ticket_type);
+                CREATE INDEX IF NOT EXISTS idx_comments_ticket ON ticket_comments (ticket_id, created_at);
+            """)
+            if self.fts_enabled:
+                self._conn.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS tickets_fts USING fts5(
+                        ticket_id UNINDEXED, title, description, comments,
+                        tokenize = 'porter unicode61'
+                    )
+                """)
+
+    # Writes
+
+    def upsert_tickets(self, tickets: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace tickets (dicts shaped like EnhancedTicketSystem tickets)"""
+        rows = []
+        for ticket in tickets:
+            metadata = ticket.get('metadata') or {}
+            rows.append((
+                ticket['id'], ticket['project_id'], ticket.get('ticket_number'),
+                ticket.get('title') or '', ticket.get('description') or '',
+                ticket.get('status'), ticket.get('vibe_status'),
+                metadata.get('ticket_type'), metadata.get('priority'), metadata.get('severity'),
+                metadata.get('assignee'), metadata.get('reporter'), metadata.get('due_date'),
+                json.dumps(metadata), ticket.get('created_at'), ticket.get('updated_at')
+            ))
+        if not rows:
+            return 0
+
+        placeholders = ', '.join('?' * len(TICKET_COLUMNS))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO tickets ({', '.join(TICKET_COLUMNS)}) VALUES ({placeholders})", rows)
+            self._reindex_text([row[0] for row in rows])
+        return len(rows)
+
+    def update_status(self, ticket_id: str, status: str, vibe_status: str = None,
+                      updated_at: str = None) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute("""
+                UPDATE tickets SET status = ?, vibe_status = COALESCE(?, vibe_status),
+                       updated_at = COALESCE(?, updated_at)
+                WHERE id = ?
+            """, (status, vibe_status, updated_at or datetime.now().isoformat(), ticket_id))
+            return cursor.rowcount > 0
+
+    def add_comment(self, ticket_id: str, comment_id: str, content: str, author: str = None,
+                    project_id: str = None, created_at: str = None):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO ticket_comments (comment_id, ticket_id, project_id, author, content, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (comment_id, ticket_id, project_id, author, content, created_at or datetime.now().isoformat()))
+            self._reindex_text([ticket_id])
+
+    def remove_missing(self, project_id: str, live_ids: Iterable[str]) -> int:
+        """Delete indexed tickets (and their comments) whose IDs are no longer upstream"""
+        live = set(live_ids)
+        with self._lock, self._conn:
+            gone = [row[0] for row in self._conn.execute("SELECT id FROM tickets WHERE project_id = ?", (project_id,))
+                    if row[0] not in live]
+            if not gone:
+                return 0
+            args = [(ticket_id,) for ticket_id in gone]
+            self._conn.executemany("DELETE FROM tickets WHERE id = ?", args)
+            self._conn.executemany("DELETE FROM ticket_comments WHERE ticket_id = ?", args)
+            if self.fts_enabled:
+                self._conn.executemany("DELETE FROM tickets_fts WHERE ticket_id = ?", args)
+        return len(gone)
+
+    def _reindex_text(self, ticket_ids: List[str]):
+        """Rebuild FTS rows for tickets; caller holds the lock and transaction"""
+        if not self.fts_enabled:
+            return
+        self._conn.executemany("DELETE FROM tickets_fts WHERE ticket_id = ?", [(tid,) for tid in ticket_ids])
+        self._conn.executemany("""
+            INSERT INTO tickets_fts (ticket_id, title, description, comments)
+            SELECT t.id, t.title, t.description,
+                   COALESCE((SELECT group_concat(content, ' ') FROM ticket_comments c WHERE c.ticket_id = t.id), '')
+            FROM tickets t WHERE t.id = ?
+        """, [(tid,) for tid in ticket_ids])
+
+    # Sync cursor
+
+    def get_sync_state(self, project_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT updated_since, last_sync FROM ticket_sync_state WHERE project_id = ?",
+                                     (project_id,)).fetchone()
+        return dict(row) if row else None
+
+    def set_sync_state(self, project_id: str, updated_since: Optional[str], last_sync: float):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT INTO ticket_sync_state (project_id, updated_since, last_sync) VALUES (?, ?, ?)
+                ON CONFLICT(project_id) DO UPDATE SET
+                    updated_since = COALESCE(excluded.updated_since, updated_since),
+                    last_sync = excluded.last_sync
+            """, (project_id, updated_since, last_sync))
+
+    # Queries
+
+    @staticmethod
+    def _row_to_ticket(row: sqlite3.Row) -> Dict[str, Any]:
+        ticket = {
+            'id': row['id'],
+            'ticket_number': row['ticket_number'],
+            'title': row['title'],
+            'description': row['description'],
+            'status': row['status'],
+            'vibe_status': row['vibe_status'],
+            'metadata': json.loads(row['metadata']),
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at']
+        }
+        if 'relevance_score' in row.keys():
+            ticket['relevance_score'] = row['relevance_score']
+        return ticket
+
+    def list_tickets(self, project_id: str, status: str = None, priority: str = None,
+                     assignee: str = None, ticket_type: str = None, limit: int = 50) -> List[Dict[str, Any]]:
+        clauses = ["project_id = ?"]
+        params: List[Any] = [project_id]
+        for column, value in (('status', status), ('priority', priority),
+                              ('assignee', assignee), ('ticket_type', ticket_type)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(f"""
+                SELECT * FROM tickets WHERE {' AND '.join(clauses)}
+                ORDER BY COALESCE(ticket_number, 0) DESC LIMIT ?
+            """, params).fetchall()
+        return [self._row_to_ticket(row) for row in rows]
+
+    def get_tickets(self, ticket_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        found = {}
+        ids = list(dict.fromkeys(ticket_ids))
+        with self._lock:
+            for i in range(0, len(ids), 500):
+                batch = ids[i:i + 500]
+                placeholders = ','.join('?' * len(batch))
+                for row in self._conn.execute(f"SELECT * FROM tickets WHERE id IN ({placeholders})", batch):
+                    found[row['id']] = self._row_to_ticket(row)
+        return found
+
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        """Quote each term so user input cannot break FTS5 query syntax"""
+        terms = re.findall(r'\w+', query)
+        return ' '.join(f'"{term}"' for term in terms)
+
+    def search(self, project_id: str, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Rank tickets by text relevance; title matches weigh most"""
+        with self._lock:
+            if self.fts_enabled:
+                fts_query = self._fts_query(query)
+                if not fts_query:
+                    return []
+                rows = self._conn.execute("""
+                    SELECT t.*, -bm25(tickets_fts, 0.0, 10.0, 2.0, 1.0) AS relevance_score
+                    FROM tickets_fts f JOIN tickets t ON t.id = f.ticket_id
+                    WHERE tickets_fts MATCH ? AND t.project_id = ?
+                    ORDER BY bm25(tickets_fts, 0.0, 10.0, 2.0, 1.0) LIMIT ?
+                """, (fts_query, project_id, limit)).fetchall()
+            else:
+                pattern = f"%{query.lower()}%"
+                rows = self._conn.execute("""
+                    SELECT t.*, CASE WHEN lower(t.title) LIKE ? THEN 1.0 ELSE 0.5 END AS relevance_score
+                    FROM tickets t
+                    WHERE t.project_id = ? AND (lower(t.title) LIKE ? OR lower(t.description) LIKE ?
+                          OR EXISTS (SELECT 1 FROM ticket_comments c
+                                     WHERE c.ticket_id = t.id AND lower(c.content) LIKE ?))
+                    ORDER BY relevance_score DESC, COALESCE(t.ticket_number, 0) DESC LIMIT ?
+                """, (pattern, project_id, pattern, pattern, pattern, limit)).fetchall()
+        return [self._row_to_ticket(row) for row in rows]
+
+    def metrics(self, project_id: str, days: int = 30) -> Dict[str, Any]:
+        period = f"-{int(days)} days"
+        with self._lock:
+            totals = self._conn.execute("""
+                SELECT COUNT(*) AS total_tickets,
+                       SUM(julianday(created_at) >= julianday('now', ?)) AS created_in_period,
+                       SUM(status = 'done' AND julianday(updated_at) >= julianday('now', ?)) AS closed_in_period,
+                       AVG(CASE WHEN status = 'done' AND julianday(updated_at) >= julianday('now', ?)
+                                THEN (julianday(updated_at) - julianday(created_at)) * 24 END) AS average_resolution_time,
+                       SUM(status != 'done' AND julianday(due_date) < julianday('now', 'localtime')) AS overdue_tickets,
+                       SUM(COALESCE(priority, 'medium') IN ('critical', 'emergency')) AS critical_tickets
+                FROM tickets WHERE project_id = ?
+            """, (period, period, period, project_id)).fetchone()
+
+            breakdowns = {}
+            for key, column, default in (('by_status', 'status', None), ('by_priority', 'priority', 'medium'),
+                                         ('by_type', 'ticket_type', 'task')):
+                breakdowns[key] = {
+                    row[0]: row[1] for row in self._conn.execute(f"""
+                        SELECT COALESCE({column}, ?) AS value, COUNT(*) FROM tickets
+                        WHERE project_id = ? GROUP BY value
+                    """, (default, project_id))
+                }
+
+        return {
+            'total_tickets': totals['total_tickets'],
+            **breakdowns,
+            'created_in_period': totals['created_in_period'] or 0,
+            'closed_in_period': totals['closed_in_period'] or 0,
+            'average_resolution_time': totals['average_resolution_time'] or 0,
+            'overdue_tickets': totals['overdue_tickets'] or 0,
+            'critical_tickets': totals['critical_tickets'] or 0
+        }
+
+    def count(self, project_id: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tickets WHERE project_id = ?",
+                                      (project_id,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
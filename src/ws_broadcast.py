@@ -0,0 +1,213 @@
+"""
+hAIveMind WebSocket Broadcaster - Per-Connection Send Queues
+
+Fans messages out to many WebSocket clients without letting one slow or
+stalled client delay the rest.
+
+Features:
+- One bounded outbound queue and writer task per connection; broadcast only
+  enqueues, so its latency does not depend on the slowest peer
+- Messages are serialized once and the same string is queued for every peer
+- Overflow handling: a queued message with the same coalesce key is replaced
+  by the newer one; a client that is still full is disconnected as a slow
+  consumer
+- Writers send heartbeats on idle connections and time out stalled sends
+- Every write goes through the writer, so replies and broadcasts never
+  interleave on one socket
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, Callable, Dict, Hashable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_MESSAGE = json.dumps({"type": "heartbeat"})
+
+
+class Outbox:
+    """Bounded send queue and writer task for one WebSocket"""
+
+    def __init__(self, key: Hashable, websocket, max_queue: int):
+        self.key = key
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.queue: deque = deque()  # (coalesce_key, text)
+        self.ready = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.sent = 0
+        self.coalesced = 0
+
+    def offer(self, text: str, coalesce_key: Optional[str] = None) -> bool:
+        """Queue text without blocking; False means the client is too far behind"""
+        if self.closed:
+            return False
+        if len(self.queue) >= self.max_queue:
+            if coalesce_key is None:
+                return False
+            for index, (queued_key, _) in enumerate(self.queue):
+                if queued_key == coalesce_key:
+                    # Later state supersedes the queued one
+                    del self.queue[index]
+                    self.queue.append((coalesce_key, text))
+                    self.coalesced += 1
+                    return True
+            return False
+        self.queue.append((coalesce_key, text))
+        self.ready.set()
+        return True
+
+
+class WebSocketBroadcaster:
+    """Registry of client outboxes with non-blocking broadcast"""
+
+    def __init__(self, max_queue: int = 256, send_timeout: float = 10.0, heartbeat_interval: float = 30.0,
+                 on_disconnect: Optional[Callable[[Hashable], None]] = None):
+        """
+        Args:
+            max_queue: Messages buffered per client before coalescing or disconnecting it
+            send_timeout: Seconds a single send may take before the client is dropped
+            heartbeat_interval: Idle seconds before a heartbeat is sent (0 disables)
+            on_disconnect: Called with the key of every client the broadcaster drops
+        """
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.on_disconnect = on_disconnect
+        self.outboxes: Dict[Hashable, Outbox] = {}
+        self.messages_broadcast = 0
+        self.slow_consumers_dropped = 0
+        self.send_failures = 0
+
+    @classmethod
+    def from_config(cls, settings: Optional[Dict[str, Any]], **kwargs) -> 'WebSocketBroadcaster':
+        settings = settings or {}
+        return cls(
+            max_queue=settings.get('max_queue', 256),
+            send_timeout=settings.get('send_timeout', 10.0),
+            heartbeat_interval=settings.get('heartbeat_interval', 30.0),
+            **kwargs
+        )
+
+    def __len__(self) -> int:
+        return len(self.outboxes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.outboxes
+
+    def register(self, key: Hashable, websocket) -> Outbox:
+        """Start a writer for an accepted WebSocket, replacing any previous one under key"""
+        previous = self.outboxes.get(key)
+        if previous is not None:
+            self._close(previous, reason="replaced")
+        outbox = Outbox(key, websocket, self.max_queue)
+        outbox.task = asyncio.ensure_future(self._writer(outbox))
+        self.outboxes[key] = outbox
+        return outbox
+
+    def unregister(self, key: Hashable, websocket=None):
+        """Stop key's writer; with websocket given, only if it is still the registered one"""
+        outbox = self.outboxes.get(key)
+        if outbox is None or (websocket is not None and outbox.websocket is not websocket):
+            return
+        del self.outboxes[key]
+        outbox.closed = True
+        if outbox.task is not None and outbox.task is not asyncio.current_task():
+            outbox.task.cancel()
+
+    @staticmethod
+    def _encode(message: Union[str, Dict[str, Any]]) -> str:
+        return message if isinstance(message, str) else json.dumps(message)
+
+    def send(self, key: Hashable, message: Union[str, Dict[str, Any]], coalesce_key: Optional[str] = None) -> bool:
+        """Queue a message for one client"""
+        outbox = self.outboxes.get(key)
+        if outbox is None:
+            return False
+        if not outbox.offer(self._encode(message), coalesce_key):
+            self._drop_slow(outbox)
+            return False
+        return True
+
+    def broadcast(self, message: Union[str, Dict[str, Any]], coalesce_key: Optional[str] = None,
+                  exclude: Optional[Hashable] = None) -> int:
+        """Serialize once and queue for every client except exclude; returns clients queued"""
+        text = self._encode(message)
+        queued = 0
+        for key, outbox in list(self.outboxes.items()):
+            if key == exclude:
+                continue
+            if outbox.offer(text, coalesce_key):
+                queued += 1
+            else:
+                self._drop_slow(outbox)
+        self.messages_broadcast += 1
+        return queued
+
+    def _drop_slow(self, outbox: Outbox):
+        if outbox.closed:
+            return
+        self.slow_consumers_dropped += 1
+        logger.warning(f"🐌 Dropping slow WebSocket client {outbox.key}: "
+                       f"{len(outbox.queue)} messages queued")
+        self._close(outbox, reason="slow consumer")
+
+    def _close(self, outbox: Outbox, reason: str):
+        self.unregister(outbox.key, outbox.websocket)
+        if reason != "replaced" and self.on_disconnect is not None:
+            try:
+                self.on_disconnect(outbox.key)
+            except Exception as e:
+                logger.debug(f"Disconnect callback failed for {outbox.key}: {e}")
+        asyncio.ensure_future(self._close_socket(outbox.websocket, reason))
+
+    async def _close_socket(self, websocket, reason: str):
+        try:
+            await asyncio.wait_for(websocket.close(code=1013 if reason == "slow consumer" else 1000, reason=reason),
+                                   timeout=self.send_timeout)
+        except Exception:
+            pass  # Already gone
+
+    async def _writer(self, outbox: Outbox):
+        websocket = outbox.websocket
+        heartbeat = self.heartbeat_interval or None
+        try:
+            while not outbox.closed:
+                if not outbox.queue:
+                    outbox.ready.clear()
+                    try:
+                        await asyncio.wait_for(outbox.ready.wait(), timeout=heartbeat)
+                    except asyncio.TimeoutError:
+                        outbox.queue.append((None, HEARTBEAT_MESSAGE))
+                    continue
+                _, text = outbox.queue.popleft()
+                await asyncio.wait_for(websocket.send_text(text), timeout=self.send_timeout)
+                outbox.sent += 1
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.send_failures += 1
+            logger.error(f"Failed to send to WebSocket client {outbox.key}: {e}")
+            if self.outboxes.get(outbox.key) is outbox:
+                self._close(outbox, reason="send failed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'connections': len(self.outboxes),
+            'queued': sum(len(outbox.queue) for outbox in self.outboxes.values()),
+            'max_queue': self.max_queue,
+            'messages_broadcast': self.messages_broadcast,
+            'slow_consumers_dropped': self.slow_consumers_dropped,
+            'send_failures': self.send_failures,
+            'coalesced': sum(outbox.coalesced for outbox in self.outboxes.values()),
+        }
+
+    async def aclose(self):
+        """Stop every writer and close the sockets"""
+        outboxes = list(self.outboxes.values())
+        for outbox in outboxes:
+            self.unregister(outbox.key)
+        await asyncio.gather(*(self._close_socket(outbox.websocket, "shutdown") for outbox in outboxes))
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the agent kanban scheduler: capability matching, atomic claims, batching
+"""
+
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from agent_kanban_system import AgentKanbanSystem, AgentStatus, TaskPriority, TaskStatus
+from agent_task_scheduler import AgentTaskScheduler
+
+
+class TestAgentTaskScheduler:
+    """Test suite for AgentTaskScheduler through AgentKanbanSystem"""
+
+    @pytest.fixture
+    def kanban(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            system = AgentKanbanSystem(str(Path(tmp) / "kanban.db"))
+            system.register_agent("ops-1", "Ops 1", "m1", [{"name": "docker", "level": 4},
+                                                           {"name": "nginx", "level": 2}], max_workload=2)
+            system.register_agent("ops-2", "Ops 2", "m2", [{"name": "docker", "level": 2}], max_workload=2)
+            system.register_agent("dba-1", "DBA 1", "m3", [{"name": "mysql", "level": 5}], max_workload=1)
+            yield system
+
+    def _workloads(self, kanban):
+        with sqlite3.connect(kanban.db_path) as conn:
+            return dict(conn.execute("SELECT id, current_workload FROM agents").fetchall())
+
+    def test_available_agents_match_capabilities_and_levels(self, kanban):
+        assert {a["id"] for a in kanban.get_available_agents(["docker"])} == {"ops-1", "ops-2"}
+        assert [a["id"] for a in kanban.get_available_agents(["docker"], 3)] == ["ops-1"]
+        assert [a["id"] for a in kanban.get_available_agents(["docker", "nginx"])] == ["ops-1"]
+        assert kanban.get_available_agents(["kubernetes"]) == []
+
+        kanban.update_agent_status("ops-1", AgentStatus.MAINTENANCE)
+        assert [a["id"] for a in kanban.get_available_agents(["docker"])] == ["ops-2"]
+
+    def test_auto_assign_uses_required_capabilities(self, kanban):
+        task_id = kanban.create_task("Tune buffer pool", "", "tester", required_capabilities=["mysql"],
+                                     min_capability_level=4)
+        assert kanban.assign_task(task_id)
+        assert self._workloads(kanban)["dba-1"] == 1
+
+        # dba-1 is now full; nobody else can take mysql work
+        second = kanban.create_task("Add index", "", "tester", required_capabilities=["mysql"])
+        assert not kanban.assign_task(second)
+
+    def test_a_task_is_never_claimed_twice(self, kanban):
+        task_id = kanban.create_task("Restart proxy", "", "tester")
+        other = AgentTaskScheduler(kanban.db_path)
+        other.load()
+
+        assert kanban.assign_task(task_id, agent_id="ops-1")
+        assert not other.claim(task_id, "ops-2")
+        assert not kanban.assign_task(task_id, agent_id="ops-2")
+        assert self._workloads(kanban) == {"ops-1": 1, "ops-2": 0, "dba-1": 0}
+
+    def test_concurrent_batches_do_not_double_assign(self, kanban):
+        for i in range(12):
+            kanban.create_task(f"Task {i}", "", "tester",
+                               required_capabilities=["docker"] if i % 2 else None)
+        schedulers = [AgentTaskScheduler(kanban.db_path) for _ in range(3)]
+        for scheduler in schedulers:
+            scheduler.load()
+
+        results = []
+        threads = [threading.Thread(target=lambda s=s: results.append(s.assign_batch())) for s in schedulers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with sqlite3.connect(kanban.db_path) as conn:
+            assigned = conn.execute("SELECT COUNT(*) FROM agent_tasks WHERE status = 'assigned'").fetchone()[0]
+            history = conn.execute("SELECT COUNT(*) FROM task_history").fetchone()[0]
+        assert sum(r["assigned_count"] for r in results) == assigned == history == 5  # total capacity
+        workloads = self._workloads(kanban)
+        assert workloads == {"ops-1": 2, "ops-2": 2, "dba-1": 1}
+
+    def test_batch_assigns_by_priority_and_unblocks_dependents(self, kanban):
+        low = kanban.create_task("Low", "", "tester", priority=TaskPriority.LOW)
+        critical = kanban.create_task("Critical", "", "tester", priority=TaskPriority.CRITICAL)
+        blocked = kanban.create_task("Follow-up", "", "tester", dependencies=[critical])
+
+        result = kanban.assign_pending_tasks(limit=1)
+        assert list(result["assigned"]) == [critical]
+        assert result["pending"] == 1  # the dependent task is not ready yet
+
+        kanban.move_task(critical, TaskStatus.DONE, "tester")
+        assert set(kanban.assign_pending_tasks()["assigned"]) == {low, blocked}
+
+    def test_agents_pull_work_they_can_serve(self, kanban):
+        kanban.get_scheduler()
+        mysql_task = kanban.create_task("Vacuum", "", "tester", required_capabilities=["mysql"])
+        docker_task = kanban.create_task("Prune images", "", "tester", priority=TaskPriority.HIGH,
+                                         required_capabilities=["docker"])
+
+        assert kanban.claim_next_task("ops-2") == docker_task
+        assert kanban.claim_next_task("ops-2") is None
+        assert kanban.claim_next_task("dba-1") == mysql_task
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the process-wide ChromaDB registry
+"""
+
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import chroma_registry
+from chroma_registry import ChromaRegistry, close_shared_chroma, shared_chroma
+
+
+class FakeCollection:
+    def __init__(self, name, embedding_function):
+        self.name = name
+        self._embedding_function = embedding_function
+
+
+class FakeSystem:
+    def __init__(self):
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+
+class FakeClient:
+    """Counts collection lookups the way a PersistentClient would serve them"""
+
+    def __init__(self):
+        self.existing = {"global_memories"}
+        self.lookups = 0
+        self._system = FakeSystem()
+
+    def get_collection(self, name, embedding_function=None):
+        self.lookups += 1
+        if name not in self.existing:
+            raise ValueError(f"Collection {name} does not exist.")
+        return FakeCollection(name, embedding_function)
+
+    def create_collection(self, name, metadata=None, embedding_function=None):
+        self.lookups += 1
+        self.existing.add(name)
+        return FakeCollection(name, embedding_function)
+
+    def get_or_create_collection(self, name, metadata=None, embedding_function=None):
+        self.lookups += 1
+        self.existing.add(name)
+        return FakeCollection(name, embedding_function)
+
+    def list_collections(self):
+        return sorted(self.existing)
+
+
+class FakeEmbeddingFunction:
+    def __call__(self, input):
+        return [[0.0] for _ in input]
+
+
+def registry(clients, embeddings):
+    def client_factory():
+        clients.append(FakeClient())
+        return clients[-1]
+
+    def embedding_factory():
+        embeddings.append(FakeEmbeddingFunction())
+        return embeddings[-1]
+
+    return ChromaRegistry("unused", client_factory=client_factory, embedding_function_factory=embedding_factory)
+
+
+class TestChromaRegistry:
+    """Test suite for ChromaRegistry"""
+
+    def test_client_opened_lazily_once_and_collections_cached(self):
+        clients, embeddings = [], []
+        chroma = registry(clients, embeddings)
+        assert clients == []
+
+        for _ in range(5):  # e.g. five sync cycles
+            collection = chroma.get_collection("global_memories")
+
+        assert len(clients) == 1 and clients[0].lookups == 1
+        assert collection._embedding_function is embeddings[0]
+        assert chroma.get_stats()["opens"] == 1 and chroma.get_stats()["collection_loads"] == 1
+
+    def test_one_embedding_function_for_every_collection(self):
+        clients, embeddings = [], []
+        chroma = registry(clients, embeddings)
+        rules = chroma.get_or_create_collection("rules")
+        created = chroma.create_collection("runbooks_memories", metadata={"category": "runbooks"})
+
+        assert rules._embedding_function is created._embedding_function
+        assert len(embeddings) == 1
+        assert chroma.get_collection("runbooks_memories") is created
+
+    def test_missing_collection_errors_pass_through_and_client_methods_proxy(self):
+        chroma = registry([], [])
+        with pytest.raises(ValueError):
+            chroma.get_collection("nope_memories")
+        assert chroma.list_collections() == ["global_memories"]
+
+    def test_close_stops_client_and_reopens_on_next_use(self):
+        clients, embeddings = [], []
+        chroma = registry(clients, embeddings)
+        chroma.get_collection("global_memories")
+        chroma.close()
+
+        assert clients[0]._system.stopped
+        chroma.get_collection("global_memories")
+        assert len(clients) == 2
+
+    def test_shared_registry_per_storage_path(self, tmp_path):
+        config = {"storage": {"chromadb": {"path": str(tmp_path / "chroma")}}}
+        other = {"storage": {"chromadb": {"path": str(tmp_path / "other")}}}
+        try:
+            assert shared_chroma(config) is shared_chroma({"storage": {"chromadb": {"path": str(tmp_path / "chroma/")}}})
+            assert shared_chroma(other) is not shared_chroma(config)
+        finally:
+            close_shared_chroma()
+        assert chroma_registry._registries == {}
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for batch confidence scoring
+"""
+
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from confidence_system import ConfidenceSystem, Context
+
+
+class TestConfidenceBatch:
+    """Batch scoring must agree with the per-memory calculators"""
+
+    @pytest.fixture
+    def system(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            yield ConfidenceSystem(db_path=str(Path(tmp) / "confidence.db"))
+
+    @pytest.fixture
+    def memories(self, system):
+        now = datetime.now()
+        data = {}
+        for i in range(12):
+            memory_id = f"mem_{i}"
+            data[memory_id] = {
+                'created_at': (now - timedelta(days=i * 7)).isoformat(),
+                'category': 'infrastructure' if i % 2 else 'security',
+                'creator_id': f"agent_{i % 3}",
+                'source_type': 'observation',
+                'creator_role': 'developer',
+                'project_id': 'proj-a' if i % 3 else 'proj-b',
+            }
+
+        system.verify_memory('mem_1', 'agent_x', 'confirmed')
+        system.verify_memory('mem_1', 'agent_y', 'still_valid')
+        system.verify_memory('mem_2', 'system_auto_verify', 'confirmed')
+        for outcome in ['success', 'success', 'partial', 'failure']:
+            system.track_memory_usage('mem_3', 'agent_z', 'deploy', outcome)
+        system.detect_contradiction('mem_4', 'mem_5', 'factual', 0.8)
+        system.update_agent_credibility('agent_1', 'infrastructure', verified_correct=8, verified_incorrect=2)
+        return data
+
+    def test_batch_matches_single(self, system, memories):
+        context = Context(project_id='proj-a', task_category='infrastructure')
+
+        expected = {
+            memory_id: system.calculate_confidence(memory_id, data, context)
+            for memory_id, data in memories.items()
+        }
+        batch = system.calculate_confidence_batch(list(memories), memories, context)
+
+        assert set(batch) == set(expected)
+        for memory_id, score in batch.items():
+            single = expected[memory_id]
+            assert score.final_score == pytest.approx(single.final_score)
+            assert score.verification_score == pytest.approx(single.verification_score)
+            assert score.success_rate_score == pytest.approx(single.success_rate_score)
+            assert score.contradiction_score == pytest.approx(single.contradiction_score)
+            assert score.source_score == pytest.approx(single.source_score)
+            assert score.level == single.level
+
+    def test_batch_persists_scores(self, system, memories):
+        system.calculate_confidence_batch(list(memories), memories)
+
+        stored = system.get_confidence_score('mem_2')
+        assert stored is not None
+        assert stored['verification_score'] == pytest.approx(1.0)
+
+    def test_batch_without_metadata_reuses_stored_factors(self, system, memories):
+        first = system.calculate_confidence_batch(['mem_0'], memories)['mem_0']
+        system.verify_memory('mem_0', 'agent_x', 'confirmed')
+
+        rescored = system.calculate_confidence_batch(['mem_0'])['mem_0']
+
+        assert rescored.freshness_score == pytest.approx(first.freshness_score)
+        assert rescored.source_score == pytest.approx(first.source_score)
+        assert rescored.verification_score > first.verification_score
+
+    def test_empty_batch(self, system):
+        assert system.calculate_confidence_batch([]) == {}
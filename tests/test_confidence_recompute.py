@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for decay-on-read freshness and the background recompute scheduler
+"""
+
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from confidence_system import ConfidenceSystem, decayed_freshness
+from confidence_recompute import ConfidenceRecomputeScheduler
+
+
+class TestConfidenceRecompute:
+    """Test suite for read-time decay and prioritized recompute"""
+
+    @pytest.fixture
+    def db_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            yield str(Path(tmp) / "confidence.db")
+
+    @pytest.fixture
+    def system(self, db_path):
+        return ConfidenceSystem(db_path=db_path)
+
+    def _age_reference(self, db_path, memory_id, days):
+        """Move a memory's freshness reference point into the past"""
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE memory_confidence SET freshness_reference_at = ? WHERE memory_id = ?",
+                         ((datetime.now() - timedelta(days=days)).isoformat(), memory_id))
+
+    def _backdate_calculation(self, db_path, memory_id, hours):
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE memory_confidence SET calculated_at = ? WHERE memory_id = ?",
+                         ((datetime.now() - timedelta(hours=hours)).isoformat(), memory_id))
+
+    def _score(self, system, memory_id, category='security'):
+        system.calculate_confidence(memory_id, {
+            'created_at': datetime.now().isoformat(),
+            'category': category,
+        })
+
+    def test_decayed_freshness(self):
+        reference = (datetime.now() - timedelta(days=20)).isoformat()
+        assert decayed_freshness(reference, 20) == pytest.approx(0.5)
+        assert decayed_freshness(None, 20) is None
+
+    def test_outdated_memories_decay_without_rescoring(self, system, db_path):
+        self._score(system, 'fresh')
+        self._score(system, 'stale')
+        self._score(system, 'stale_runbook', category='runbooks')
+        assert system.get_outdated_memories() == []
+
+        for memory_id in ('stale', 'stale_runbook'):
+            self._age_reference(db_path, memory_id, days=60)
+
+        assert system.get_outdated_memories() == ['stale']
+        assert system.get_outdated_memories(category='runbooks') == []
+        assert system.get_confidence_score('stale')['freshness_score'] == pytest.approx(1.0)
+        assert system.get_confidence_score('stale')['current_freshness_score'] == pytest.approx(0.125)
+
+    def test_high_confidence_uses_current_freshness(self, system, db_path):
+        self._score(system, 'mem_a')
+        stored = system.get_confidence_score('mem_a')['final_score']
+
+        self._age_reference(db_path, 'mem_a', days=200)
+
+        assert system.get_high_confidence_memories(min_confidence=stored - 0.01) == []
+        assert system.get_high_confidence_memories(min_confidence=0.0) == ['mem_a']
+
+    def test_scheduler_prioritizes_accessed_and_oldest(self, system, db_path):
+        for memory_id in ('cold_recent', 'cold_old', 'hot_recent', 'current'):
+            self._score(system, memory_id)
+        self._backdate_calculation(db_path, 'cold_recent', hours=2)
+        self._backdate_calculation(db_path, 'cold_old', hours=48)
+        self._backdate_calculation(db_path, 'hot_recent', hours=2)
+        for _ in range(50):
+            system.record_access(['hot_recent'])
+
+        scheduler = ConfidenceRecomputeScheduler(system, batch_size=2, rescore_after_seconds=3600)
+        assert scheduler.get_metrics()['backlog'] == 3
+
+        candidates = system.get_rescore_candidates(datetime.now() - timedelta(hours=1), limit=3)
+        assert candidates == ['hot_recent', 'cold_old', 'cold_recent']
+
+        assert scheduler.run_once() == 2
+        assert scheduler.run_once() == 1
+        assert scheduler.run_once() == 0
+
+        metrics = system.get_confidence_stats()['recompute']
+        assert metrics['backlog'] == 0
+        assert metrics['total_rescored'] == 3
+        assert metrics['batches_run'] == 2
+
+    def test_rescore_keeps_decay_parameters(self, system, db_path):
+        self._score(system, 'mem_a')
+        self._age_reference(db_path, 'mem_a', days=20)
+        self._backdate_calculation(db_path, 'mem_a', hours=2)
+
+        ConfidenceRecomputeScheduler(system).run_once()
+
+        stored = system.get_confidence_score('mem_a')
+        assert stored['freshness_score'] == pytest.approx(0.5)
+        assert stored['half_life_days'] == 20
+
+    def test_legacy_database_is_migrated(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE memory_confidence (
+                    memory_id TEXT PRIMARY KEY, final_score REAL NOT NULL,
+                    confidence_level TEXT NOT NULL, description TEXT,
+                    freshness_score REAL, source_score REAL, verification_score REAL,
+                    consensus_score REAL, contradiction_score REAL, success_rate_score REAL,
+                    context_relevance_score REAL, weights_json TEXT,
+                    calculated_at TIMESTAMP, updated_at TIMESTAMP
+                )
+            """)
+            conn.execute("INSERT INTO memory_confidence (memory_id, final_score, confidence_level, freshness_score) "
+                         "VALUES ('legacy', 0.6, 'medium', 0.2)")
+
+        system = ConfidenceSystem(db_path=db_path)
+
+        assert system.get_outdated_memories() == ['legacy']
+
+    def test_stop_joins_the_background_thread(self, system):
+        scheduler = ConfidenceRecomputeScheduler(system, idle_interval=60.0)
+        scheduler.start()
+        thread = scheduler._thread
+        scheduler.stop(timeout=5.0)
+        assert not thread.is_alive()
+        assert scheduler.get_metrics()['running'] is False
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for content-addressed config snapshot storage, lazy diffs and GC
+"""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from config_backup_system import ConfigBackupSystem, ConfigSnapshot
+from config_chunk_store import split_chunks
+
+
+def make_config(lines=4000, marker=None, at=2000):
+    """An nginx-like config large enough to span many chunks"""
+    body = [f"location /service_{i} {{ proxy_pass http://backend_{i % 17}:80{i % 10}; }}\n"
+            for i in range(lines)]
+    if marker:
+        body.insert(at, f"# {marker}\n")
+    return ''.join(body)
+
+
+class TestConfigBackupStorage:
+    """Test suite for the chunked snapshot store"""
+
+    @pytest.fixture
+    def db_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            yield str(Path(tmp) / "config_backup.db")
+
+    @pytest.fixture
+    def backup(self, db_path):
+        system = ConfigBackupSystem(db_path)
+        system.register_system("web-1", "Web 1", "nginx")
+        system.register_system("web-2", "Web 2", "nginx")
+        return system
+
+    def _snapshot(self, backup, system_id, content):
+        return backup.create_snapshot(ConfigSnapshot(system_id=system_id, config_type="nginx",
+                                                     config_content=content))
+
+    def _count(self, db_path, table):
+        with sqlite3.connect(db_path) as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_chunk_boundaries_survive_insertions(self):
+        original = split_chunks(make_config())
+        edited = split_chunks(make_config(marker="inserted"))
+
+        assert b''.join(original).decode() == make_config()
+        assert len(set(edited) - set(original)) <= 2
+
+    def test_snapshot_roundtrip_and_small_edits_store_little(self, backup, db_path):
+        first = self._snapshot(backup, "web-1", make_config())
+        second = self._snapshot(backup, "web-1", make_config(marker="edit one"))
+
+        assert backup.get_snapshot_content(first) == make_config()
+        assert backup.get_current_config("web-1")["config_content"] == make_config(marker="edit one")
+
+        with sqlite3.connect(db_path) as conn:
+            sizes = dict(conn.execute("SELECT id, stored_size FROM config_snapshots").fetchall())
+        assert sizes[second] < sizes[first] / 10
+
+    def test_chunks_are_shared_across_systems(self, backup, db_path):
+        self._snapshot(backup, "web-1", make_config())
+        chunks = self._count(db_path, "config_chunks")
+        self._snapshot(backup, "web-2", make_config())
+
+        assert self._count(db_path, "config_chunks") == chunks
+        assert backup.get_storage_stats()["space_saving_ratio"] > 2
+
+    def test_diffs_are_computed_lazily_and_cached(self, backup, db_path):
+        first = self._snapshot(backup, "web-1", make_config())
+        second = self._snapshot(backup, "web-1", make_config(marker="ssl_certificate changed"))
+        assert self._count(db_path, "config_diffs") == 0
+
+        history = backup.get_system_history("web-1")
+        assert [h["change_type"] for h in history] == ["added", None]
+        assert self._count(db_path, "config_diffs") == 1
+
+        diff = backup.compare_snapshots(first, second)
+        assert "+# ssl_certificate changed" in diff["diff_content"]
+
+        reverse = ConfigBackupSystem(db_path).compare_snapshots(second, first)
+        assert reverse["lines_removed"] == 1
+        assert self._count(db_path, "config_diff_cache") == 1
+
+    def test_garbage_collection_honours_retention(self, backup, db_path):
+        ids = [self._snapshot(backup, "web-1", make_config(marker=f"rev {i}")) for i in range(5)]
+        backup.get_system_history("web-1")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE config_snapshots SET timestamp = datetime('now', '-60 days')")
+        backup.create_drift_alert("web-1", "unauthorized_change", "high", "pinned", snapshot_id=ids[1])
+        stored_before = backup.get_storage_stats()["stored_bytes"]
+
+        result = backup.collect_garbage(keep_last=2, max_age_days=30)
+
+        with sqlite3.connect(db_path) as conn:
+            remaining = {row[0] for row in conn.execute("SELECT id FROM config_snapshots")}
+        assert ids[1] in remaining  # pinned by an unresolved alert
+        assert len(remaining) == 3
+        assert result["snapshots_removed"] == 2
+        with sqlite3.connect(db_path) as conn:
+            parents = dict(conn.execute("SELECT id, parent_snapshot_id FROM config_snapshots").fetchall())
+        # Survivors chain onto each other instead of onto removed snapshots
+        assert parents == {ids[1]: None, ids[3]: ids[1], ids[4]: ids[3]}
+        assert result["snapshots_rebased"] == 2
+        assert [h["change_type"] for h in backup.get_system_history("web-1")] == ["modified", "modified", None]
+        assert backup.get_storage_stats()["stored_bytes"] <= stored_before
+        for snapshot_id in remaining:
+            assert backup.get_snapshot_content(snapshot_id) is not None
+
+    def test_legacy_snapshots_are_migrated(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE config_snapshots (
+                    id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
+                    system_id TEXT NOT NULL, config_type TEXT NOT NULL,
+                    config_content TEXT NOT NULL, config_hash TEXT NOT NULL, file_path TEXT,
+                    timestamp TEXT DEFAULT CURRENT_TIMESTAMP, agent_id TEXT,
+                    metadata TEXT DEFAULT '{}', size INTEGER, UNIQUE (system_id, config_hash)
+                )
+            """)
+            conn.execute("INSERT INTO config_snapshots (id, system_id, config_type, config_content, config_hash) "
+                         "VALUES ('legacy', 'web-1', 'nginx', 'listen 80;\n', 'h')")
+
+        backup = ConfigBackupSystem(db_path)  # Migrates on open
+        assert backup.get_snapshot_content("legacy") == "listen 80;\n"
+        assert backup.migrate_legacy_snapshots() == 0
+        assert backup.get_storage_stats()["legacy_inline_bytes"] == 0
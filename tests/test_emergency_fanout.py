@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent emergency fan-out with circuit breakers and quorum
+"""
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from emergency_fanout import EmergencyFanoutDispatcher
+
+
+class FakeResponse:
+    def __init__(self, status_code, applied=True):
+        self.status_code = status_code
+        self.applied = applied
+
+    def json(self):
+        return {"success": True, "applied": self.applied}
+
+
+class FakeClient:
+    """In-process stand-in for the pooled HTTP client, keyed by host behaviour"""
+
+    def __init__(self, behaviours, latency=0.01):
+        self.behaviours = behaviours
+        self.latency = latency
+        self.calls = {}
+
+    async def post(self, url, json=None):
+        host = url.split("//")[1].split("/")[0]
+        self.calls[host] = self.calls.get(host, 0) + 1
+        behaviour = self.behaviours.get(host, "ok")
+        if behaviour == "dead":
+            raise ConnectionError("connection refused")
+        if behaviour == "hung":
+            await asyncio.sleep(3600)
+        if behaviour == "slow_first" and self.calls[host] == 1:
+            await asyncio.sleep(3600)
+        await asyncio.sleep(self.latency)
+        return FakeResponse(503 if behaviour == "error" else 200, applied=behaviour != "not_applied")
+
+
+class TestEmergencyFanout:
+    """Test suite for the emergency fan-out dispatcher"""
+
+    URL = "http://{machine}/api/rules/emergency-sync"
+
+    def _dispatcher(self, client, **config):
+        settings = {"timeout": 0.3, "hedge_delay": 0.05, "max_concurrency": 16}
+        settings.update(config)
+        return EmergencyFanoutDispatcher(settings, client=client)
+
+    def test_hung_hosts_do_not_serialize_delivery(self):
+        hosts = [f"machine-{i}" for i in range(50)]
+        client = FakeClient({"machine-3": "hung", "machine-7": "hung", "machine-9": "dead"})
+        dispatcher = self._dispatcher(client)
+
+        started = time.perf_counter()
+        result = asyncio.run(dispatcher.dispatch(hosts, {"sync_message": {}}, self.URL))
+        elapsed = time.perf_counter() - started
+
+        assert len(result.acknowledged) == 47
+        assert set(result.failed) == {"machine-3", "machine-7", "machine-9"}
+        assert elapsed < 1.5
+
+    def test_quorum_reported_before_stragglers_finish(self):
+        hosts = ["a", "b", "c", "d"]
+        dispatcher = self._dispatcher(FakeClient({"d": "hung"}), quorum=0.75)
+        reports = []
+
+        result = asyncio.run(dispatcher.dispatch(hosts, {}, self.URL, on_quorum=reports.append))
+
+        assert result.quorum == 3
+        assert result.quorum_reached
+        assert len(reports) == 1
+        assert result.quorum_seconds < result.total_seconds
+
+    def test_hedged_attempt_wins_over_slow_first_attempt(self):
+        client = FakeClient({"a": "slow_first"})
+        dispatcher = self._dispatcher(client)
+
+        result = asyncio.run(dispatcher.dispatch(["a"], {}, self.URL))
+
+        assert result.acknowledged == ["a"]
+        assert result.hedged_attempts == 1
+        assert result.total_seconds < 0.3
+
+    def test_circuit_opens_and_skips_dead_host(self):
+        client = FakeClient({"dead": "dead", "broken": "error"})
+        dispatcher = self._dispatcher(client, failure_threshold=2, reset_timeout=60)
+
+        for _ in range(2):
+            asyncio.run(dispatcher.dispatch(["dead", "broken", "ok"], {}, self.URL))
+        calls_before = dict(client.calls)
+        result = asyncio.run(dispatcher.dispatch(["dead", "broken", "ok"], {}, self.URL))
+
+        assert sorted(result.skipped) == ["broken", "dead"]
+        assert client.calls["dead"] == calls_before["dead"]
+        assert sorted(dispatcher.get_stats()["open_circuits"]) == ["broken", "dead"]
+
+    def test_quorum_size(self):
+        dispatcher = EmergencyFanoutDispatcher({"quorum": 0.5})
+        assert dispatcher.quorum_size(50) == 25
+        assert dispatcher.quorum_size(3) == 2
+        assert dispatcher.quorum_size(3, quorum=5) == 3
+        assert dispatcher.quorum_size(0) == 0
+
+    def test_only_applied_acknowledgements_count_towards_quorum(self):
+        dispatcher = self._dispatcher(FakeClient({"b": "not_applied", "c": "not_applied"}), quorum=0.5)
+
+        result = asyncio.run(dispatcher.dispatch(["a", "b", "c", "d"], {}, self.URL))
+
+        assert sorted(result.acknowledged) == ["a", "d"]
+        assert result.failed == {"b": "delivered but not applied", "c": "delivered but not applied"}
+        assert result.quorum_reached
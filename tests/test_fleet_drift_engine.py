@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for fleet-wide drift detection
+"""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from config_backup_system import ConfigBackupSystem, ConfigSnapshot
+from fleet_drift_engine import FleetDriftEngine
+
+BASE_CONFIG = "server {\n    listen 80;\n    server_name example.com;\n    root /var/www;\n}\n"
+
+
+class TestFleetDriftEngine:
+    """Test suite for FleetDriftEngine scans and caching"""
+
+    @pytest.fixture
+    def backup(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            system = ConfigBackupSystem(str(Path(tmp) / "config_backup.db"))
+            for i in range(6):
+                system.register_system(f"web-{i}", f"Web {i}", "nginx")
+                self._snapshot(system, f"web-{i}", BASE_CONFIG)
+            yield system
+
+    def _snapshot(self, backup, system_id, content):
+        return backup.create_snapshot(ConfigSnapshot(system_id=system_id, config_type="nginx",
+                                                     config_content=content))
+
+    def test_scan_reports_only_changed_systems(self, backup):
+        self._snapshot(backup, "web-1", BASE_CONFIG.replace("listen 80;", "listen 8080;"))
+        self._snapshot(backup, "web-4", BASE_CONFIG + "ssl_certificate /etc/ssl/new.pem;\n")
+
+        result = FleetDriftEngine(backup, max_workers=1).scan()
+
+        issues = {issue["system_id"]: issue for issue in result["issues"]}
+        assert sorted(issues) == ["web-1", "web-4"]
+        assert [issue["risk_score"] for issue in result["issues"]] == sorted(
+            (issue["risk_score"] for issue in result["issues"]), reverse=True)
+        assert issues["web-4"]["analysis"]["severity"] == "critical"
+        assert issues["web-1"]["analysis"]["patterns_detected"][0]["type"] == "network_change"
+        assert result["stats"]["changed_systems"] == 2
+        assert result["summary"]["critical"] == 1
+
+    def test_results_match_per_system_drift_detection(self, backup):
+        self._snapshot(backup, "web-2", BASE_CONFIG.replace("server_name example.com;",
+                                                            "server_name example.org;\n    proxy_pass http://app;"))
+
+        fleet = FleetDriftEngine(backup, max_workers=1).scan(include_diff=True)["issues"]
+        single = backup.detect_drift("web-2")
+
+        assert len(fleet) == len(single) == 1
+        for field in ("snapshot_id_after", "change_type", "risk_score", "diff_content", "analysis"):
+            assert fleet[0][field] == single[0][field]
+
+    def test_repeat_scans_are_served_from_cache(self, backup):
+        self._snapshot(backup, "web-3", BASE_CONFIG.replace("root /var/www;", "root /srv/www;"))
+        engine = FleetDriftEngine(backup, max_workers=1)
+
+        assert engine.scan()["stats"]["analyzed"] == 1
+        assert engine.scan()["stats"]["memory_hits"] == 1
+
+        fresh = FleetDriftEngine(backup, max_workers=1).scan()
+        assert fresh["stats"]["cache_hits"] == 1
+        assert fresh["stats"]["analyzed"] == 0
+        assert fresh["issues"][0]["system_id"] == "web-3"
+
+        # A new snapshot is a new pair and is analyzed again
+        self._snapshot(backup, "web-3", BASE_CONFIG.replace("listen 80;", "listen 443;"))
+        assert engine.scan()["stats"]["analyzed"] == 1
+
+    def test_process_pool_matches_inline_analysis(self, backup):
+        for i in range(6):
+            self._snapshot(backup, f"web-{i}", BASE_CONFIG.replace("80", str(8000 + i)))
+
+        inline = FleetDriftEngine(backup, max_workers=1).scan()
+        with sqlite3.connect(backup.db_path) as conn:
+            conn.execute("DELETE FROM config_drift_cache")
+        pooled = FleetDriftEngine(backup, max_workers=2, inline_threshold=1).scan()
+
+        assert pooled["stats"]["analyzed"] == 6
+        assert pooled["stats"]["reused_diffs"] == 6
+        assert pooled["issues"] == inline["issues"]
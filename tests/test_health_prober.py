@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for the background MCP health prober
+"""
+
+import asyncio
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from health_prober import HealthProber, LatencyHistogram
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeClient:
+    """Answers /health for hosts by behaviour: ok (default), down, 500, hang"""
+
+    def __init__(self, latency=0.01):
+        self.latency = latency
+        self.behaviours = {}
+        self.calls = []
+
+    async def get(self, url):
+        host = url.split("//")[1].split(":")[0]
+        self.calls.append(host)
+        behaviour = self.behaviours.get(host, "ok")
+        if behaviour == "hang":
+            await asyncio.sleep(3600)
+        await asyncio.sleep(self.latency)
+        if behaviour == "down":
+            raise ConnectionError("connection refused")
+        return FakeResponse(500 if behaviour == "500" else 200)
+
+
+def registry(n):
+    return {f"srv-{i}": (f"server {i}", f"http://host{i}:8900/sse") for i in range(n)}
+
+
+class TestHealthProber:
+    """Test suite for HealthProber"""
+
+    def _prober(self, targets, client, **config):
+        settings = {"timeout": 0.2, "max_concurrency": 16}
+        settings.update(config)
+        return HealthProber(lambda: targets, settings, client=client)
+
+    def test_targets_probed_concurrently_and_snapshot_cached(self):
+        client = FakeClient(latency=0.05)
+        prober = self._prober(registry(10), client)
+
+        async def scenario():
+            first = await prober.get_snapshot()
+            cached = await prober.get_snapshot()
+            return first, cached
+
+        first, cached = asyncio.run(scenario())
+        assert first["probe"]["round_seconds"] < 0.05 * 10 / 2
+        assert len(client.calls) == 10  # the second read was served from the cache
+        assert "age_seconds" in cached
+        assert first["services"]["server 3"]["status"] == "healthy"
+        assert client.calls[0].startswith("host")
+
+    def test_fresh_requests_share_one_probe_round(self):
+        client = FakeClient(latency=0.05)
+        prober = self._prober(registry(4), client)
+
+        async def scenario():
+            return await asyncio.gather(*(prober.get_snapshot(fresh=True) for _ in range(5)))
+
+        snapshots = asyncio.run(scenario())
+        assert len(client.calls) == 4
+        assert all(snapshot is snapshots[0] for snapshot in snapshots)
+
+    def test_up_down_state_needs_consecutive_failures(self):
+        client = FakeClient()
+        prober = self._prober(registry(2), client, failure_threshold=2)
+
+        async def scenario():
+            await prober.refresh()
+            client.behaviours["host0"] = "down"
+            client.behaviours["host1"] = "hang"
+            once = await prober.refresh()
+            twice = await prober.refresh()
+            client.behaviours.clear()
+            recovered = await prober.refresh()
+            return once, twice, recovered
+
+        once, twice, recovered = asyncio.run(scenario())
+        assert once["services"]["server 0"]["state"] == "up"  # one failure does not flap
+        assert once["services"]["server 0"]["status"] == "offline"
+        assert once["overall_status"] == "healthy"
+        assert twice["services"]["server 0"]["state"] == "down"
+        assert twice["services"]["server 1"]["state"] == "down"  # per-target timeout
+        assert twice["overall_status"] == "degraded"
+        assert recovered["services"]["server 0"]["state"] == "up"
+        assert prober.health["srv-0"].failures == 2
+
+    def test_checks_run_alongside_probes_and_failures_degrade(self):
+        targets = registry(1)
+        prober = self._prober(targets, FakeClient())
+
+        async def tools():
+            return {"status": "healthy", "type": "local", "tools_count": 34}
+
+        async def bridges():
+            raise RuntimeError("bridge manager offline")
+
+        prober.add_check("haivemind", tools)
+        prober.add_check("bridges", bridges)
+        snapshot = asyncio.run(prober.refresh())
+
+        assert snapshot["services"]["haivemind"]["tools_count"] == 34
+        assert snapshot["services"]["bridges"] == {"status": "error", "error": "bridge manager offline"}
+        assert snapshot["overall_status"] == "degraded"
+
+        del targets["srv-0"]
+        asyncio.run(prober.refresh())
+        assert prober.health == {}
+
+    def test_latency_histogram_window_and_percentiles(self):
+        histogram = LatencyHistogram(window=100)
+        for latency in range(1, 201):
+            histogram.observe(float(latency))
+
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 100  # only the most recent window
+        assert snapshot["p50_ms"] == 151.0
+        assert snapshot["max_ms"] == 200.0
+        assert snapshot["buckets"] == {"le_250": 100}
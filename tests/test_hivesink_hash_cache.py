@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for HiveSink incremental change detection: cached hashes, streaming, sync
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import hivesink_init
+from hivesink_init import ContentType, FileHashCache, HiveSinkInit, SyncDirection, SyncScope, hash_file
+
+
+def write_old(path: Path, content: str, age: int = 60):
+    """Write a file with an mtime outside the racy window so it can be cached"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    past = time.time() - age
+    os.utime(path, (past, past))
+
+
+class TestHiveSinkHashCache:
+    """Test suite for FileHashCache and the sync paths that use it"""
+
+    @pytest.fixture
+    def hivesink(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as tmp:
+            monkeypatch.setenv("HOME", str(Path(tmp) / "home"))
+            project = Path(tmp) / "project"
+            project.mkdir()
+            yield HiveSinkInit(str(project))
+
+    def test_streamed_hash_matches_whole_file_digest(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(hivesink_init, "HASH_CHUNK_SIZE", 7)
+        data = os.urandom(1000)
+        path = tmp_path / "blob.bin"
+        path.write_bytes(data)
+
+        assert hash_file(path) == hashlib.blake2b(data, digest_size=20).hexdigest()
+        assert hash_file(path, legacy=True) == hashlib.md5(data).hexdigest()
+
+    def test_unchanged_files_are_not_reread(self, tmp_path, monkeypatch):
+        files = [tmp_path / f"skill-{i}.md" for i in range(20)]
+        for i, path in enumerate(files):
+            write_old(path, f"skill {i}")
+        cache = FileHashCache(tmp_path / "cache.json")
+        first = cache.get_many(files)
+        cache.save()
+
+        reads = []
+        monkeypatch.setattr(hivesink_init, "hash_file", lambda p, legacy=False: reads.append(p) or "x")
+        reloaded = FileHashCache(tmp_path / "cache.json")
+        assert reloaded.get_many(files) == first
+        assert reads == []
+
+        write_old(files[3], "edited skill", age=30)
+        assert reloaded.get(files[3]) == "x"
+        assert reads == [files[3]]
+
+    def test_recently_modified_files_are_not_cached(self, tmp_path):
+        path = tmp_path / "fresh.md"
+        path.write_text("just written")
+        cache = FileHashCache(tmp_path / "cache.json")
+        cache.get(path)
+        cache.save()
+
+        assert not (tmp_path / "cache.json").exists()
+
+    def test_sync_transfers_only_changed_files(self, hivesink):
+        vault = hivesink.get_vault_path(SyncScope.PERSONAL)
+        commands = hivesink.project_root / ".claude" / "commands"
+        for i in range(5):
+            write_old(commands / f"skill-{i}.md", f"skill {i}")
+
+        first = hivesink.sync(SyncDirection.UP, SyncScope.PERSONAL, [ContentType.SKILLS])
+        assert len(first.new) == 5
+
+        write_old(commands / "skill-2.md", "skill 2 v2", age=30)
+        write_old(commands / "skill-4.md", "skill 4!", age=30)  # same size, different content
+        second = hivesink.sync(SyncDirection.UP, SyncScope.PERSONAL, [ContentType.SKILLS])
+        assert sorted(second.synced) == ["skill-2.md", "skill-4.md"]
+        assert (vault / "skills" / "skill-4.md").read_text() == "skill 4!"
+
+        manifest = json.loads((vault / "manifest.json").read_text())
+        assert manifest["files"]["skill-4.md"]["hash"] == hash_file(commands / "skill-4.md")
+
+        preview = hivesink.preview_sync(SyncDirection.UP, SyncScope.PERSONAL, [ContentType.SKILLS])
+        assert len(preview["unchanged"]) == 5
+
+    def test_legacy_md5_release_hashes_still_match(self, hivesink):
+        vault = hivesink.get_vault_path(SyncScope.PERSONAL)
+        write_old(vault / "docs" / "CLAUDE.md", "# docs")
+        write_old(hivesink.project_root / "CLAUDE.md", "# docs")
+        hivesink.create_release("1.0.0", SyncScope.PERSONAL)
+
+        release_path = vault / "release.json"
+        release = json.loads(release_path.read_text())
+        release["files"]["CLAUDE.md"]["hash"] = hashlib.md5(b"# docs").hexdigest()
+        release_path.write_text(json.dumps(release))
+
+        assert not hivesink.check_for_updates(SyncScope.PERSONAL).has_updates
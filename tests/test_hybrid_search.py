@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for confidence-aware hybrid search ranking
+"""
+
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from confidence_system import ConfidenceSystem
+from hybrid_search import HybridRanker, HybridRankingConfig, ConfidenceScoreCache
+
+
+class TestHybridSearch:
+    """Test suite for the hybrid ranker and its confidence cache"""
+
+    @pytest.fixture
+    def db_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            yield str(Path(tmp) / "confidence.db")
+
+    @pytest.fixture
+    def system(self, db_path):
+        return ConfidenceSystem(db_path=db_path)
+
+    def _candidate(self, memory_id, similarity, days_old=0, category='infrastructure'):
+        return {
+            'id': memory_id,
+            'category': category,
+            'created_at': (datetime.now() - timedelta(days=days_old)).isoformat(),
+            'score': similarity,
+        }
+
+    def _score(self, system, memory_id, verifications=0):
+        for i in range(verifications):
+            system.verify_memory(memory_id, f"agent_{i}", 'confirmed')
+        system.calculate_confidence(memory_id, {
+            'created_at': datetime.now().isoformat(),
+            'category': 'infrastructure',
+            'source_type': 'verified_fact',
+        })
+
+    def test_cache_refreshes_incrementally(self, system, db_path):
+        cache = ConfidenceScoreCache(db_path, refresh_interval=0)
+        self._score(system, 'mem_a')
+        assert cache.refresh(force=True) == 1
+
+        self._score(system, 'mem_b')
+        assert cache.refresh(force=True) == 1
+        assert cache.get('mem_a') is not None
+        assert cache.get('mem_b') is not None
+        assert len(cache) == 2
+
+    def test_cache_picks_up_rows_sharing_the_high_water_timestamp(self, system, db_path):
+        cache = ConfidenceScoreCache(db_path, refresh_interval=0)
+        stamp = '2025-01-01T00:00:00'
+        self._score(system, 'mem_a')
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE memory_confidence SET updated_at = ?", (stamp,))
+        assert cache.refresh(force=True) == 1
+
+        self._score(system, 'mem_b')
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE memory_confidence SET updated_at = ? WHERE memory_id = 'mem_b'", (stamp,))
+        assert cache.refresh(force=True) == 1
+        assert cache.get('mem_b') is not None
+        assert cache.refresh(force=True) == 0
+
+    def test_cache_evicts_deleted_scores(self, system, db_path):
+        cache = ConfidenceScoreCache(db_path, refresh_interval=0)
+        self._score(system, 'mem_a')
+        self._score(system, 'mem_b')
+        cache.refresh(force=True)
+
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("DELETE FROM memory_confidence WHERE memory_id = 'mem_a'")
+        cache.refresh(force=True)
+        assert cache.get('mem_a') is None
+        assert cache.get('mem_b') is not None
+        assert len(cache) == 1
+
+    def test_confidence_reorders_similar_results(self, system, db_path):
+        self._score(system, 'trusted', verifications=5)
+        system.detect_contradiction('doubtful', 'trusted', 'factual', 1.0)
+        system.calculate_confidence('doubtful', {
+            'created_at': datetime.now().isoformat(),
+            'category': 'infrastructure',
+            'source_type': 'rumor',
+        })
+
+        config = HybridRankingConfig(refresh_interval=0)
+        ranker = HybridRanker(config, ConfidenceScoreCache(db_path, refresh_interval=0))
+
+        ranked = ranker.rank([
+            self._candidate('doubtful', 0.82),
+            self._candidate('trusted', 0.80),
+        ], limit=2)
+
+        assert [m['id'] for m in ranked] == ['trusted', 'doubtful']
+        assert ranked[0]['similarity'] == pytest.approx(0.80)
+        assert ranked[0]['confidence'] > ranked[1]['confidence']
+
+    def test_min_confidence_cut_before_truncation(self, system, db_path):
+        self._score(system, 'trusted', verifications=5)
+
+        config = HybridRankingConfig(refresh_interval=0)
+        ranker = HybridRanker(config, ConfidenceScoreCache(db_path, refresh_interval=0))
+
+        ranked = ranker.rank([
+            self._candidate('unscored_1', 0.99),
+            self._candidate('unscored_2', 0.98),
+            self._candidate('trusted', 0.50),
+        ], limit=1, min_confidence=0.6)
+
+        assert [m['id'] for m in ranked] == ['trusted']
+
+    def test_freshness_decays_by_category_half_life(self, db_path):
+        ranker = HybridRanker(HybridRankingConfig(), ConfidenceScoreCache(db_path))
+        now = datetime.now()
+        thirty_days_ago = (now - timedelta(days=30)).isoformat()
+
+        assert ranker.freshness(thirty_days_ago, 'infrastructure', now) == pytest.approx(0.5)
+        assert ranker.freshness(thirty_days_ago, 'runbooks', now) > 0.5
+
+    def test_candidate_overfetch(self, db_path):
+        ranker = HybridRanker(HybridRankingConfig(overfetch_factor=3, max_candidates=40),
+                              ConfidenceScoreCache(db_path))
+        assert ranker.candidate_count(10) == 30
+        assert ranker.candidate_count(20) == 40
+        assert ranker.candidate_count(60) == 60
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the index-backed Log Correlation Engine
+"""
+
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from log_correlation_engine import LogCorrelationEngine
+
+
+class TestLogCorrelationEngine:
+    """Test suite for SQL-side log correlation"""
+
+    @pytest.fixture
+    def temp_db_path(self):
+        """Create temporary database with a minimal log_entries table"""
+        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
+            path = f.name
+        conn = sqlite3.connect(path)
+        conn.execute('''
+            CREATE TABLE log_entries (
+                id TEXT PRIMARY KEY, timestamp TIMESTAMP NOT NULL, level TEXT NOT NULL,
+                source TEXT NOT NULL, host TEXT NOT NULL, message TEXT NOT NULL,
+                trace_id TEXT, user_id TEXT, session_id TEXT, pattern_id TEXT
+            )
+        ''')
+        conn.commit()
+        conn.close()
+        yield path
+        Path(path).unlink(missing_ok=True)
+
+    @pytest.fixture
+    def engine(self, temp_db_path):
+        engine = LogCorrelationEngine(temp_db_path, page_size=2)
+        engine.ensure_indexes()
+        return engine
+
+    def _insert(self, db_path, rows):
+        conn = sqlite3.connect(db_path)
+        conn.executemany('''
+            INSERT INTO log_entries (id, timestamp, level, source, host, message, trace_id)
+            VALUES (?, ?, ?, ?, 'host-1', 'msg', ?)
+        ''', rows)
+        conn.commit()
+        conn.close()
+
+    def test_trace_correlation_summaries(self, engine, temp_db_path):
+        now = datetime.now()
+        self._insert(temp_db_path, [
+            ('a1', now - timedelta(seconds=30), 'INFO', 'api', 'trace-a'),
+            ('a2', now - timedelta(seconds=20), 'ERROR', 'db', 'trace-a'),
+            ('a3', now - timedelta(seconds=10), 'INFO', 'api', 'trace-a'),
+            ('b1', now - timedelta(seconds=10), 'INFO', 'api', 'trace-b'),
+            ('b2', now - timedelta(seconds=5), 'INFO', 'api', 'trace-b'),
+        ])
+
+        traces = [c for c in engine.correlate(5, now=now) if c['correlation_type'] == 'trace']
+
+        assert len(traces) == 1
+        assert traces[0]['trace_id'] == 'trace-a'
+        assert traces[0]['services'] == ['api', 'db']
+        assert traces[0]['log_count'] == 3
+        assert traces[0]['error_count'] == 1
+        assert traces[0]['time_span_seconds'] == pytest.approx(20.0)
+        assert 'logs' not in traces[0]
+
+    def test_trace_logs_are_paginated(self, engine, temp_db_path):
+        now = datetime.now()
+        self._insert(temp_db_path, [
+            (f'id{i}', now - timedelta(seconds=10 - i), 'INFO', f'svc{i % 2}', 'trace-a')
+            for i in range(5)
+        ])
+
+        seen = []
+        page = engine.get_trace_logs('trace-a')
+        while True:
+            seen.extend(log['id'] for log in page['logs'])
+            if not page['next']:
+                break
+            page = engine.get_trace_logs('trace-a', after=page['next'])
+
+        assert seen == [f'id{i}' for i in range(5)]
+
+    def test_temporal_correlation_buckets(self, engine, temp_db_path):
+        now = datetime.now().replace(second=30, microsecond=0)
+        self._insert(temp_db_path, [
+            ('w1', now, 'WARN', 'api', None),
+            ('w2', now + timedelta(seconds=5), 'ERROR', 'db', None),
+            ('w3', now + timedelta(seconds=6), 'INFO', 'cache', None),
+        ])
+
+        temporal = [c for c in engine.correlate(5, now=now + timedelta(seconds=10))
+                    if c['correlation_type'] == 'temporal']
+
+        assert len(temporal) == 1
+        assert temporal[0]['services'] == ['api', 'db']
+        page = engine.get_bucket_logs(temporal[0]['time_bucket'], page_size=10)
+        assert [log['id'] for log in page['logs']] == ['w1', 'w2']
+
+    def test_incremental_open_groups(self, engine):
+        now = datetime.now()
+        engine.observe('trace-a', 'api', 'INFO', now - timedelta(minutes=10))
+        engine.observe('trace-a', 'db', 'ERROR', now - timedelta(minutes=9))
+        engine.observe('trace-b', 'api', 'INFO', now)
+        engine.observe('trace-b', 'worker', 'INFO', now)
+
+        open_groups = engine.open_correlations(now=now)
+        assert {g['trace_id'] for g in open_groups} == {'trace-a', 'trace-b'}
+
+        closed = engine.expire_idle(now=now)
+        assert [g['trace_id'] for g in closed] == ['trace-a']
+        assert closed[0]['open'] is False
+        assert engine.get_stats()['open_traces'] == 1
+
+    def test_incremental_mixes_utc_and_naive_timestamps(self, engine):
+        now = datetime.now(timezone.utc)
+        parsed = datetime.fromisoformat((now - timedelta(seconds=5)).strftime('%Y-%m-%dT%H:%M:%S') + '+00:00')
+        engine.observe('trace-a', 'api', 'INFO', parsed)
+        engine.observe('trace-a', 'db', 'ERROR', datetime.now())  # _parse_log_entry fallback is naive local time
+
+        assert [g['trace_id'] for g in engine.open_correlations(5)] == ['trace-a']
+        assert engine.expire_idle() == []
+        assert engine.expire_idle(now=now + timedelta(minutes=10))[0]['log_count'] == 2
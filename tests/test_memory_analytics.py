@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental memory analytics counters
+"""
+
+from datetime import date, timedelta
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from memory_analytics import MemoryAnalytics, parse_tags
+
+
+def memory(content, category="global", machine_id="lance-dev", tags="", context="", **extra):
+    return content, {"category": category, "machine_id": machine_id, "tags": tags, "context": context,
+                     "created_at": "2026-01-05T10:00:00", **extra}
+
+
+class FakeCollection:
+    """Serves collection.get(limit, offset) pages and counts the calls"""
+
+    def __init__(self, records):
+        self.records = records
+        self.pages = 0
+
+    def get(self, limit, offset, include):
+        self.pages += 1
+        page = self.records[offset:offset + limit]
+        return {"ids": [f"m{offset + i}" for i in range(len(page))],
+                "documents": [content for content, _ in page],
+                "metadatas": [metadata for _, metadata in page]}
+
+
+class TestMemoryAnalytics:
+    """Test suite for MemoryAnalytics"""
+
+    def test_store_and_delete_update_live_counters(self, tmp_path):
+        analytics = MemoryAnalytics(tmp_path / "analytics.db")
+        first = memory("x" * 120, tags="redis,cache", context="ops")
+        analytics.record_added([first, memory("y" * 40, category="infrastructure", machine_id="proxy0")])
+        analytics.record_added([memory("z" * 3000, tags="redis")])
+        analytics.record_removed([first])
+        analytics.record_removed([memory("gone", deleted_at="2026-01-06")])  # already soft-deleted
+
+        summary = analytics.summary()
+        assert summary["total_memories"] == 2
+        assert summary["category_distribution"]["infrastructure"] == {"count": 1, "percentage": 50.0}
+        assert summary["machine_contributions"]["proxy0"]["count"] == 1
+        assert summary["quality_metrics"]["avg_content_length"] == 1520
+        assert summary["quality_metrics"]["tagged_memories_percentage"] == 50.0
+        assert summary["quality_metrics"]["memories_with_context"] == 0
+        assert summary["quality_metrics"]["content_length_histogram"] == {"le_100": 1, "le_5000": 1}
+        assert summary["quality_metrics"]["top_tags"] == {"redis": 1}
+        assert summary["recent_activity"]["last_24h"] == 3
+        assert summary["growth_analytics"]["daily_growth"] == 2
+        assert summary["events"] == {"stored": 3, "deleted": 1}
+
+    def test_replace_moves_counts_without_growth(self, tmp_path):
+        analytics = MemoryAnalytics(tmp_path / "analytics.db")
+        old = memory("short", tags="a")
+        analytics.record_added([old])
+        analytics.record_replaced(old, memory("much longer content " * 20, category="runbooks", tags="a,b"),
+                                  event="merged")
+
+        summary = analytics.summary()
+        assert summary["total_memories"] == 1
+        assert summary["category_distribution"] == {"runbooks": {"count": 1, "percentage": 100.0}}
+        assert summary["quality_metrics"]["top_tags"] == {"a": 1, "b": 1}
+        assert summary["quality_metrics"]["merged_duplicates"] == 1
+        assert summary["growth_analytics"]["weekly_growth"] == 1
+
+    def test_growth_windows_and_trend(self, tmp_path):
+        analytics = MemoryAnalytics(tmp_path / "analytics.db")
+        analytics.record_added([memory(f"m{i}") for i in range(4)])
+        later = date.today() + timedelta(days=10)
+
+        summary = analytics.summary(today=later)
+        assert summary["recent_activity"] == {"last_24h": 0, "last_7d": 0, "last_30d": 4, "removed_last_30d": 0}
+        assert summary["growth_analytics"]["previous_week_growth"] == 4
+        assert summary["growth_analytics"]["trend"] == "decreasing"
+
+    def test_rebuild_streams_pages_and_replaces_counters(self, tmp_path):
+        analytics = MemoryAnalytics(tmp_path / "analytics.db")
+        analytics.record_added([memory("stale counter")])
+        records = [memory(f"memory {i}", tags="scan") for i in range(25)]
+        records.append(memory("soft deleted", deleted_at="2026-01-07"))
+        collection = FakeCollection(records)
+
+        result = analytics.rebuild({"global": collection}, page_size=10)
+        summary = analytics.summary(today=date(2026, 1, 5))
+
+        assert result["scanned"] == 26 and collection.pages == 3
+        assert summary["total_memories"] == 25
+        assert summary["quality_metrics"]["top_tags"] == {"scan": 25}
+        assert summary["recent_activity"]["last_24h"] == 25  # dated by created_at
+        assert summary["built_at"] is not None
+
+    def test_parse_tags_formats(self):
+        assert parse_tags("b, a,,a") == ["a", "b"]
+        assert parse_tags('["x", "y"]') == ["x", "y"]
+        assert parse_tags(["z"]) == ["z"]
+        assert parse_tags(None) == []
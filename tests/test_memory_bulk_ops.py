@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Tests for batched bulk memory operations
+"""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from memory_analytics import MemoryAnalytics
+from memory_bulk_ops import BulkMemoryOperations, BulkOperationError
+from memory_cache import HotMemoryCache, MemoryLocator
+
+
+class FakeCollection:
+    """Dict-backed ChromaDB collection that counts calls"""
+
+    def __init__(self):
+        self.records = {}
+        self.calls = 0
+
+    def add(self, ids, documents, metadatas, embeddings=None):
+        self.calls += 1
+        for i, memory_id in enumerate(ids):
+            self.records[memory_id] = {"document": documents[i], "metadata": dict(metadatas[i]),
+                                       "embedding": embeddings[i] if embeddings else [0.0]}
+
+    def get(self, ids, include):
+        self.calls += 1
+        found = [memory_id for memory_id in ids if memory_id in self.records]
+        return {"ids": found,
+                "documents": [self.records[memory_id]["document"] for memory_id in found],
+                "metadatas": [dict(self.records[memory_id]["metadata"]) for memory_id in found],
+                "embeddings": ([self.records[memory_id]["embedding"] for memory_id in found]
+                               if "embeddings" in include else None)}
+
+    def update(self, ids, metadatas):
+        self.calls += 1
+        for memory_id, metadata in zip(ids, metadatas):
+            self.records[memory_id]["metadata"] = dict(metadata)
+
+    def delete(self, ids):
+        self.calls += 1
+        for memory_id in ids:
+            self.records.pop(memory_id, None)
+
+
+class FakeStorage:
+    """The parts of MemoryStorage the bulk engine uses"""
+
+    def __init__(self, tmp_path):
+        self.collections = {"global": FakeCollection(), "runbooks": FakeCollection()}
+        self.memory_locator = MemoryLocator(None, str(tmp_path / "locator.db"))
+        self.hot_cache = HotMemoryCache()
+        self.redis_client = None
+        self.analytics = MemoryAnalytics(tmp_path / "analytics.db")
+        self.machine_id = "lance-dev"
+        self.audits = []
+        self.broadcasts = []
+        self.operation_audits = []
+
+    def seed(self, category, count, prefix="m", tags="ops", locate=True):
+        ids = [f"{prefix}{i}" for i in range(count)]
+        records = [(f"content {memory_id}", {"category": category, "tags": tags}) for memory_id in ids]
+        self.collections[category].add(ids, [content for content, _ in records],
+                                        [metadata for _, metadata in records], [[float(i)] for i in range(count)])
+        self.analytics.record_added(records)
+        if locate:
+            self.memory_locator.set_many({memory_id: category for memory_id in ids})
+        return ids
+
+    def total_calls(self):
+        return sum(collection.calls for collection in self.collections.values())
+
+    async def _log_deletion_audit(self, log_data, audit_type="memory_deletion"):
+        self.audits.append((audit_type, log_data))
+
+    async def _log_operation_audit(self, log_data, audit_type, operation):
+        self.operation_audits.append((audit_type, operation, log_data))
+
+    async def _broadcast_bulk_deletion_event(self, memory_ids, action, reason, job_id=None):
+        self.broadcasts.append((memory_ids, action, job_id))
+
+
+class TestBulkMemoryOperations:
+    """Test suite for BulkMemoryOperations"""
+
+    def test_soft_delete_ten_thousand_in_few_round_trips(self, tmp_path):
+        storage = FakeStorage(tmp_path)
+        ids = storage.seed("global", 10000)
+        bulk = BulkMemoryOperations(storage, batch_size=5000, background_threshold=100000)
+        before = storage.total_calls()
+
+        job = asyncio.run(bulk.run("delete", ids + ["missing"], {"reason": "cleanup"}))
+
+        assert job["succeeded"] == 10000 and job["failed"] == 1
+        assert job["errors"] == [{"memory_id": "missing", "error": "Memory not found"}]
+        assert storage.total_calls() - before == job["round_trips"] <= 8
+        assert storage.collections["global"].records["m7"]["metadata"]["deletion_reason"] == "cleanup"
+        assert storage.analytics.summary()["total_memories"] == 0
+        assert len(storage.audits) == 1 and storage.audits[0][1]["requested"] == 10001
+        assert len(storage.audits[0][1]["memory_ids_sample"]) == 100
+        assert len(storage.broadcasts) == 1
+        broadcast_ids, action, job_id = storage.broadcasts[0]
+        assert sorted(broadcast_ids) == sorted(ids) and action == "bulk_soft_delete"
+        assert job_id == job["job_id"]
+
+    def test_hard_delete_removes_records_and_locations(self, tmp_path):
+        storage = FakeStorage(tmp_path)
+        ids = storage.seed("global", 3)
+        bulk = BulkMemoryOperations(storage)
+
+        job = asyncio.run(bulk.run("delete", ids, {"hard_delete": True}))
+
+        assert job["succeeded"] == 3
+        assert storage.collections["global"].records == {}
+        assert storage.memory_locator.get_many(ids) == {}
+
+    def test_tag_modes_and_unlocated_ids(self, tmp_path):
+        storage = FakeStorage(tmp_path)
+        located = storage.seed("global", 2, prefix="g", tags="ops,old")
+        unlocated = storage.seed("runbooks", 2, prefix="r", tags="ops", locate=False)
+        bulk = BulkMemoryOperations(storage)
+
+        asyncio.run(bulk.run("tag", located + unlocated, {"tags": ["new", "ops"]}))
+        asyncio.run(bulk.run("tag", located, {"tags": "old", "mode": "remove"}))
+
+        assert storage.collections["global"].records["g0"]["metadata"]["tags"] == "ops,new"
+        assert storage.collections["runbooks"].records["r1"]["metadata"]["tags"] == "ops,new"
+        assert storage.memory_locator.get("r0") == "runbooks"  # backfilled by the first pass
+        assert storage.analytics.summary()["quality_metrics"]["top_tags"] == {"new": 4, "ops": 4}
+        assert storage.audits == [] and storage.broadcasts == []
+        assert [(audit_type, operation) for audit_type, operation, _ in storage.operation_audits] == [
+            ("bulk_tag", "tag"), ("bulk_tag", "tag")]
+
+    def test_categorize_moves_with_embeddings(self, tmp_path):
+        storage = FakeStorage(tmp_path)
+        ids = storage.seed("global", 3)
+        bulk = BulkMemoryOperations(storage)
+
+        job = asyncio.run(bulk.run("categorize", ids, {"category": "runbooks"}))
+
+        assert job["succeeded"] == 3
+        assert storage.collections["global"].records == {}
+        assert storage.collections["runbooks"].records["m2"]["embedding"] == [2.0]
+        assert storage.memory_locator.get("m1") == "runbooks"
+        distribution = storage.analytics.summary()["category_distribution"]
+        assert distribution == {"runbooks": {"count": 3, "percentage": 100.0}}
+
+    def test_large_jobs_run_in_background(self, tmp_path):
+        storage = FakeStorage(tmp_path)
+        ids = storage.seed("global", 20)
+        bulk = BulkMemoryOperations(storage, background_threshold=10)
+
+        async def scenario():
+            started = await bulk.run("tag", ids, {"tags": "x"})
+            while bulk.get_job(started["job_id"])["status"] == "running":
+                await asyncio.sleep(0.01)
+            return started, bulk.get_job(started["job_id"])
+
+        started, finished = asyncio.run(scenario())
+        assert started["status"] == "running"
+        assert finished["status"] == "completed" and finished["progress"] == 1.0
+
+    def test_export_streams_ndjson(self, tmp_path):
+        storage = FakeStorage(tmp_path)
+        ids = storage.seed("global", 5)
+        bulk = BulkMemoryOperations(storage, batch_size=2)
+
+        async def collect():
+            return [chunk async for chunk in bulk.export(ids + ["missing"])]
+
+        chunks = asyncio.run(collect())
+        lines = [json.loads(line) for chunk in chunks for line in chunk.decode().splitlines()]
+        assert len(chunks) == 3
+        assert [line["id"] for line in lines] == ids + ["missing"]
+        assert lines[-1]["error"] == "Memory not found"
+        assert storage.audits == []
+        assert storage.operation_audits[0][:2] == ("bulk_export", "export")
+
+    def test_rejects_invalid_requests(self, tmp_path):
+        bulk = BulkMemoryOperations(FakeStorage(tmp_path))
+        with pytest.raises(BulkOperationError):
+            asyncio.run(bulk.run("archive", ["m0"]))
+        with pytest.raises(BulkOperationError):
+            asyncio.run(bulk.run("categorize", ["m0"], {"category": "nowhere"}))
+        with pytest.raises(BulkOperationError):
+            asyncio.run(bulk.run("tag", ["m0"], {"tags": []}))
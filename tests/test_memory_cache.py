@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for the memory locator and TinyLFU hot cache
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from memory_cache import INVALIDATION_CHANNEL, MemoryLocator, TinyLFUCache, HotMemoryCache, publish_invalidations
+
+
+class TestMemoryCache:
+    """Test suite for retrieve_memory's lookup tiers"""
+
+    @pytest.fixture
+    def locator(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            yield MemoryLocator(None, str(Path(tmp) / "locator.db"))
+
+    def test_sqlite_locator_roundtrip(self, locator):
+        locator.set('mem_1', 'infrastructure')
+        locator.set_many({'mem_2': 'security', 'mem_1': 'runbooks'})
+
+        assert locator.get('mem_1') == 'runbooks'
+        assert locator.get('mem_2') == 'security'
+
+        locator.remove_many(['mem_1', 'missing'])
+        assert locator.get('mem_1') is None
+
+    def test_frequent_items_survive_one_hit_scan(self):
+        cache = TinyLFUCache(capacity=4)
+        hot_keys = [f"hot_{i}" for i in range(4)]
+        for _ in range(5):
+            for key in hot_keys:
+                cache.get(key)
+        for key in hot_keys:
+            assert cache.put(key, key)
+
+        # A burst of one-off reads must not flush the frequently read set
+        for i in range(100):
+            key = f"cold_{i}"
+            cache.get(key)
+            cache.put(key, key)
+
+        assert all(key in cache for key in hot_keys)
+        assert cache.rejections >= 100
+
+    def test_lru_eviction_among_equals(self):
+        cache = TinyLFUCache(capacity=2)
+        for key in ('a', 'b', 'c'):
+            cache.get(key)
+            cache.put(key, key)
+
+        assert 'a' not in cache
+        assert 'b' in cache and 'c' in cache
+
+    def test_per_category_hit_ratios(self):
+        cache = HotMemoryCache(capacity=8)
+        memory = {'id': 'mem_1', 'category': 'security', 'content': 'x'}
+
+        assert cache.get('mem_1') is None
+        cache.record('security', 'scan')
+        cache.offer(memory)
+        assert cache.get('mem_1') == memory
+        cache.record('security', 'hot')
+        cache.record(None, 'miss')
+
+        stats = cache.get_stats()
+        assert stats['categories']['security']['lookups'] == 2
+        assert stats['categories']['security']['hot_hit_ratio'] == pytest.approx(0.5)
+        assert stats['categories']['unknown']['miss'] == 1
+
+        cache.invalidate('mem_1')
+        assert cache.get('mem_1') is None
+
+    def test_hot_entries_are_copies_and_expire(self, monkeypatch):
+        cache = HotMemoryCache(capacity=8, ttl_seconds=60)
+        cache.offer({'id': 'mem_1', 'category': 'security', 'content': 'x', 'metadata': {'tags': 'a'}})
+
+        served = cache.get('mem_1')
+        served['content'] = 'mutated'
+        served['metadata']['tags'] = 'mutated'
+        assert cache.get('mem_1')['content'] == 'x'
+        assert cache.get('mem_1')['metadata'] == {'tags': 'a'}
+
+        now = time.monotonic()
+        monkeypatch.setattr(time, 'monotonic', lambda: now + 61)
+        assert cache.get('mem_1') is None
+        assert cache.get_stats()['expirations'] == 1
+
+    def test_invalidations_reach_other_processes(self):
+        bus = FakeRedisBus()
+        writer, reader = HotMemoryCache(capacity=8), HotMemoryCache(capacity=8)
+        writer.attach(bus.client())
+        reader.attach(bus.client())
+        reader.offer({'id': 'mem_1', 'category': 'global', 'content': 'old'})
+
+        writer.invalidate_many(['mem_1'])
+        assert reader.get('mem_1') is None
+        assert reader.get_stats()['remote_invalidations'] == 1
+
+        publish_invalidations(bus.client(), ['mem_2'])  # sync service merges publish the same way
+        assert bus.published[-1] == (INVALIDATION_CHANNEL, '["mem_2"]')
+
+
+class FakeRedisBus:
+    """Synchronous in-process pub/sub standing in for Redis channels"""
+
+    def __init__(self):
+        self.handlers = []
+        self.published = []
+
+    def client(self):
+        bus = self
+
+        class Client:
+            def publish(self, channel, data):
+                bus.published.append((channel, data))
+                for subscribed, handler in list(bus.handlers):
+                    if subscribed == channel:
+                        handler({'channel': channel, 'data': data})
+
+            def pubsub(self, ignore_subscribe_messages=False):
+                return FakePubSub(bus)
+
+        return Client()
+
+
+class FakePubSub:
+    def __init__(self, bus):
+        self.bus = bus
+
+    def subscribe(self, **handlers):
+        self.bus.handlers.extend(handlers.items())
+
+    def run_in_thread(self, sleep_time=0, daemon=False):
+        return self
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
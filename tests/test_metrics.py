@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Tests for the Prometheus metrics registry and hot-path instrumentation
+"""
+
+import asyncio
+import inspect
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import metrics
+import sqlite_pool
+from metrics import (InstrumentedCollection, InstrumentedRedis, MetricsRegistry, instrument_fastmcp,
+                     instrument_sqlite, start_http_server)
+
+
+class FakeEmbeddingFunction:
+    def __call__(self, input):
+        return [[float(len(text))] for text in input]
+
+    @staticmethod
+    def name():
+        return "default"
+
+
+class FakeCollection:
+    name = "global_memories"
+
+    def __init__(self):
+        self._embedding_function = FakeEmbeddingFunction()
+
+    def query(self, query_texts, n_results=10):
+        self._embedding_function(query_texts)
+        return {"ids": [["m1"]]}
+
+    def add(self, ids, documents, metadatas=None):
+        raise RuntimeError("collection is read-only")
+
+
+class FakePipeline:
+    def __init__(self):
+        self.commands = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.commands.clear()
+
+    def setex(self, *args):
+        self.commands.append(args)
+        return self
+
+    def execute(self):
+        return [True] * len(self.commands)
+
+
+class FakeRedis:
+    def get(self, key):
+        return None
+
+    def pipeline(self, transaction=True):
+        return FakePipeline()
+
+
+class FakeMCP:
+    def __init__(self):
+        self.tools = {}
+
+    def add_tool(self, fn, name=None, description=None):
+        self.tools[name or fn.__name__] = fn
+
+    def tool(self, name=None, description=None):
+        def decorator(fn):
+            self.add_tool(fn, name=name, description=description)
+            return fn
+        return decorator
+
+
+def count(family_name, *labels):
+    return metrics.REGISTRY.get(family_name).labels(*labels).snapshot()[0]
+
+
+class TestMetrics:
+    """Test suite for the metrics registry and instrumentation wrappers"""
+
+    def test_histogram_renders_cumulative_buckets(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("demo_seconds", "Demo latency", ("tool",), buckets=(0.01, 0.1))
+        for seconds in (0.005, 0.01, 0.05, 2.0):
+            latency.labels('search "all"').observe(seconds)
+        registry.counter("demo_total", "Demo calls").inc(3)
+
+        text = registry.render()
+        assert '# TYPE demo_seconds histogram' in text
+        assert 'demo_seconds_bucket{tool="search \\"all\\"",le="0.01"} 2' in text
+        assert 'demo_seconds_bucket{tool="search \\"all\\"",le="0.1"} 3' in text
+        assert 'demo_seconds_bucket{tool="search \\"all\\"",le="+Inf"} 4' in text
+        assert 'demo_seconds_count{tool="search \\"all\\""} 4' in text
+        assert 'demo_total 3' in text
+        with pytest.raises(ValueError):
+            registry.counter("demo_seconds", "Same name, different type")
+
+    def test_fastmcp_tools_are_timed_with_signature_preserved(self):
+        mcp = instrument_fastmcp(FakeMCP(), "test")
+
+        @mcp.tool()
+        async def search_things(query: str, limit: int = 10) -> str:
+            if query == "boom":
+                raise ValueError("bad query")
+            return f"{query}:{limit}"
+
+        tool = mcp.tools["search_things"]
+        assert list(inspect.signature(tool).parameters) == ["query", "limit"]
+        assert inspect.iscoroutinefunction(tool)
+        assert asyncio.run(tool(query="x")) == "x:10"
+        with pytest.raises(ValueError):
+            asyncio.run(tool(query="boom"))
+
+        assert sum(count("haivemind_tool_call_seconds", "test", "search_things")) == 2
+        assert metrics.TOOL_ERRORS.labels("test", "search_things").value == 1
+
+    def test_collection_and_embedding_instrumentation(self):
+        collection = InstrumentedCollection(FakeCollection(), "global")
+        assert collection.query(query_texts=["a", "bb"]) == {"ids": [["m1"]]}
+        with pytest.raises(RuntimeError):
+            collection.add(ids=["m2"], documents=["c"])
+
+        embedding = collection._embedding_function
+        assert isinstance(embedding, FakeEmbeddingFunction) and embedding.name() == "default"
+        assert sum(count("haivemind_chromadb_op_seconds", "query", "global")) == 1
+        assert metrics.CHROMA_ERRORS.labels("add", "global").value == 1
+        assert metrics.EMBEDDING_TEXTS.labels("FakeEmbeddingFunction").value >= 2
+        assert collection.name == "global_memories"
+
+    def test_redis_commands_and_pipelines_are_timed(self):
+        client = InstrumentedRedis(FakeRedis())
+        before = sum(count("haivemind_redis_op_seconds", "pipeline"))
+        assert client.get("memory:1") is None
+        with client.pipeline(transaction=False) as pipe:
+            pipe.setex("memory:1", 60, "{}")
+            assert pipe.execute() == [True]
+
+        assert bool(client)
+        assert sum(count("haivemind_redis_op_seconds", "get")) >= 1
+        assert sum(count("haivemind_redis_op_seconds", "pipeline")) == before + 1
+
+    def test_sqlite_hook_and_http_exposition(self, tmp_path):
+        instrument_sqlite()
+        conn = sqlite_pool.connect(tmp_path / "metrics_test.db")
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.execute("  select * from t")
+        conn.close()
+        metrics.REGISTRY.add_collector("demo_queue", lambda: {"depth": 3, "per_category": {"global": 0.5},
+                                                              "name": "skipped"})
+
+        server = start_http_server(0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode()
+                assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        finally:
+            server.shutdown()
+            metrics.REGISTRY.remove_collector("demo_queue")
+
+        assert 'haivemind_sqlite_query_seconds_count{db="metrics_test.db",statement="SELECT"} 1' in body
+        assert "haivemind_demo_queue_depth 3" in body
+        assert "haivemind_demo_queue_per_category_global 0.5" in body
+        assert "skipped" not in body
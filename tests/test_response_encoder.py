@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the token-budgeted response encoder
+"""
+
+import json
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from response_encoder import Projection, ResponseEncoder, snippet
+
+
+def memory(memory_id, content="short content", **metadata):
+    return {
+        "id": memory_id, "content": content, "category": "infrastructure", "context": "",
+        "created_at": "2025-01-01T00:00:00", "score": 0.876543,
+        "metadata": {"machine_id": "lance-dev", "hostname": "lance-dev.local", "os": "Linux",
+                     "tailscale_ip": "100.64.0.1", "tags": "", **metadata},
+    }
+
+
+class TestResponseEncoder:
+    """Test suite for projection, snippets and budget packing"""
+
+    def test_projection_drops_system_metadata_and_empty_fields(self):
+        encoder = ResponseEncoder()
+        result = json.loads(encoder.encode("search_memories", [memory("m1")]))
+
+        assert result == {"results": [{
+            "id": "m1", "category": "infrastructure", "score": 0.8765,
+            "created_at": "2025-01-01T00:00:00", "content": "short content",
+            "metadata": {"machine_id": "lance-dev"},
+        }]}
+        full = json.loads(encoder.encode("retrieve_memory", memory("m1")))
+        assert full["metadata"]["hostname"] == "lance-dev.local"
+
+    def test_snippet_is_centred_on_query_hits(self):
+        content = "filler " * 200 + "nginx reload failed on elastic3" + " filler" * 200
+        cut = snippet(content, "nginx reload", 120)
+
+        assert "nginx reload failed" in cut
+        assert cut.startswith("…") and cut.endswith("…")
+        assert len(cut) <= 122
+        assert snippet("no hits here " * 50, "kafka", 40).startswith("no hits")
+
+    def test_budget_packs_whole_results_and_reports_omitted(self):
+        encoder = ResponseEncoder(max_tokens=500, projections={
+            "search_memories": Projection(content_chars=None)
+        })
+        memories = [memory(f"m{i}", content="x" * 300) for i in range(20)]
+        resumed = {}
+
+        def on_omitted(envelope, included):
+            resumed["included"] = included
+            envelope["pagination"]["next_offset"] = included
+
+        encoded = encoder.encode("search_memories", {"memories": memories, "pagination": {"total": 20}},
+                                 on_omitted=on_omitted)
+        result = json.loads(encoded)
+
+        assert len(encoded) <= 500 * 4
+        assert all(len(m["content"]) == 300 for m in result["memories"])  # whole results only
+        assert result["omitted"] == 20 - len(result["memories"]) > 0
+        assert result["pagination"]["next_offset"] == resumed["included"] == len(result["memories"])
+
+    def test_single_oversized_result_is_shortened_not_dropped(self):
+        encoder = ResponseEncoder(max_tokens=100, projections={
+            "search_memories": Projection(content_chars=None)
+        })
+        result = json.loads(encoder.encode("search_memories", [memory("big", content="y" * 5000)]))["results"]
+
+        assert result[0]["id"] == "big"
+        assert result[0]["content_length"] == 5000
+        assert len(result[0]["content"]) < 5000
+
+    def test_lists_keep_one_shape_whether_trimmed_or_not(self):
+        encoder = ResponseEncoder(max_tokens=200)
+        small = json.loads(encoder.encode("search_memories", [memory("m1")]))
+        trimmed = json.loads(encoder.encode("search_memories", [memory(f"m{i}", content="z" * 200)
+                                                                for i in range(10)]))
+
+        assert set(small) == {"results"}
+        assert set(trimmed) == {"results", "omitted"}
+        assert json.loads(encoder.encode("search_memories", [])) == {"results": []}
+
+    def test_metrics_track_size_and_time_per_tool(self):
+        encoder = ResponseEncoder(max_tokens=200)
+        encoder.encode("search_memories", [memory(f"m{i}", content="z" * 200) for i in range(10)])
+        encoder.encode_json("get_memory_stats", {"total": 3})
+
+        stats = encoder.get_stats()
+        assert stats["search_memories"]["responses"] == 1
+        assert stats["search_memories"]["budget_hits"] == 1
+        assert stats["search_memories"]["max_bytes"] <= 200 * 4
+        assert stats["get_memory_stats"]["bytes"] == len('{"total":3}')
+        assert stats["search_memories"]["avg_ms"] >= 0
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the search result set cache behind cursor pagination
+"""
+
+import time
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from result_set_cache import CursorError, ResultSetCache
+
+
+def ranked(n, prefix="m"):
+    return [(f"{prefix}{i}", 1.0 - i / 100) for i in range(n)]
+
+
+class TestResultSetCache:
+    """Test suite for ResultSetCache"""
+
+    def test_cursor_pages_walk_the_same_snapshot(self):
+        cache = ResultSetCache()
+        fingerprint = cache.fingerprint("search_memories", {"query": "nginx"})
+        result_set = cache.put(fingerprint, ranked(12))
+
+        cursor = cache.encode_cursor(result_set, 5)
+        # A newer search for the same query must not move existing cursors
+        cache.put(fingerprint, ranked(12, prefix="new"))
+
+        resolved, offset = cache.resolve(cursor)
+        assert resolved is result_set
+        assert [memory_id for memory_id, _ in resolved.page(offset, 5)] == [f"m{i}" for i in range(5, 10)]
+        assert cache.get(fingerprint).ranked[0][0] == "new0"
+
+    def test_fingerprint_ignores_parameter_order(self):
+        assert ResultSetCache.fingerprint("t", {"a": 1, "b": 2}) == ResultSetCache.fingerprint("t", {"b": 2, "a": 1})
+        assert ResultSetCache.fingerprint("t", {"a": 1}) != ResultSetCache.fingerprint("u", {"a": 1})
+
+    def test_expired_and_malformed_cursors_raise(self):
+        cache = ResultSetCache(ttl=0.05)
+        cursor = cache.encode_cursor(cache.put("fp", ranked(3)), 1)
+        time.sleep(0.1)
+
+        with pytest.raises(CursorError, match="expired"):
+            cache.resolve(cursor)
+        with pytest.raises(CursorError, match="Invalid"):
+            cache.resolve("not-a-cursor")
+        assert cache.get("fp") is None
+        assert cache.get_stats()['expired'] == 1
+
+    def test_byte_budget_evicts_least_recently_used(self):
+        one_set = ResultSetCache().put("probe", ranked(50)).size_bytes
+        cache = ResultSetCache(max_bytes=one_set * 2)
+        cache.put("a", ranked(50))
+        cache.put("b", ranked(50))
+        assert cache.get("a") is not None  # touch a so b is least recently used
+        cache.put("c", ranked(50))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        stats = cache.get_stats()
+        assert stats['evicted'] == 1
+        assert stats['bytes'] <= cache.max_bytes
+
+    def test_truncated_snapshot_extends_without_reordering(self):
+        cache = ResultSetCache(window=4)
+        fingerprint = cache.fingerprint("search_memories", {"query": "nginx"})
+        result_set = cache.put(fingerprint, ranked(4), exhausted=False)
+        cursor = cache.encode_cursor(result_set, 4)
+        size = cache.get_stats()['bytes']
+
+        # A deeper run of the query repeats the head (possibly reordered) and adds the tail
+        deeper = ranked(4)[::-1] + ranked(6, prefix="m")[4:]
+        cache.extend(result_set, deeper, exhausted=True)
+
+        resolved, offset = cache.resolve(cursor)
+        assert [memory_id for memory_id, _ in resolved.ranked] == [f"m{i}" for i in range(6)]
+        assert [memory_id for memory_id, _ in resolved.page(offset, 4)] == ["m4", "m5"]
+        assert resolved.exhausted
+        assert cache.get_stats()['bytes'] > size
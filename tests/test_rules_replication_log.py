@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Tests for the durable rules replication log (SQLite stand-in backend)
+"""
+
+import asyncio
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from rules_replication_log import RuleReplicationLog
+
+
+class TestRulesReplicationLog:
+    """Test suite for acked delivery, snapshot catch-up and lag"""
+
+    @pytest.fixture
+    def config(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            yield {
+                'local_db_path': str(Path(tmp) / "replication.db"),
+                'block_ms': 0,
+                'retention_seconds': 0,
+            }
+
+    def _message(self, rule_id, operation='update', name=None, source='machine_a'):
+        return {
+            'sync_id': f"{operation}:{rule_id}:{name}",
+            'operation': operation,
+            'priority': 500,
+            'source_machine': source,
+            'target_machines': None,
+            'rule_data': {'id': rule_id, 'name': name or rule_id},
+            'timestamp': '2025-01-01T00:00:00',
+            'checksum': '',
+            'metadata': {},
+            'requires_acknowledgment': False,
+            'expires_at': None,
+        }
+
+    def _drain(self, log):
+        """Run the consumer until the backlog is empty and return what it applied"""
+        applied = []
+
+        async def handler(message_data):
+            applied.append((message_data['rule_data']['id'], message_data['rule_data']['name']))
+
+        async def run():
+            task = asyncio.create_task(log.consume(handler))
+            while True:
+                lag = log.get_replication_lag().get(log.machine_id)
+                if lag and lag['entries_behind'] == 0 and lag['unacknowledged'] == 0:
+                    break
+                await asyncio.sleep(0.01)
+            log.stop()
+            await task
+
+        asyncio.run(run())
+        return applied
+
+    def test_reconnecting_node_applies_only_missed_changes(self, config):
+        producer = RuleReplicationLog(None, 'machine_a', config)
+        consumer = RuleReplicationLog(None, 'machine_b', config)
+
+        producer.append(self._message('rule_1', name='v1'))
+        assert self._drain(consumer) == [('rule_1', 'v1')]
+
+        # machine_b goes offline while two more changes land
+        producer.append(self._message('rule_2', name='v1'))
+        producer.append(self._message('rule_1', name='v2'))
+
+        reconnected = RuleReplicationLog(None, 'machine_b', config)
+        assert reconnected.get_replication_lag()['machine_b']['entries_behind'] == 2
+        assert self._drain(reconnected) == [('rule_2', 'v1'), ('rule_1', 'v2')]
+
+    def test_unacknowledged_entries_are_redelivered(self, config):
+        producer = RuleReplicationLog(None, 'machine_a', config)
+        consumer = RuleReplicationLog(None, 'machine_b', config)
+        consumer.catch_up_entries()
+        producer.append(self._message('rule_1'))
+
+        # Read but crash before acknowledging
+        assert len(consumer.read_batch()) == 1
+        assert consumer.get_replication_lag()['machine_b']['unacknowledged'] == 1
+
+        assert self._drain(RuleReplicationLog(None, 'machine_b', config)) == [('rule_1', 'rule_1')]
+        assert consumer.get_replication_lag()['machine_b']['unacknowledged'] == 0
+
+    def test_node_behind_trim_point_restores_from_snapshot(self, config):
+        producer = RuleReplicationLog(None, 'machine_a', config)
+        producer.append(self._message('rule_1', name='v1'))
+        producer.append(self._message('rule_1', name='v2'))
+        producer.append({**self._message('bulk', 'bulk_sync'),
+                         'rule_data': {'rules': [{'id': 'rule_2', 'name': 'v1'}], 'count': 1}})
+
+        result = producer.compact()
+        assert result['compacted'] == 3
+        assert result['trimmed'] == 3
+
+        late_joiner = RuleReplicationLog(None, 'machine_c', config)
+        snapshot, restored = late_joiner.catch_up_entries()
+        assert restored
+        assert sorted((m['rule_data']['id'], m['rule_data']['name'], m['operation']) for m in snapshot) == [
+            ('rule_1', 'v2', 'update'), ('rule_2', 'v1', 'update')]
+
+        producer.append(self._message('rule_3'))
+        assert self._drain(late_joiner) == [('rule_3', 'rule_3')]
+
+    def test_compaction_keeps_entries_inside_retention(self, config):
+        producer = RuleReplicationLog(None, 'machine_a', {**config, 'retention_seconds': 3600})
+        producer.append(self._message('rule_1'))
+
+        result = producer.compact()
+        assert result['compacted'] == 1
+        assert result['trimmed'] == 0
+
+        consumer = RuleReplicationLog(None, 'machine_b', config)
+        assert consumer.catch_up_entries() == ([], False)
+        assert self._drain(consumer) == [('rule_1', 'rule_1')]
+
+    def test_failed_apply_stays_pending_and_is_retried_in_order(self, config):
+        producer = RuleReplicationLog(None, 'machine_a', config)
+        consumer = RuleReplicationLog(None, 'machine_b', {**config, 'retry_backoff_seconds': 0})
+        producer.append(self._message('rule_1'))
+        producer.append(self._message('rule_2'))
+        applied, failures = [], {'rule_1': 2}
+
+        async def flaky(message_data):
+            rule_id = message_data['rule_data']['id']
+            if failures.get(rule_id):
+                failures[rule_id] -= 1
+                raise RuntimeError("rules db locked")
+            applied.append(rule_id)
+
+        async def run():
+            task = asyncio.create_task(consumer.consume(flaky))
+            while len(applied) < 2:
+                await asyncio.sleep(0.01)
+            consumer.stop()
+            await task
+
+        asyncio.run(run())
+        assert applied == ['rule_1', 'rule_2']
+        assert consumer.failed_applies == 2
+        assert consumer.get_replication_lag()['machine_b']['unacknowledged'] == 0
+
+    def test_entry_is_parked_after_max_attempts(self, config):
+        producer = RuleReplicationLog(None, 'machine_a', config)
+        consumer = RuleReplicationLog(None, 'machine_b', {**config, 'retry_backoff_seconds': 0,
+                                                         'max_delivery_attempts': 2})
+        poison = producer.append(self._message('rule_1'))
+        producer.append(self._message('rule_2'))
+        applied = []
+
+        async def handler(message_data):
+            if message_data['rule_data']['id'] == 'rule_1':
+                raise ValueError("unknown rule schema")
+            applied.append(message_data['rule_data']['id'])
+
+        async def run():
+            task = asyncio.create_task(consumer.consume(handler))
+            while not applied:
+                await asyncio.sleep(0.01)
+            consumer.stop()
+            await task
+
+        asyncio.run(run())
+        assert applied == ['rule_2']
+        assert consumer.get_stats()['parked_entries'] == [poison]
+        # Still pending, so a restart (or XCLAIM) gets another chance at it
+        assert consumer.get_replication_lag()['machine_b']['unacknowledged'] == 1
+
+    def test_lagging_consumer_restores_when_its_entries_are_trimmed(self, config):
+        producer = RuleReplicationLog(None, 'machine_a', config)
+        consumer = RuleReplicationLog(None, 'machine_b', config)
+        consumer.catch_up_entries()
+        producer.append(self._message('rule_1', name='v1'))
+        consumer.ack([entry_id for entry_id, _ in consumer.read_batch()])
+        assert consumer.restore_if_trimmed() == ([], False)
+
+        # Compaction trims entries the running consumer has not read yet
+        producer.append(self._message('rule_1', name='v2'))
+        producer.append(self._message('rule_2', name='v1'))
+        producer.compact()
+
+        snapshot, restored = consumer.restore_if_trimmed()
+        assert restored
+        assert sorted((m['rule_data']['id'], m['rule_data']['name']) for m in snapshot) == [
+            ('rule_1', 'v2'), ('rule_2', 'v1')]
+        assert consumer.read_batch() == []
+
+    def test_max_length_trims_only_after_folding(self, config):
+        producer = RuleReplicationLog(None, 'machine_a', {**config, 'retention_seconds': 3600, 'max_length': 2})
+        for i in range(5):
+            producer.append(self._message(f'rule_{i}'))
+
+        result = producer.compact()
+        assert result['compacted'] == 5 and result['trimmed'] == 3
+        stats = producer.get_stats()
+        assert stats['trimmed_to'] is not None
+        assert RuleReplicationLog(None, 'machine_c', config).catch_up_entries()[1]
+
+    def test_entry_timestamps_are_read_in_one_batch(self, config):
+        producer = RuleReplicationLog(None, 'machine_a', config)
+        ids = [producer.append(self._message(f'rule_{i}')) for i in range(3)]
+
+        millis = producer.backend.id_millis_many(ids + ['999'])
+        assert all(millis[entry_id] > 0 for entry_id in ids)
+        assert millis['999'] == 0
+        assert producer.backend.id_millis(ids[0]) == millis[ids[0]]
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for lazy subsystem initialization and readiness gating
+"""
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from service_registry import ServiceRegistry, readiness_gate
+
+
+class SlowService:
+    def __init__(self, delay=0.0):
+        time.sleep(delay)
+        self.machine_id = "lance-dev"
+        self.calls = 0
+
+    def ping(self):
+        self.calls += 1
+        return "pong"
+
+
+def http_scope(path):
+    return {"type": "http", "path": path, "method": "GET", "headers": []}
+
+
+async def call(app, path):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(http_scope(path), receive, send)
+    return sent
+
+
+class TestServiceRegistry:
+    """Test suite for ServiceRegistry and the readiness gate"""
+
+    def test_proxy_builds_service_once_on_first_use(self):
+        registry = ServiceRegistry()
+        built = []
+        storage = registry.register("storage", lambda: built.append(1) or SlowService())
+
+        assert built == [] and registry.peek("storage") is None
+        assert storage.ping() == "pong"
+        assert storage.machine_id == "lance-dev"
+        assert built == [1]
+        assert registry.peek("storage").calls == 1
+        assert registry.status()["services"]["storage"]["status"] == "ready"
+
+    def test_liveness_answers_while_warm_up_runs(self):
+        registry = ServiceRegistry()
+        registry.register("storage", lambda: SlowService(delay=0.3))
+
+        async def downstream(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": scope["path"].encode()})
+
+        app = readiness_gate(downstream, registry)
+
+        async def scenario():
+            registry.start_warm_up()
+            started = time.perf_counter()
+            probe = await call(app, "/health/live")
+            probe_seconds = time.perf_counter() - started
+            assert not registry.is_ready()
+            request = await call(app, "/sse")
+            return probe, probe_seconds, request
+
+        probe, probe_seconds, request = asyncio.run(scenario())
+        assert probe[0]["status"] == 200 and probe_seconds < 0.1
+        assert request[0]["status"] == 200  # held until warm-up finished, then served
+        assert registry.is_ready()
+
+    def test_failed_required_service_fails_readiness(self):
+        registry = ServiceRegistry()
+
+        def broken():
+            raise RuntimeError("chromadb unavailable")
+        registry.register("storage", broken)
+        registry.register("extras", SlowService, required=False)
+
+        async def downstream(scope, receive, send):
+            raise AssertionError("request should not reach the app")
+
+        sent = asyncio.run(call(readiness_gate(downstream, registry), "/messages/"))
+
+        assert sent[0]["status"] == 503
+        status = registry.status()
+        assert status["ready"] is False
+        assert status["services"]["storage"]["error"] == "chromadb unavailable"
+        assert status["services"]["extras"]["status"] == "ready"
+
+    def test_optional_failure_does_not_block_readiness(self):
+        registry = ServiceRegistry()
+        registry.register("storage", SlowService)
+
+        def no_firebase():
+            raise RuntimeError("no credentials")
+        registry.register("agent_auth", no_firebase, required=False)
+
+        assert asyncio.run(registry.wait_ready(timeout=1.0)) is True
+        with pytest.raises(RuntimeError):
+            registry.get("agent_auth")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared pooled SQLite access layer
+"""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import sqlite_pool
+
+
+class TestSqlitePool:
+    """Test suite for connection reuse, per-call state reset and hooks"""
+
+    @pytest.fixture
+    def db_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "pool.db"
+            with sqlite_pool.connect(path) as conn:
+                conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+            yield path
+
+    def test_connections_are_reused_with_wal_and_pragmas(self, db_path):
+        pool = sqlite_pool.get_pool(db_path)
+        sqlite_pool.connect(db_path).close()
+        opened = pool.stats['opened']
+        for _ in range(20):
+            conn = sqlite_pool.connect(db_path)
+            conn.execute("SELECT 1").fetchone()
+            conn.close()
+        assert pool.stats['opened'] == opened
+
+        conn = sqlite_pool.connect(db_path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        conn.close()
+
+    def test_with_block_commits_and_released_state_is_reset(self, db_path):
+        def insert_with_row_factory():
+            with sqlite_pool.connect(db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                conn.execute("PRAGMA foreign_keys = ON")
+                conn.execute("INSERT INTO items (name) VALUES ('kept')")
+
+        insert_with_row_factory()
+        conn = sqlite_pool.connect(db_path)
+        conn.execute("INSERT INTO items (name) VALUES ('uncommitted')")
+        conn.close()
+
+        conn = sqlite_pool.connect(db_path)
+        assert conn.execute("SELECT name FROM items").fetchall() == [("kept",)]
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 0
+        conn.close()
+
+    def test_nested_connections_do_not_share_transactions(self, db_path):
+        outer = sqlite_pool.connect(db_path)
+        outer.execute("INSERT INTO items (name) VALUES ('outer')")
+        inner = sqlite_pool.connect(db_path)
+        assert inner.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+        inner.close()
+        outer.rollback()
+        outer.close()
+
+    def test_threads_see_each_others_commits(self, db_path):
+        def writer(n):
+            for i in range(25):
+                with sqlite_pool.connect(db_path) as conn:
+                    conn.execute("INSERT INTO items (name) VALUES (?)", (f"{n}-{i}",))
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        conn = sqlite_pool.connect(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 100
+        conn.close()
+
+    def test_recreated_database_file_is_not_served_stale(self, db_path):
+        sqlite_pool.connect(db_path).close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(f"{db_path}{suffix}"):
+                os.remove(f"{db_path}{suffix}")
+
+        conn = sqlite_pool.connect(db_path)
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'items'").fetchone() is None
+        conn.close()
+
+    def test_query_hooks_and_async_facade(self, db_path):
+        seen = []
+        hook = lambda path, sql, seconds: seen.append(sql)
+        sqlite_pool.add_query_hook(hook)
+        try:
+            database = sqlite_pool.AsyncDatabase(db_path)
+
+            async def scenario():
+                await database.executemany("INSERT INTO items (name) VALUES (?)", [("a",), ("b",)])
+                return await database.fetchall("SELECT name FROM items ORDER BY name")
+
+            assert asyncio.run(scenario()) == [{"name": "a"}, {"name": "b"}]
+        finally:
+            sqlite_pool.remove_query_hook(hook)
+        assert "SELECT name FROM items ORDER BY name" in seen
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Tests for the fleet sync fan-out scheduler
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from sync_scheduler import SyncFanoutScheduler, TokenBucket
+from sync_wire import CODECS_HEADER, WIRE_CONTENT_TYPE, SyncWireEncoder, decode
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+
+    def json(self):
+        return self._payload
+
+
+class FakeClient:
+    """In-process stand-in for the pooled HTTP client, keyed by host behaviour"""
+
+    def __init__(self, behaviours=None, latency=0.01):
+        self.behaviours = behaviours or {}
+        self.latency = latency
+        self.bodies = {}
+        self.order = []
+        self.active = 0
+        self.peak = 0
+
+    async def post(self, url, content=None, headers=None):
+        host = url.split("//")[1].split(":")[0]
+        self.bodies.setdefault(host, []).append(json.loads(content))
+        self.order.append(host)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.latency)
+            if self.behaviours.get(host) == "dead":
+                raise ConnectionError("connection refused")
+            return FakeResponse(200, {"memories": [], "vector_clock": {host: 1}})
+        finally:
+            self.active -= 1
+
+
+class FakeStreamingResponse:
+    def __init__(self, frames):
+        self.status_code = 200
+        self.headers = {"content-type": WIRE_CONTENT_TYPE, CODECS_HEADER: "zlib, none"}
+        self.frames = frames
+
+    async def aiter_bytes(self):
+        for frame in self.frames:
+            yield frame
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeWireClient:
+    """Streaming client for a peer that answers in the binary wire format"""
+
+    def __init__(self, reply_memories):
+        self.requests = []
+        self.reply_memories = reply_memories
+
+    def stream(self, method, url, content=None, headers=None):
+        self.requests.append((headers, content))
+        encoder = SyncWireEncoder(frame_records=1)
+        return FakeStreamingResponse(list(encoder.iter_frames({"machine_id": "peer", "vector_clock": {"peer": 3}},
+                                                              self.reply_memories)))
+
+
+class FakeService:
+    """Minimal MemorySyncService surface used by the scheduler"""
+
+    def __init__(self, memories):
+        self.machine_id = "local"
+        self.vector_clock = {"local": 1}
+        self.memories = memories
+        self.builds = 0
+        self.merged = []
+
+    async def get_outbound_changeset(self, max_age=None):
+        self.builds += 1
+        return list(self.memories)
+
+    async def _process_sync_response(self, remote_data):
+        self.merged.append(remote_data)
+
+    def get_sync_peers(self):
+        return []
+
+
+def memory(memory_id, created_at):
+    return {"id": memory_id, "content": memory_id, "category": "global",
+            "metadata": {"created_at": created_at}}
+
+
+class TestSyncScheduler:
+    """Test suite for SyncFanoutScheduler"""
+
+    def _scheduler(self, service, client, **config):
+        settings = {"max_concurrency": 4, "timeout": 1.0, "backoff_base": 60}
+        settings.update(config)
+        return SyncFanoutScheduler(service, settings, client=client)
+
+    def test_changeset_built_once_and_peers_synced_concurrently(self):
+        service = FakeService([memory("m1", "2025-01-01T00:00:00")])
+        client = FakeClient(latency=0.05)
+        scheduler = self._scheduler(service, client)
+        peers = [f"peer-{i}" for i in range(12)]
+
+        result = asyncio.run(scheduler.run_cycle(peers))
+
+        assert sorted(result.synced) == sorted(peers)
+        assert service.builds == 1
+        assert result.payloads_serialized == 1
+        assert client.peak == 4
+        assert result.cycle_seconds < 0.05 * 12 / 2
+        assert len(service.merged) == 12
+
+    def test_peers_receive_only_changes_since_their_last_sync(self):
+        service = FakeService([memory("old", "2020-01-01T00:00:00")])
+        client = FakeClient()
+        scheduler = self._scheduler(service, client)
+
+        async def scenario():
+            await scheduler.run_cycle(["a"])
+            service.memories.append(memory("new", "2999-01-01T00:00:00"))
+            await scheduler.run_cycle(["a", "b"])
+
+        asyncio.run(scenario())
+        assert [m["id"] for m in client.bodies["a"][1]["memories"]] == ["new"]
+        assert [m["id"] for m in client.bodies["b"][0]["memories"]] == ["old", "new"]
+
+    def test_relayed_memories_reach_peers_synced_before_they_arrived(self):
+        service = FakeService([])
+        client = FakeClient()
+        scheduler = self._scheduler(service, client)
+
+        async def scenario():
+            await scheduler.run_cycle(["b"])
+            # Merged in from peer a after b's last sync, but created long ago
+            relayed = memory("relayed", "2020-01-01T00:00:00")
+            relayed["metadata"]["synced_at"] = "2999-01-01T00:00:00"
+            service.memories.append(relayed)
+            await scheduler.run_cycle(["b"])
+
+        asyncio.run(scenario())
+        assert [m["id"] for m in client.bodies["b"][1]["memories"]] == ["relayed"]
+
+    def test_memories_committed_after_the_changeset_read_are_not_skipped(self):
+        service = FakeService([])
+        client = FakeClient()
+        scheduler = self._scheduler(service, client)
+
+        async def scenario():
+            stamped = datetime.now().isoformat()  # created_at set before the embedding and add finish
+            await scheduler.run_cycle(["a"])
+            service.memories.append(memory("late", stamped))
+            service.memories.append(memory("ancient", "2020-01-01T00:00:00"))
+            await scheduler.run_cycle(["a"])
+
+        asyncio.run(scenario())
+        assert [m["id"] for m in client.bodies["a"][1]["memories"]] == ["late"]
+
+    def test_unreachable_peers_back_off_and_stale_peers_go_first(self):
+        service = FakeService([])
+        client = FakeClient({"down": "dead"})
+        scheduler = self._scheduler(service, client, max_concurrency=1)
+
+        async def scenario():
+            first = await scheduler.run_cycle(["fresh", "down"])
+            scheduler.peers["fresh"].last_success = time.time() - 5
+            scheduler.peers["fresh"].last_success_marker = None
+            second = await scheduler.run_cycle(["fresh", "down", "never"])
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        assert "down" in first.failed
+        assert second.backing_off == ["down"]
+        assert 60 * 0.8 <= scheduler.peers["down"].next_attempt - time.time() <= 60 * 1.2
+        assert client.order[2:] == ["never", "fresh"]  # never-synced peers first
+
+    def test_binary_replies_switch_peer_to_wire_format(self):
+        service = FakeService([memory("m1", "2025-01-01T00:00:00")])
+        client = FakeWireClient([memory("r1", "2025-01-01T00:00:00"), memory("r2", "2025-01-01T00:00:00")])
+        scheduler = self._scheduler(service, client)
+
+        async def scenario():
+            await scheduler.run_cycle(["peer"])
+            await scheduler.run_cycle(["peer"])
+
+        asyncio.run(scenario())
+        (first_headers, first_body), (second_headers, second_body) = client.requests
+        assert first_headers["Content-Type"] == "application/json" and WIRE_CONTENT_TYPE in first_headers["Accept"]
+        assert json.loads(first_body)["memories"][0]["id"] == "m1"
+        assert second_headers["Content-Type"] == WIRE_CONTENT_TYPE
+        assert decode(second_body)["machine_id"] == "local"
+        # Meta frame, then each record frame merged as it arrived
+        assert service.merged[:3] == [{"vector_clock": {"peer": 3}},
+                                      {"memories": [dict(memory("r1", "2025-01-01T00:00:00"), embedding=None)]},
+                                      {"memories": [dict(memory("r2", "2025-01-01T00:00:00"), embedding=None)]}]
+        assert scheduler.get_stats()["peers"]["peer"]["wire_format"] == "zlib"
+
+    def test_backoff_grows_exponentially_to_the_cap(self):
+        scheduler = self._scheduler(FakeService([]), FakeClient({"down": "dead"}),
+                                    backoff_base=10, backoff_max=35)
+        peer = scheduler._peer("down")
+        delays = []
+        for _ in range(4):
+            scheduler._record_failure(peer, "refused")
+            delays.append(peer.next_attempt - time.time())
+        assert [round(d / 10) * 10 for d in delays[:2]] == [10, 20]
+        assert all(d <= 35 * 1.2 for d in delays)
+
+    def test_bandwidth_limit_spaces_uploads(self):
+        bucket = TokenBucket(rate=1000, burst=1000)
+
+        async def scenario():
+            started = time.perf_counter()
+            for _ in range(3):
+                await bucket.consume(500)
+            return time.perf_counter() - started
+
+        assert asyncio.run(scenario()) == pytest.approx(0.5, abs=0.15)
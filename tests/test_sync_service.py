@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the /api/sync endpoint and WebSocket fan-out of the memory sync service
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+pytest.importorskip("fastapi")
+pytest.importorskip("redis")
+
+from fastapi.testclient import TestClient
+
+import sync_service
+from sync_wire import CODECS_HEADER, WIRE_CONTENT_TYPE, SyncWireEncoder, decode
+
+
+class FakeSyncService:
+    """Records merged payloads and serves a fixed outbound change set"""
+
+    machine_id = "lance-dev"
+
+    def __init__(self, outbound):
+        self.vector_clock = {"lance-dev": 3}
+        self.outbound = outbound
+        self.merged = []
+
+    async def _process_sync_response(self, payload):
+        self.merged.append(payload)
+
+    async def get_outbound_changeset(self):
+        return self.outbound
+
+
+def memories(count):
+    return [{"id": f"m{i}", "content": f"memory {i}", "category": "global",
+             "metadata": {"created_at": "2026-10-01T00:00:00"}, "embedding": [0.5, -0.25]}
+            for i in range(count)]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = FakeSyncService(memories(3))
+    monkeypatch.setattr(sync_service, "sync_service", fake)
+    monkeypatch.setattr(sync_service, "config", {"sync": {"wire": {"frame_records": 2}}})
+    sync_service.app.dependency_overrides[sync_service.verify_token] = lambda: "test"
+    yield TestClient(sync_service.app), fake
+    sync_service.app.dependency_overrides.clear()
+
+
+class TestHandleSync:
+    """Test suite for handle_sync"""
+
+    def test_binary_request_gets_binary_reply(self, client):
+        http, fake = client
+        body = SyncWireEncoder().encode({"machine_id": "elastic1", "vector_clock": {"elastic1": 9}}, memories(2))
+        response = http.post("/api/sync", content=body, headers={
+            "content-type": WIRE_CONTENT_TYPE, "accept": f"{WIRE_CONTENT_TYPE}, application/json",
+            CODECS_HEADER: "zlib, none"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith(WIRE_CONTENT_TYPE)
+        reply = decode(response.content)
+        assert reply["machine_id"] == "lance-dev" and reply["vector_clock"] == {"lance-dev": 3}
+        assert [m["id"] for m in reply["memories"]] == ["m0", "m1", "m2"]
+        assert fake.merged[0] == {"vector_clock": {"elastic1": 9}}
+        assert [m["id"] for m in fake.merged[1]["memories"]] == ["m0", "m1"]
+
+    def test_json_request_gets_json_reply(self, client):
+        http, fake = client
+        response = http.post("/api/sync", json={
+            "machine_id": "elastic1", "memories": memories(1), "vector_clock": {"elastic1": 9}})
+
+        assert response.status_code == 200
+        assert [m["id"] for m in response.json()["memories"]] == ["m0", "m1", "m2"]
+        assert fake.merged[0]["vector_clock"] == {"elastic1": 9}
+
+    def test_corrupt_binary_body_is_rejected(self, client):
+        http, _ = client
+        response = http.post("/api/sync", content=b"HVS1\x01\x00garbage",
+                             headers={"content-type": WIRE_CONTENT_TYPE})
+        assert response.status_code == 400
+
+
+class TestConnectionManager:
+    """Test suite for ConnectionManager"""
+
+    def test_sync_events_coalesce_per_origin_machine(self, monkeypatch):
+        manager = sync_service.ConnectionManager()
+        keys = []
+        monkeypatch.setattr(manager.broadcaster, "broadcast",
+                            lambda message, coalesce_key=None, exclude=None: keys.append(coalesce_key))
+
+        async def scenario():
+            for machine in ("machine-a", "machine-b", "machine-a"):
+                await manager.broadcast_sync_event({"type": "external_sync", "from_machine": machine})
+
+        asyncio.run(scenario())
+        assert keys[0] == keys[2] != keys[1]
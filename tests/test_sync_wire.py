@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the binary sync wire format
+"""
+
+import asyncio
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from sync_wire import (SyncWireDecoder, SyncWireEncoder, WireFormatError, choose_codec, decode, decode_stream,
+                       stream_frames)
+
+META = {"machine_id": "lance-dev", "vector_clock": {"lance-dev": 7}}
+
+
+def memories(count, dim=16):
+    rng = random.Random(count)
+    return [{"id": f"m{i}", "content": f"memory {i}", "category": "global",
+             "metadata": {"created_at": "2026-10-01T00:00:00", "tags": "a,b"},
+             "embedding": [rng.uniform(-1, 1) for _ in range(dim)] if i % 3 else None}
+            for i in range(count)]
+
+
+class TestSyncWire:
+    """Test suite for SyncWireEncoder and SyncWireDecoder"""
+
+    @pytest.mark.parametrize("dtype,tolerance", [("float32", 1e-6), ("float16", 1e-3), ("int8", 1e-2)])
+    def test_roundtrip_per_dtype(self, dtype, tolerance):
+        original = memories(10)
+        payload = decode(SyncWireEncoder(embedding_dtype=dtype, frame_records=4).encode(META, original))
+
+        assert payload["machine_id"] == "lance-dev" and payload["vector_clock"] == {"lance-dev": 7}
+        assert [m["id"] for m in payload["memories"]] == [m["id"] for m in original]
+        for sent, received in zip(original, payload["memories"]):
+            assert received["metadata"] == sent["metadata"]
+            if sent["embedding"] is None:
+                assert received["embedding"] is None
+            else:
+                assert max(abs(a - b) for a, b in zip(sent["embedding"], received["embedding"])) < tolerance
+
+    def test_binary_is_much_smaller_than_json(self):
+        original = memories(60, dim=384)
+        json_size = len(json.dumps(dict(META, memories=original)).encode())
+        binary_size = len(SyncWireEncoder(embedding_dtype="float16").encode(META, original))
+        assert binary_size * 8 < json_size
+
+    def test_incremental_feed_yields_frames_as_they_complete(self):
+        data = SyncWireEncoder(frame_records=5).encode(META, memories(12))
+        decoder = SyncWireDecoder()
+        kinds = []
+        for i in range(len(data)):
+            kinds.extend(kind for kind, _ in decoder.feed(data[i:i + 1]))
+        decoder.close()
+        assert kinds == ["meta", "memories", "memories", "memories"]
+
+    def test_truncated_and_foreign_streams_are_rejected(self):
+        data = SyncWireEncoder().encode(META, memories(3))
+        decoder = SyncWireDecoder()
+        decoder.feed(data[:-5])
+        with pytest.raises(WireFormatError):
+            decoder.close()
+        with pytest.raises(WireFormatError):
+            SyncWireDecoder().feed(b"{\"memories\": []}")
+
+    def test_async_stream_roundtrip(self):
+        encoder = SyncWireEncoder(frame_records=2)
+
+        async def scenario():
+            received = []
+            async for kind, value in decode_stream(stream_frames(encoder, META, memories(5))):
+                received.append((kind, len(value) if kind == "memories" else value))
+            return received
+
+        assert asyncio.run(scenario()) == [("meta", META), ("memories", 2), ("memories", 2), ("memories", 1)]
+
+    def test_codec_negotiation(self):
+        assert choose_codec("zlib, none") == "zlib"
+        assert choose_codec("none") == "none"
+        assert choose_codec(None) == "zlib"
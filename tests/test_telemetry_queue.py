@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for the telemetry write-behind queue
+"""
+
+import asyncio
+import uuid
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from telemetry_queue import TelemetryEvent, TelemetryQueue
+
+
+def event(content, durable=False, **kwargs):
+    return TelemetryEvent(memory_id=str(uuid.uuid4()), content=content, category="crud_operations",
+                          durable=durable, **kwargs)
+
+
+class TestTelemetryQueue:
+    """Test suite for batching, coalescing and overload handling"""
+
+    @pytest.fixture
+    def written(self):
+        return []
+
+    @pytest.fixture
+    def queue(self, written):
+        async def flush_batch(batch):
+            written.append(list(batch))
+        return TelemetryQueue(flush_batch, max_size=5, batch_size=3, flush_interval=0.05)
+
+    def test_identical_events_coalesce_into_one_memory(self, queue, written):
+        first = queue.enqueue(event("search returned 3 results", metadata={"query": "nginx"}))
+        again = queue.enqueue(event("search returned 3 results", metadata={"query": "nginx"}))
+        other = queue.enqueue(event("search returned 3 results", metadata={"query": "redis"}))
+
+        assert again == first != other
+        asyncio.run(queue.flush())
+        assert [e.occurrences for e in written[0]] == [2, 1]
+        assert queue.get_stats()['coalesced'] == 1
+
+    def test_overload_drops_oldest_but_keeps_durable(self, queue, written):
+        audit_id = queue.enqueue(event("audit", durable=True))
+        for i in range(6):
+            queue.enqueue(event(f"search {i}"))
+
+        stats = queue.get_stats()
+        assert stats['queue_depth'] == 5
+        assert stats['dropped'] == 2
+
+        asyncio.run(queue.flush())
+        contents = [e.content for batch in written for e in batch]
+        assert contents == ["audit", "search 2", "search 3", "search 4", "search 5"]
+        assert written[0][0].memory_id == audit_id
+        assert [len(batch) for batch in written] == [3, 2]
+
+    def test_durable_event_is_returned_to_caller_when_full(self, queue):
+        for _ in range(5):
+            assert queue.enqueue(event(f"audit {uuid.uuid4()}", durable=True))
+        assert queue.enqueue(event("one more audit", durable=True)) is None
+        assert queue.enqueue(event("droppable")) is None
+        assert queue.get_stats()['rejected'] == 1
+
+    def test_background_flush_does_not_block_enqueue(self, queue, written):
+        async def scenario():
+            release = asyncio.Event()
+
+            async def slow_flush(batch):
+                await release.wait()
+                written.append(list(batch))
+            queue.flush_batch = slow_flush
+
+            for i in range(4):
+                queue.enqueue(event(f"ticket {i}"))  # returns immediately while the flush waits
+            await asyncio.sleep(0.1)
+            release.set()
+            await queue.close()
+
+        asyncio.run(scenario())
+        assert sorted(e.content for batch in written for e in batch) == [f"ticket {i}" for i in range(4)]
+
+    def test_flush_failures_are_counted_not_raised(self, queue):
+        async def failing(batch):
+            raise RuntimeError("chroma unavailable")
+        queue.flush_batch = failing
+        queue.enqueue(event("lost"))
+
+        assert asyncio.run(queue.flush()) == 0
+        assert queue.get_stats()['failed'] == 1
+        assert queue.get_stats()['queue_depth'] == 0
+
+    def test_failed_durable_events_are_retried_in_order(self, written):
+        attempts = []
+
+        async def flaky(batch):
+            attempts.append([e.content for e in batch])
+            if len(attempts) == 1:
+                raise RuntimeError("chroma unavailable")
+            written.append(list(batch))
+
+        queue = TelemetryQueue(flaky, batch_size=10, flush_interval=0.01, retry_backoff=0.02)
+        audit_id = queue.enqueue(event("audit", durable=True))
+        queue.enqueue(event("search"))
+
+        async def scenario():
+            queue._ensure_worker(wake=True)
+            queue.enqueue(event("audit 2", durable=True))
+            while not written:
+                await asyncio.sleep(0.01)
+            await queue.close()
+
+        asyncio.run(scenario())
+        assert attempts[0] == ["audit", "search", "audit 2"]
+        assert [e.content for batch in written for e in batch] == ["audit", "audit 2"]
+        assert written[0][0].memory_id == audit_id and written[0][0].attempts == 1
+        stats = queue.get_stats()
+        assert stats['failed'] == 1 and stats['retried'] == 2 and stats['queue_depth'] == 0
+
+    def test_close_keeps_retrying_durable_events_until_timeout(self, written):
+        failures = [RuntimeError("redis down")] * 2
+
+        async def recovering(batch):
+            if failures:
+                raise failures.pop()
+            written.append(list(batch))
+
+        queue = TelemetryQueue(recovering, retry_backoff=0.01, close_timeout=1.0)
+        queue.enqueue(event("deletion audit", durable=True))
+        asyncio.run(queue.close())
+        assert [e.content for batch in written for e in batch] == ["deletion audit"]
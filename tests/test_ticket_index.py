@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for the local ticket index behind EnhancedTicketSystem
+"""
+
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from ticket_index import TicketIndex
+
+
+def make_ticket(number, title, priority="medium", assignee=None, status="new",
+                ticket_type="task", description="", project_id="proj", **extra):
+    now = datetime.now()
+    return {
+        'id': f"task-{number}",
+        'project_id': project_id,
+        'ticket_number': number,
+        'title': title,
+        'description': description,
+        'status': status,
+        'vibe_status': 'todo',
+        'metadata': {'ticket_type': ticket_type, 'priority': priority, 'assignee': assignee,
+                     'severity': 'minor', 'reporter': 'system', 'due_date': extra.get('due_date')},
+        'created_at': extra.get('created_at', now.isoformat()),
+        'updated_at': extra.get('updated_at', now.isoformat())
+    }
+
+
+class TestTicketIndex:
+    """Test suite for indexed filtering, full-text search and metrics"""
+
+    @pytest.fixture
+    def index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ticket_index = TicketIndex(str(Path(tmp) / "tickets.db"))
+            yield ticket_index
+            ticket_index.close()
+
+    def test_filters_return_full_pages(self, index):
+        index.upsert_tickets(make_ticket(1000 + i, f"Ticket {i}",
+                                         priority="high" if i % 10 == 0 else "low",
+                                         assignee="alice" if i % 2 else "bob")
+                             for i in range(200))
+
+        high = index.list_tickets("proj", priority="high", limit=15)
+        assert len(high) == 15
+        assert all(t['metadata']['priority'] == "high" for t in high)
+        assert [t['ticket_number'] for t in high] == sorted((t['ticket_number'] for t in high), reverse=True)
+
+        assert len(index.list_tickets("proj", priority="high", assignee="bob", limit=100)) == 20
+        assert index.list_tickets("other") == []
+
+    def test_search_covers_title_description_and_comments(self, index):
+        index.upsert_tickets([
+            make_ticket(1, "Redis failover broken", description="sentinel does not promote"),
+            make_ticket(2, "Update docs", description="mention redis in the setup guide"),
+            make_ticket(3, "Nginx reload"),
+        ])
+        index.add_comment("task-3", "c1", "Root cause was the redis: cache warmup", author="alice")
+
+        results = index.search("proj", "redis")
+        assert [t['id'] for t in results][0] == "task-1"  # title match ranks first
+        assert {t['id'] for t in results} == {"task-1", "task-2", "task-3"}
+
+        # User input with FTS syntax characters is treated as plain terms
+        assert [t['id'] for t in index.search("proj", 'sentinel "promote')] == ["task-1"]
+
+    def test_updates_replace_indexed_text_and_status(self, index):
+        index.upsert_tickets([make_ticket(1, "Old title")])
+        index.upsert_tickets([make_ticket(1, "Renamed ticket")])
+        index.update_status("task-1", "done", "done")
+
+        assert index.search("proj", "old") == []
+        assert index.search("proj", "renamed")[0]['status'] == "done"
+        assert index.count("proj") == 1
+
+    def test_metrics_match_ticket_state(self, index):
+        now = datetime.now()
+        index.upsert_tickets([
+            make_ticket(1, "a", priority="critical", status="done",
+                        created_at=(now - timedelta(hours=10)).isoformat(), updated_at=now.isoformat()),
+            make_ticket(2, "b", status="in_progress", due_date=(now - timedelta(days=1)).isoformat()),
+            make_ticket(3, "c", ticket_type="bug", created_at=(now - timedelta(days=90)).isoformat()),
+        ])
+
+        metrics = index.metrics("proj", days=30)
+        assert metrics['total_tickets'] == 3
+        assert metrics['by_status'] == {'done': 1, 'in_progress': 1, 'new': 1}
+        assert metrics['by_type'] == {'task': 2, 'bug': 1}
+        assert metrics['created_in_period'] == 2
+        assert metrics['closed_in_period'] == 1
+        assert metrics['average_resolution_time'] == pytest.approx(10, abs=0.1)
+        assert metrics['overdue_tickets'] == 1
+        assert metrics['critical_tickets'] == 1
+
+    def test_sync_cursor_survives_empty_polls(self, index):
+        assert index.get_sync_state("proj") is None
+        index.set_sync_state("proj", "2025-01-02T00:00:00Z", 100.0)
+        index.set_sync_state("proj", None, 200.0)
+
+        assert index.get_sync_state("proj") == {'updated_since': "2025-01-02T00:00:00Z", 'last_sync': 200.0}
+
+    def test_tickets_deleted_upstream_are_removed(self, index):
+        index.upsert_tickets([make_ticket(1, "Keep redis"), make_ticket(2, "Gone redis"),
+                              make_ticket(3, "Other project", project_id="other")])
+        index.add_comment("task-2", "c1", "redis comment")
+
+        assert index.remove_missing("proj", ["task-1"]) == 1
+        assert [t['id'] for t in index.list_tickets("proj")] == ["task-1"]
+        assert [t['id'] for t in index.search("proj", "redis")] == ["task-1"]
+        assert index.count("other") == 1
+        assert index.remove_missing("proj", ["task-1"]) == 0
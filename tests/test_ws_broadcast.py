@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-connection WebSocket broadcaster
+"""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from ws_broadcast import HEARTBEAT_MESSAGE, WebSocketBroadcaster
+
+
+class FakeWebSocket:
+    """Records sent text; a stalled socket blocks every send until released"""
+
+    def __init__(self, stalled=False):
+        self.sent = []
+        self.closed_with = None
+        self.release = asyncio.Event()
+        if not stalled:
+            self.release.set()
+
+    async def send_text(self, text):
+        await self.release.wait()
+        self.sent.append(text)
+
+    async def close(self, code=1000, reason=""):
+        self.closed_with = code
+
+
+async def settle(until=lambda: False, timeout=1.0):
+    """Let writers run until the condition holds (or a few loop turns without one)"""
+    deadline = time.monotonic() + timeout
+    for _ in range(5):
+        await asyncio.sleep(0)
+    while not until() and time.monotonic() < deadline:
+        await asyncio.sleep(0.001)
+
+
+class TestWebSocketBroadcaster:
+    """Test suite for WebSocketBroadcaster"""
+
+    def test_stalled_peer_does_not_delay_others(self):
+        async def scenario():
+            broadcaster = WebSocketBroadcaster(max_queue=1000, heartbeat_interval=0)
+            fast, stalled = FakeWebSocket(), FakeWebSocket(stalled=True)
+            broadcaster.register("fast", fast)
+            broadcaster.register("stalled", stalled)
+
+            started = time.perf_counter()
+            for i in range(100):
+                broadcaster.broadcast({"n": i})
+            elapsed = time.perf_counter() - started
+            await settle(lambda: len(fast.sent) == 100)
+            await broadcaster.aclose()
+            return elapsed, fast, stalled
+
+        elapsed, fast, stalled = asyncio.run(scenario())
+        assert elapsed < 0.1
+        assert [json.loads(text)["n"] for text in fast.sent] == list(range(100))
+        assert stalled.sent == []
+
+    def test_message_serialized_once_and_exclude(self):
+        async def scenario():
+            broadcaster = WebSocketBroadcaster(heartbeat_interval=0)
+            sockets = {key: FakeWebSocket() for key in ("a", "b", "c")}
+            for key, websocket in sockets.items():
+                broadcaster.register(key, websocket)
+            assert broadcaster.broadcast({"type": "sync_event"}, exclude="c") == 2
+            await settle(lambda: sockets["a"].sent and sockets["b"].sent)
+            await broadcaster.aclose()
+            return sockets
+
+        sockets = asyncio.run(scenario())
+        assert sockets["a"].sent[0] is sockets["b"].sent[0]
+        assert sockets["c"].sent == []
+
+    def test_overflow_coalesces_then_drops_slow_consumer(self):
+        dropped = []
+
+        async def scenario():
+            broadcaster = WebSocketBroadcaster(max_queue=2, heartbeat_interval=0, on_disconnect=dropped.append)
+            slow = FakeWebSocket(stalled=True)
+            broadcaster.register("slow", slow)
+            for i in range(3):
+                broadcaster.broadcast({"stats": i}, coalesce_key="stats")
+            outbox = broadcaster.outboxes["slow"]
+            queued = [json.loads(text)["stats"] for _, text in outbox.queue]
+            broadcaster.broadcast({"other": True})
+            await settle(lambda: slow.closed_with is not None)
+            return broadcaster, slow, queued
+
+        broadcaster, slow, queued = asyncio.run(scenario())
+        assert queued == [1, 2]  # the overflowing third message replaced the oldest queued one
+        assert dropped == ["slow"]
+        assert "slow" not in broadcaster and slow.closed_with == 1013
+        assert broadcaster.get_stats()["slow_consumers_dropped"] == 1
+
+    def test_idle_writer_sends_heartbeat(self):
+        async def scenario():
+            broadcaster = WebSocketBroadcaster(heartbeat_interval=0.01)
+            websocket = FakeWebSocket()
+            broadcaster.register("peer", websocket)
+            await asyncio.sleep(0.05)
+            await broadcaster.aclose()
+            return websocket
+
+        websocket = asyncio.run(scenario())
+        assert websocket.sent and websocket.sent[0] == HEARTBEAT_MESSAGE
+
+    def test_reregister_replaces_and_stale_unregister_is_ignored(self):
+        async def scenario():
+            broadcaster = WebSocketBroadcaster(heartbeat_interval=0)
+            old, new = FakeWebSocket(), FakeWebSocket()
+            broadcaster.register("m2", old)
+            broadcaster.register("m2", new)
+            broadcaster.unregister("m2", old)  # late cleanup from the old connection
+            broadcaster.send("m2", "hello")
+            await settle(lambda: new.sent)
+            await broadcaster.aclose()
+            return old, new
+
+        old, new = asyncio.run(scenario())
+        assert new.sent == ["hello"] and old.sent == []